@@ -0,0 +1,30 @@
+"""add_job_posting_content_hash
+
+Revision ID: 5d8b2e61c0af
+Revises: c3e1f7a92d14
+Create Date: 2026-10-17 11:40:05.127934
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5d8b2e61c0af'
+down_revision: Union[str, Sequence[str], None] = 'c3e1f7a92d14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('raw_job_postings', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('job_postings', sa.Column('content_hash', sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('job_postings', 'content_hash')
+    op.drop_column('raw_job_postings', 'content_hash')
@@ -0,0 +1,30 @@
+"""add_job_posting_dedup_features
+
+Revision ID: 7c3a9e5f1b82
+Revises: e2b7d94a0c15
+Create Date: 2026-10-17 15:10:12.664021
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c3a9e5f1b82'
+down_revision: Union[str, Sequence[str], None] = 'e2b7d94a0c15'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job_postings', sa.Column('title_tokens', sa.JSON(), nullable=True))
+    op.add_column('job_postings', sa.Column('description_tf', sa.LargeBinary(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('job_postings', 'description_tf')
+    op.drop_column('job_postings', 'title_tokens')
@@ -0,0 +1,40 @@
+"""add_staging_reprocess_checkpoints
+
+Revision ID: 9a4f6c1d2b37
+Revises: 5d8b2e61c0af
+Create Date: 2026-10-17 13:05:48.602117
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4f6c1d2b37'
+down_revision: Union[str, Sequence[str], None] = '5d8b2e61c0af'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('staging_reprocess_checkpoints',
+    sa.Column('id', sa.UUID(as_uuid=False), nullable=False),
+    sa.Column('job_name', sa.String(length=100), nullable=False),
+    sa.Column('source_key', sa.String(length=50), nullable=False),
+    sa.Column('last_raw_id', sa.UUID(as_uuid=False), nullable=True),
+    sa.Column('rows_processed', sa.Integer(), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('started_at', sa.DateTime(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.Column('completed_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('job_name', 'source_key', name='uq_staging_reprocess_job_source')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('staging_reprocess_checkpoints')
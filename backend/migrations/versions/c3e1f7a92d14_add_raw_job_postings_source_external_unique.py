@@ -0,0 +1,52 @@
+"""add_raw_job_postings_source_external_unique
+
+Revision ID: c3e1f7a92d14
+Revises: 4aa27483b44a
+Create Date: 2026-10-17 09:12:31.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e1f7a92d14'
+down_revision: Union[str, Sequence[str], None] = '4aa27483b44a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Bulk ingestion stages raw postings with INSERT ... ON CONFLICT, which
+    # needs a unique arbiter on the staging key.
+    # Concurrent runs could stage the same pair twice before; keep the newest
+    # row of each pair. No foreign key references raw_job_postings.id, and
+    # job_postings link to staged rows through external_id, so they keep
+    # resolving to the surviving row.
+    op.execute(
+        """
+        DELETE FROM raw_job_postings r
+        USING (
+            SELECT id, ROW_NUMBER() OVER (
+                PARTITION BY source_key, external_id
+                ORDER BY created_at DESC, id DESC
+            ) AS position
+            FROM raw_job_postings
+        ) ranked
+        WHERE r.id = ranked.id AND ranked.position > 1
+        """
+    )
+    op.create_unique_constraint(
+        'uq_raw_job_postings_source_external',
+        'raw_job_postings',
+        ['source_key', 'external_id'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(
+        'uq_raw_job_postings_source_external', 'raw_job_postings', type_='unique'
+    )
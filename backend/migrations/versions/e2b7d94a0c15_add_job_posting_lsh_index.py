@@ -0,0 +1,39 @@
+"""add_job_posting_lsh_index
+
+Revision ID: e2b7d94a0c15
+Revises: 9a4f6c1d2b37
+Create Date: 2026-10-17 14:22:31.418305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7d94a0c15'
+down_revision: Union[str, Sequence[str], None] = '9a4f6c1d2b37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('job_postings', sa.Column('minhash_signature', sa.LargeBinary(), nullable=True))
+    op.create_table('job_posting_lsh_bands',
+    sa.Column('job_posting_id', sa.UUID(as_uuid=False), nullable=False),
+    sa.Column('band', sa.SmallInteger(), nullable=False),
+    sa.Column('company_id', sa.UUID(as_uuid=False), nullable=False),
+    sa.Column('bucket', sa.BigInteger(), nullable=False),
+    sa.ForeignKeyConstraint(['job_posting_id'], ['job_postings.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('job_posting_id', 'band')
+    )
+    op.create_index('idx_job_posting_lsh_bands_lookup', 'job_posting_lsh_bands', ['company_id', 'band', 'bucket'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_job_posting_lsh_bands_lookup', table_name='job_posting_lsh_bands')
+    op.drop_table('job_posting_lsh_bands')
+    op.drop_column('job_postings', 'minhash_signature')
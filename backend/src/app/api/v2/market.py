@@ -57,9 +57,10 @@ router = APIRouter(prefix="/market", tags=["market"])
 
 class ManualIngestRequest(BaseModel):
     source_key: str
-    query: str
-    location: str
+    query: str | list[str]
+    location: str | list[str]
     limit: int = 100
+    bulk: bool = False
 
 
 class AdminPostingItem(BaseModel):
@@ -78,6 +79,7 @@ class AdminPostingItem(BaseModel):
 class AdminIngestRequest(BaseModel):
     source: str
     postings: list[AdminPostingItem]
+    bulk: bool = False
 
 
 class DedupeResolveRequest(BaseModel):
@@ -111,6 +113,7 @@ async def trigger_ingestion(
         query=payload.query,
         location=payload.location,
         limit=payload.limit,
+        bulk=payload.bulk,
     )
     return {
         "run_id": run_id,
@@ -246,7 +249,10 @@ async def admin_market_ingest(
     """
     postings_list = [item.model_dump(mode="json") for item in payload.postings]
     audit_id = await JobIngestionService.ingest_postings(
-        db=db, source=payload.source, postings=postings_list
+        db=db,
+        source=payload.source,
+        postings=postings_list,
+        bulk=payload.bulk,
     )
     return {
         "audit_log_id": audit_id,
@@ -5,6 +5,7 @@ from typing import Any
 
 from sqlalchemy import (
     JSON,
+    BigInteger,
     Boolean,
     DateTime,
     ForeignKey,
@@ -14,6 +15,8 @@ from sqlalchemy import (
     Date,
     Integer,
     Index,
+    LargeBinary,
+    SmallInteger,
     UniqueConstraint,
     text,
 )
@@ -533,6 +536,10 @@ class JobPosting(Base):
         UUID(as_uuid=False), ForeignKey("job_postings.id", ondelete="SET NULL"), index=True, nullable=True
     )
     dedupe_fingerprint: Mapped[str | None] = mapped_column(String(64), index=True, nullable=True)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    title_tokens: Mapped[list[str] | None] = mapped_column(JSON, nullable=True)
+    description_tf: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+    minhash_signature: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
     is_primary: Mapped[bool] = mapped_column(Boolean, default=True, nullable=False)
     is_ghost_posting: Mapped[bool] = mapped_column(
         Boolean, default=False, index=True, nullable=False
@@ -642,8 +649,48 @@ class RawJobPosting(Base):
     url: Mapped[str] = mapped_column(Text, nullable=False)
     salary_raw: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
     raw_payload: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    content_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=now_utc, nullable=False)
 
+    __table_args__ = (
+        UniqueConstraint("source_key", "external_id", name="uq_raw_job_postings_source_external"),
+    )
+
+
+class StagingReprocessCheckpoint(Base):
+    __tablename__ = "staging_reprocess_checkpoints"
+
+    id: Mapped[str] = mapped_column(UUID(as_uuid=False), primary_key=True)
+    job_name: Mapped[str] = mapped_column(String(100), nullable=False)
+    source_key: Mapped[str] = mapped_column(String(50), nullable=False)
+    last_raw_id: Mapped[str | None] = mapped_column(UUID(as_uuid=False), nullable=True)
+    rows_processed: Mapped[int] = mapped_column(default=0, nullable=False)
+    status: Mapped[str] = mapped_column(String(50), nullable=False)  # RUNNING|COMPLETED
+    started_at: Mapped[datetime] = mapped_column(DateTime, default=now_utc, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime, default=now_utc, onupdate=now_utc, nullable=False
+    )
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    __table_args__ = (
+        UniqueConstraint("job_name", "source_key", name="uq_staging_reprocess_job_source"),
+    )
+
+
+class JobPostingLSHBand(Base):
+    __tablename__ = "job_posting_lsh_bands"
+
+    job_posting_id: Mapped[str] = mapped_column(
+        UUID(as_uuid=False), ForeignKey("job_postings.id", ondelete="CASCADE"), primary_key=True
+    )
+    band: Mapped[int] = mapped_column(SmallInteger, primary_key=True)
+    company_id: Mapped[str] = mapped_column(UUID(as_uuid=False), nullable=False)
+    bucket: Mapped[int] = mapped_column(BigInteger, nullable=False)
+
+    __table_args__ = (
+        Index("idx_job_posting_lsh_bands_lookup", "company_id", "band", "bucket"),
+    )
+
 
 class JobDuplicate(Base):
     __tablename__ = "job_duplicates"
@@ -0,0 +1,237 @@
+"""
+Two-tier embedding cache: a bounded in-process LRU in front of Redis.
+
+Entries are keyed by (model, task_type, SHA-256 of the normalized text).
+Both tiers hold vectors packed at embedding_cache_precision (per 768-dim
+vector: fp32 3 KB, fp16 1.5 KB, int8 772 bytes; a list of Python floats
+takes about 25 KB). Redis keys live under a namespace of model,
+embedding_cache_version and precision, so a new model, version or
+precision never reads vectors of the old one.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import re
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.infrastructure.rag.embeddings.quantization import check_precision, pack, unpack
+from app.services.metrics_collection_service import MetricsCollectionService
+from app.services.redis_service import RedisService
+
+logger = get_logger(__name__)
+
+_KEY_PREFIX = "embedding_cache"
+# Namespace the cache was last written with; a different one is purged on warm-up
+_CURRENT_KEY = f"{_KEY_PREFIX}:current"
+# Usage counts of the most used entries kept in the warm-up ranking
+_HOT_KEYS_LIMIT = 50000
+_WHITESPACE = re.compile(r"\s+")
+# Key suffixes within a namespace (fp16/int8 namespaces nest below the fp32 one)
+_NAMESPACE_KEY = re.compile(r"(hot|[A-Za-z_]+:[0-9a-f]{64})")
+
+Vector = List[float]
+
+
+def normalize_text(text: str) -> str:
+    """Unicode NFC with runs of whitespace collapsed, so trivially different copies share an entry."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def content_hash(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Embeddings by content, in process (max_entries, LRU) and in Redis
+    (ttl_seconds). Every hit and store bumps the entry in a per-namespace
+    usage ranking; warm_up() loads the top of that ranking into the LRU.
+    Redis errors are logged and treated as misses, so embedding keeps
+    working without Redis.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        max_entries: Optional[int] = None,
+        ttl_seconds: Optional[int] = None,
+        version: Optional[str] = None,
+        precision: Optional[str] = None,
+    ):
+        self.client = client
+        self.max_entries = settings.embedding_cache_size if max_entries is None else max_entries
+        self.ttl_seconds = ttl_seconds or settings.embedding_cache_ttl_seconds
+        self.version = version or settings.embedding_cache_version
+        self.precision = check_precision(precision or settings.embedding_cache_precision)
+        # Packed vectors by (model, task_type, content hash)
+        self._entries: "OrderedDict[Tuple[str, str, str], bytes]" = OrderedDict()
+        self._bytes = 0
+
+    def _redis(self):
+        return self.client or RedisService.get_client()
+
+    def namespace(self, model: str) -> str:
+        namespace = f"{_KEY_PREFIX}:{model}:v{self.version}"
+        return namespace if self.precision == "fp32" else f"{namespace}:{self.precision}"
+
+    def _remember(self, key: Tuple[str, str, str], packed: bytes) -> None:
+        if not self.max_entries:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= len(previous)
+        self._entries[key] = packed
+        self._bytes += len(packed)
+        while len(self._entries) > self.max_entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= len(evicted)
+
+    def _report(self) -> None:
+        MetricsCollectionService.set_embedding_cache_size(len(self._entries), self._bytes)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of packed vectors held in process."""
+        return self._bytes
+
+    async def get_many(self, model: str, task_type: str, texts: Sequence[str]) -> List[Optional[Vector]]:
+        """Cached vectors of texts, in order; None for misses."""
+        hashes = [content_hash(text) for text in texts]
+        results: List[Optional[Vector]] = [None] * len(texts)
+        missing: Dict[str, List[int]] = {}
+        for i, digest in enumerate(hashes):
+            key = (model, task_type, digest)
+            packed = self._entries.get(key)
+            if packed is not None:
+                self._entries.move_to_end(key)
+                results[i] = unpack(packed, self.precision).tolist()
+            else:
+                missing.setdefault(digest, []).append(i)
+        MetricsCollectionService.record_embedding_cache_lookup(
+            "memory", len(texts) - sum(map(len, missing.values())), sum(map(len, missing.values()))
+        )
+        if not missing:
+            return results
+
+        namespace = self.namespace(model)
+        digests = list(missing)
+        try:
+            values = await self._redis().mget([f"{namespace}:{task_type}:{d}" for d in digests])
+            found = [(d, v) for d, v in zip(digests, values) if v]
+            if found:
+                async with self._redis().pipeline(transaction=False) as pipe:
+                    for digest, _ in found:
+                        pipe.zincrby(f"{namespace}:hot", 1, f"{task_type}:{digest}")
+                    await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Embedding cache lookup in Redis failed: {e}")
+            found = []
+
+        hits = 0
+        for digest, value in found:
+            self._remember((model, task_type, digest), value)
+            vector = unpack(value, self.precision).tolist()
+            for i in missing[digest]:
+                results[i] = vector
+                hits += 1
+        MetricsCollectionService.record_embedding_cache_lookup(
+            "redis", hits, sum(map(len, missing.values())) - hits
+        )
+        self._report()
+        return results
+
+    async def put_many(self, model: str, task_type: str, items: Sequence[Tuple[str, Vector]]) -> None:
+        """Stores (text, vector) pairs in both tiers."""
+        if not items:
+            return
+        namespace = self.namespace(model)
+        stored = {}
+        for text, vector in items:
+            digest = content_hash(text)
+            stored[digest] = pack(vector, self.precision)
+            self._remember((model, task_type, digest), stored[digest])
+        self._report()
+        try:
+            async with self._redis().pipeline(transaction=False) as pipe:
+                for digest, packed in stored.items():
+                    pipe.set(f"{namespace}:{task_type}:{digest}", packed, ex=self.ttl_seconds)
+                    pipe.zincrby(f"{namespace}:hot", 1, f"{task_type}:{digest}")
+                pipe.zremrangebyrank(f"{namespace}:hot", 0, -_HOT_KEYS_LIMIT - 1)
+                pipe.set(_CURRENT_KEY, namespace)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Embedding cache store in Redis failed: {e}")
+
+    async def invalidate_stale(self, model: str) -> int:
+        """
+        Deletes the entries of the namespace the cache was last written with
+        if it is not the one of model and this version. Returns keys deleted.
+        """
+        client = self._redis()
+        namespace = self.namespace(model)
+        previous = await client.get(_CURRENT_KEY)
+        previous = previous.decode("utf-8") if isinstance(previous, bytes) else previous
+        if not previous or previous == namespace:
+            return 0
+        deleted = 0
+        batch = []
+        async for key in client.scan_iter(match=f"{previous}:*", count=1000):
+            name = key.decode("utf-8") if isinstance(key, bytes) else key
+            if not _NAMESPACE_KEY.fullmatch(name[len(previous) + 1 :]):
+                continue
+            batch.append(key)
+            if len(batch) >= 1000:
+                deleted += await client.unlink(*batch)
+                batch = []
+        if batch:
+            deleted += await client.unlink(*batch)
+        await client.set(_CURRENT_KEY, namespace)
+        logger.info(f"Embedding cache: dropped {deleted} keys of stale namespace {previous}")
+        return deleted
+
+    async def warm_up(self, model: str, limit: Optional[int] = None) -> int:
+        """
+        Drops a stale namespace, then loads the limit most used entries of
+        model into the LRU. Returns the number of entries loaded.
+        """
+        limit = settings.embedding_cache_warmup if limit is None else limit
+        limit = min(limit, self.max_entries)
+        if not limit:
+            return 0
+        try:
+            await self.invalidate_stale(model)
+            namespace = self.namespace(model)
+            client = self._redis()
+            members = await client.zrevrange(f"{namespace}:hot", 0, limit - 1)
+            members = [m.decode("utf-8") if isinstance(m, bytes) else m for m in members]
+            if not members:
+                return 0
+            values = await client.mget([f"{namespace}:{m}" for m in members])
+        except Exception as e:
+            logger.warning(f"Embedding cache warm-up failed: {e}")
+            return 0
+
+        loaded = 0
+        # Least used first, so the hottest entries end up most recently used
+        for member, value in reversed(list(zip(members, values))):
+            if value:
+                task_type, digest = member.split(":", 1)
+                self._remember((model, task_type, digest), value)
+                loaded += 1
+        self._report()
+        logger.info(f"Embedding cache: warmed up {loaded} entries")
+        return loaded
+
+    def clear(self) -> None:
+        """Empties the in-process tier."""
+        self._entries.clear()
+        self._bytes = 0
+        self._report()
+
+    def __len__(self) -> int:
+        return len(self._entries)
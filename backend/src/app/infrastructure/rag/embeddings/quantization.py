@@ -0,0 +1,175 @@
+"""
+Scalar quantization of embeddings (fp16 and int8) for storage and search.
+
+Precisions, in bytes per 768-dim vector:
+- fp32: 3072, exact;
+- fp16: 1536, half-precision floats;
+- int8: 772, symmetric int8 codes with one float32 scale per vector
+  (scale = max |x| / 127), so every vector uses its full code range.
+
+QuantizedIndex scores queries against the quantized vectors and re-scores
+an oversampled candidate list in full precision for the final top-k.
+Qdrant collections are configured the same way (see qdrant_vectors_config).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.infrastructure.rag.embeddings.similarity import as_matrix, as_vector, normalize_rows, top_k
+
+PRECISIONS = ("fp32", "fp16", "int8")
+
+_INT8_MAX = 127.0
+# Rows converted back to float32 at a time while scoring; the temporary copy stays in cache
+_SCORE_BLOCK_ROWS = 256
+
+
+def check_precision(precision: str) -> str:
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown vector precision '{precision}', expected one of {PRECISIONS}")
+    return precision
+
+
+def quantize(matrix: np.ndarray, precision: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """Quantizes the rows of matrix; returns (codes, per-row float32 scales or None)."""
+    check_precision(precision)
+    matrix = as_matrix(matrix)
+    if precision == "fp32":
+        return matrix, None
+    if precision == "fp16":
+        return matrix.astype(np.float16), None
+    scales = np.abs(matrix).max(axis=1) / _INT8_MAX
+    safe = np.where(scales > 0, scales, 1.0).astype(np.float32)
+    codes = np.clip(np.rint(matrix / safe[:, None]), -_INT8_MAX, _INT8_MAX).astype(np.int8)
+    return codes, scales.astype(np.float32)
+
+
+def pack(vector: Sequence[float] | np.ndarray, precision: str) -> bytes:
+    """Compact bytes of one vector; int8 puts the float32 scale first."""
+    codes, scales = quantize(as_vector(vector)[None, :], precision)
+    if scales is None:
+        return codes.tobytes()
+    return scales.tobytes() + codes.tobytes()
+
+
+def unpack(data: bytes, precision: str) -> np.ndarray:
+    """float32 vector of pack() output."""
+    check_precision(precision)
+    if precision == "fp32":
+        return np.frombuffer(data, dtype=np.float32).copy()
+    if precision == "fp16":
+        return np.frombuffer(data, dtype=np.float16).astype(np.float32)
+    scale = np.frombuffer(data[:4], dtype=np.float32)
+    return np.frombuffer(data[4:], dtype=np.int8).astype(np.float32) * scale
+
+
+class QuantizedIndex:
+    """
+    Cosine top-k search over quantized unit vectors.
+
+    The index keeps only codes and scales in memory. For the final top-k,
+    oversampling * k candidates are re-scored in full precision against
+    full_precision, which can be any row-indexable float32 matrix (for
+    example an np.memmap on disk); without it, quantized scores are final.
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[Hashable],
+        vectors: Sequence[Sequence[float]] | np.ndarray,
+        precision: str = "int8",
+        full_precision: Any = None,
+        oversampling: float = 4.0,
+    ):
+        if len(ids) != len(vectors):
+            raise ValueError(f"{len(ids)} ids for {len(vectors)} vectors")
+        self.ids = list(ids)
+        self.precision = check_precision(precision)
+        self.codes, self.scales = quantize(normalize_rows(as_matrix(vectors)), precision)
+        self.full_precision = full_precision
+        self.oversampling = oversampling
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory of the quantized vectors (full-precision vectors not included)."""
+        return self.codes.nbytes + (self.scales.nbytes if self.scales is not None else 0)
+
+    def scores(self, query: Sequence[float] | np.ndarray) -> np.ndarray:
+        """Approximate cosine similarity of query with every vector, from the codes."""
+        query = as_vector(query)
+        norm = float(np.linalg.norm(query))
+        if norm == 0 or not len(self):
+            return np.zeros(len(self), dtype=np.float32)
+        query = query / norm
+        if self.precision == "fp32":
+            return self.codes @ query
+        scores = np.empty(len(self), dtype=np.float32)
+        for start in range(0, len(self), _SCORE_BLOCK_ROWS):
+            block = self.codes[start : start + _SCORE_BLOCK_ROWS].astype(np.float32)
+            scores[start : start + len(block)] = block @ query
+        if self.scales is not None:
+            scores *= self.scales
+        return scores
+
+    def search(
+        self, query: Sequence[float] | np.ndarray, k: int = 10, rescore: bool = True
+    ) -> List[Tuple[Hashable, float]]:
+        """The k most similar (id, cosine similarity) pairs, best first."""
+        scores = self.scores(query)
+        if not rescore or self.full_precision is None:
+            indices, best = top_k(scores, k)
+            return [(self.ids[i], float(s)) for i, s in zip(indices, best)]
+
+        candidates, _ = top_k(scores, max(k, int(k * self.oversampling)))
+        order = np.sort(candidates)
+        exact = normalize_rows(as_matrix(self.full_precision[order])) @ (
+            as_vector(query) / (float(np.linalg.norm(query)) or 1.0)
+        )
+        indices, best = top_k(exact, k)
+        return [(self.ids[order[i]], float(s)) for i, s in zip(indices, best)]
+
+
+def qdrant_vectors_config(size: int, precision: str) -> Dict[str, Any]:
+    """
+    create_collection arguments storing vectors at precision:
+    fp16 stores half-precision vectors; int8 keeps int8 codes in RAM and
+    the float32 originals on disk for re-scoring.
+    """
+    from qdrant_client.http import models as qmodels  # noqa: PLC0415
+
+    check_precision(precision)
+    if precision == "fp16":
+        return {
+            "vectors_config": qmodels.VectorParams(
+                size=size, distance=qmodels.Distance.COSINE, datatype=qmodels.Datatype.FLOAT16
+            )
+        }
+    if precision == "int8":
+        return {
+            "vectors_config": qmodels.VectorParams(
+                size=size, distance=qmodels.Distance.COSINE, on_disk=True
+            ),
+            "quantization_config": qmodels.ScalarQuantization(
+                scalar=qmodels.ScalarQuantizationConfig(
+                    type=qmodels.ScalarType.INT8, quantile=0.99, always_ram=True
+                )
+            ),
+        }
+    return {"vectors_config": qmodels.VectorParams(size=size, distance=qmodels.Distance.COSINE)}
+
+
+def qdrant_search_params(precision: str, oversampling: float) -> Any:
+    """Search parameters re-scoring int8 candidates with the original vectors."""
+    from qdrant_client.http import models as qmodels  # noqa: PLC0415
+
+    if check_precision(precision) != "int8":
+        return None
+    return qmodels.SearchParams(
+        quantization=qmodels.QuantizationSearchParams(rescore=True, oversampling=oversampling)
+    )
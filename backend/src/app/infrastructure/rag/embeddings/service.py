@@ -1,45 +1,45 @@
 """
 Embedding service using Google's text-embedding-004 model (768 dims).
 
-Provides async and sync helpers for generating embeddings, with a simple
-in-process LRU cache to avoid re-embedding identical skill strings.
+Provides async and sync helpers for generating embeddings, a batched API for
+bulk jobs, a two-tier content-hash cache (see cache.py) and a deterministic
+local backend for offline tests and benchmarks.
 """
 
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import math
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.infrastructure.rag.embeddings import similarity
+from app.infrastructure.rag.embeddings.cache import EmbeddingCache, normalize_text
 
 logger = get_logger(__name__)
 
 _EMBEDDING_DIM = 768
 _EMBEDDING_MODEL = "models/embedding-001"  # v1beta-compatible; text-embedding-004 requires v1 stable API
+_MAX_BATCH_SIZE = 100  # texts per batchEmbedContents request accepted by the API
+_RETRY_BACKOFF_SECONDS = 0.5
+_WORD_PATTERN = re.compile(r"[a-z0-9+#.]+")
 
 
-def _cosine_similarity(a: list[float], b: list[float]) -> float:
-    """Compute cosine similarity between two equal-length vectors."""
-    if len(a) != len(b):
-        return 0.0
-    dot = sum(x * y for x, y in zip(a, b, strict=False))
-    norm_a = math.sqrt(sum(x * x for x in a))
-    norm_b = math.sqrt(sum(x * x for x in b))
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
+class GeminiEmbeddingBackend:
+    """Google Generative AI embeddings; one request embeds a whole chunk."""
 
-
-class EmbeddingService:
-    """Wraps Google Generative AI embeddings with an in-process cache."""
+    model = _EMBEDDING_MODEL
 
     def __init__(self) -> None:
         self._client: Any = None
         self._available: bool | None = None  # None = not yet checked
 
-    def _ensure_client(self) -> bool:
+    def ensure_client(self) -> bool:
         """Lazy-init the Google embedding client.  Returns True if available."""
         if self._available is not None:
             return self._available
@@ -55,6 +55,90 @@ class EmbeddingService:
             self._available = False
         return self._available  # type: ignore[return-value]
 
+    def embed(self, texts: list[str], task_type: str) -> list[list[float]]:
+        if not self.ensure_client():
+            raise RuntimeError("Google GenAI client is not available")
+        result = self._client.embed_content(
+            model=_EMBEDDING_MODEL,
+            content=texts[0] if len(texts) == 1 else texts,
+            task_type=task_type,
+        )
+        embedding = result["embedding"]
+        return [embedding] if len(texts) == 1 else list(embedding)
+
+
+class LocalEmbeddingBackend:
+    """
+    Local, deterministic stand-in for the embedding API used by tests and
+    benchmarks: hashes word unigrams and bigrams into _EMBEDDING_DIM
+    buckets and L2-normalizes, so texts sharing words are similar.
+    latency simulates the per-request round trip; requests and texts count
+    the calls made.
+    """
+
+    model = "local-feature-hash-768"
+
+    def __init__(self, latency: float = 0.0) -> None:
+        self.latency = latency
+        self.requests = 0
+        self.texts = 0
+
+    def ensure_client(self) -> bool:
+        return True
+
+    def embed(self, texts: list[str], task_type: str) -> list[list[float]]:
+        self.requests += 1
+        self.texts += len(texts)
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._embed(text) for text in texts]
+
+    @staticmethod
+    def _embed(text: str) -> list[float]:
+        vector = [0.0] * _EMBEDDING_DIM
+        words = _WORD_PATTERN.findall(text.lower())
+        for feature in words + [f"{a} {b}" for a, b in zip(words, words[1:])]:
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            bucket = int.from_bytes(digest[:4], "little") % _EMBEDDING_DIM
+            vector[bucket] += 1.0 if digest[4] & 1 else -1.0
+        norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+        return [x / norm for x in vector]
+
+
+class EmbeddingService:
+    """
+    Wraps Google Generative AI embeddings (or the local backend when
+    embedding_backend is 'local').
+
+    Calls run on a dedicated thread pool of embedding_max_concurrency
+    workers, so bulk embedding cannot exhaust the event loop's default
+    executor, and at most that many provider requests are in flight.
+    With a cache, texts embedded before are served from it and only the
+    rest reach the provider.
+    """
+
+    def __init__(self, backend: Any = None, cache: EmbeddingCache | None = None) -> None:
+        if backend is None:
+            backend = (
+                LocalEmbeddingBackend()
+                if settings.embedding_backend == "local"
+                else GeminiEmbeddingBackend()
+            )
+        self.backend = backend
+        self.cache = cache
+        self._executor: ThreadPoolExecutor | None = None
+
+    def _ensure_client(self) -> bool:
+        return self.backend.ensure_client()
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=settings.embedding_max_concurrency,
+                thread_name_prefix="embedding",
+            )
+        return self._executor
+
     # ---------- public API ----------
 
     def embed_text_sync(self, text: str) -> list[float] | None:
@@ -64,20 +148,91 @@ class EmbeddingService:
         if not self._ensure_client():
             return None
         try:
-            result = self._client.embed_content(
-                model=_EMBEDDING_MODEL,
-                content=text,
-                task_type="SEMANTIC_SIMILARITY",
-            )
-            return result["embedding"]
+            return self.backend.embed([text], "SEMANTIC_SIMILARITY")[0]
         except Exception as e:
             logger.warning(f"EmbeddingService.embed_text_sync: {e}")
             return None
 
     async def embed_text(self, text: str) -> list[float] | None:
-        """Async wrapper — runs the sync call in a thread pool."""
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, self.embed_text_sync, text)
+        """Embeds a single string through embed_batch (cache, embedding thread pool, retries)."""
+        return (await self.embed_batch([text]))[0]
+
+    async def embed_batch(
+        self, texts: list[str], task_type: str = "SEMANTIC_SIMILARITY"
+    ) -> list[list[float] | None]:
+        """
+        Embeds many strings with as few provider requests as possible.
+
+        Non-blank texts are sent in chunks of embedding_batch_size (at most
+        the provider limit of _MAX_BATCH_SIZE), at most
+        embedding_max_concurrency chunks at a time. A failed chunk is
+        retried embedding_max_retries times with exponential backoff.
+        Cached texts and repeats of a text within the call are not sent.
+        Returns one vector per input, in input order; blank texts and texts
+        of chunks that kept failing get None.
+        """
+        results: list[list[float] | None] = [None] * len(texts)
+        positions = [i for i, text in enumerate(texts) if text and text.strip()]
+        if positions and self.cache is not None:
+            cached = await self.cache.get_many(
+                self.backend.model, task_type, [texts[i] for i in positions]
+            )
+            for i, vector in zip(positions, cached):
+                results[i] = vector
+            positions = [i for i in positions if results[i] is None]
+        if not positions or not self._ensure_client():
+            return results
+
+        # First position of every distinct (normalized) text; only those are embedded
+        first: dict[str, int] = {}
+        for i in positions:
+            first.setdefault(normalize_text(texts[i]), i)
+        unique = list(first.values())
+
+        size = min(settings.embedding_batch_size, _MAX_BATCH_SIZE)
+        chunks = [unique[start : start + size] for start in range(0, len(unique), size)]
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+
+        async def embed_chunk(chunk: list[int]) -> None:
+            batch = [texts[i] for i in chunk]
+            for attempt in range(settings.embedding_max_retries + 1):
+                try:
+                    vectors = await loop.run_in_executor(
+                        executor, self.backend.embed, batch, task_type
+                    )
+                    if len(vectors) != len(batch):
+                        raise ValueError(
+                            f"expected {len(batch)} embeddings, got {len(vectors)}"
+                        )
+                    for i, vector in zip(chunk, vectors):
+                        results[i] = vector
+                    return
+                except Exception as e:
+                    if attempt == settings.embedding_max_retries:
+                        logger.warning(
+                            f"EmbeddingService.embed_batch: chunk of {len(batch)} texts "
+                            f"failed after {attempt + 1} attempts: {e}"
+                        )
+                        return
+                    await asyncio.sleep(_RETRY_BACKOFF_SECONDS * 2**attempt)
+
+        await asyncio.gather(*(embed_chunk(chunk) for chunk in chunks))
+        for i in positions:
+            results[i] = results[first[normalize_text(texts[i])]]
+        if self.cache is not None:
+            await self.cache.put_many(
+                self.backend.model,
+                task_type,
+                [(texts[i], results[i]) for i in unique if results[i] is not None],
+            )
+        return results
+
+    async def warm_up(self) -> int:
+        """Preloads the most used cached embeddings; returns how many were loaded."""
+        if self.cache is None:
+            return 0
+        return await self.cache.warm_up(self.backend.model)
 
     async def embed_skills(self, skills: list[str]) -> list[float] | None:
         """
@@ -90,7 +245,7 @@ class EmbeddingService:
         return await self.embed_text(combined)
 
     def cosine_similarity(self, a: list[float], b: list[float]) -> float:
-        return _cosine_similarity(a, b)
+        return similarity.cosine(a, b)
 
     @property
     def dim(self) -> int:
@@ -98,9 +253,8 @@ class EmbeddingService:
 
     @property
     def available(self) -> bool:
-        self._ensure_client()
-        return bool(self._available)
+        return bool(self._ensure_client())
 
 
-# Module-level singleton
-embedding_service = EmbeddingService()
+# Module-level singleton, cached in process and in Redis
+embedding_service = EmbeddingService(cache=EmbeddingCache())
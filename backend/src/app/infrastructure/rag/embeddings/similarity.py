@@ -0,0 +1,122 @@
+"""
+Vector math for embeddings on NumPy float32 arrays.
+
+Pairwise helpers (cosine, dot) accept plain lists; cosine_many and top_k
+score one query against a whole matrix at once, and VectorIndex keeps a
+matrix of unit vectors preloaded so a search is one matrix-vector product
+plus an argpartition.
+"""
+
+from __future__ import annotations
+
+from typing import Hashable, List, Sequence, Tuple
+
+import numpy as np
+
+VectorLike = Sequence[float] | np.ndarray
+
+
+def as_vector(vector: VectorLike) -> np.ndarray:
+    return np.asarray(vector, dtype=np.float32)
+
+
+def as_matrix(vectors: Sequence[VectorLike] | np.ndarray) -> np.ndarray:
+    """Rows of vectors as a C-contiguous float32 matrix."""
+    matrix = np.ascontiguousarray(vectors, dtype=np.float32)
+    if matrix.ndim != 2:
+        matrix = matrix.reshape(len(matrix), -1)
+    return matrix
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Rows scaled to unit length; all-zero rows stay zero."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+
+def dot(a: VectorLike, b: VectorLike) -> float:
+    """Dot product of two equal-length vectors (0.0 if their lengths differ)."""
+    a, b = as_vector(a), as_vector(b)
+    if a.shape != b.shape:
+        return 0.0
+    return float(np.dot(a, b))
+
+
+def cosine(a: VectorLike, b: VectorLike) -> float:
+    """Cosine similarity of two equal-length vectors; 0.0 if lengths differ or one is all zeros."""
+    a, b = as_vector(a), as_vector(b)
+    if a.shape != b.shape:
+        return 0.0
+    norm = float(np.linalg.norm(a)) * float(np.linalg.norm(b))
+    if norm == 0:
+        return 0.0
+    return float(np.dot(a, b)) / norm
+
+
+def cosine_many(matrix: np.ndarray, query: VectorLike, normalized: bool = False) -> np.ndarray:
+    """
+    Cosine similarity of query with every row of matrix, as one
+    matrix-vector product. Pass normalized=True if the rows are already
+    unit vectors (as in VectorIndex) to skip their norms.
+    """
+    query = as_vector(query)
+    query_norm = float(np.linalg.norm(query))
+    if query_norm == 0 or not len(matrix):
+        return np.zeros(len(matrix), dtype=np.float32)
+    scores = matrix @ (query / query_norm)
+    if not normalized:
+        norms = np.linalg.norm(matrix, axis=1)
+        scores = np.divide(scores, norms, out=np.zeros_like(scores), where=norms > 0)
+    return scores
+
+
+def top_k(scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Indices and scores of the k highest scores, best first. argpartition
+    selects them in linear time; only those k are sorted.
+    """
+    k = min(k, len(scores))
+    if k <= 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=scores.dtype)
+    if k < len(scores):
+        candidates = np.argpartition(scores, -k)[-k:]
+    else:
+        candidates = np.arange(len(scores))
+    order = candidates[np.argsort(scores[candidates])[::-1]]
+    return order, scores[order]
+
+
+class VectorIndex:
+    """
+    Exact cosine top-k search over vectors preloaded into one float32 matrix
+    of unit rows (768 dims: 3 KB per vector, so 50k vectors take about 150 MB).
+    """
+
+    def __init__(self, ids: Sequence[Hashable], vectors: Sequence[VectorLike] | np.ndarray):
+        if len(ids) != len(vectors):
+            raise ValueError(f"{len(ids)} ids for {len(vectors)} vectors")
+        self.ids = list(ids)
+        self.matrix = normalize_rows(as_matrix(vectors)) if len(ids) else np.empty((0, 0), np.float32)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def scores(self, query: VectorLike) -> np.ndarray:
+        """Cosine similarity of query with every indexed vector, in index order."""
+        return cosine_many(self.matrix, query, normalized=True)
+
+    def search(self, query: VectorLike, k: int = 10) -> List[Tuple[Hashable, float]]:
+        """The k most similar (id, cosine similarity) pairs, best first."""
+        indices, scores = top_k(self.scores(query), k)
+        return [(self.ids[i], float(s)) for i, s in zip(indices, scores)]
+
+    def search_many(self, queries: Sequence[VectorLike], k: int = 10) -> List[List[Tuple[Hashable, float]]]:
+        """search() for many queries with one matrix-matrix product."""
+        if not len(self):
+            return [[] for _ in queries]
+        scores = normalize_rows(as_matrix(queries)) @ self.matrix.T
+        results = []
+        for row in scores:
+            indices, best = top_k(row, k)
+            results.append([(self.ids[i], float(s)) for i, s in zip(indices, best)])
+        return results
@@ -1,13 +1,13 @@
 import os
 import sys
 import asyncio
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
 
 if sys.platform == "win32":
     asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
 
 import uvicorn
-from fastapi import FastAPI, Response
+from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.staticfiles import StaticFiles
@@ -30,9 +30,13 @@ from app.core.config import settings
 from app.core.logging import get_logger, setup_logging
 from app.infrastructure.database.connection import engine
 from app.infrastructure.database.init_db import init_db
+from app.infrastructure.rag.embeddings.service import embedding_service
 from app.middleware.request_id import RequestIDMiddleware
+from app.services.circuit_breaker_service import circuit_breakers
 from app.services.observability_telemetry_service import ObservabilityTelemetryService
 from app.services.metrics_collection_service import MetricsCollectionService
+from app.services.redis_service import RedisService
+from app.utils.event_bus import dispatcher
 from app.middleware.metrics import MetricsMiddleware
 from app.middleware.rate_limit import RateLimitMiddleware
 
@@ -66,6 +70,14 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Database connection failed: {e}")
         raise
+
+    # Application-scoped Redis pool shared by every service
+    await RedisService.open_pool()
+    # Adopt circuit breaker transitions published by other workers
+    circuit_sync_stop = asyncio.Event()
+    circuit_sync = asyncio.create_task(circuit_breakers.run(circuit_sync_stop))
+    # Preload the most used cached embeddings in the background
+    embedding_warmup = asyncio.create_task(embedding_service.warm_up())
     yield
 
     # At shutdown
@@ -75,6 +87,18 @@ async def lifespan(app: FastAPI):
         await Neo4jService.close_driver()
     except Exception as e:
         logger.warning(f"Error closing Neo4j driver on shutdown: {e}")
+    try:
+        await asyncio.wait_for(dispatcher.drain(), timeout=5.0)
+    except Exception as e:
+        logger.warning(f"In-process event handlers did not drain on shutdown: {e!r}")
+    await dispatcher.close()
+    embedding_warmup.cancel()
+    with suppress(asyncio.CancelledError):
+        await embedding_warmup
+    circuit_sync_stop.set()
+    await circuit_sync
+    await circuit_breakers.flush()
+    await RedisService.close_pool()
 
 
 app = FastAPI(title=settings.app_name, version=settings.app_version, lifespan=lifespan)
@@ -112,7 +136,13 @@ app.add_middleware(RateLimitMiddleware)
 
 # Expose /metrics scrape endpoint
 @app.get("/metrics")
-def metrics_endpoint():
+def metrics_endpoint(request: Request):
+    # Scrapers that accept OpenMetrics also get the trace-id exemplars
+    if "application/openmetrics-text" in request.headers.get("accept", ""):
+        return Response(
+            content=MetricsCollectionService.get_serialized_metrics(openmetrics=True),
+            media_type="application/openmetrics-text; version=1.0.0; charset=utf-8"
+        )
     return Response(
         content=MetricsCollectionService.get_serialized_metrics(),
         media_type="text/plain; version=0.0.4"
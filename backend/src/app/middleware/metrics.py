@@ -1,34 +1,103 @@
 from __future__ import annotations
 
 import time
-import re
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from typing import Any, Dict, Iterable, Optional
+
+from opentelemetry import trace
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
 from app.services.metrics_collection_service import MetricsCollectionService
 
-class MetricsMiddleware(BaseHTTPMiddleware):
+# Route label of requests that matched no route (404s, scans, typos), so
+# unexpected paths share one label instead of adding one each
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_templates(routes: Iterable[Any], prefix: str = "") -> Dict[int, str]:
+    """
+    Full path templates of every route, by route object id. Routers that
+    FastAPI includes lazily keep their routes with paths relative to the
+    include prefix; those prefixes are joined here once instead of per request.
+    """
+    templates: Dict[int, str] = {}
+    for route in routes:
+        included = getattr(route, "original_router", None)
+        if included is not None:
+            include_prefix = getattr(getattr(route, "include_context", None), "prefix", "")
+            templates.update(route_templates(included.routes, prefix + include_prefix))
+        elif isinstance(getattr(route, "path", None), str):
+            templates[id(route)] = prefix + route.path
+    return templates
+
+
+def route_label(scope: Scope, templates: Dict[int, str]) -> str:
+    """
+    Path template of the route the router matched for the request (e.g.
+    /api/v2/profile/versions/{version_number}/restore), or UNMATCHED_ROUTE.
+    """
+    route = scope.get("route")
+    if route is None:
+        return UNMATCHED_ROUTE
+    return templates.get(id(route)) or getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def current_trace_id() -> Optional[str]:
+    """Hex id of the active OpenTelemetry trace, if a span is recording."""
+    span_context = trace.get_current_span().get_span_context()
+    return format(span_context.trace_id, "032x") if span_context.is_valid else None
+
+
+class MetricsMiddleware:
     """
     FastAPI Metrics Interceptor Middleware.
     Updates Prometheus counters and histograms with HTTP request latencies and codes.
+    Requests are labelled with the template of the matched route, which the
+    router stores in the scope, and latency observations carry the trace id
+    of the request as exemplar. Latency is measured until the response
+    headers are sent, so streamed responses are not counted for as long as
+    their body keeps streaming.
     """
-    async def dispatch(self, request: Request, call_next):
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._templates: Dict[int, str] = {}
+        self._templates_app: Any = None
+
+    def _route_templates(self, scope: Scope) -> Dict[int, str]:
+        application = scope.get("app")
+        if application is not self._templates_app:
+            self._templates = route_templates(getattr(application, "routes", []))
+            self._templates_app = application
+        return self._templates
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith("/api"):
+            await self.app(scope, receive, send)
+            return
+
         start_time = time.perf_counter()
-        response = await call_next(request)
-        duration = time.perf_counter() - start_time
-        
-        path = request.url.path
-        if path.startswith("/api"):
-            method = request.method
-            
-            # Clean path to prevent label cardinality explosion in Prometheus (e.g. replace UUIDs/variables)
-            clean_route = re.sub(r"/[a-f0-9\-]{36}", "/{uuid}", path)
-            clean_route = re.sub(r"/circuits/[a-zA-Z0-9\-_]+/reset", "/circuits/{service_name}/reset", clean_route)
-            
+        recorded = False
+
+        def record(status: int) -> None:
+            nonlocal recorded
+            recorded = True
             MetricsCollectionService.record_api_request(
-                method=method,
-                route=clean_route,
-                status=response.status_code,
-                duration=duration
+                method=scope["method"],
+                route=route_label(scope, self._route_templates(scope)),
+                status=status,
+                duration=time.perf_counter() - start_time,
+                trace_id=current_trace_id(),
             )
-            
-        return response
+
+        async def send_with_metrics(message: Message) -> None:
+            if message["type"] == "http.response.start" and not recorded:
+                record(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_metrics)
+        except Exception:
+            # Unhandled errors become a 500 in the outer error middleware
+            if not recorded:
+                record(500)
+            raise
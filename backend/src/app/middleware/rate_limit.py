@@ -1,46 +1,80 @@
 from __future__ import annotations
 
-import re
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers
 from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
 from app.services.reliability_manager_service import ReliabilityManagerService
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
+# Tokens a request takes from its bucket, by path prefix (longest match wins).
+# Routes that start agent runs, research or LLM extraction cost more than reads.
+ROUTE_COSTS = {
+    "/api/v2/agents/run": 5,
+    "/api/v2/research/": 5,
+    "/api/v2/market/ingestion/trigger": 5,
+    "/api/v2/market/skills/extract": 3,
+    "/api/v2/market/graph/sync": 5,
+    "/api/v2/applications/workflows/trigger": 3,
+}
+DEFAULT_ROUTE_COST = 1
+
+
+def route_cost(path: str) -> int:
+    """Cost weight of a request path; DEFAULT_ROUTE_COST unless listed in ROUTE_COSTS."""
+    matches = [prefix for prefix in ROUTE_COSTS if path.startswith(prefix)]
+    return ROUTE_COSTS[max(matches, key=len)] if matches else DEFAULT_ROUTE_COST
+
+
+class RateLimitMiddleware:
     """
     FastAPI Rate Limiting Middleware.
-    Enforces Redis token-bucket limits on API routes.
+    Enforces Redis token-bucket limits on API routes; requests take
+    route_cost(path) tokens. Plain ASGI middleware: allowed requests are
+    passed to the app untouched, denied ones get a 429 JSON response.
     """
-    async def dispatch(self, request: Request, call_next):
-        path = request.url.path
-        
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        path = scope["path"]
+
         # Rate limit only v2 API routes, exclude health checks and documentation routes
         if not path.startswith("/api/v2") or "health" in path or "docs" in path or "openapi.json" in path:
-            return await call_next(request)
-            
+            await self.app(scope, receive, send)
+            return
+
         # Determine rate-limiting key (authenticated user token prefix or fallback to client IP)
         user_id = "anonymous"
-        auth_header = request.headers.get("Authorization")
+        auth_header = Headers(scope=scope).get("Authorization")
         if auth_header and auth_header.startswith("Bearer "):
             # Use a slice of the token as a unique key prefix
             token = auth_header.split(" ")[1]
             user_id = token[-20:] if len(token) > 20 else token
         else:
-            user_id = request.client.host if request.client else "unknown_ip"
-            
+            client = scope.get("client")
+            user_id = client[0] if client else "unknown_ip"
+
         # Rate limit configuration: 100 requests per 60 seconds by default
         limit = 100
         window = 60
-        
+
         # Admin routes have lower limits to prevent brute-force (e.g. 10/minute)
         if "/admin/" in path:
             limit = 15
-            
-        allowed = await ReliabilityManagerService.check_rate_limit(user_id, path, limit, window)
+
+        allowed = await ReliabilityManagerService.check_rate_limit(
+            user_id, path, limit, window, cost=route_cost(path)
+        )
         if not allowed:
-            return JSONResponse(
+            response = JSONResponse(
                 status_code=429,
                 content={"detail": "Too many requests. Please try again later."}
             )
-            
-        return await call_next(request)
+            await response(scope, receive, send)
+            return
+
+        await self.app(scope, receive, send)
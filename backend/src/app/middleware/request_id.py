@@ -1,32 +1,45 @@
 import uuid
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.logging import request_id_var
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+class RequestIDMiddleware:
     """
     Middleware that generates/extracts a unique Request ID for each incoming
     HTTP request, stores it in contextvars for log tracing, and sets it in
     the response headers.
+
+    Implemented as plain ASGI middleware: the request runs in the caller's
+    task, so the context variable is visible to the endpoint and to
+    streaming response bodies, which are passed through unbuffered.
     """
 
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
 
-    async def dispatch(self, request: Request, call_next) -> Response:
         # Check if the request already has a request ID header
-        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+        request_id = Headers(scope=scope).get("X-Request-ID") or str(uuid.uuid4())
 
         # Set the request ID in the context variable
         token = request_id_var.set(request_id)
         # Store in request state for endpoint visibility
-        request.state.request_id = request_id
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)["X-Request-ID"] = request_id
+            await send(message)
 
         try:
-            response = await call_next(request)
-            response.headers["X-Request-ID"] = request_id
-            return response
+            await self.app(scope, receive, send_with_request_id)
         finally:
             # Reset the context variable
             request_id_var.reset(token)
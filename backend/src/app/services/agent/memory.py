@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.config import settings
 from app.core.logging import get_logger
 from app.infrastructure.database.models import InteractionMemory, InteractionSummary
+from app.infrastructure.rag.embeddings.quantization import qdrant_search_params, qdrant_vectors_config
 from app.infrastructure.rag.embeddings.service import embedding_service
 from app.services.agent.models import MessageModel, ThreadMemory
 from langchain_google_genai import ChatGoogleGenerativeAI
@@ -44,10 +45,8 @@ class InteractionMemoryService:
             if not exists:
                 self.qdrant.create_collection(
                     collection_name=self.collection_name,
-                    vectors_config=qmodels.VectorParams(
-                        size=768,  # models/embedding-001 dimension
-                        distance=qmodels.Distance.COSINE,
-                    ),
+                    # 768 = models/embedding-001 dimension
+                    **qdrant_vectors_config(768, settings.qdrant_memory_precision),
                 )
                 logger.info(f"Qdrant collection '{self.collection_name}' created.")
         except Exception as e:
@@ -135,9 +134,9 @@ class InteractionMemoryService:
                 return []
 
             # Vector search in Qdrant
-            results = self.qdrant.search(
+            results = self.qdrant.query_points(
                 collection_name=self.collection_name,
-                query_vector=query_vector,
+                query=query_vector,
                 query_filter=qmodels.Filter(
                     must=[
                         qmodels.FieldCondition(
@@ -146,8 +145,11 @@ class InteractionMemoryService:
                         )
                     ]
                 ),
-                limit=limit
-            )
+                limit=limit,
+                search_params=qdrant_search_params(
+                    settings.qdrant_memory_precision, settings.vector_rescore_oversampling
+                ),
+            ).points
             return [hit.payload["text_chunk"] for hit in results]
         except Exception as e:
             logger.warning(f"Failed to retrieve contextual memories: {e}")
@@ -1,55 +1,105 @@
 from __future__ import annotations
 
+import asyncio
 import json
+import time
 from datetime import datetime
-from typing import Any, List, Optional
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
 from uuid import UUID
 
-from qdrant_client import QdrantClient
+import numpy as np
+from qdrant_client import AsyncQdrantClient
 from qdrant_client.http import models as qmodels
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.infrastructure.rag.embeddings.quantization import qdrant_search_params, qdrant_vectors_config
 from app.infrastructure.rag.embeddings.service import embedding_service
 from app.services.agent.models import HybridRetrievalRequest, RetrievalCandidate
+from app.services.database_service import AsyncSessionLocal
+from app.services.metrics_collection_service import MetricsCollectionService
 from langchain_google_genai import ChatGoogleGenerativeAI
 
 logger = get_logger(__name__)
 
+# Rank offset of Reciprocal Rank Fusion: score = sum over legs of 1 / (RRF_K + rank)
+RRF_K = 60
+
+BM25_QUERY = text("""
+    SELECT jp.id, jp.title, c.name as company_name, ts_rank_cd(jp.search_vector, plainto_tsquery('english', :query)) as rank
+    FROM job_postings jp
+    JOIN companies c ON jp.company_id = c.id
+    WHERE jp.search_vector @@ plainto_tsquery('english', :query)
+      AND jp.is_active = true
+    ORDER BY rank DESC
+    LIMIT :limit
+""")
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[Hashable]], k: int = RRF_K
+) -> List[Tuple[Hashable, float]]:
+    """
+    Fuses ranked id lists (best first) into (id, RRF score) pairs, best
+    first. Scores are accumulated with one scatter-add over all legs;
+    ties keep the order in which ids first appear.
+    """
+    positions: Dict[Hashable, int] = {}
+    slots, ranks = [], []
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            slots.append(positions.setdefault(key, len(positions)))
+            ranks.append(rank)
+    if not positions:
+        return []
+    scores = np.zeros(len(positions))
+    np.add.at(scores, np.asarray(slots), 1.0 / (k + np.asarray(ranks, dtype=np.float64)))
+    keys = list(positions)
+    order = np.argsort(-scores, kind="stable")
+    return [(keys[i], float(scores[i])) for i in order]
+
 
 class HybridRetrievalService:
     """
     Implements a multi-stage search pipeline:
-    1. BM25 search on PostgreSQL.
-    2. Dense vector search on Qdrant.
-    3. Fusion using Reciprocal Rank Fusion (RRF).
-    4. Reranking using Gemini as a Cross-Encoder model.
+    1. Dense vector search on Qdrant and BM25 search on PostgreSQL,
+       concurrently, each within its own timeout. If one leg fails or
+       times out, results come from the other. BM25 runs on a session of
+       its own, so a timeout never cancels a query on the caller's session.
+    2. Fusion using Reciprocal Rank Fusion (RRF).
+    3. Reranking using Gemini as a Cross-Encoder model.
+    The latency of every leg is recorded in careerpilot_retrieval_leg_duration_seconds.
     """
 
-    def __init__(self) -> None:
-        self.qdrant = QdrantClient(url=settings.qdrant_url)
+    def __init__(
+        self,
+        qdrant: Optional[AsyncQdrantClient] = None,
+        llm: Any = None,
+        session_factory: Optional[Callable[[], AsyncSession]] = None,
+    ) -> None:
+        self.qdrant = qdrant or AsyncQdrantClient(url=settings.qdrant_url)
+        self.session_factory = session_factory or AsyncSessionLocal
         self.collection_name = "job_postings_vectors"
-        self._ensure_collection()
-        self.llm = ChatGoogleGenerativeAI(
+        self._collection_ready = False
+        self.llm = llm or ChatGoogleGenerativeAI(
             model=settings.model_name,
             temperature=0.0,
         )
 
-    def _ensure_collection(self) -> None:
+    async def _ensure_collection(self) -> None:
+        if self._collection_ready:
+            return
         try:
-            collections = self.qdrant.get_collections().collections
-            exists = any(c.name == self.collection_name for c in collections)
-            if not exists:
-                self.qdrant.create_collection(
+            if not await self.qdrant.collection_exists(self.collection_name):
+                await self.qdrant.create_collection(
                     collection_name=self.collection_name,
-                    vectors_config=qmodels.VectorParams(
-                        size=768,  # models/embedding-001 dimension
-                        distance=qmodels.Distance.COSINE,
-                    ),
+                    # 768 = models/embedding-001 dimension
+                    **qdrant_vectors_config(768, settings.qdrant_job_postings_precision),
                 )
                 logger.info(f"Qdrant collection '{self.collection_name}' created.")
+            self._collection_ready = True
         except Exception as e:
             logger.error(f"Failed to ensure Qdrant collection: {e}")
 
@@ -59,125 +109,173 @@ class HybridRetrievalService:
 
     async def index_job_posting(self, job_id: UUID, title: str, company_name: str, description: str, skills: List[str], location: str) -> None:
         """Helper to index job posting into Qdrant."""
+        await self.index_job_postings([{
+            "job_id": job_id,
+            "title": title,
+            "company_name": company_name,
+            "description": description,
+            "skills": skills,
+            "location": location,
+        }])
+
+    async def index_job_postings(self, postings: List[dict]) -> int:
+        """
+        Indexes many job postings with batched embedding calls and one Qdrant upsert.
+        Each posting has the keyword arguments of index_job_posting.
+        Returns the number of postings indexed; postings without an embedding are skipped.
+        """
         try:
-            combined_text = f"{title} | {company_name} | {description} | {' '.join(skills)}"
-            vector = await self.generate_embeddings(combined_text)
-            self.qdrant.upsert(
-                collection_name=self.collection_name,
-                points=[
-                    qmodels.PointStruct(
-                        id=str(job_id),
-                        vector=vector,
-                        payload={
-                            "job_id": str(job_id),
-                            "title": title,
-                            "company_name": company_name,
-                            "skills": skills,
-                            "location": location,
-                        }
-                    )
-                ]
-            )
+            texts = [
+                f"{p['title']} | {p['company_name']} | {p['description']} | {' '.join(p['skills'])}"
+                for p in postings
+            ]
+            vectors = await embedding_service.embed_batch(texts)
+            points = [
+                qmodels.PointStruct(
+                    id=str(p["job_id"]),
+                    vector=vector,
+                    payload={
+                        "job_id": str(p["job_id"]),
+                        "title": p["title"],
+                        "company_name": p["company_name"],
+                        "skills": p["skills"],
+                        "location": p["location"],
+                    }
+                )
+                for p, vector in zip(postings, vectors)
+                if vector
+            ]
+            if len(points) < len(postings):
+                logger.warning(f"No embedding for {len(postings) - len(points)} job postings; not indexed")
+            if points:
+                await self._ensure_collection()
+                await self.qdrant.upsert(collection_name=self.collection_name, points=points)
+            return len(points)
         except Exception as e:
-            logger.error(f"Failed to index job posting in Qdrant: {e}")
-
-    async def search(self, db: AsyncSession, request: HybridRetrievalRequest) -> List[RetrievalCandidate]:
-        # 1. Get Query Vector
-        query_vector = await self.generate_embeddings(request.query)
+            logger.error(f"Failed to index job postings in Qdrant: {e}")
+            return 0
 
-        # 2. Vector Search (Qdrant)
-        vector_results = []
+    @staticmethod
+    async def _timed(leg: str, call: Callable[[], Awaitable[Any]], timeout: Optional[float] = None) -> Any:
+        """
+        Runs one retrieval leg, recording its latency and outcome.
+        Raises what the leg raised, or TimeoutError after timeout seconds.
+        """
+        started = time.perf_counter()
+        outcome = "error"
         try:
-            q_res = self.qdrant.search(
+            result = await asyncio.wait_for(call(), timeout) if timeout else await call()
+            outcome = "ok"
+            return result
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise
+        finally:
+            MetricsCollectionService.record_retrieval_leg(leg, outcome, time.perf_counter() - started)
+
+    async def _vector_search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        async def embed() -> Optional[List[float]]:
+            return await embedding_service.embed_text(query)
+
+        query_vector = await self._timed("embedding", embed)
+        if not query_vector:
+            raise RuntimeError("query embedding unavailable")
+
+        async def search() -> Any:
+            await self._ensure_collection()
+            return await self.qdrant.query_points(
                 collection_name=self.collection_name,
-                query_vector=query_vector,
-                limit=request.rerank_top_k
+                query=query_vector,
+                limit=limit,
+                search_params=qdrant_search_params(
+                    settings.qdrant_job_postings_precision, settings.vector_rescore_oversampling
+                ),
             )
-            for idx, hit in enumerate(q_res):
-                vector_results.append({
-                    "job_id": UUID(hit.payload["job_id"]),
-                    "title": hit.payload["title"],
-                    "company_name": hit.payload["company_name"],
-                    "rank": idx + 1,
-                    "score": hit.score
-                })
-        except Exception as e:
-            logger.warning(f"Qdrant vector search failed, falling back to BM25: {e}")
 
-        # 3. BM25 Search (Postgres)
-        bm25_results = []
-        try:
-            # Sanitize search query for plainto_tsquery
-            cleaned_query = request.query.replace("'", " ").replace('"', ' ')
-            sql = text("""
-                SELECT jp.id, jp.title, c.name as company_name, ts_rank_cd(jp.search_vector, plainto_tsquery('english', :query)) as rank
-                FROM job_postings jp
-                JOIN companies c ON jp.company_id = c.id
-                WHERE jp.search_vector @@ plainto_tsquery('english', :query)
-                  AND jp.is_active = true
-                ORDER BY rank DESC
-                LIMIT :limit
-            """)
-            result = await db.execute(sql, {"query": cleaned_query, "limit": request.rerank_top_k})
-            for idx, row in enumerate(result.fetchall()):
-                bm25_results.append({
-                    "job_id": row.id if isinstance(row.id, UUID) else UUID(row.id),
-                    "title": row.title,
-                    "company_name": row.company_name,
-                    "rank": idx + 1
-                })
-        except Exception as e:
-            logger.warning(f"Postgres BM25 search failed, falling back to Vector: {e}")
-
-        if not vector_results and not bm25_results:
-            return []
+        response = await self._timed("qdrant", search)
+        return [
+            {
+                "job_id": UUID(hit.payload["job_id"]),
+                "title": hit.payload["title"],
+                "company_name": hit.payload["company_name"],
+                "rank": idx + 1,
+                "score": hit.score,
+            }
+            for idx, hit in enumerate(response.points)
+        ]
 
-        # 4. Reciprocal Rank Fusion (RRF)
-        # RRF_score = sum(1 / (60 + rank))
-        candidates_map = {}
-        for r in vector_results:
-            jid = r["job_id"]
-            candidates_map[jid] = {
-                "job_id": jid,
-                "title": r["title"],
-                "company_name": r["company_name"],
-                "vector_rank": r["rank"],
-                "bm25_rank": None,
-                "retrieval_sources": ["vector"]
+    async def _bm25_search(self, query: str, limit: int) -> List[Dict[str, Any]]:
+        # Sanitize search query for plainto_tsquery
+        cleaned_query = query.replace("'", " ").replace('"', ' ')
+        async with self.session_factory() as session:
+            result = await session.execute(BM25_QUERY, {"query": cleaned_query, "limit": limit})
+            rows = result.fetchall()
+        return [
+            {
+                "job_id": row.id if isinstance(row.id, UUID) else UUID(row.id),
+                "title": row.title,
+                "company_name": row.company_name,
+                "rank": idx + 1,
             }
+            for idx, row in enumerate(rows)
+        ]
 
-        for r in bm25_results:
-            jid = r["job_id"]
-            if jid in candidates_map:
-                candidates_map[jid]["bm25_rank"] = r["rank"]
-                candidates_map[jid]["retrieval_sources"].append("bm25")
-            else:
-                candidates_map[jid] = {
-                    "job_id": jid,
+    async def search(self, db: AsyncSession, request: HybridRetrievalRequest) -> List[RetrievalCandidate]:
+        # 1. Vector search (query embedding + Qdrant) and BM25 search (Postgres), concurrently
+        vector_leg, bm25_leg = await asyncio.gather(
+            self._timed(
+                "vector",
+                lambda: self._vector_search(request.query, request.rerank_top_k),
+                settings.retrieval_vector_timeout,
+            ),
+            self._timed(
+                "bm25",
+                lambda: self._bm25_search(request.query, request.rerank_top_k),
+                settings.retrieval_lexical_timeout,
+            ),
+            return_exceptions=True,
+        )
+        if isinstance(vector_leg, BaseException):
+            logger.warning(f"Qdrant vector search failed, falling back to BM25: {vector_leg!r}")
+            vector_leg = []
+        if isinstance(bm25_leg, BaseException):
+            logger.warning(f"Postgres BM25 search failed, falling back to Vector: {bm25_leg!r}")
+            bm25_leg = []
+
+        if not vector_leg and not bm25_leg:
+            return []
+
+        # 2. Reciprocal Rank Fusion (RRF)
+        fusion_started = time.perf_counter()
+        legs = {"vector": vector_leg, "bm25": bm25_leg}
+        rows: Dict[UUID, Dict[str, Any]] = {}
+        for source, results in legs.items():
+            for r in results:
+                cand = rows.setdefault(r["job_id"], {
+                    "job_id": r["job_id"],
                     "title": r["title"],
                     "company_name": r["company_name"],
                     "vector_rank": None,
-                    "bm25_rank": r["rank"],
-                    "retrieval_sources": ["bm25"]
-                }
-
-        # Calculate RRF Scores
-        k = 60
-        merged_candidates = []
-        for jid, cand in candidates_map.items():
-            rrf_score = 0.0
-            if cand["vector_rank"] is not None:
-                rrf_score += 1.0 / (k + cand["vector_rank"])
-            if cand["bm25_rank"] is not None:
-                rrf_score += 1.0 / (k + cand["bm25_rank"])
-            cand["rrf_score"] = rrf_score
-            merged_candidates.append(cand)
-
-        # Sort by RRF score descending and take top rerank_top_k
-        merged_candidates.sort(key=lambda x: x["rrf_score"], reverse=True)
-        top_candidates = merged_candidates[:request.rerank_top_k]
-
-        # 5. Rerank using Gemini (Cross-Encoder style)
+                    "bm25_rank": None,
+                    "retrieval_sources": [],
+                })
+                cand[f"{source}_rank"] = r["rank"]
+                cand["retrieval_sources"].append(source)
+
+        fused = reciprocal_rank_fusion(
+            [[r["job_id"] for r in results] for results in legs.values()]
+        )
+        top_candidates = []
+        for jid, rrf_score in fused[:request.rerank_top_k]:
+            rows[jid]["rrf_score"] = rrf_score
+            top_candidates.append(rows[jid])
+        MetricsCollectionService.record_retrieval_leg(
+            "fusion", "ok", time.perf_counter() - fusion_started
+        )
+
+        # 3. Rerank using Gemini (Cross-Encoder style)
+        rerank_started = time.perf_counter()
+        rerank_outcome = "ok"
         reranked_results = []
         try:
             # We fetch job descriptions for top candidates to rerank accurately
@@ -235,6 +333,7 @@ class HybridRetrievalService:
                 )
 
         except Exception as e:
+            rerank_outcome = "error"
             logger.warning(f"Gemini reranking failed, falling back to RRF scores: {e}")
             for cand in top_candidates:
                 # normalize RRF score to [0, 1] range roughly
@@ -252,6 +351,10 @@ class HybridRetrievalService:
                     )
                 )
 
+        MetricsCollectionService.record_retrieval_leg(
+            "rerank", rerank_outcome, time.perf_counter() - rerank_started
+        )
+
         # Sort by final score descending and limit results
         reranked_results.sort(key=lambda x: x.final_score, reverse=True)
         return reranked_results[:request.limit]
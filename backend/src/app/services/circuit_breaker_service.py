@@ -0,0 +1,349 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional
+from uuid import uuid4
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.metrics_collection_service import MetricsCollectionService
+from app.services.redis_service import RedisService
+
+logger = get_logger(__name__)
+
+CLOSED = "CLOSED"
+OPEN = "OPEN"
+HALF_OPEN = "HALF_OPEN"
+
+# Writes a transition unless Redis already holds a newer one (by changed_at),
+# so workers publishing concurrently cannot roll the shared state back.
+# KEYS: state, changed_at, failure_count, last_failure_at
+# ARGV: state, changed_at, failure_count, last_failure_at ('' deletes it)
+TRANSITION_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[2]) or '0')
+if tonumber(ARGV[2]) < current then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1])
+redis.call('SET', KEYS[2], ARGV[2])
+redis.call('SET', KEYS[3], ARGV[3])
+if ARGV[4] == '' then
+    redis.call('DEL', KEYS[4])
+else
+    redis.call('SET', KEYS[4], ARGV[4])
+end
+return 1
+"""
+
+
+class CircuitOpenException(Exception):
+    """Exception raised when a circuit breaker is in OPEN state."""
+    pass
+
+
+@dataclass(frozen=True)
+class BreakerSettings:
+    """Thresholds of one dependency's circuit breaker."""
+
+    # Failures within window_seconds that open the circuit
+    failure_threshold: int = 5
+    window_seconds: float = 60.0
+    # Time an open circuit rejects calls before letting probes through
+    cooldown_seconds: float = 60.0
+    # Concurrent probe calls allowed per worker while half-open
+    half_open_max_probes: int = 1
+    # Successful probes that close the circuit again
+    success_threshold: int = 1
+
+
+DEFAULT_BREAKER_SETTINGS = BreakerSettings()
+
+# Protected dependencies and their settings; other names use the defaults
+DEPENDENCY_SETTINGS: Dict[str, BreakerSettings] = {
+    "openai-api-connector": BreakerSettings(cooldown_seconds=30.0, half_open_max_probes=2),
+    "greenhouse-board-connector": BreakerSettings(failure_threshold=10, cooldown_seconds=120.0),
+    "jsearch-api-connector": BreakerSettings(),
+    "qdrant-vector-service": BreakerSettings(
+        window_seconds=30.0, cooldown_seconds=15.0, half_open_max_probes=2
+    ),
+    "google-genai-service": BreakerSettings(
+        cooldown_seconds=30.0, half_open_max_probes=2, success_threshold=2
+    ),
+}
+
+
+def _keys(name: str) -> List[str]:
+    prefix = f"circuit_breaker:{name}"
+    return [f"{prefix}:state", f"{prefix}:changed_at", f"{prefix}:failure_count", f"{prefix}:last_failure_at"]
+
+
+def _decode(value: Any) -> Any:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker of one dependency, kept in process memory.
+
+    CLOSED counts failures in a rolling window and opens at
+    failure_threshold. OPEN rejects calls until cooldown_seconds have
+    passed, then turns HALF_OPEN, which lets half_open_max_probes calls
+    through at a time: success_threshold successful probes close the
+    circuit, a failed probe opens it again. Admitting and recording calls
+    never waits for Redis; transitions are handed to the registry.
+    """
+
+    def __init__(self, name: str, config: BreakerSettings, registry: "CircuitBreakerRegistry"):
+        self.name = name
+        self.config = config
+        self.state = CLOSED
+        # Wall-clock time of the last transition, comparable across workers
+        self.changed_at = 0.0
+        self.failures: Deque[float] = deque()
+        self.last_failure_at: Optional[str] = None
+        self.probes_in_flight = 0
+        self.probe_successes = 0
+        self._registry = registry
+
+    def failure_count(self) -> int:
+        """Failures within the rolling window."""
+        horizon = time.monotonic() - self.config.window_seconds
+        while self.failures and self.failures[0] < horizon:
+            self.failures.popleft()
+        return len(self.failures)
+
+    def acquire(self) -> bool:
+        """
+        Admits a call. Returns True if the call is a half-open probe.
+        Raises CircuitOpenException if the call is rejected.
+        """
+        if self.state == OPEN and time.time() - self.changed_at >= self.config.cooldown_seconds:
+            self._transition(HALF_OPEN)
+        if self.state == CLOSED:
+            return False
+        if self.state == HALF_OPEN and self.probes_in_flight < self.config.half_open_max_probes:
+            self.probes_in_flight += 1
+            return True
+        MetricsCollectionService.record_circuit_call(self.name, "rejected")
+        raise CircuitOpenException(f"Circuit breaker is open for service: {self.name}")
+
+    def record_success(self, probe: bool) -> None:
+        MetricsCollectionService.record_circuit_call(self.name, "success")
+        if not probe:
+            return
+        self.probes_in_flight = max(0, self.probes_in_flight - 1)
+        if self.state == HALF_OPEN:
+            self.probe_successes += 1
+            if self.probe_successes >= self.config.success_threshold:
+                self._transition(CLOSED)
+
+    def record_failure(self, error: Exception, probe: bool) -> None:
+        MetricsCollectionService.record_circuit_call(self.name, "failure")
+        self.last_failure_at = datetime.now(timezone.utc).isoformat()
+        if probe:
+            self.probes_in_flight = max(0, self.probes_in_flight - 1)
+            if self.state == HALF_OPEN:
+                self._transition(OPEN, error)
+            return
+        if self.state == CLOSED:
+            self.failures.append(time.monotonic())
+            if self.failure_count() >= self.config.failure_threshold:
+                self._transition(OPEN, error)
+
+    def release(self, probe: bool) -> None:
+        """
+        Frees the slot of a call that ended without an outcome (cancelled),
+        so an unfinished probe does not keep the circuit half-open.
+        """
+        if probe:
+            self.probes_in_flight = max(0, self.probes_in_flight - 1)
+
+    def open_for_probes(self) -> None:
+        """Ends the cooldown of an open circuit early."""
+        if self.state == OPEN:
+            self._transition(HALF_OPEN)
+
+    def reset(self) -> None:
+        self.last_failure_at = None
+        self._transition(CLOSED)
+
+    def _enter(self, state: str, changed_at: float) -> None:
+        self.state = state
+        self.changed_at = changed_at
+        self.probes_in_flight = 0
+        self.probe_successes = 0
+        if state == CLOSED:
+            self.failures.clear()
+        MetricsCollectionService.set_circuit_state(self.name, state)
+
+    def _transition(self, state: str, error: Optional[Exception] = None) -> None:
+        failures = self.failure_count() if state != CLOSED else 0
+        # Strictly increasing, so a transition is never older than the one it replaces
+        self._enter(state, max(time.time(), self.changed_at + 1e-6))
+        MetricsCollectionService.record_circuit_transition(self.name, state)
+        if state == OPEN:
+            logger.error(f"Circuit breaker for {self.name} has OPENED due to {failures} failures.")
+        else:
+            logger.info(f"Circuit breaker for {self.name} transitioned to {state}.")
+        self._registry.publish(self, failures, error)
+
+    def adopt(self, state: str, changed_at: float) -> bool:
+        """Takes over a transition another worker published, if it is newer."""
+        if changed_at <= self.changed_at:
+            return False
+        if state != self.state:
+            logger.info(f"Circuit breaker for {self.name} transitioned to {state} on another worker.")
+        self._enter(state, changed_at)
+        return True
+
+
+class CircuitBreakerRegistry:
+    """
+    Process-wide circuit breakers, synchronised between workers through Redis.
+
+    Transitions are queued and written by one background task per process
+    (pipelined, newest-wins via TRANSITION_SCRIPT), so protected calls never
+    wait for Redis. Every worker adopts transitions written by others when
+    it syncs (run() polls every circuit_breaker_sync_interval seconds).
+    Half-open probe limits apply per worker.
+    """
+
+    def __init__(self, client=None):
+        self.client = client
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._dirty: Dict[str, Dict[str, Any]] = {}
+        self._writer: Optional[asyncio.Task] = None
+        self._script = None
+
+    def _redis(self):
+        return self.client or RedisService.get_client()
+
+    def get(self, name: str) -> CircuitBreaker:
+        breaker = self._breakers.get(name)
+        if breaker is None:
+            config = DEPENDENCY_SETTINGS.get(name, DEFAULT_BREAKER_SETTINGS)
+            breaker = self._breakers[name] = CircuitBreaker(name, config, self)
+            MetricsCollectionService.set_circuit_state(name, CLOSED)
+        return breaker
+
+    def names(self) -> List[str]:
+        """Known dependencies first, then any other name a breaker was used for."""
+        return list(DEPENDENCY_SETTINGS) + sorted(set(self._breakers) - set(DEPENDENCY_SETTINGS))
+
+    def publish(self, breaker: CircuitBreaker, failures: int, error: Optional[Exception]) -> None:
+        """Queues a transition for the background writer."""
+        self._dirty[breaker.name] = {
+            "state": breaker.state,
+            "changed_at": breaker.changed_at,
+            "failure_count": failures,
+            "last_failure_at": breaker.last_failure_at if breaker.state != CLOSED else None,
+            "error": error,
+        }
+        loop = asyncio.get_running_loop()
+        if self._writer is None or self._writer.done() or self._writer.get_loop() is not loop:
+            self._writer = loop.create_task(self._write())
+
+    async def _write(self) -> None:
+        from app.utils.event_bus import EventBus
+
+        while self._dirty:
+            batch = list(self._dirty.items())
+            self._dirty.clear()
+            try:
+                client = self._redis()
+                if self._script is None:
+                    self._script = client.register_script(TRANSITION_SCRIPT)
+                async with client.pipeline(transaction=False) as pipe:
+                    for name, transition in batch:
+                        await self._script(
+                            keys=_keys(name),
+                            args=[
+                                transition["state"],
+                                repr(transition["changed_at"]),
+                                transition["failure_count"],
+                                transition["last_failure_at"] or "",
+                            ],
+                            client=pipe,
+                        )
+                    await pipe.execute()
+            except Exception as e:
+                logger.error(f"Failed to share {len(batch)} circuit breaker transitions: {e}")
+
+            for name, transition in batch:
+                if transition["state"] != OPEN:
+                    continue
+                try:
+                    await EventBus.publish(
+                        "circuit.opened",
+                        {
+                            "event_id": f"evt_circ_opn_{str(uuid4())[:8]}",
+                            "event_type": "circuit.opened",
+                            "timestamp": datetime.now(timezone.utc).isoformat() + "Z",
+                            "payload": {
+                                "service_name": name,
+                                "failure_count": transition["failure_count"],
+                                "last_error": str(transition["error"]),
+                            },
+                        },
+                    )
+                except Exception as ev_err:
+                    logger.error(f"Failed to publish circuit.opened event: {ev_err}")
+
+    async def flush(self) -> None:
+        """Waits until queued transitions have been written to Redis."""
+        writer = self._writer
+        if writer is not None and not writer.done() and writer.get_loop() is asyncio.get_running_loop():
+            await asyncio.shield(writer)
+
+    async def sync(self) -> int:
+        """
+        Adopts transitions other workers wrote to Redis with one MGET.
+        Returns the number of breakers that changed.
+        """
+        names = self.names()
+        keys = [key for name in names for key in _keys(name)[:2]]
+        values = await self._redis().mget(keys)
+        adopted = 0
+        for i, name in enumerate(names):
+            state, changed_at = _decode(values[2 * i]), _decode(values[2 * i + 1])
+            if state in (CLOSED, OPEN, HALF_OPEN) and changed_at:
+                adopted += self.get(name).adopt(state, float(changed_at))
+        return adopted
+
+    async def run(self, stop: asyncio.Event, interval: Optional[float] = None) -> None:
+        """Syncs until stop is set; Redis errors are logged and retried."""
+        interval = interval or settings.circuit_breaker_sync_interval
+        while not stop.is_set():
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.warning(f"Circuit breaker sync failed: {e}")
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def snapshot(self) -> List[Dict[str, Any]]:
+        """Shared state of every known circuit, including this worker's queued transitions."""
+        await self.flush()
+        names = self.names()
+        keys = [key for name in names for key in _keys(name)]
+        values = await self._redis().mget(keys)
+        circuits = []
+        for i, name in enumerate(names):
+            state, _, failures, last_failure_at = (_decode(v) for v in values[4 * i : 4 * i + 4])
+            circuits.append({
+                "service_name": name,
+                "state": state or CLOSED,
+                "failure_count": int(failures) if failures else 0,
+                "last_failure_at": last_failure_at,
+            })
+        return circuits
+
+
+# Process-wide registry used by ReliabilityManagerService.execute_with_breaker
+circuit_breakers = CircuitBreakerRegistry()
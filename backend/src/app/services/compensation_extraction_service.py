@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import re
 from decimal import Decimal
-from typing import Any
+from typing import Any, List, Sequence
 from uuid import uuid4
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -13,6 +13,61 @@ from app.services.location_normalization_service import LocationNormalizationSer
 
 logger = get_logger(__name__)
 
+_CURRENCY_SYMBOLS = re.compile(r"[$£€₹]")
+_THOUSANDS_COMMA = re.compile(r"(?<=\d),(?=\d)")
+
+# Tried in order; the first pattern found anywhere in the text wins
+_SALARY_PATTERNS = [
+    (re.compile(pattern, re.IGNORECASE), interval)
+    for pattern, interval in [
+        # Annual range (e.g., $140000 - $180000 a year)
+        (
+            r"(?:\$|£|€|₹)\s*(\d+)\s*(?:-|to)\s*(?:\$|£|€|₹)\s*(\d+)\s*"
+            r"(?:/\s*yr|/\s*year|/annum|per\s+year|a\s+year|a\s+yr|"
+            r"annually|yr|annual)",
+            "ANNUAL",
+        ),
+        # Hourly range (e.g., $60 - $80 per hour)
+        (
+            r"(?:\$|£|€|₹)\s*(\d+)\s*(?:-|to)\s*(?:\$|£|€|₹)\s*(\d+)\s*"
+            r"(?:/\s*hr|/\s*hour|per\s+hour|a\s+hour|an\s+hour|"
+            r"a\s+hr|an\s+hr|hourly|hr)",
+            "HOURLY",
+        ),
+        # Monthly range (e.g., $10000 - $15000 / month)
+        (
+            r"(?:\$|£|€|₹)\s*(\d+)\s*(?:-|to)\s*(?:\$|£|€|₹)\s*(\d+)\s*"
+            r"(?:/\s*mo|/\s*month|per\s+month|a\s+month|a\s+mo|"
+            r"monthly|mo)",
+            "MONTHLY",
+        ),
+        # Generic range without explicit interval
+        (
+            r"(?:\$|£|€|₹)\s*(\d{5,})\s*(?:-|to)\s*(?:\$|£|€|₹)\s*(\d{5,})",
+            "ANNUAL",
+        ),
+        # Single generic salary (e.g., $140000 a year or $60/hr)
+        (
+            r"(?:\$|£|€|₹)\s*(\d+)\s*"
+            r"(?:/\s*yr|/\s*year|/annum|per\s+year|a\s+year|a\s+yr|"
+            r"annually|yr|annual)",
+            "ANNUAL_SINGLE",
+        ),
+        (
+            r"(?:\$|£|€|₹)\s*(\d+)\s*"
+            r"(?:/\s*hr|/\s*hour|per\s+hour|a\s+hour|an\s+hour|"
+            r"a\s+hr|an\s+hr|hourly|hr)",
+            "HOURLY_SINGLE",
+        ),
+        (
+            r"(?:\$|£|€|₹)\s*(\d+)\s*"
+            r"(?:/\s*mo|/\s*month|per\s+month|a\s+month|a\s+mo|"
+            r"monthly|mo)",
+            "MONTHLY_SINGLE",
+        ),
+    ]
+]
+
 
 class CompensationExtractionService:
     """
@@ -78,68 +133,25 @@ class CompensationExtractionService:
         if not text:
             return None
 
+        # Every salary pattern starts with a currency symbol
+        if not _CURRENCY_SYMBOLS.search(text):
+            return None
+
         # Clean commas for easier regex number parsing (e.g. 140,000 -> 140000)
-        text_clean = re.sub(r"(?<=\d),(?=\d)", "", text)
+        text_clean = _THOUSANDS_COMMA.sub("", text)
 
         # Detect currency
+        text_lower = text.lower()
         currency = "USD"
-        if "£" in text or "gbp" in text.lower():
+        if "£" in text or "gbp" in text_lower:
             currency = "GBP"
-        elif "€" in text or "eur" in text.lower():
+        elif "€" in text or "eur" in text_lower:
             currency = "EUR"
-        elif "₹" in text or "inr" in text.lower():
+        elif "₹" in text or "inr" in text_lower:
             currency = "INR"
 
-        patterns = [
-            # Annual range (e.g., $140000 - $180000 a year)
-            (
-                r"(?:\$|£|€|₹)\s*(\d+)\s*(?:-|to)\s*(?:\$|£|€|₹)\s*(\d+)\s*"
-                r"(?:/\s*yr|/\s*year|/annum|per\s+year|a\s+year|a\s+yr|"
-                r"annually|yr|annual)",
-                "ANNUAL",
-            ),
-            # Hourly range (e.g., $60 - $80 per hour)
-            (
-                r"(?:\$|£|€|₹)\s*(\d+)\s*(?:-|to)\s*(?:\$|£|€|₹)\s*(\d+)\s*"
-                r"(?:/\s*hr|/\s*hour|per\s+hour|a\s+hour|an\s+hour|"
-                r"a\s+hr|an\s+hr|hourly|hr)",
-                "HOURLY",
-            ),
-            # Monthly range (e.g., $10000 - $15000 / month)
-            (
-                r"(?:\$|£|€|₹)\s*(\d+)\s*(?:-|to)\s*(?:\$|£|€|₹)\s*(\d+)\s*"
-                r"(?:/\s*mo|/\s*month|per\s+month|a\s+month|a\s+mo|"
-                r"monthly|mo)",
-                "MONTHLY",
-            ),
-            # Generic range without explicit interval
-            (
-                r"(?:\$|£|€|₹)\s*(\d{5,})\s*(?:-|to)\s*(?:\$|£|€|₹)\s*(\d{5,})",
-                "ANNUAL",
-            ),
-            # Single generic salary (e.g., $140000 a year or $60/hr)
-            (
-                r"(?:\$|£|€|₹)\s*(\d+)\s*"
-                r"(?:/\s*yr|/\s*year|/annum|per\s+year|a\s+year|a\s+yr|"
-                r"annually|yr|annual)",
-                "ANNUAL_SINGLE",
-            ),
-            (
-                r"(?:\$|£|€|₹)\s*(\d+)\s*"
-                r"(?:/\s*hr|/\s*hour|per\s+hour|a\s+hour|an\s+hour|"
-                r"a\s+hr|an\s+hr|hourly|hr)",
-                "HOURLY_SINGLE",
-            ),
-            (
-                r"(?:\$|£|€|₹)\s*(\d+)\s*"
-                r"(?:/\s*mo|/\s*month|per\s+month|a\s+month|a\s+mo|"
-                r"monthly|mo)",
-                "MONTHLY_SINGLE",
-            ),
-        ]
-
-        for pattern, interval in patterns:
-            match = re.search(pattern, text_clean, re.IGNORECASE)
+        for pattern, interval in _SALARY_PATTERNS:
+            match = pattern.search(text_clean)
             if match:
                 if "SINGLE" in interval:
                     val = float(match.group(1))
@@ -160,12 +172,27 @@ class CompensationExtractionService:
         return None
 
     @staticmethod
-    async def process_and_save_compensation(
-        db: AsyncSession, job_posting_id: str, description: str, location_raw: str
+    def extract_salaries_from_texts(texts: Sequence[str]) -> List[dict[str, Any] | None]:
+        """
+        extract_salary_from_text of many texts. Texts without a currency
+        symbol are skipped with one scan each; repeated texts are parsed once.
+        """
+        parsed: dict[str, dict[str, Any] | None] = {}
+        results = []
+        for text in texts:
+            if text not in parsed:
+                parsed[text] = CompensationExtractionService.extract_salary_from_text(text)
+            result = parsed[text]
+            results.append(dict(result) if result else None)
+        return results
+
+    @staticmethod
+    def build_compensation_record(
+        job_posting_id: str, description: str, location_raw: str
     ) -> CompensationRecord | None:
         """
-        Extracts salary details from job description, normalizes values,
-        maps location COL tier, and stores a CompensationRecord.
+        Extracts salary details from job description, normalizes values and
+        maps location COL tier into an unsaved CompensationRecord.
         Drops outlier records exceeding $1,000,000 and logs a warning.
         """
         extracted = CompensationExtractionService.extract_salary_from_text(description)
@@ -206,6 +233,22 @@ class CompensationExtractionService:
             location_normalized=loc_normalized["location"],
             col_tier=loc_normalized["col_tier"],
         )
+        return record
+
+    @staticmethod
+    async def process_and_save_compensation(
+        db: AsyncSession, job_posting_id: str, description: str, location_raw: str
+    ) -> CompensationRecord | None:
+        """
+        Builds a CompensationRecord from the job description and stores it.
+        """
+        record = CompensationExtractionService.build_compensation_record(
+            job_posting_id=job_posting_id,
+            description=description,
+            location_raw=location_raw,
+        )
+        if not record:
+            return None
 
         db.add(record)
         await db.flush()
@@ -0,0 +1,376 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
+from uuid import uuid4
+
+from sqlalchemy import bindparam, case, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.logging import get_logger
+from app.infrastructure.database.models import (
+    DedupeAuditLog,
+    JobDuplicate,
+    JobPosting,
+)
+from app.services.database_service import AsyncSessionLocal
+from app.services.job_deduplication_service import JobDeduplicationService
+from app.utils.event_bus import EventBus
+
+logger = get_logger(__name__)
+
+# Companies up to this size score every pair; larger ones only LSH candidate pairs
+CORPUS_EXHAUSTIVE_LIMIT = 2000
+
+# Merged postings written per bulk statement
+APPLY_BATCH_SIZE = 1000
+
+# Seconds between progress reports
+PROGRESS_INTERVAL = 5.0
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+# Columns shipped to worker processes; the description is only needed for
+# postings ingested before their term-frequency vector was stored
+_POSTING_COLUMNS = (
+    JobPosting.id,
+    JobPosting.company_id,
+    JobPosting.raw_title,
+    JobPosting.location,
+    JobPosting.created_at,
+    JobPosting.title_tokens,
+    JobPosting.description_tf,
+    JobPosting.minhash_signature,
+    JobPosting.dedupe_fingerprint,
+    case((JobPosting.description_tf.is_(None), JobPosting.description), else_="").label(
+        "description"
+    ),
+)
+
+
+class _UnionFind:
+    """Disjoint sets over 0..n-1 with path halving and union by size."""
+
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int) -> None:
+        ri, rj = self.find(i), self.find(j)
+        if ri == rj:
+            return
+        if self.size[ri] < self.size[rj]:
+            ri, rj = rj, ri
+        self.parent[rj] = ri
+        self.size[ri] += self.size[rj]
+
+
+class CorpusDedupService:
+    """
+    Offline re-deduplication of the whole active corpus. Active postings are
+    partitioned by company, duplicate pairs are scored in a process pool and
+    grouped into clusters with union-find, and every cluster is collapsed
+    onto one canonical primary (the oldest posting). Used to merge postings
+    that arrived in an order or from sources the insert-time dedup missed,
+    and to reapply tuned thresholds to history.
+    """
+
+    @staticmethod
+    def cluster_company(
+        rows: Sequence[Dict[str, Any]],
+        threshold: float = 0.85,
+        exhaustive_limit: int = CORPUS_EXHAUSTIVE_LIMIT,
+    ) -> List[Dict[str, Any]]:
+        """
+        Duplicate clusters among the active postings of one company, given as
+        column dicts. Returns one entry per cluster with more than one posting:
+        the canonical posting id and, per merged member, the score and
+        similarities of its strongest duplicate edge.
+        """
+        jobs = [
+            JobPosting(
+                id=row["id"],
+                company_id=row["company_id"],
+                raw_title=row["raw_title"],
+                location=row["location"],
+                description=row["description"] or "",
+                title_tokens=row["title_tokens"],
+                description_tf=row["description_tf"],
+                minhash_signature=row["minhash_signature"],
+                dedupe_fingerprint=row["dedupe_fingerprint"],
+            )
+            for row in rows
+        ]
+        if len(jobs) < 2:
+            return []
+        for job in jobs:
+            JobDeduplicationService.apply_features(job)
+
+        sets = _UnionFind(len(jobs))
+        strongest: Dict[int, Tuple[float, float, float]] = {}
+
+        # Equal fingerprints are exact duplicates without scoring
+        by_fingerprint: Dict[str, int] = {}
+        for i, job in enumerate(jobs):
+            first = by_fingerprint.setdefault(job.dedupe_fingerprint, i)
+            if first != i:
+                sets.union(first, i)
+                strongest[i] = max(strongest.get(i, (0.0, 0.0, 0.0)), (1.0, 1.0, 1.0))
+                strongest[first] = max(strongest.get(first, (0.0, 0.0, 0.0)), (1.0, 1.0, 1.0))
+
+        for i, j, score, t_sim, d_sim in JobDeduplicationService.duplicate_pairs(
+            jobs, threshold, exhaustive_limit
+        ):
+            sets.union(i, j)
+            for k in (i, j):
+                strongest[k] = max(strongest.get(k, (0.0, 0.0, 0.0)), (score, t_sim, d_sim))
+
+        members: Dict[int, List[int]] = {}
+        for i in range(len(jobs)):
+            members.setdefault(sets.find(i), []).append(i)
+
+        clusters = []
+        for cluster in members.values():
+            if len(cluster) < 2:
+                continue
+            canonical = min(cluster, key=lambda k: (rows[k]["created_at"], rows[k]["id"]))
+            clusters.append(
+                {
+                    "canonical_id": jobs[canonical].id,
+                    "members": [
+                        {
+                            "id": jobs[k].id,
+                            "score": strongest[k][0],
+                            "title": strongest[k][1],
+                            "description": strongest[k][2],
+                        }
+                        for k in cluster
+                        if k != canonical
+                    ],
+                }
+            )
+        return clusters
+
+    @staticmethod
+    async def apply_clusters(
+        db: Any, clusters: Sequence[Dict[str, Any]], threshold: float
+    ) -> int:
+        """
+        Merges every cluster member into its canonical primary with bulk
+        statements: flags the members, repoints postings previously merged
+        into a member, and records AUTO_MERGED duplicates plus MERGE audit
+        logs. Returns the number of merged postings.
+        """
+        merges = [
+            (cluster["canonical_id"], member)
+            for cluster in clusters
+            for member in cluster["members"]
+        ]
+        if not merges:
+            return 0
+
+        now = datetime.utcnow()
+        await db.execute(
+            update(JobPosting),
+            [
+                {
+                    "id": member["id"],
+                    "is_primary": False,
+                    "is_active": False,
+                    "merged_into_id": canonical_id,
+                    "deduplicated_to_id": canonical_id,
+                    "updated_at": now,
+                }
+                for canonical_id, member in merges
+            ],
+        )
+        await db.execute(
+            update(JobPosting.__table__)
+            .where(JobPosting.__table__.c.merged_into_id == bindparam("old_primary_id"))
+            .values(
+                merged_into_id=bindparam("new_primary_id"),
+                deduplicated_to_id=bindparam("new_primary_id"),
+            ),
+            [
+                {"old_primary_id": member["id"], "new_primary_id": canonical_id}
+                for canonical_id, member in merges
+            ],
+        )
+        await db.execute(
+            pg_insert(JobDuplicate),
+            [
+                {
+                    "id": str(uuid4()),
+                    "primary_job_id": canonical_id,
+                    "duplicate_job_id": member["id"],
+                    "confidence_score": round(member["score"], 3),
+                    "title_similarity": round(member["title"], 3),
+                    "company_similarity": 1.0,
+                    "description_similarity": round(member["description"], 3),
+                    "status": "AUTO_MERGED",
+                    "reviewed_by": None,
+                    "created_at": now,
+                    "resolved_at": now,
+                }
+                for canonical_id, member in merges
+            ],
+        )
+        await db.execute(
+            pg_insert(DedupeAuditLog),
+            [
+                {
+                    "id": str(uuid4()),
+                    "action": "MERGE",
+                    "primary_job_id": canonical_id,
+                    "merged_job_id": member["id"],
+                    "merge_details": {
+                        "offline": True,
+                        "score": member["score"],
+                        "threshold": threshold,
+                    },
+                    "created_at": now,
+                }
+                for canonical_id, member in merges
+            ],
+        )
+        return len(merges)
+
+    @staticmethod
+    async def run(
+        company_ids: Optional[Sequence[str]] = None,
+        threshold: float = 0.85,
+        workers: Optional[int] = None,
+        dry_run: bool = False,
+        progress: Optional[ProgressCallback] = None,
+    ) -> Dict[str, Any]:
+        """
+        Re-deduplicates the active postings of every company (or the given
+        ones). Postings are streamed in company order; each company is
+        clustered in a worker process, with at most two companies queued per
+        worker, and merges are written and committed every APPLY_BATCH_SIZE
+        postings. dry_run only reports what would be merged. progress
+        receives the running stats every PROGRESS_INTERVAL seconds and once
+        at the end.
+        """
+        workers = workers or multiprocessing.cpu_count()
+        stats: Dict[str, Any] = {
+            "companies": 0,
+            "postings": 0,
+            "clusters": 0,
+            "merged": 0,
+            "elapsed_seconds": 0.0,
+            "dry_run": dry_run,
+        }
+        started = time.perf_counter()
+        last_report = started
+
+        def report(final: bool = False) -> None:
+            nonlocal last_report
+            now = time.perf_counter()
+            if not final and now - last_report < PROGRESS_INTERVAL:
+                return
+            last_report = now
+            stats["elapsed_seconds"] = round(now - started, 2)
+            logger.info(
+                f"Corpus dedup: {stats['companies']} companies, {stats['postings']} postings, "
+                f"{stats['clusters']} clusters, {stats['merged']} merged "
+                f"({stats['elapsed_seconds']}s)"
+            )
+            if progress:
+                progress(dict(stats))
+
+        stmt = (
+            select(*_POSTING_COLUMNS)
+            .where(JobPosting.is_active == True)  # noqa: E712 - active postings only
+            .order_by(JobPosting.company_id)
+            .execution_options(yield_per=APPLY_BATCH_SIZE)
+        )
+        if company_ids is not None:
+            stmt = stmt.where(JobPosting.company_id.in_(list(company_ids)))
+
+        loop = asyncio.get_running_loop()
+        # Spawned workers do not inherit the parent's pooled connections
+        context = multiprocessing.get_context("spawn")
+        pending_clusters: List[Dict[str, Any]] = []
+        pending_merges = 0
+        in_flight: Set[asyncio.Future] = set()
+
+        async with AsyncSessionLocal() as write_db, AsyncSessionLocal() as read_db:
+
+            async def flush_merges(force: bool = False) -> None:
+                nonlocal pending_merges
+                if not pending_clusters or (not force and pending_merges < APPLY_BATCH_SIZE):
+                    return
+                if not dry_run:
+                    await CorpusDedupService.apply_clusters(write_db, pending_clusters, threshold)
+                    await write_db.commit()
+                pending_clusters.clear()
+                pending_merges = 0
+
+            async def collect(done: Set[asyncio.Future]) -> None:
+                nonlocal pending_merges
+                for future in done:
+                    clusters, posting_count = future.result()
+                    stats["companies"] += 1
+                    stats["postings"] += posting_count
+                    stats["clusters"] += len(clusters)
+                    merged = sum(len(cluster["members"]) for cluster in clusters)
+                    stats["merged"] += merged
+                    pending_clusters.extend(clusters)
+                    pending_merges += merged
+                await flush_merges()
+                report()
+
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+
+                async def submit(rows: List[Dict[str, Any]]) -> None:
+                    while len(in_flight) >= workers * 2:
+                        done, _ = await asyncio.wait(
+                            in_flight, return_when=asyncio.FIRST_COMPLETED
+                        )
+                        in_flight.difference_update(done)
+                        await collect(done)
+                    in_flight.add(
+                        loop.run_in_executor(pool, _cluster_worker, rows, threshold)
+                    )
+
+                result = await read_db.stream(stmt)
+                company_rows: List[Dict[str, Any]] = []
+                async for partition in result.partitions():
+                    for row in partition:
+                        row_dict = dict(row._mapping)
+                        if company_rows and company_rows[0]["company_id"] != row_dict["company_id"]:
+                            await submit(company_rows)
+                            company_rows = []
+                        company_rows.append(row_dict)
+                if company_rows:
+                    await submit(company_rows)
+
+                if in_flight:
+                    done, _ = await asyncio.wait(in_flight)
+                    in_flight.clear()
+                    await collect(done)
+
+            await flush_merges(force=True)
+
+        report(final=True)
+        if not dry_run:
+            await EventBus.publish("market.corpus_dedup.completed", dict(stats))
+        return stats
+
+
+def _cluster_worker(
+    rows: List[Dict[str, Any]], threshold: float
+) -> Tuple[List[Dict[str, Any]], int]:
+    """Process pool entry point clustering one company."""
+    return CorpusDedupService.cluster_company(rows, threshold), len(rows)
@@ -20,6 +20,8 @@ from app.infrastructure.database.models import (
     PositionDelta,
     Company,
 )
+from app.utils.event_bus import dispatcher
+from app.utils.event_dispatcher import Event
 
 logger = get_logger(__name__)
 
@@ -179,6 +181,17 @@ class DashboardAggregationService:
             logger.error(f"Redis cache eviction failed: {e}")
 
 
+@dispatcher.on(
+    ["profile.updated", "identity.goals_updated", "cohort.assignment.updated"],
+    name="dashboard.invalidate_cache",
+)
+async def _invalidate_on_user_change(event: Event) -> None:
+    """Evicts the dashboard of a user whose inputs changed, from any producer."""
+    user_id = event.data.get("user_id")
+    if user_id:
+        await DashboardAggregationService.invalidate_cache(user_id)
+
+
 class AnalyticsService:
     """Service to track and record dashboard analytics events."""
 
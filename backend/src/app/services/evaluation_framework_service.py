@@ -14,6 +14,7 @@ from app.infrastructure.database.models import EvalDataset, EvalRun, EvalResult
 from app.services.database_service import AsyncSessionLocal
 from app.services.skill_extraction_service import SkillExtractionService
 from app.infrastructure.rag.embeddings.service import embedding_service
+from app.infrastructure.rag.embeddings.similarity import cosine
 from app.utils.event_bus import EventBus
 from app.schemas.evaluation import EvaluationReport, EvalRunMetrics
 
@@ -36,10 +37,9 @@ async def evaluate_semantic_similarity(actual: str, expected: str) -> float:
     if actual.strip().lower() == expected.strip().lower():
         return 1.0
     if embedding_service.available:
-        act_emb = await embedding_service.embed_text(actual)
-        exp_emb = await embedding_service.embed_text(expected)
+        act_emb, exp_emb = await embedding_service.embed_batch([actual, expected])
         if act_emb and exp_emb:
-            return embedding_service.cosine_similarity(act_emb, exp_emb)
+            return cosine(act_emb, exp_emb)
     
     # Fallback to Jaccard similarity of words
     a_words = set(actual.lower().split())
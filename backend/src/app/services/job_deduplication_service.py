@@ -1,13 +1,30 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import math
 import re
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from uuid import uuid4
 
-from sqlalchemy import select
+import numpy as np
+from scipy import sparse
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.logging import get_logger
@@ -17,10 +34,36 @@ from app.infrastructure.database.models import (
     JobDuplicate,
     JobPosting,
 )
+from app.services.minhash_lsh_service import (
+    LSH_MIN_PRIMARIES,
+    NUM_MINHASH_BANDS,
+    CompanyCandidates,
+    MinHashLSHService,
+)
 from app.utils.event_bus import EventBus
 
 logger = get_logger(__name__)
 
+# Similarities of postings with equal fingerprints
+EXACT_MATCH_SIMILARITIES = {"title": 1.0, "company": 1.0, "description": 1.0}
+
+# Incoming rows scored against the candidate matrix at a time
+SCORE_CHUNK_SIZE = 256
+# Candidate pairs scored row-wise at a time
+PAIR_CHUNK_SIZE = 100_000
+
+Match = Tuple[Optional[JobPosting], float, Dict[str, float]]
+
+
+@dataclass
+class DedupFeatures:
+    """Precomputed scoring inputs of a posting."""
+
+    title_tokens: FrozenSet[str]
+    tf_index: np.ndarray  # sorted 32-bit token hashes
+    tf_counts: np.ndarray  # term frequency per hash
+    tf_norm: float
+
 
 class JobDeduplicationService:
     """
@@ -102,53 +145,187 @@ class JobDeduplicationService:
         return dot / (mag1 * mag2)
 
     @staticmethod
-    def generate_fingerprint(title: str, company: str, description: str) -> str:
+    def generate_fingerprint(
+        title: str, company: str, description: str, location: str = ""
+    ) -> str:
         """
-        Generates a stable SHA-256 fingerprint for a cleaned job posting description/details.
+        Generates a stable SHA-256 fingerprint of the cleaned title tokens,
+        company (name or id), location and whitespace/case-normalized
+        description. Postings with equal fingerprints score exactly 1.0.
         """
-        import hashlib
-
-        text = f"{title.lower().strip()}|{company.lower().strip()}|{description.lower().strip()[:200]}"
+        title_key = " ".join(JobDeduplicationService.title_tokens(title))
+        description_key = " ".join(re.findall(r"\w+", description.lower()))
+        text = f"{title_key}|{company.lower().strip()}|{location.lower().strip()}|{description_key}"
         return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
     @staticmethod
-    async def evaluate_and_deduplicate(
-        db: AsyncSession, incoming_job: JobPosting
-    ) -> Optional[str]:
+    def title_tokens(title: str) -> List[str]:
+        """Sorted distinct tokens of the cleaned title, as compared by Jaccard."""
+        return sorted(set(re.findall(r"\w+", JobDeduplicationService.clean_title(title))))
+
+    @staticmethod
+    def term_frequencies(text: str) -> bytes:
         """
-        Compares incoming_job against existing postings from the same company and location.
-        Merges automatically if similarity > 0.85, queues for review if between 0.75 and 0.85.
-        Returns the primary job posting ID if merged, else None.
+        Compact hashed term-frequency vector of a description: the sorted
+        32-bit token hashes followed by their counts, both little-endian uint32.
         """
-        # Exclude comparing the job with itself
-        stmt = (
-            select(JobPosting)
-            .where(
-                JobPosting.company_id == incoming_job.company_id,
-                JobPosting.id != incoming_job.id,
-                JobPosting.is_primary == True,  # noqa: E712 - compare with active primaries
+        hashes = MinHashLSHService.token_hashes(re.findall(r"\w+", text.lower()))
+        index, counts = np.unique(hashes, return_counts=True)
+        return index.astype("<u4").tobytes() + counts.astype("<u4").tobytes()
+
+    @staticmethod
+    def decode_term_frequencies(data: bytes) -> Tuple[np.ndarray, np.ndarray]:
+        """Token hashes and counts of a vector built by term_frequencies."""
+        values = np.frombuffer(data, dtype="<u4")
+        half = len(values) // 2
+        return values[:half], values[half:].astype(np.float64)
+
+    @staticmethod
+    def apply_features(job: JobPosting) -> None:
+        """Computes and sets the stored dedup features a posting is missing."""
+        if job.title_tokens is None:
+            job.title_tokens = JobDeduplicationService.title_tokens(job.raw_title)
+        if job.description_tf is None:
+            job.description_tf = JobDeduplicationService.term_frequencies(job.description)
+        if job.dedupe_fingerprint is None:
+            job.dedupe_fingerprint = JobDeduplicationService.generate_fingerprint(
+                job.raw_title, job.company_id, job.description, job.location
             )
+
+    @staticmethod
+    def features(job: JobPosting) -> DedupFeatures:
+        """
+        Scoring inputs of a posting, decoded from its stored features or, for
+        postings ingested before they were stored, computed from its text.
+        """
+        title_tokens = job.title_tokens
+        if title_tokens is None:
+            title_tokens = JobDeduplicationService.title_tokens(job.raw_title)
+        tf = job.description_tf
+        if tf is None:
+            tf = JobDeduplicationService.term_frequencies(job.description)
+        tf_index, tf_counts = JobDeduplicationService.decode_term_frequencies(tf)
+        return DedupFeatures(
+            title_tokens=frozenset(title_tokens),
+            tf_index=tf_index,
+            tf_counts=tf_counts,
+            tf_norm=math.sqrt(float(tf_counts @ tf_counts)),
         )
-        res = await db.execute(stmt)
-        active_jobs = res.scalars().all()
 
+    @staticmethod
+    def title_similarity(f1: DedupFeatures, f2: DedupFeatures) -> float:
+        """Jaccard similarity of precomputed title token sets."""
+        if not f1.title_tokens and not f2.title_tokens:
+            return 1.0
+        if not f1.title_tokens or not f2.title_tokens:
+            return 0.0
+        return len(f1.title_tokens & f2.title_tokens) / len(f1.title_tokens | f2.title_tokens)
+
+    @staticmethod
+    def description_similarity(f1: DedupFeatures, f2: DedupFeatures) -> float:
+        """Cosine similarity of precomputed term-frequency vectors."""
+        if not len(f1.tf_index) and not len(f2.tf_index):
+            return 1.0
+        if not len(f1.tf_index) or not len(f2.tf_index):
+            return 0.0
+        _, i1, i2 = np.intersect1d(
+            f1.tf_index, f2.tf_index, assume_unique=True, return_indices=True
+        )
+        dot = float(f1.tf_counts[i1] @ f2.tf_counts[i2])
+        return dot / (f1.tf_norm * f2.tf_norm)
+
+    @staticmethod
+    def lsh_buckets(job: JobPosting) -> List[int]:
+        """
+        LSH band buckets of a posting: the MinHash bands of its description
+        plus one band for its cleaned title. Computes and sets the posting's
+        minhash_signature when missing.
+        """
+        if job.minhash_signature is None:
+            if job.description_tf is not None:
+                hashes, _ = JobDeduplicationService.decode_term_frequencies(
+                    job.description_tf
+                )
+                job.minhash_signature = MinHashLSHService.signature_from_hashes(hashes)
+            else:
+                job.minhash_signature = MinHashLSHService.signature(job.description)
+        return MinHashLSHService.band_buckets(
+            job.minhash_signature, JobDeduplicationService.clean_title(job.raw_title)
+        )
+
+    @staticmethod
+    async def reindex_postings(db: AsyncSession, posting_ids: Sequence[str]) -> None:
+        """
+        Recomputes the stored dedup features (title tokens, term frequencies,
+        fingerprint, MinHash signature) and LSH band rows of stored postings,
+        e.g. after their title, description or location changed.
+        """
+        if not posting_ids:
+            return
+        res = await db.execute(
+            select(
+                JobPosting.id,
+                JobPosting.company_id,
+                JobPosting.raw_title,
+                JobPosting.description,
+                JobPosting.location,
+            ).where(JobPosting.id.in_(list(posting_ids)))
+        )
+        updates = []
+        entries = []
+        for posting_id, company_id, raw_title, description, location in res.all():
+            job = JobPosting(
+                id=posting_id,
+                company_id=company_id,
+                raw_title=raw_title,
+                description=description,
+                location=location,
+            )
+            JobDeduplicationService.apply_features(job)
+            buckets = JobDeduplicationService.lsh_buckets(job)
+            updates.append(
+                {
+                    "id": posting_id,
+                    "title_tokens": job.title_tokens,
+                    "description_tf": job.description_tf,
+                    "dedupe_fingerprint": job.dedupe_fingerprint,
+                    "minhash_signature": job.minhash_signature,
+                }
+            )
+            entries.append((posting_id, company_id, buckets))
+        if updates:
+            await db.execute(update(JobPosting), updates)
+            await MinHashLSHService.index_postings(db, entries)
+
+    @staticmethod
+    def find_best_match(
+        incoming_job: JobPosting, candidates: Sequence[JobPosting]
+    ) -> Tuple[Optional[JobPosting], float, Dict[str, float]]:
+        """
+        Scores incoming_job against candidate primaries from the same company,
+        using their stored title tokens and term-frequency vectors. Returns
+        the best matching candidate, its composite score and the per-signal
+        similarities.
+        """
         best_match: Optional[JobPosting] = None
         best_score = 0.0
         best_similarities: Dict[str, float] = {}
+        incoming_features = JobDeduplicationService.features(incoming_job)
+
+        for existing in candidates:
+            existing_features = JobDeduplicationService.features(existing)
 
-        for existing in active_jobs:
             # Title similarity (Jaccard of cleaned tokens)
-            t_sim = JobDeduplicationService.calculate_jaccard_similarity(
-                JobDeduplicationService.clean_title(incoming_job.raw_title),
-                JobDeduplicationService.clean_title(existing.raw_title),
+            t_sim = JobDeduplicationService.title_similarity(
+                incoming_features, existing_features
             )
 
             # Company similarity (We already filtered by company_id, so it is 1.0)
             c_sim = 1.0
 
-            # Description similarity (Cosine of tokens)
-            d_sim = JobDeduplicationService.calculate_cosine_similarity(
-                incoming_job.description, existing.description
+            # Description similarity (Cosine of token frequencies)
+            d_sim = JobDeduplicationService.description_similarity(
+                incoming_features, existing_features
             )
 
             # Location similarity multiplier / boundary (e.g. strict location mismatch drops score)
@@ -169,42 +346,462 @@ class JobDeduplicationService:
                 best_match = existing
                 best_similarities = {"title": t_sim, "company": c_sim, "description": d_sim}
 
+        return best_match, best_score, best_similarities
+
+    @staticmethod
+    def _feature_matrices(
+        feats: Sequence[DedupFeatures],
+    ) -> Tuple[sparse.csr_matrix, np.ndarray, np.ndarray, sparse.csr_matrix, np.ndarray]:
+        """
+        Sparse term-count matrix (with row norms and term counts) and binary
+        title-token matrix (with token counts) of a list of features.
+        """
+        lengths = np.fromiter((len(f.tf_index) for f in feats), dtype=np.int64, count=len(feats))
+        hashes = np.concatenate([f.tf_index for f in feats] + [np.empty(0, dtype="<u4")])
+        counts = np.concatenate([f.tf_counts for f in feats] + [np.empty(0)])
+        _, columns = np.unique(hashes, return_inverse=True)
+        tf = sparse.csr_matrix(
+            (counts, columns.reshape(-1), np.concatenate(([0], np.cumsum(lengths)))),
+            shape=(len(feats), max(int(columns.max(initial=-1)) + 1, 1)),
+        )
+        norms = np.fromiter((f.tf_norm for f in feats), dtype=np.float64, count=len(feats))
+
+        vocab: Dict[str, int] = {}
+        title_cols = [
+            [vocab.setdefault(token, len(vocab)) for token in f.title_tokens] for f in feats
+        ]
+        sizes = np.fromiter((len(c) for c in title_cols), dtype=np.int64, count=len(feats))
+        titles = sparse.csr_matrix(
+            (
+                np.ones(int(sizes.sum())),
+                np.fromiter((c for cols in title_cols for c in cols), dtype=np.int64),
+                np.concatenate(([0], np.cumsum(sizes))),
+            ),
+            shape=(len(feats), max(len(vocab), 1)),
+        )
+        return tf, norms, lengths, titles, sizes
+
+    @staticmethod
+    def _combine_similarities(
+        dots: np.ndarray,
+        norm_products: np.ndarray,
+        both_empty: np.ndarray,
+        intersections: np.ndarray,
+        unions: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Title Jaccard and description cosine from their sparse products."""
+        with np.errstate(divide="ignore", invalid="ignore"):
+            d_sim = np.where(norm_products > 0, dots / norm_products, 0.0)
+            t_sim = np.where(unions > 0, intersections / unions, 1.0)
+        d_sim[both_empty] = 1.0
+        return t_sim, d_sim
+
+    @staticmethod
+    def similarity_matrices(
+        left: Sequence[DedupFeatures], right: Sequence[DedupFeatures]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Title Jaccard and description cosine similarity of every (left, right)
+        pair, computed with sparse matrix products. Values are identical to
+        title_similarity / description_similarity.
+        """
+        n_left = len(left)
+        tf, norms, lengths, titles, sizes = JobDeduplicationService._feature_matrices(
+            list(left) + list(right)
+        )
+        # Integer term counts divided by the norm product, like description_similarity
+        dots = (tf[:n_left] @ tf[n_left:].T).toarray()
+        intersections = (titles[:n_left] @ titles[n_left:].T).toarray()
+        empty = lengths == 0
+        return JobDeduplicationService._combine_similarities(
+            dots,
+            np.outer(norms[:n_left], norms[n_left:]),
+            empty[:n_left, None] & empty[None, n_left:],
+            intersections,
+            sizes[:n_left, None] + sizes[None, n_left:] - intersections,
+        )
+
+    @staticmethod
+    def _location_codes(jobs: Sequence[JobPosting], codes: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Lower-cased location code and remote flag of every posting."""
+        locations = [job.location.lower() for job in jobs]
+        return (
+            np.array([codes.setdefault(loc, len(codes)) for loc in locations], dtype=np.int64),
+            np.array(["remote" in loc for loc in locations], dtype=bool),
+        )
+
+    @staticmethod
+    def _location_penalty(
+        left_loc: np.ndarray, left_remote: np.ndarray, right_loc: np.ndarray, right_remote: np.ndarray
+    ) -> np.ndarray:
+        """find_best_match location penalty of broadcast location codes / remote flags."""
+        return np.where(
+            left_loc == right_loc,
+            1.0,
+            np.where(left_remote | right_remote, 0.90, 0.70),
+        )
+
+    @staticmethod
+    def score_matrix(
+        left_jobs: Sequence[JobPosting],
+        right_jobs: Sequence[JobPosting],
+        left_features: Sequence[DedupFeatures],
+        right_features: Sequence[DedupFeatures],
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Vectorized find_best_match scoring: the composite
+        (0.3 title + 0.3 company + 0.4 description) x location penalty score
+        of every (left, right) pair, with the title and description similarities.
+        """
+        t_sim, d_sim = JobDeduplicationService.similarity_matrices(
+            left_features, right_features
+        )
+        codes: Dict[str, int] = {}
+        left_loc, left_remote = JobDeduplicationService._location_codes(left_jobs, codes)
+        right_loc, right_remote = JobDeduplicationService._location_codes(right_jobs, codes)
+        loc_penalty = JobDeduplicationService._location_penalty(
+            left_loc[:, None], left_remote[:, None], right_loc[None, :], right_remote[None, :]
+        )
+        scores = ((0.3 * t_sim) + (0.3 * 1.0) + (0.4 * d_sim)) * loc_penalty
+        return scores, t_sim, d_sim
+
+    @staticmethod
+    def pair_scores(
+        jobs: Sequence[JobPosting],
+        features: Sequence[DedupFeatures],
+        left: np.ndarray,
+        right: np.ndarray,
+        chunk_size: int = PAIR_CHUNK_SIZE,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Composite score, title and description similarity of the posting
+        pairs (jobs[left[k]], jobs[right[k]]), scored row-wise on sparse
+        matrices chunk_size pairs at a time.
+        """
+        tf, norms, lengths, titles, sizes = JobDeduplicationService._feature_matrices(features)
+        loc, remote = JobDeduplicationService._location_codes(jobs, {})
+        empty = lengths == 0
+        scores = np.empty(len(left))
+        t_sim = np.empty(len(left))
+        d_sim = np.empty(len(left))
+        for start in range(0, len(left), chunk_size):
+            lc = left[start : start + chunk_size]
+            rc = right[start : start + chunk_size]
+            dots = np.asarray(tf[lc].multiply(tf[rc]).sum(axis=1)).ravel()
+            intersections = np.asarray(titles[lc].multiply(titles[rc]).sum(axis=1)).ravel()
+            t_chunk, d_chunk = JobDeduplicationService._combine_similarities(
+                dots,
+                norms[lc] * norms[rc],
+                empty[lc] & empty[rc],
+                intersections,
+                sizes[lc] + sizes[rc] - intersections,
+            )
+            loc_penalty = JobDeduplicationService._location_penalty(
+                loc[lc], remote[lc], loc[rc], remote[rc]
+            )
+            scores[start : start + chunk_size] = (
+                (0.3 * t_chunk) + (0.3 * 1.0) + (0.4 * d_chunk)
+            ) * loc_penalty
+            t_sim[start : start + chunk_size] = t_chunk
+            d_sim[start : start + chunk_size] = d_chunk
+        return scores, t_sim, d_sim
+
+    @staticmethod
+    def candidate_pairs(
+        buckets: Sequence[Sequence[int]], bands: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Index pairs (i < j) of postings sharing at least one LSH bucket among
+        the first bands bands (all bands by default).
+        """
+        n = len(buckets)
+        groups: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        for i, posting_buckets in enumerate(buckets):
+            for band, bucket in enumerate(posting_buckets[:bands]):
+                groups[(band, bucket)].append(i)
+        codes = []
+        for members in groups.values():
+            if len(members) > 1:
+                members_arr = np.array(members, dtype=np.int64)
+                a, b = np.triu_indices(len(members_arr), k=1)
+                codes.append(members_arr[a] * n + members_arr[b])
+        if not codes:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        unique = np.unique(np.concatenate(codes))
+        return unique // n, unique % n
+
+    @staticmethod
+    def duplicate_pairs(
+        jobs: Sequence[JobPosting],
+        threshold: float = 0.85,
+        exhaustive_limit: int = LSH_MIN_PRIMARIES,
+    ) -> List[Tuple[int, int, float, float, float]]:
+        """
+        Index pairs (i < j, score, title, description) of postings of one
+        company scoring above threshold. Companies up to exhaustive_limit
+        postings score every pair; larger ones only pairs sharing a MinHash
+        band. The title band is left out: a merge-level score needs a
+        description cosine of at least 0.625, and same-title buckets of large
+        employers would otherwise pair most of their postings.
+        """
+        features = [JobDeduplicationService.features(job) for job in jobs]
+        if len(jobs) <= exhaustive_limit:
+            scores, t_sim, d_sim = JobDeduplicationService.score_matrix(
+                jobs, jobs, features, features
+            )
+            left, right = np.triu_indices(len(jobs), k=1)
+            scores, t_sim, d_sim = scores[left, right], t_sim[left, right], d_sim[left, right]
+        else:
+            buckets = [JobDeduplicationService.lsh_buckets(job) for job in jobs]
+            left, right = JobDeduplicationService.candidate_pairs(buckets, NUM_MINHASH_BANDS)
+            scores, t_sim, d_sim = JobDeduplicationService.pair_scores(
+                jobs, features, left, right
+            )
+        keep = scores > threshold
+        return list(
+            zip(
+                left[keep].tolist(),
+                right[keep].tolist(),
+                scores[keep].tolist(),
+                t_sim[keep].tolist(),
+                d_sim[keep].tolist(),
+            )
+        )
+
+    @staticmethod
+    def match_company_batch(
+        incoming: Sequence[JobPosting],
+        candidates: Sequence[JobPosting],
+        exact_primaries: Dict[str, JobPosting],
+        allowed: Optional[np.ndarray] = None,
+        batch_allowed: Optional[np.ndarray] = None,
+    ) -> List[Match]:
+        """
+        Batch counterpart of find_best_match for incoming postings of one
+        company, in order. Reaches the same decisions as running the scalar
+        path posting by posting: a fingerprint in exact_primaries is an exact
+        match, and every posting that is not auto-merged becomes a candidate
+        (and exact primary) for the postings after it.
+        allowed / batch_allowed optionally restrict which candidates / earlier
+        incoming postings each posting may match (the LSH candidate sets).
+        """
+        n = len(incoming)
+        in_feats = [JobDeduplicationService.features(job) for job in incoming]
+        cand_feats = [JobDeduplicationService.features(job) for job in candidates]
+
+        stored_idx = np.zeros(n, dtype=np.int64)
+        stored_score = np.zeros(n)
+        stored_t = np.zeros(n)
+        stored_d = np.zeros(n)
+        if candidates:
+            for start in range(0, n, SCORE_CHUNK_SIZE):
+                stop = min(start + SCORE_CHUNK_SIZE, n)
+                scores, t_sim, d_sim = JobDeduplicationService.score_matrix(
+                    incoming[start:stop], candidates, in_feats[start:stop], cand_feats
+                )
+                if allowed is not None:
+                    scores = np.where(allowed[start:stop], scores, 0.0)
+                rows = np.arange(stop - start)
+                best = scores.argmax(axis=1)
+                stored_idx[start:stop] = best
+                stored_score[start:stop] = scores[rows, best]
+                stored_t[start:stop] = t_sim[rows, best]
+                stored_d[start:stop] = d_sim[rows, best]
+
+        batch_scores, batch_t, batch_d = JobDeduplicationService.score_matrix(
+            incoming, incoming, in_feats, in_feats
+        )
+        if batch_allowed is not None:
+            batch_scores = np.where(batch_allowed, batch_scores, 0.0)
+
+        primary = np.zeros(n, dtype=bool)
+        results: List[Match] = []
+        for i, job in enumerate(incoming):
+            exact = exact_primaries.get(job.dedupe_fingerprint)
+            if exact is not None:
+                match: Match = (exact, 1.0, dict(EXACT_MATCH_SIMILARITIES))
+            else:
+                match = (None, 0.0, {})
+                # Strict > keeps the first best candidate, stored ones first
+                if stored_score[i] > 0:
+                    match = (
+                        candidates[stored_idx[i]],
+                        float(stored_score[i]),
+                        {"title": float(stored_t[i]), "company": 1.0, "description": float(stored_d[i])},
+                    )
+                earlier = np.flatnonzero(primary[:i])
+                if len(earlier):
+                    j = earlier[batch_scores[i, earlier].argmax()]
+                    if batch_scores[i, j] > match[1]:
+                        match = (
+                            incoming[j],
+                            float(batch_scores[i, j]),
+                            {"title": float(batch_t[i, j]), "company": 1.0, "description": float(batch_d[i, j])},
+                        )
+            if match[0] is None or match[1] <= 0.85:
+                primary[i] = True
+                exact_primaries.setdefault(job.dedupe_fingerprint, job)
+            results.append(match)
+        return results
+
+    @staticmethod
+    def match_with_candidates(
+        incoming: Sequence[JobPosting],
+        buckets: Sequence[Sequence[int]],
+        company_candidates: CompanyCandidates,
+        exact_primaries: Dict[str, JobPosting],
+    ) -> List[Match]:
+        """
+        Runs match_company_batch over the candidates loaded by
+        MinHashLSHService.load_candidates, restricting every posting to its
+        LSH candidates when the company is not scored exhaustively.
+        """
+        candidates = company_candidates.postings
+        allowed = batch_allowed = None
+        if not company_candidates.exhaustive:
+            position = {posting.id: k for k, posting in enumerate(candidates)}
+            allowed = np.zeros((len(incoming), len(candidates)), dtype=bool)
+            for i, posting_buckets in enumerate(buckets):
+                allowed[
+                    i,
+                    [position[p.id] for p in company_candidates.candidates(posting_buckets)],
+                ] = True
+            bucket_matrix = np.array(buckets, dtype=np.int64).reshape(len(incoming), -1)
+            batch_allowed = (bucket_matrix[:, None, :] == bucket_matrix[None, :, :]).any(axis=2)
+        return JobDeduplicationService.match_company_batch(
+            incoming, candidates, exact_primaries, allowed, batch_allowed
+        )
+
+    @staticmethod
+    async def load_exact_primaries(
+        db: AsyncSession,
+        fingerprints: Dict[str, Iterable[str]],
+        exclude_ids: Iterable[str] = (),
+    ) -> Dict[str, Dict[str, JobPosting]]:
+        """
+        Primaries holding one of the given fingerprints, per company id and
+        fingerprint. fingerprints maps a company id to incoming fingerprints.
+        """
+        exclude = set(exclude_ids)
+        result: Dict[str, Dict[str, JobPosting]] = {company_id: {} for company_id in fingerprints}
+        wanted = {fp for fps in fingerprints.values() for fp in fps if fp}
+        if not wanted:
+            return result
+        res = await db.execute(
+            select(JobPosting).where(
+                JobPosting.dedupe_fingerprint.in_(wanted),
+                JobPosting.company_id.in_(list(fingerprints)),
+                JobPosting.is_primary == True,  # noqa: E712 - compare with active primaries
+            )
+        )
+        for existing in res.scalars().all():
+            if existing.id not in exclude:
+                result[existing.company_id].setdefault(existing.dedupe_fingerprint, existing)
+        return result
+
+    @staticmethod
+    def build_dedupe_records(
+        incoming_job: JobPosting,
+        best_match: JobPosting,
+        best_score: float,
+        best_similarities: Dict[str, float],
+    ) -> Tuple[JobDuplicate, Optional[DedupeAuditLog]]:
+        """
+        Builds the JobDuplicate row (and the merge audit log for auto-merges)
+        for a match at or above the review threshold. Auto-merges also flag
+        incoming_job as a non-primary duplicate of best_match.
+        """
+        auto_merge = best_score > 0.85
+        dup = JobDuplicate(
+            id=str(uuid4()),
+            primary_job_id=best_match.id,
+            duplicate_job_id=incoming_job.id,
+            confidence_score=Decimal(str(round(best_score, 3))),
+            title_similarity=Decimal(str(round(best_similarities["title"], 3))),
+            company_similarity=Decimal(str(round(best_similarities["company"], 3))),
+            description_similarity=Decimal(
+                str(round(best_similarities["description"], 3))
+            ),
+            status="AUTO_MERGED" if auto_merge else "PENDING_REVIEW",
+            created_at=datetime.utcnow(),
+        )
+        if not auto_merge:
+            return dup, None
+
+        incoming_job.is_primary = False
+        incoming_job.is_active = False
+        incoming_job.merged_into_id = best_match.id
+        incoming_job.deduplicated_to_id = best_match.id
+
+        audit = DedupeAuditLog(
+            id=str(uuid4()),
+            action="MERGE",
+            primary_job_id=best_match.id,
+            merged_job_id=incoming_job.id,
+            merge_details={
+                "title": incoming_job.raw_title,
+                "url": incoming_job.url,
+                "description_length": len(incoming_job.description),
+                "score": best_score,
+            },
+            created_at=datetime.utcnow(),
+        )
+        return dup, audit
+
+    @staticmethod
+    async def evaluate_and_deduplicate(
+        db: AsyncSession, incoming_job: JobPosting
+    ) -> Optional[str]:
+        """
+        Compares incoming_job against existing postings from the same company and location.
+        A primary with the same fingerprint is an exact (1.0) match without any
+        scoring; otherwise large companies only score the primaries found
+        through the MinHash/LSH index. The posting is indexed as it is evaluated.
+        Merges automatically if similarity > 0.85, queues for review if between 0.75 and 0.85.
+        Returns the primary job posting ID if merged, else None.
+        """
+        JobDeduplicationService.apply_features(incoming_job)
+        buckets = JobDeduplicationService.lsh_buckets(incoming_job)
+
+        # Equal fingerprints mean equal title tokens, location and description
+        exact_res = await db.execute(
+            select(JobPosting)
+            .where(
+                JobPosting.company_id == incoming_job.company_id,
+                JobPosting.dedupe_fingerprint == incoming_job.dedupe_fingerprint,
+                JobPosting.id != incoming_job.id,
+                JobPosting.is_primary == True,  # noqa: E712 - compare with active primaries
+            )
+            .limit(1)
+        )
+        exact_match = exact_res.scalar_one_or_none()
+        if exact_match:
+            best_match, best_score, best_similarities = (
+                exact_match,
+                1.0,
+                dict(EXACT_MATCH_SIMILARITIES),
+            )
+        else:
+            # Candidates come from the LSH index for large companies; the job
+            # itself is excluded
+            company_candidates = await MinHashLSHService.load_candidates(
+                db, {incoming_job.company_id: [buckets]}, exclude_ids=[incoming_job.id]
+            )
+            active_jobs = company_candidates[incoming_job.company_id].candidates(buckets)
+            best_match, best_score, best_similarities = (
+                JobDeduplicationService.find_best_match(incoming_job, active_jobs)
+            )
+        await MinHashLSHService.index_postings(
+            db, [(incoming_job.id, incoming_job.company_id, buckets)]
+        )
+
         if best_match and best_score >= 0.75:
-            if best_score > 0.85:
+            dup, audit = JobDeduplicationService.build_dedupe_records(
+                incoming_job, best_match, best_score, best_similarities
+            )
+            db.add(dup)
+            if audit:
                 # 1. AUTO MERGE
-                incoming_job.is_primary = False
-                incoming_job.is_active = False
-                incoming_job.merged_into_id = best_match.id
-                incoming_job.deduplicated_to_id = best_match.id
-
-                # Save duplicate record
-                dup = JobDuplicate(
-                    id=str(uuid4()),
-                    primary_job_id=best_match.id,
-                    duplicate_job_id=incoming_job.id,
-                    confidence_score=Decimal(str(round(best_score, 3))),
-                    title_similarity=Decimal(str(round(best_similarities["title"], 3))),
-                    company_similarity=Decimal(str(round(best_similarities["company"], 3))),
-                    description_similarity=Decimal(
-                        str(round(best_similarities["description"], 3))
-                    ),
-                    status="AUTO_MERGED",
-                )
-                db.add(dup)
-
-                # Save audit log
-                audit = DedupeAuditLog(
-                    id=str(uuid4()),
-                    action="MERGE",
-                    primary_job_id=best_match.id,
-                    merged_job_id=incoming_job.id,
-                    merge_details={
-                        "title": incoming_job.raw_title,
-                        "url": incoming_job.url,
-                        "description_length": len(incoming_job.description),
-                        "score": best_score,
-                    },
-                )
                 db.add(audit)
                 await db.flush()
 
@@ -223,19 +820,6 @@ class JobDeduplicationService:
                 return best_match.id
             else:
                 # 2. QUEUE FOR REVIEW (0.75 to 0.85)
-                dup = JobDuplicate(
-                    id=str(uuid4()),
-                    primary_job_id=best_match.id,
-                    duplicate_job_id=incoming_job.id,
-                    confidence_score=Decimal(str(round(best_score, 3))),
-                    title_similarity=Decimal(str(round(best_similarities["title"], 3))),
-                    company_similarity=Decimal(str(round(best_similarities["company"], 3))),
-                    description_similarity=Decimal(
-                        str(round(best_similarities["description"], 3))
-                    ),
-                    status="PENDING_REVIEW",
-                )
-                db.add(dup)
                 await db.flush()
                 logger.info(
                     f"Flagged potential duplicate job {incoming_job.id} matching {best_match.id} "
@@ -244,6 +828,102 @@ class JobDeduplicationService:
 
         return None
 
+    @staticmethod
+    async def deduplicate_batch(
+        db: AsyncSession,
+        incoming_jobs: Sequence[JobPosting],
+        publish: Optional[Callable[[str, Dict[str, Any]], Awaitable[None]]] = None,
+    ) -> List[Optional[str]]:
+        """
+        Batch counterpart of evaluate_and_deduplicate for flushed postings, in
+        ingestion order. Candidates and exact primaries are loaded with one
+        query each, scores are computed per company with matrix operations,
+        and all JobDuplicate / DedupeAuditLog rows are written with one
+        multi-row INSERT per table. Decisions match inserting the postings
+        one at a time, each followed by evaluate_and_deduplicate.
+        Returns, per posting, the primary job posting ID if merged, else None.
+        """
+        publish = publish or EventBus.publish
+        if not incoming_jobs:
+            return []
+
+        buckets: List[List[int]] = []
+        by_company: Dict[str, List[int]] = defaultdict(list)
+        for i, job in enumerate(incoming_jobs):
+            JobDeduplicationService.apply_features(job)
+            buckets.append(JobDeduplicationService.lsh_buckets(job))
+            by_company[job.company_id].append(i)
+        incoming_ids = [job.id for job in incoming_jobs]
+
+        company_candidates = await MinHashLSHService.load_candidates(
+            db,
+            {c: [buckets[i] for i in idxs] for c, idxs in by_company.items()},
+            exclude_ids=incoming_ids,
+        )
+        exact_primaries = await JobDeduplicationService.load_exact_primaries(
+            db,
+            {
+                c: [incoming_jobs[i].dedupe_fingerprint for i in idxs]
+                for c, idxs in by_company.items()
+            },
+            exclude_ids=incoming_ids,
+        )
+
+        matches: List[Match] = [(None, 0.0, {})] * len(incoming_jobs)
+        for company_id, idxs in by_company.items():
+            company_matches = JobDeduplicationService.match_with_candidates(
+                [incoming_jobs[i] for i in idxs],
+                [buckets[i] for i in idxs],
+                company_candidates[company_id],
+                exact_primaries[company_id],
+            )
+            for i, match in zip(idxs, company_matches):
+                matches[i] = match
+
+        results: List[Optional[str]] = [None] * len(incoming_jobs)
+        duplicate_rows: List[Dict[str, Any]] = []
+        audit_rows: List[Dict[str, Any]] = []
+        merged_events: List[Dict[str, Any]] = []
+        for i, (best_match, best_score, best_similarities) in enumerate(matches):
+            incoming_job = incoming_jobs[i]
+            if not best_match or best_score < 0.75:
+                continue
+            dup, audit = JobDeduplicationService.build_dedupe_records(
+                incoming_job, best_match, best_score, best_similarities
+            )
+            duplicate_rows.append({c.key: getattr(dup, c.key) for c in dup.__table__.columns})
+            if audit:
+                audit_rows.append(
+                    {c.key: getattr(audit, c.key) for c in audit.__table__.columns}
+                )
+                merged_events.append(
+                    {
+                        "primary_job_id": best_match.id,
+                        "merged_job_id": incoming_job.id,
+                        "source_merged": incoming_job.source,
+                        "primary_source": best_match.source,
+                    }
+                )
+                results[i] = best_match.id
+
+        await MinHashLSHService.index_postings(
+            db, list(zip(incoming_ids, (job.company_id for job in incoming_jobs), buckets))
+        )
+        # Merged postings were flagged on their ORM objects
+        await db.flush()
+        if duplicate_rows:
+            await db.execute(insert(JobDuplicate), duplicate_rows)
+        if audit_rows:
+            await db.execute(insert(DedupeAuditLog), audit_rows)
+
+        logger.info(
+            f"Batch dedup of {len(incoming_jobs)} postings: {len(audit_rows)} auto-merged, "
+            f"{len(duplicate_rows) - len(audit_rows)} queued for review"
+        )
+        for data in merged_events:
+            await publish("market.jobs.merged", data)
+        return results
+
     @staticmethod
     async def resolve_duplicate_pair(
         db: AsyncSession, duplicate_pair_id: str, action: str, operator_id: Optional[str] = None
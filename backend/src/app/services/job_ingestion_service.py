@@ -1,21 +1,40 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import os
 import re
+from collections import defaultdict
+from contextlib import aclosing
 from datetime import datetime, UTC
 from decimal import Decimal
-from typing import Any, Dict, List, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
 from uuid import uuid4
 
 import httpx
-from sqlalchemy import select
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.core.logging import get_logger
 from app.infrastructure.database.models import (
     Company,
+    CompensationRecord,
+    DedupeAuditLog,
     IngestionAuditLog,
+    JobDuplicate,
     JobIngestionRun,
     JobPosting,
     JobPostingSkill,
@@ -30,24 +49,43 @@ from app.services.job_deduplication_service import JobDeduplicationService
 from app.services.location_normalization_service import (
     LocationNormalizationService,
 )
+from app.services.minhash_lsh_service import MinHashLSHService
+from app.services.redis_service import RedisService
 from app.services.skill_extraction_service import SkillExtractionService
 from app.utils.event_bus import EventBus
 
 logger = get_logger(__name__)
 
+# Number of postings written per set-based batch when bulk ingestion is enabled
+BULK_BATCH_SIZE = 500
+
+EventPublisher = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+# Unified posting fields covered by the content hash
+CONTENT_FIELDS = ("title", "description", "location_raw", "salary_raw")
+
 
 class JSearchIngestionClient:
     """Client for JSearch API via RapidAPI."""
 
     @staticmethod
     async def fetch_jobs(
-        query: str, location: str, page: int = 1
+        query: str,
+        location: str,
+        page: int = 1,
+        client: Optional[httpx.AsyncClient] = None,
     ) -> List[Dict[str, Any]]:
         api_key = settings.jsearch_api_key or os.getenv("JSEARCH_API_KEY")
         if not api_key:
             logger.warning("JSearch API Key is not configured.")
             return []
 
+        if client is None:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                return await JSearchIngestionClient.fetch_jobs(
+                    query, location, page, client
+                )
+
         url = f"https://{settings.jsearch_api_host}/search"
         headers = {
             "X-RapidAPI-Key": api_key,
@@ -59,47 +97,46 @@ class JSearchIngestionClient:
             "num_pages": "1",
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.get(url, headers=headers, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-
-            results = data.get("data", [])
-            unified = []
-            for job in results:
-                ext_id = job.get("job_id")
-                if not ext_id:
-                    continue
-                min_sal = job.get("job_min_salary")
-                max_sal = job.get("job_max_salary")
-                salary_raw = None
-                if min_sal is not None or max_sal is not None:
-                    salary_raw = {
-                        "min_salary": min_sal,
-                        "max_salary": max_sal,
-                        "currency": job.get("job_salary_currency", "USD"),
-                        "payment_interval": job.get("job_salary_period", "YEAR"),
-                    }
+        resp = await client.get(url, headers=headers, params=params)
+        resp.raise_for_status()
+        data = resp.json()
+
+        results = data.get("data", [])
+        unified = []
+        for job in results:
+            ext_id = job.get("job_id")
+            if not ext_id:
+                continue
+            min_sal = job.get("job_min_salary")
+            max_sal = job.get("job_max_salary")
+            salary_raw = None
+            if min_sal is not None or max_sal is not None:
+                salary_raw = {
+                    "min_salary": min_sal,
+                    "max_salary": max_sal,
+                    "currency": job.get("job_salary_currency", "USD"),
+                    "payment_interval": job.get("job_salary_period", "YEAR"),
+                }
 
-                city = job.get("job_city") or ""
-                state = job.get("job_state") or ""
-                country = job.get("job_country") or ""
-                loc_parts = [p for p in (city, state, country) if p]
-                loc_raw = ", ".join(loc_parts) if loc_parts else "Remote"
+            city = job.get("job_city") or ""
+            state = job.get("job_state") or ""
+            country = job.get("job_country") or ""
+            loc_parts = [p for p in (city, state, country) if p]
+            loc_raw = ", ".join(loc_parts) if loc_parts else "Remote"
 
-                unified.append(
-                    {
-                        "external_id": ext_id,
-                        "title": job.get("job_title") or "Unknown Title",
-                        "company_name": job.get("employer_name") or "Unknown Company",
-                        "description": job.get("job_description") or "",
-                        "location_raw": loc_raw,
-                        "url": job.get("job_apply_link") or "",
-                        "salary_raw": salary_raw,
-                        "raw_payload": job,
-                    }
-                )
-            return unified
+            unified.append(
+                {
+                    "external_id": ext_id,
+                    "title": job.get("job_title") or "Unknown Title",
+                    "company_name": job.get("employer_name") or "Unknown Company",
+                    "description": job.get("job_description") or "",
+                    "location_raw": loc_raw,
+                    "url": job.get("job_apply_link") or "",
+                    "salary_raw": salary_raw,
+                    "raw_payload": job,
+                }
+            )
+        return unified
 
 
 class AdzunaIngestionClient:
@@ -107,7 +144,10 @@ class AdzunaIngestionClient:
 
     @staticmethod
     async def fetch_jobs(
-        query: str, location: str, page: int = 1
+        query: str,
+        location: str,
+        page: int = 1,
+        client: Optional[httpx.AsyncClient] = None,
     ) -> List[Dict[str, Any]]:
         app_id = os.getenv("ADZUNA_APP_ID")
         app_key = os.getenv("ADZUNA_APP_KEY")
@@ -115,6 +155,12 @@ class AdzunaIngestionClient:
             logger.warning("Adzuna API App ID or App Key not configured.")
             return []
 
+        if client is None:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                return await AdzunaIngestionClient.fetch_jobs(
+                    query, location, page, client
+                )
+
         url = f"https://api.adzuna.com/v1/api/jobs/us/search/{page}"
         params = {
             "app_id": app_id,
@@ -125,127 +171,490 @@ class AdzunaIngestionClient:
             "content-type": "application/json",
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.get(url, params=params)
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await client.get(url, params=params)
+        resp.raise_for_status()
+        data = resp.json()
+
+        results = data.get("results", [])
+        unified = []
+        for job in results:
+            ext_id = job.get("id")
+            if not ext_id:
+                continue
+            min_sal = job.get("salary_min")
+            max_sal = job.get("salary_max")
+            salary_raw = None
+            if min_sal is not None or max_sal is not None:
+                salary_raw = {
+                    "min_salary": min_sal,
+                    "max_salary": max_sal,
+                    "currency": "USD",
+                    "payment_interval": "ANNUAL",
+                }
 
-            results = data.get("results", [])
-            unified = []
-            for job in results:
-                ext_id = job.get("id")
-                if not ext_id:
-                    continue
-                min_sal = job.get("salary_min")
-                max_sal = job.get("salary_max")
-                salary_raw = None
-                if min_sal is not None or max_sal is not None:
-                    salary_raw = {
-                        "min_salary": min_sal,
-                        "max_salary": max_sal,
-                        "currency": "USD",
-                        "payment_interval": "ANNUAL",
-                    }
+            loc_data = job.get("location", {})
+            loc_raw = loc_data.get("display_name") or "Remote"
+
+            unified.append(
+                {
+                    "external_id": str(ext_id),
+                    "title": job.get("title") or "Unknown Title",
+                    "company_name": job.get("company", {}).get("display_name")
+                    or "Unknown Company",
+                    "description": job.get("description") or "",
+                    "location_raw": loc_raw,
+                    "url": job.get("redirect_url") or "",
+                    "salary_raw": salary_raw,
+                    "raw_payload": job,
+                }
+            )
+        return unified
 
-                loc_data = job.get("location", {})
-                loc_raw = loc_data.get("display_name") or "Remote"
 
-                unified.append(
-                    {
-                        "external_id": str(ext_id),
-                        "title": job.get("title") or "Unknown Title",
-                        "company_name": job.get("company", {}).get("display_name")
-                        or "Unknown Company",
-                        "description": job.get("description") or "",
-                        "location_raw": loc_raw,
-                        "url": job.get("redirect_url") or "",
-                        "salary_raw": salary_raw,
-                        "raw_payload": job,
-                    }
-                )
-            return unified
+class NotModifiedPage(list):
+    """
+    Empty result of a conditional request answered with 304 Not Modified.
+    Unlike an empty page it does not mean the listing ends here.
+    """
+
+
+class CrawledPage(list):
+    """
+    Postings of a board crawl response, carrying the ETag / Last-Modified
+    validators (by cache key) of the response. They are stored only once
+    every posting of the page has been processed and committed.
+    """
+
+    def __init__(
+        self,
+        jobs: Sequence[Dict[str, Any]] = (),
+        validators: Optional[Dict[str, Dict[str, str]]] = None,
+    ):
+        super().__init__(jobs)
+        self.validators: Dict[str, Dict[str, str]] = dict(validators or {})
+
+
+class ConditionalRequestCache:
+    """
+    Remembers the ETag / Last-Modified validators of board crawl responses in
+    Redis, so re-crawls can send conditional requests and skip unchanged boards.
+    """
+
+    KEY_PREFIX = "ingestion:http_validators:"
+    TTL_SECONDS = 24 * 60 * 60
+
+    @staticmethod
+    def cache_key(url: str, params: Optional[Dict[str, str]] = None) -> str:
+        return str(httpx.URL(url, params=params))
+
+    @staticmethod
+    async def request_headers(url: str) -> Dict[str, str]:
+        """Conditional request headers for url, empty when nothing is cached."""
+        try:
+            client = RedisService.get_client()
+            cached = await client.hgetall(ConditionalRequestCache.KEY_PREFIX + url)
+            await client.close()
+        except Exception as e:
+            logger.warning(f"Failed to read HTTP validators for {url}: {e}")
+            return {}
+
+        cached = {k.decode(): v.decode() for k, v in cached.items()}
+        headers = {}
+        if cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
+        return headers
+
+    @staticmethod
+    def validators(response: httpx.Response) -> Dict[str, str]:
+        """Validators of a successful response, empty if the provider sent none."""
+        validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        return {k: v for k, v in validators.items() if v}
+
+    @staticmethod
+    def page(
+        jobs: Sequence[Dict[str, Any]],
+        url: str,
+        params: Optional[Dict[str, str]],
+        response: httpx.Response,
+    ) -> CrawledPage:
+        """Wraps the postings of response with its validators."""
+        validators = ConditionalRequestCache.validators(response)
+        if not validators:
+            return CrawledPage(jobs)
+        key = ConditionalRequestCache.cache_key(url, params)
+        return CrawledPage(jobs, {key: validators})
+
+    @staticmethod
+    async def remember(url: str, validators: Dict[str, str]) -> None:
+        """Stores the validators of url for conditional requests of later crawls."""
+        if not validators:
+            return
+        key = ConditionalRequestCache.KEY_PREFIX + url
+        try:
+            client = RedisService.get_client()
+            await client.delete(key)
+            await client.hset(key, mapping=validators)
+            await client.expire(key, ConditionalRequestCache.TTL_SECONDS)
+            await client.close()
+        except Exception as e:
+            logger.warning(f"Failed to store HTTP validators for {url}: {e}")
+
+    @staticmethod
+    async def get(
+        client: httpx.AsyncClient, url: str, params: Optional[Dict[str, str]] = None
+    ) -> Optional[httpx.Response]:
+        """
+        Conditional GET; returns None when the provider reports the resource
+        as not modified since the cached validators were stored. New
+        validators are not stored here: they travel with the CrawledPage
+        (see page) until its postings are committed.
+        """
+        cache_key = ConditionalRequestCache.cache_key(url, params)
+        headers = await ConditionalRequestCache.request_headers(cache_key)
+        resp = await client.get(url, params=params, headers=headers)
+        if resp.status_code == 304:
+            logger.info(f"{cache_key} not modified since last crawl. Skipping.")
+            return None
+        resp.raise_for_status()
+        return resp
 
 
 class GreenhouseCrawlerClient:
     """Client for crawling public Greenhouse job boards."""
 
     @staticmethod
-    async def fetch_board_jobs(company_board_id: str) -> List[Dict[str, Any]]:
+    async def fetch_board_jobs(
+        company_board_id: str, client: Optional[httpx.AsyncClient] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetches a Greenhouse board; returns no postings when the board is
+        unchanged since the last crawl.
+        """
+        if client is None:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                return await GreenhouseCrawlerClient.fetch_board_jobs(
+                    company_board_id, client
+                )
+
         url = f"https://boards-api.greenhouse.io/v1/boards/{company_board_id}/jobs"
         params = {"content": "true"}
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.get(url, params=params)
-            resp.raise_for_status()
-            data = resp.json()
+        resp = await ConditionalRequestCache.get(client, url, params)
+        if resp is None:
+            return NotModifiedPage()
+        data = resp.json()
 
-            results = data.get("jobs", [])
-            unified = []
-            for job in results:
-                ext_id = job.get("id")
-                if not ext_id:
-                    continue
+        results = data.get("jobs", [])
+        unified = []
+        for job in results:
+            ext_id = job.get("id")
+            if not ext_id:
+                continue
 
-                loc_data = job.get("location", {})
-                loc_raw = loc_data.get("name") or "Remote"
+            loc_data = job.get("location", {})
+            loc_raw = loc_data.get("name") or "Remote"
 
-                desc_html = job.get("content") or ""
-                desc_clean = re.sub(r"<[^>]*>", "", desc_html).strip()
+            desc_html = job.get("content") or ""
+            desc_clean = re.sub(r"<[^>]*>", "", desc_html).strip()
 
-                unified.append(
-                    {
-                        "external_id": f"greenhouse_{ext_id}",
-                        "title": job.get("title") or "Unknown Title",
-                        "company_name": company_board_id.title(),
-                        "description": desc_clean,
-                        "location_raw": loc_raw,
-                        "url": job.get("absolute_url") or "",
-                        "salary_raw": None,
-                        "raw_payload": job,
-                    }
-                )
-            return unified
+            unified.append(
+                {
+                    "external_id": f"greenhouse_{ext_id}",
+                    "title": job.get("title") or "Unknown Title",
+                    "company_name": company_board_id.title(),
+                    "description": desc_clean,
+                    "location_raw": loc_raw,
+                    "url": job.get("absolute_url") or "",
+                    "salary_raw": None,
+                    "raw_payload": job,
+                }
+            )
+        return ConditionalRequestCache.page(unified, url, params, resp)
 
 
 class LeverCrawlerClient:
     """Client for crawling public Lever job boards."""
 
+    PAGE_SIZE = 100
+
     @staticmethod
-    async def fetch_board_jobs(company_board_id: str) -> List[Dict[str, Any]]:
+    async def fetch_board_jobs(
+        company_board_id: str,
+        page: Optional[int] = None,
+        client: Optional[httpx.AsyncClient] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetches a Lever board. Without page, the whole board is returned;
+        with page, only that PAGE_SIZE slice of postings. Returns no postings
+        when the board (page) is unchanged since the last crawl.
+        """
+        if client is None:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                return await LeverCrawlerClient.fetch_board_jobs(
+                    company_board_id, page, client
+                )
+
         url = f"https://api.lever.co/v0/postings/{company_board_id}"
+        params = {}
+        if page is not None:
+            params = {
+                "mode": "json",
+                "skip": str((page - 1) * LeverCrawlerClient.PAGE_SIZE),
+                "limit": str(LeverCrawlerClient.PAGE_SIZE),
+            }
+
+        resp = await ConditionalRequestCache.get(client, url, params)
+        if resp is None:
+            return NotModifiedPage()
+        results = resp.json()
+
+        unified = []
+        for job in results:
+            ext_id = job.get("id")
+            if not ext_id:
+                continue
+
+            categories = job.get("categories", {})
+            loc_raw = categories.get("location") or "Remote"
+
+            desc_clean = job.get("descriptionPlain") or ""
+            if not desc_clean:
+                desc_html = job.get("description") or ""
+                desc_clean = re.sub(r"<[^>]*>", "", desc_html).strip()
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            resp = await client.get(url)
-            resp.raise_for_status()
-            results = resp.json()
+            unified.append(
+                {
+                    "external_id": f"lever_{ext_id}",
+                    "title": job.get("text") or "Unknown Title",
+                    "company_name": company_board_id.title(),
+                    "description": desc_clean,
+                    "location_raw": loc_raw,
+                    "url": job.get("hostedUrl") or "",
+                    "salary_raw": None,
+                    "raw_payload": job,
+                }
+            )
+        return ConditionalRequestCache.page(unified, url, params, resp)
 
-            unified = []
-            for job in results:
-                ext_id = job.get("id")
-                if not ext_id:
-                    continue
 
-                categories = job.get("categories", {})
-                loc_raw = categories.get("location") or "Remote"
+class JobFetchOrchestrator:
+    """
+    Fetches postings for one or more job sources concurrently.
 
-                desc_clean = job.get("descriptionPlain") or ""
-                if not desc_clean:
-                    desc_html = job.get("description") or ""
-                    desc_clean = re.sub(r"<[^>]*>", "", desc_html).strip()
+    Every provider gets one pooled httpx client and at most max_in_flight
+    concurrent page requests. Search APIs fan out over every query/location
+    pair and board crawlers over every board ID; pages are requested until a
+    target runs dry, max_pages is reached, or enough postings were collected
+    to satisfy the limit.
+    """
 
-                unified.append(
-                    {
-                        "external_id": f"lever_{ext_id}",
-                        "title": job.get("text") or "Unknown Title",
-                        "company_name": company_board_id.title(),
-                        "description": desc_clean,
-                        "location_raw": loc_raw,
-                        "url": job.get("hostedUrl") or "",
-                        "salary_raw": None,
-                        "raw_payload": job,
-                    }
-                )
-            return unified
+    PAGED_SOURCES = ("jsearch", "adzuna", "lever")
+    BOARD_SOURCES = ("greenhouse", "lever")
+
+    def __init__(
+        self,
+        max_in_flight: Optional[int] = None,
+        max_pages: Optional[int] = None,
+        timeout: float = 30.0,
+    ):
+        self.max_in_flight = max_in_flight or settings.ingestion_max_in_flight
+        self.max_pages = max_pages or settings.ingestion_max_pages
+        self.timeout = timeout
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    async def __aenter__(self) -> "JobFetchOrchestrator":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+    def client_for(self, source_key: str) -> httpx.AsyncClient:
+        """Returns the pooled client of a provider, creating it on first use."""
+        client = self._clients.get(source_key)
+        if client is None:
+            client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_in_flight,
+                    max_keepalive_connections=self.max_in_flight,
+                ),
+            )
+            self._clients[source_key] = client
+        return client
+
+    async def fetch_page(
+        self, source_key: str, target: Tuple[str, str], page: int
+    ) -> List[Dict[str, Any]]:
+        """Fetches one page of a (query, location) or (board_id, "") target."""
+        query, location = target
+        client = self.client_for(source_key)
+        if source_key == "jsearch":
+            return await JSearchIngestionClient.fetch_jobs(
+                query, location, page, client
+            )
+        if source_key == "adzuna":
+            return await AdzunaIngestionClient.fetch_jobs(
+                query, location, page, client
+            )
+        if source_key == "greenhouse":
+            return await GreenhouseCrawlerClient.fetch_board_jobs(query, client)
+        if source_key == "lever":
+            return await LeverCrawlerClient.fetch_board_jobs(query, page, client)
+        raise ValueError(f"Unknown source key: {source_key}")
+
+    async def iter_pages(
+        self,
+        source_key: str,
+        queries: Sequence[str],
+        locations: Sequence[str] = ("",),
+        limit: int = 100,
+    ) -> AsyncIterator[CrawledPage]:
+        """
+        Streams pages of not yet seen postings of one source as they arrive,
+        up to limit postings in total. Queries are board IDs for board
+        crawlers, which ignore locations. At most max_in_flight fetched pages
+        are buffered, so slow consumers pause fetching. Pages cut short by
+        deduplication or by the limit carry no HTTP validators.
+        A fetch error is only raised when no target returned any postings.
+        """
+        source_key = source_key.lower().strip()
+        if source_key not in self.PAGED_SOURCES + self.BOARD_SOURCES:
+            raise ValueError(f"Unknown source key: {source_key}")
+
+        if source_key in self.BOARD_SOURCES:
+            targets = [(board_id, "") for board_id in dict.fromkeys(queries)]
+        else:
+            targets = [
+                (query, location)
+                for query in dict.fromkeys(queries)
+                for location in dict.fromkeys(locations)
+            ]
+        if not targets or limit <= 0:
+            return
+
+        max_pages = self.max_pages if source_key in self.PAGED_SOURCES else 1
+        next_page = [1] * len(targets)
+        exhausted = [False] * len(targets)
+        seen: set[str] = set()
+        errors: List[Exception] = []
+        pages: asyncio.Queue[Optional[CrawledPage]] = asyncio.Queue(
+            maxsize=self.max_in_flight
+        )
+        collected = 0
+        cursor = 0
+
+        def claim() -> Optional[Tuple[int, int]]:
+            # Round-robin over targets so every target gets its first pages early
+            nonlocal cursor
+            for _ in range(len(targets)):
+                idx = cursor % len(targets)
+                cursor += 1
+                if not exhausted[idx] and next_page[idx] <= max_pages:
+                    page = next_page[idx]
+                    next_page[idx] += 1
+                    return idx, page
+            return None
+
+        async def worker() -> None:
+            nonlocal collected
+            while collected < limit:
+                item = claim()
+                if item is None:
+                    return
+                idx, page = item
+                try:
+                    jobs = await self.fetch_page(source_key, targets[idx], page)
+                except Exception as ex:
+                    logger.warning(
+                        f"Fetching {source_key} page {page} for {targets[idx]} failed: {ex}"
+                    )
+                    errors.append(ex)
+                    exhausted[idx] = True
+                    continue
+                if isinstance(jobs, NotModifiedPage):
+                    continue
+                if not jobs:
+                    exhausted[idx] = True
+                    continue
+                fresh = [job for job in jobs if job["external_id"] not in seen]
+                seen.update(job["external_id"] for job in fresh)
+                collected += len(fresh)
+                if fresh:
+                    # Validators only cover the page if all of it is passed on
+                    validators = None
+                    if isinstance(jobs, CrawledPage) and len(fresh) == len(jobs):
+                        validators = jobs.validators
+                    await pages.put(CrawledPage(fresh, validators))
+
+        async def run_workers() -> None:
+            workers = min(self.max_in_flight, len(targets) * max_pages)
+            await asyncio.gather(*(worker() for _ in range(workers)))
+            await pages.put(None)
+
+        runner = asyncio.create_task(run_workers())
+        yielded = 0
+        try:
+            while yielded < limit:
+                page = await pages.get()
+                if page is None:
+                    break
+                if len(page) > limit - yielded:
+                    page = CrawledPage(page[: limit - yielded])
+                yielded += len(page)
+                yield page
+            if errors and not yielded:
+                raise errors[0]
+        finally:
+            runner.cancel()
+            await asyncio.gather(runner, return_exceptions=True)
+
+    async def fetch(
+        self,
+        source_key: str,
+        queries: Sequence[str],
+        locations: Sequence[str] = ("",),
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetches up to limit unique postings of one source, see iter_pages.
+        """
+        jobs: List[Dict[str, Any]] = []
+        async with aclosing(
+            self.iter_pages(source_key, queries, locations, limit)
+        ) as pages:
+            async for page in pages:
+                jobs.extend(page)
+        return jobs
+
+    async def fetch_sources(
+        self,
+        requests: Dict[str, Tuple[Sequence[str], Sequence[str]]],
+        limit: int = 100,
+    ) -> Dict[str, List[Dict[str, Any]] | Exception]:
+        """
+        Fetches several sources at once. requests maps a source key to its
+        (queries, locations); each source is limited independently.
+        Returns per source either its postings or the raised exception.
+        """
+        source_keys = list(requests)
+        results = await asyncio.gather(
+            *(
+                self.fetch(key, requests[key][0], requests[key][1], limit)
+                for key in source_keys
+            ),
+            return_exceptions=True,
+        )
+        return dict(zip(source_keys, results))
 
 
 class JobIngestionService:
@@ -296,20 +705,284 @@ class JobIngestionService:
             return f"Junior {role}"
         return role
 
+    @staticmethod
+    def content_hash(raw_job: Dict[str, Any]) -> str:
+        """
+        SHA-256 over the posting content that feeds downstream stages:
+        title, description, location and salary.
+        """
+        payload = json.dumps(
+            [raw_job.get(field) for field in CONTENT_FIELDS],
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def staged_content_hash(staged: RawJobPosting) -> str:
+        """Content hash of a staged raw posting, computed for rows staged before hashing."""
+        return staged.content_hash or JobIngestionService.content_hash(
+            {field: getattr(staged, field) for field in CONTENT_FIELDS}
+        )
+
+    @staticmethod
+    def changed_fields(staged: RawJobPosting, raw_job: Dict[str, Any]) -> List[str]:
+        """Content fields of raw_job that differ from the staged raw posting."""
+        return [
+            field
+            for field in CONTENT_FIELDS
+            if getattr(staged, field) != raw_job.get(field)
+        ]
+
+    @staticmethod
+    def _restage_values(
+        raw_id: str, run_id: str, raw_job: Dict[str, Any], content_hash: str
+    ) -> Dict[str, Any]:
+        """Bulk UPDATE parameters refreshing a staged raw posting with new content."""
+        return {
+            "id": raw_id,
+            "ingestion_run_id": run_id,
+            "title": raw_job["title"],
+            "company_name": raw_job["company_name"],
+            "description": raw_job["description"],
+            "location_raw": raw_job["location_raw"],
+            "url": raw_job["url"],
+            "salary_raw": raw_job["salary_raw"],
+            "raw_payload": raw_job["raw_payload"],
+            "content_hash": content_hash,
+        }
+
+    @staticmethod
+    def _build_compensation(
+        job_posting_id: str, description: str, location_raw: str
+    ) -> Optional[CompensationRecord]:
+        """
+        Builds the compensation record of a posting, excluding exaggerated
+        salary ranges (max/min ratio above 3).
+        """
+        comp_rec = CompensationExtractionService.build_compensation_record(
+            job_posting_id=job_posting_id,
+            description=description,
+            location_raw=location_raw,
+        )
+        if comp_rec and comp_rec.min_salary > 0:
+            ratio = float(comp_rec.max_salary / comp_rec.min_salary)
+            if ratio > 3.0:
+                logger.warning(
+                    f"Exaggerated salary range ratio ({ratio:.2f}) for job {job_posting_id}. Excluded."
+                )
+                return None
+        return comp_rec
+
+    @staticmethod
+    async def _extract_skill_links(
+        db: AsyncSession,
+        job_posting_id: str,
+        description: str,
+        taxonomy: List[NormalizedSkill],
+        skills_by_name: Dict[str, NormalizedSkill],
+        new_skills: List[NormalizedSkill],
+        skill_links: List[JobPostingSkill],
+    ) -> List[str]:
+        """
+        Extracts skills against the preloaded taxonomy and appends unsaved
+        skill links (and skills missing from the taxonomy) to the collectors.
+        Returns the linked canonical skill names.
+        """
+        ext_skills = await SkillExtractionService.extract_skills_from_text(
+            db, description, taxonomy=taxonomy
+        )
+        skill_names = []
+        for ext_s in ext_skills:
+            skill_db = skills_by_name.get(ext_s.canonical_name)
+            if not skill_db:
+                skill_db = NormalizedSkill(
+                    id=str(uuid4()),
+                    name=ext_s.canonical_name,
+                    category=ext_s.category,
+                    aliases=[ext_s.alias_resolved_from],
+                )
+                skills_by_name[skill_db.name] = skill_db
+                taxonomy.append(skill_db)
+                new_skills.append(skill_db)
+
+            skill_links.append(
+                JobPostingSkill(
+                    id=str(uuid4()),
+                    job_posting_id=job_posting_id,
+                    skill_id=skill_db.id,
+                    raw_mention=ext_s.alias_resolved_from,
+                    extraction_method=(
+                        "SPACY_NER" if ext_s.confidence_score >= 1.0 else "LLM_FALLBACK"
+                    ),
+                    confidence_score=Decimal(str(round(ext_s.confidence_score, 3))),
+                    context_sentence=ext_s.context_sentence,
+                )
+            )
+            skill_names.append(ext_s.canonical_name)
+        return skill_names
+
+    @staticmethod
+    async def _write_skill_links(
+        db: AsyncSession,
+        new_skills: List[NormalizedSkill],
+        skill_links: List[JobPostingSkill],
+    ) -> None:
+        """
+        Inserts new taxonomy skills (reusing rows created concurrently under
+        the same name) and then the skill links.
+        """
+        if new_skills:
+            stmt = pg_insert(NormalizedSkill).values(
+                [JobIngestionService._insert_row(skill) for skill in new_skills]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[NormalizedSkill.name],
+                set_={"name": stmt.excluded.name},
+            ).returning(NormalizedSkill.name, NormalizedSkill.id)
+            res = await db.execute(stmt)
+            stored_ids = {name: skill_id for name, skill_id in res.all()}
+            remapped = {}
+            for skill in new_skills:
+                stored_id = stored_ids.get(skill.name, skill.id)
+                if stored_id != skill.id:
+                    remapped[skill.id] = stored_id
+                    skill.id = stored_id
+            for link in skill_links:
+                link.skill_id = remapped.get(link.skill_id, link.skill_id)
+            new_skills.clear()
+        if skill_links:
+            await db.execute(
+                pg_insert(JobPostingSkill),
+                [JobIngestionService._insert_row(link) for link in skill_links],
+            )
+            skill_links.clear()
+
+    @staticmethod
+    async def refresh_postings(
+        db: AsyncSession,
+        refreshes: Sequence[Tuple[str, Dict[str, Any], Sequence[str]]],
+        taxonomy: Optional[List[NormalizedSkill]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Re-runs only the stages whose inputs changed for already ingested
+        postings, given as (job_posting_id, raw_job, changed_fields):
+        title normalization, location normalization, compensation (description
+        or location changed), skill links (description changed) and the
+        stored dedup features and LSH index entry (title, description or
+        location changed).
+        Deduplication decisions are kept as they are.
+        Returns the market.job_updated event payloads, in input order.
+        """
+        if not refreshes:
+            return []
+        if taxonomy is None:
+            tax_res = await db.execute(select(NormalizedSkill))
+            taxonomy = list(tax_res.scalars().all())
+        skills_by_name = {skill.name: skill for skill in taxonomy}
+
+        updates: List[Dict[str, Any]] = []
+        compensation_rows: List[Dict[str, Any]] = []
+        comp_rebuild_ids: List[str] = []
+        skill_rebuild_ids: List[str] = []
+        reindex_ids: List[str] = []
+        new_skills: List[NormalizedSkill] = []
+        skill_links: List[JobPostingSkill] = []
+        payloads: List[Dict[str, Any]] = []
+
+        await SkillExtractionService.prefetch_fallback(
+            [raw_job["description"] for _, raw_job, changed in refreshes if "description" in changed],
+            taxonomy,
+        )
+
+        for posting_id, raw_job, changed in refreshes:
+            values: Dict[str, Any] = {
+                "id": posting_id,
+                "content_hash": JobIngestionService.content_hash(raw_job),
+                "updated_at": datetime.utcnow(),
+            }
+            if "title" in changed:
+                values["title"] = JobIngestionService.normalize_title(raw_job["title"])
+                values["raw_title"] = raw_job["title"]
+            if "location_raw" in changed:
+                values["location"] = LocationNormalizationService.normalize_location(
+                    raw_job["location_raw"]
+                )["location"]
+            if "description" in changed:
+                values["description"] = raw_job["description"]
+            if "description" in changed or "location_raw" in changed:
+                comp_rec = JobIngestionService._build_compensation(
+                    posting_id, raw_job["description"], raw_job["location_raw"]
+                )
+                comp_rebuild_ids.append(posting_id)
+                values["compensation_min"] = comp_rec.min_salary if comp_rec else None
+                values["compensation_max"] = comp_rec.max_salary if comp_rec else None
+                values["currency"] = comp_rec.currency if comp_rec else "USD"
+                if comp_rec:
+                    compensation_rows.append(JobIngestionService._insert_row(comp_rec))
+
+            payload: Dict[str, Any] = {
+                "job_posting_id": posting_id,
+                "changed_fields": list(changed),
+            }
+            if {"title", "description", "location_raw"} & set(changed):
+                reindex_ids.append(posting_id)
+            if "description" in changed:
+                skill_rebuild_ids.append(posting_id)
+                payload["skills"] = await JobIngestionService._extract_skill_links(
+                    db,
+                    posting_id,
+                    raw_job["description"],
+                    taxonomy,
+                    skills_by_name,
+                    new_skills,
+                    skill_links,
+                )
+            updates.append(values)
+            payloads.append(payload)
+
+        if comp_rebuild_ids:
+            await db.execute(
+                delete(CompensationRecord).where(
+                    CompensationRecord.job_posting_id.in_(comp_rebuild_ids)
+                )
+            )
+        if skill_rebuild_ids:
+            await db.execute(
+                delete(JobPostingSkill).where(
+                    JobPostingSkill.job_posting_id.in_(skill_rebuild_ids)
+                )
+            )
+        await db.execute(update(JobPosting), updates)
+        if compensation_rows:
+            await db.execute(pg_insert(CompensationRecord), compensation_rows)
+        await JobIngestionService._write_skill_links(db, new_skills, skill_links)
+        await JobDeduplicationService.reindex_postings(db, reindex_ids)
+
+        return payloads
+
     @staticmethod
     async def process_job_entry(
         db: AsyncSession,
         raw_job: Dict[str, Any],
         run_id: str,
         source_key: str,
+        publish: Optional[EventPublisher] = None,
     ) -> bool:
         """
         Processes a single job dictionary: saves RawJobPosting, maps Company,
         normalizes Title & Location, extracts salary/compensation, evaluates duplicate states,
         resolves/links skills taxonomy, and publishes events.
-        Returns True if newly inserted, False if duplicate or skipped.
+        Already ingested postings are skipped when their content hash is
+        unchanged, and refreshed stage by stage when it changed.
+        Events go to publish (EventBus.publish by default), so a caller can
+        hold them until its transaction commits.
+        Returns True if newly inserted, False if duplicate, refreshed or skipped.
         """
+        publish = publish or EventBus.publish
         source_key_clean = source_key.lower().strip()
+        content_hash = JobIngestionService.content_hash(raw_job)
 
         # Check if already staged in RawJobPosting
         chk_stmt = select(RawJobPosting).where(
@@ -319,7 +992,21 @@ class JobIngestionService:
         chk_res = await db.execute(chk_stmt)
         existing_raw = chk_res.scalar_one_or_none()
 
-        if not existing_raw:
+        staged_hash = None
+        changed = list(CONTENT_FIELDS)
+        if existing_raw:
+            staged_hash = JobIngestionService.staged_content_hash(existing_raw)
+            changed = JobIngestionService.changed_fields(existing_raw, raw_job)
+            if staged_hash != content_hash:
+                await db.execute(
+                    update(RawJobPosting),
+                    [
+                        JobIngestionService._restage_values(
+                            existing_raw.id, run_id, raw_job, content_hash
+                        )
+                    ],
+                )
+        else:
             raw_post = RawJobPosting(
                 id=str(uuid4()),
                 ingestion_run_id=run_id,
@@ -332,11 +1019,12 @@ class JobIngestionService:
                 url=raw_job["url"],
                 salary_raw=raw_job["salary_raw"],
                 raw_payload=raw_job["raw_payload"],
+                content_hash=content_hash,
             )
             db.add(raw_post)
             await db.flush()
 
-            await EventBus.publish(
+            await publish(
                 "market.raw_job.ingested",
                 {
                     "raw_job_id": raw_post.id,
@@ -355,6 +1043,11 @@ class JobIngestionService:
         existing_core = core_res.scalar_one_or_none()
 
         if existing_core:
+            if (existing_core.content_hash or staged_hash) != content_hash:
+                payloads = await JobIngestionService.refresh_postings(
+                    db, [(existing_core.id, raw_job, changed)]
+                )
+                await publish("market.job_updated", payloads[0])
             return False
 
         # Get/Create Company
@@ -392,6 +1085,7 @@ class JobIngestionService:
             post_date=datetime.utcnow().date(),
             is_active=True,
             is_primary=True,
+            content_hash=content_hash,
         )
         db.add(job_posting)
         await db.flush()
@@ -471,7 +1165,7 @@ class JobIngestionService:
         await db.flush()
 
         # Publish job ingested event
-        await EventBus.publish(
+        await publish(
             "market.job_ingested",
             {
                 "job_posting_id": job_posting.id,
@@ -483,17 +1177,437 @@ class JobIngestionService:
 
         return True
 
+    @staticmethod
+    def _insert_row(obj: Any) -> Dict[str, Any]:
+        """
+        Column values of an unsaved ORM object for a multi-row INSERT, with
+        Python-side column defaults applied.
+        """
+        row: Dict[str, Any] = {}
+        for column in obj.__table__.columns:
+            value = getattr(obj, column.key, None)
+            if value is None and column.default is not None:
+                default = column.default
+                value = default.arg(None) if default.is_callable else default.arg
+            row[column.key] = value
+        return row
+
+    @staticmethod
+    async def _resolve_companies(
+        db: AsyncSession, names: Sequence[str]
+    ) -> Dict[str, str]:
+        """
+        Maps cleaned company names to company ids, creating missing companies
+        with a single INSERT ... ON CONFLICT statement.
+        """
+        if not names:
+            return {}
+
+        res = await db.execute(
+            select(Company.name, Company.id).where(Company.name.in_(set(names)))
+        )
+        company_ids = {name: company_id for name, company_id in res.all()}
+
+        missing = sorted(set(names) - company_ids.keys())
+        if missing:
+            stmt = pg_insert(Company).values(
+                [
+                    JobIngestionService._insert_row(Company(id=str(uuid4()), name=name))
+                    for name in missing
+                ]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Company.name], set_={"name": stmt.excluded.name}
+            ).returning(Company.name, Company.id)
+            res = await db.execute(stmt)
+            company_ids.update({name: company_id for name, company_id in res.all()})
+
+        return company_ids
+
+    @staticmethod
+    async def process_job_batch(
+        db: AsyncSession,
+        raw_jobs: Sequence[Dict[str, Any]],
+        run_id: str,
+        source_key: str,
+        publish: Optional[EventPublisher] = None,
+    ) -> List[bool]:
+        """
+        Set-based counterpart of process_job_entry for a batch of unified job
+        dictionaries. Staged raw postings, core keys and content hashes,
+        companies, candidate primaries (through the LSH index for large
+        companies) and the skills taxonomy are preloaded up front, and dedup
+        scores each company's postings with matrix operations, so every item
+        is classified as new, changed or unchanged up front. Rows are written
+        with multi-row statements, and the same events are handed to publish
+        (EventBus.publish by default) once the batch has been written.
+        Returns, per input job, True if newly inserted, False if duplicate,
+        refreshed or skipped.
+        """
+        publish = publish or EventBus.publish
+        source_key_clean = source_key.lower().strip()
+        if not raw_jobs:
+            return []
+
+        external_ids = {raw_job["external_id"] for raw_job in raw_jobs}
+
+        raw_res = await db.execute(
+            select(RawJobPosting).where(
+                RawJobPosting.source_key == source_key_clean,
+                RawJobPosting.external_id.in_(external_ids),
+            )
+        )
+        staged = {raw.external_id: raw for raw in raw_res.scalars().all()}
+
+        core_res = await db.execute(
+            select(JobPosting.source_id, JobPosting.id, JobPosting.content_hash).where(
+                JobPosting.source_id.in_(external_ids)
+            )
+        )
+        core = {
+            source_id: (posting_id, posting_hash)
+            for source_id, posting_id, posting_hash in core_res.all()
+        }
+
+        results = [False] * len(raw_jobs)
+        events: List[List[Tuple[str, Dict[str, Any]]]] = [[] for _ in raw_jobs]
+
+        # Classify every posting as new, changed or unchanged
+        raw_rows: List[Dict[str, Any]] = []
+        restage_rows: List[Dict[str, Any]] = []
+        refreshes: List[Tuple[str, Dict[str, Any], Sequence[str]]] = []
+        refresh_idx: List[int] = []
+        pending: List[int] = []
+        seen: set[str] = set()
+        for idx, raw_job in enumerate(raw_jobs):
+            ext_id = raw_job["external_id"]
+            if ext_id in seen:
+                continue
+            seen.add(ext_id)
+            content_hash = JobIngestionService.content_hash(raw_job)
+
+            staged_raw = staged.get(ext_id)
+            staged_hash = None
+            changed = list(CONTENT_FIELDS)
+            if staged_raw:
+                staged_hash = JobIngestionService.staged_content_hash(staged_raw)
+                changed = JobIngestionService.changed_fields(staged_raw, raw_job)
+                if staged_hash != content_hash:
+                    restage_rows.append(
+                        JobIngestionService._restage_values(
+                            staged_raw.id, run_id, raw_job, content_hash
+                        )
+                    )
+            else:
+                raw_post = RawJobPosting(
+                    id=str(uuid4()),
+                    ingestion_run_id=run_id,
+                    source_key=source_key_clean,
+                    external_id=ext_id,
+                    title=raw_job["title"],
+                    company_name=raw_job["company_name"],
+                    description=raw_job["description"],
+                    location_raw=raw_job["location_raw"],
+                    url=raw_job["url"],
+                    salary_raw=raw_job["salary_raw"],
+                    raw_payload=raw_job["raw_payload"],
+                    content_hash=content_hash,
+                )
+                raw_rows.append(JobIngestionService._insert_row(raw_post))
+                events[idx].append(
+                    (
+                        "market.raw_job.ingested",
+                        {
+                            "raw_job_id": raw_post.id,
+                            "source_key": source_key_clean,
+                            "external_id": ext_id,
+                            "company_name": raw_job["company_name"],
+                            "title": raw_job["title"],
+                        },
+                    )
+                )
+
+            if ext_id in core:
+                posting_id, posting_hash = core[ext_id]
+                if (posting_hash or staged_hash) != content_hash:
+                    refreshes.append((posting_id, raw_job, changed))
+                    refresh_idx.append(idx)
+                continue
+            pending.append(idx)
+
+        company_names = {
+            idx: JobDeduplicationService.clean_company(
+                raw_jobs[idx]["company_name"]
+            ).title()
+            for idx in pending
+        }
+        company_ids = await JobIngestionService._resolve_companies(
+            db, list(company_names.values())
+        )
+
+        taxonomy: List[NormalizedSkill] = []
+        if pending or refreshes:
+            tax_res = await db.execute(select(NormalizedSkill))
+            taxonomy = list(tax_res.scalars().all())
+        skills_by_name = {skill.name: skill for skill in taxonomy}
+
+        posting_rows: List[Dict[str, Any]] = []
+        compensation_rows: List[Dict[str, Any]] = []
+        duplicate_rows: List[Dict[str, Any]] = []
+        audit_rows: List[Dict[str, Any]] = []
+        new_skills: List[NormalizedSkill] = []
+        skill_links: List[JobPostingSkill] = []
+
+        postings: Dict[int, JobPosting] = {}
+        buckets: Dict[int, List[int]] = {}
+        by_company: Dict[str, List[int]] = defaultdict(list)
+        for idx in pending:
+            raw_job = raw_jobs[idx]
+            company_id = company_ids[company_names[idx]]
+
+            loc_normalized = LocationNormalizationService.normalize_location(
+                raw_job["location_raw"]
+            )
+            job_posting = JobPosting(
+                id=str(uuid4()),
+                company_id=company_id,
+                title=JobIngestionService.normalize_title(raw_job["title"]),
+                raw_title=raw_job["title"],
+                location=loc_normalized["location"],
+                description=raw_job["description"],
+                url=raw_job["url"],
+                source=source_key_clean.upper(),
+                source_id=raw_job["external_id"],
+                post_date=datetime.utcnow().date(),
+                is_active=True,
+                is_primary=True,
+                content_hash=JobIngestionService.content_hash(raw_job),
+            )
+            JobDeduplicationService.apply_features(job_posting)
+            postings[idx] = job_posting
+            buckets[idx] = JobDeduplicationService.lsh_buckets(job_posting)
+            by_company[company_id].append(idx)
+
+            comp_rec = JobIngestionService._build_compensation(
+                job_posting.id, job_posting.description, raw_job["location_raw"]
+            )
+            if comp_rec:
+                job_posting.compensation_min = comp_rec.min_salary
+                job_posting.compensation_max = comp_rec.max_salary
+                job_posting.currency = comp_rec.currency
+                compensation_rows.append(JobIngestionService._insert_row(comp_rec))
+
+        # Deduplicate against stored primaries and earlier postings of this
+        # batch, scoring each company's postings with matrix operations
+        company_candidates = await MinHashLSHService.load_candidates(
+            db, {c: [buckets[idx] for idx in idxs] for c, idxs in by_company.items()}
+        )
+        exact_primaries = await JobDeduplicationService.load_exact_primaries(
+            db,
+            {
+                c: [postings[idx].dedupe_fingerprint for idx in idxs]
+                for c, idxs in by_company.items()
+            },
+        )
+        matches = {}
+        for company_id, idxs in by_company.items():
+            company_matches = JobDeduplicationService.match_with_candidates(
+                [postings[idx] for idx in idxs],
+                [buckets[idx] for idx in idxs],
+                company_candidates[company_id],
+                exact_primaries[company_id],
+            )
+            matches.update(zip(idxs, company_matches))
+
+        # Postings kept as primaries have their skills extracted; start their
+        # LLM fallbacks together so they share batched prompts
+        await SkillExtractionService.prefetch_fallback(
+            [
+                postings[idx].description
+                for idx in pending
+                if not (matches[idx][0] and matches[idx][1] > 0.85)
+            ],
+            taxonomy,
+        )
+
+        for idx in pending:
+            job_posting = postings[idx]
+            company_name = company_names[idx]
+            best_match, best_score, sims = matches[idx]
+            if best_match and best_score >= 0.75:
+                dup, audit = JobDeduplicationService.build_dedupe_records(
+                    job_posting, best_match, best_score, sims
+                )
+                duplicate_rows.append(JobIngestionService._insert_row(dup))
+                if audit:
+                    audit_rows.append(JobIngestionService._insert_row(audit))
+                    posting_rows.append(JobIngestionService._insert_row(job_posting))
+                    events[idx].append(
+                        (
+                            "market.jobs.merged",
+                            {
+                                "primary_job_id": best_match.id,
+                                "merged_job_id": job_posting.id,
+                                "source_merged": job_posting.source,
+                                "primary_source": best_match.source,
+                            },
+                        )
+                    )
+                    logger.info(
+                        f"Auto-merged job {job_posting.id} into {best_match.id} (Score: {best_score:.3f})"
+                    )
+                    continue
+                logger.info(
+                    f"Flagged potential duplicate job {job_posting.id} matching {best_match.id} "
+                    f"(Score: {best_score:.3f}). Queued for review."
+                )
+
+            posting_rows.append(JobIngestionService._insert_row(job_posting))
+
+            # Extract and link required skills
+            skill_names = await JobIngestionService._extract_skill_links(
+                db,
+                job_posting.id,
+                job_posting.description,
+                taxonomy,
+                skills_by_name,
+                new_skills,
+                skill_links,
+            )
+
+            events[idx].append(
+                (
+                    "market.job_ingested",
+                    {
+                        "job_posting_id": job_posting.id,
+                        "company_name": company_name,
+                        "normalized_title": job_posting.title,
+                        "skills": skill_names,
+                    },
+                )
+            )
+            results[idx] = True
+
+        # Write the batch, parents before children
+        if raw_rows:
+            await db.execute(
+                pg_insert(RawJobPosting).on_conflict_do_nothing(
+                    constraint="uq_raw_job_postings_source_external"
+                ),
+                raw_rows,
+            )
+        if restage_rows:
+            await db.execute(update(RawJobPosting), restage_rows)
+        if posting_rows:
+            inserted_res = await db.execute(
+                pg_insert(JobPosting)
+                .on_conflict_do_nothing(index_elements=[JobPosting.source_id])
+                .returning(JobPosting.id),
+                posting_rows,
+            )
+            inserted_ids = set(inserted_res.scalars().all())
+            await MinHashLSHService.index_postings(
+                db,
+                [
+                    (postings[idx].id, postings[idx].company_id, buckets[idx])
+                    for idx in pending
+                    if postings[idx].id in inserted_ids
+                ],
+            )
+        if compensation_rows:
+            await db.execute(pg_insert(CompensationRecord), compensation_rows)
+        if duplicate_rows:
+            await db.execute(pg_insert(JobDuplicate), duplicate_rows)
+        if audit_rows:
+            await db.execute(pg_insert(DedupeAuditLog), audit_rows)
+        await JobIngestionService._write_skill_links(db, new_skills, skill_links)
+
+        # Changed postings re-run only the stages whose inputs changed
+        refreshed = await JobIngestionService.refresh_postings(
+            db, refreshes, taxonomy
+        )
+        for idx, payload in zip(refresh_idx, refreshed):
+            events[idx].append(("market.job_updated", payload))
+
+        for posting_events in events:
+            for event_type, data in posting_events:
+                await publish(event_type, data)
+
+        return results
+
+    @staticmethod
+    async def _process_entries(
+        db: AsyncSession,
+        raw_jobs: Sequence[Dict[str, Any]],
+        run_id: str,
+        source_key: str,
+        bulk: bool = False,
+        publish: Optional[EventPublisher] = None,
+    ) -> List[bool | Exception]:
+        """
+        Runs unified job dictionaries through process_job_entry, or through
+        process_job_batch in chunks of BULK_BATCH_SIZE when bulk is set.
+        A failing bulk chunk is rolled back to its savepoint and retried row by row.
+        Events of both paths go to publish (EventBus.publish by default).
+        Returns, per input job, the processing result or the raised exception.
+        """
+        outcomes: List[bool | Exception] = []
+
+        async def process_rows(rows: Sequence[Dict[str, Any]]) -> None:
+            for raw_job in rows:
+                try:
+                    outcomes.append(
+                        await JobIngestionService.process_job_entry(
+                            db=db,
+                            raw_job=raw_job,
+                            run_id=run_id,
+                            source_key=source_key,
+                            publish=publish,
+                        )
+                    )
+                except Exception as ex:
+                    logger.error(
+                        f"Failed processing individual job: {ex}", exc_info=True
+                    )
+                    outcomes.append(ex)
+
+        if not bulk:
+            await process_rows(raw_jobs)
+            return outcomes
+
+        for start in range(0, len(raw_jobs), BULK_BATCH_SIZE):
+            chunk = raw_jobs[start : start + BULK_BATCH_SIZE]
+            try:
+                async with db.begin_nested():
+                    chunk_results = await JobIngestionService.process_job_batch(
+                        db=db,
+                        raw_jobs=chunk,
+                        run_id=run_id,
+                        source_key=source_key,
+                        publish=publish,
+                    )
+                outcomes.extend(chunk_results)
+            except Exception as ex:
+                logger.warning(
+                    f"Bulk ingestion of {len(chunk)} jobs failed ({ex}). Retrying row by row."
+                )
+                await process_rows(chunk)
+
+        return outcomes
+
     @staticmethod
     async def trigger_run(
         db: AsyncSession,
         source_key: str,
-        query: str,
-        location: str,
+        query: str | Sequence[str],
+        location: str | Sequence[str],
         limit: int = 100,
+        bulk: bool = False,
     ) -> str:
         """
-        Initializes an ingestion run, queries the client, stages raw postings,
-        and processes the raw postings.
+        Initializes an ingestion run and streams up to limit postings across
+        all queries (board IDs for crawlers) and locations through the
+        IngestionPipeline (set-based in batches when bulk is set).
         """
         source_key_clean = source_key.lower().strip()
         stmt = select(JobSource).where(JobSource.source_key == source_key_clean)
@@ -535,62 +1649,25 @@ class JobIngestionService:
         )
 
         try:
-            raw_postings = []
-            if source_key_clean == "jsearch":
-                raw_postings = await JSearchIngestionClient.fetch_jobs(
-                    query, location
-                )
-            elif source_key_clean == "adzuna":
-                raw_postings = await AdzunaIngestionClient.fetch_jobs(
-                    query, location
-                )
-            elif source_key_clean == "greenhouse":
-                raw_postings = await GreenhouseCrawlerClient.fetch_board_jobs(
-                    query
+            queries = [query] if isinstance(query, str) else list(query)
+            locations = [location] if isinstance(location, str) else list(location)
+            pipeline = IngestionPipeline(db, run, source_key_clean, bulk=bulk)
+            async with JobFetchOrchestrator() as orchestrator:
+                await pipeline.run(
+                    orchestrator.iter_pages(
+                        source_key_clean, queries, locations, limit=limit
+                    )
                 )
-            elif source_key_clean == "lever":
-                raw_postings = await LeverCrawlerClient.fetch_board_jobs(query)
-            else:
-                raise ValueError(f"Unknown source key: {source_key_clean}")
-
-            raw_postings = raw_postings[:limit]
-            run.items_scraped = len(raw_postings)
-            await db.flush()
-
-            inserted_count = 0
-            duplicated_count = 0
-            failed_count = 0
-            log_details = {"duplicates": [], "failures": []}
 
-            for raw_job in raw_postings:
-                try:
-                    is_new = await JobIngestionService.process_job_entry(
-                        db=db,
-                        raw_job=raw_job,
-                        run_id=run_id,
-                        source_key=source_key_clean,
-                    )
-                    if is_new:
-                        inserted_count += 1
-                    else:
-                        duplicated_count += 1
-                except Exception as ex:
-                    logger.error(
-                        f"Failed processing individual job: {ex}",
-                        exc_info=True,
-                    )
-                    failed_count += 1
-                    log_details["failures"].append(
-                        {
-                            "external_id": raw_job.get("external_id"),
-                            "error": str(ex),
-                        }
-                    )
+            inserted_count = pipeline.inserted
+            duplicated_count = pipeline.duplicated
+            failed_count = pipeline.failed
+            log_details = {"duplicates": [], "failures": pipeline.failures}
 
             audit = IngestionAuditLog(
                 id=str(uuid4()),
                 source=source_key_clean.upper(),
-                job_count_attempted=len(raw_postings),
+                job_count_attempted=pipeline.scraped,
                 job_count_inserted=inserted_count,
                 job_count_duplicated=duplicated_count,
                 job_count_failed=failed_count,
@@ -600,6 +1677,7 @@ class JobIngestionService:
             db.add(audit)
 
             run.status = "COMPLETED"
+            run.items_scraped = pipeline.scraped
             run.items_inserted = inserted_count
             run.items_failed = failed_count
             run.completed_at = datetime.utcnow()
@@ -615,7 +1693,7 @@ class JobIngestionService:
                 {
                     "run_id": run_id,
                     "source_key": source_key_clean,
-                    "items_scraped": len(raw_postings),
+                    "items_scraped": pipeline.scraped,
                     "items_inserted": inserted_count,
                     "items_failed": failed_count,
                 },
@@ -658,7 +1736,10 @@ class JobIngestionService:
 
     @staticmethod
     async def ingest_postings(
-        db: AsyncSession, source: str, postings: List[Dict[str, Any]]
+        db: AsyncSession,
+        source: str,
+        postings: List[Dict[str, Any]],
+        bulk: bool = False,
     ) -> str:
         """
         Directly ingests a list of dictionary postings. Used by admin APIs.
@@ -707,6 +1788,8 @@ class JobIngestionService:
         failed_count = 0
         log_details = {"duplicates": [], "failures": []}
 
+        unified_jobs: List[Dict[str, Any]] = []
+        unified_sources: List[Any] = []
         for p_dict in postings:
             try:
                 # Format to matching unified schema
@@ -722,27 +1805,19 @@ class JobIngestionService:
                         "payment_interval": "ANNUAL",
                     }
 
-                unified = {
-                    "external_id": p_dict["source_id"],
-                    "title": p_dict["title"],
-                    "company_name": p_dict["company_name"],
-                    "description": p_dict["description"],
-                    "location_raw": p_dict["location"],
-                    "url": p_dict["url"],
-                    "salary_raw": salary_raw,
-                    "raw_payload": p_dict,
-                }
-
-                is_new = await JobIngestionService.process_job_entry(
-                    db=db,
-                    raw_job=unified,
-                    run_id=run_id,
-                    source_key=source_key_clean,
+                unified_jobs.append(
+                    {
+                        "external_id": p_dict["source_id"],
+                        "title": p_dict["title"],
+                        "company_name": p_dict["company_name"],
+                        "description": p_dict["description"],
+                        "location_raw": p_dict["location"],
+                        "url": p_dict["url"],
+                        "salary_raw": salary_raw,
+                        "raw_payload": p_dict,
+                    }
                 )
-                if is_new:
-                    inserted_count += 1
-                else:
-                    duplicated_count += 1
+                unified_sources.append(p_dict.get("source_id"))
             except Exception as ex:
                 logger.error(
                     f"Failed processing individual job: {ex}", exc_info=True
@@ -755,6 +1830,20 @@ class JobIngestionService:
                     }
                 )
 
+        outcomes = await JobIngestionService._process_entries(
+            db, unified_jobs, run_id, source_key_clean, bulk=bulk
+        )
+        for source_id, outcome in zip(unified_sources, outcomes):
+            if isinstance(outcome, Exception):
+                failed_count += 1
+                log_details["failures"].append(
+                    {"source_id": source_id, "error": str(outcome)}
+                )
+            elif outcome:
+                inserted_count += 1
+            else:
+                duplicated_count += 1
+
         audit = IngestionAuditLog(
             id=str(uuid4()),
             source=source_key_clean.upper(),
@@ -799,3 +1888,194 @@ class JobIngestionService:
         )
 
         return audit.id
+
+
+class PageProgress:
+    """Postings of a crawled page still to be committed, and whether any failed."""
+
+    def __init__(self, page: CrawledPage):
+        self.validators = page.validators
+        self.remaining = len(page)
+        self.failed = False
+
+
+# A posting on its way to the write stage, with the progress of its page
+QueuedPosting = Tuple[Dict[str, Any], Optional[PageProgress]]
+
+
+class IngestionPipeline:
+    """
+    Streaming pipeline for one ingestion run:
+    fetch -> stage raw / normalize / dedup / skill link -> publish.
+
+    The stages run as concurrent tasks joined by bounded queues, so fetching
+    overlaps with database writes and memory stays flat however large the
+    source is. Postings are written in chunks on the run's session; every
+    chunk is committed together with the live JobIngestionRun counters and
+    its events are published in pipelined batches once committed. The HTTP
+    validators of a crawled page are stored once its last posting is
+    committed, and never if any of its postings failed.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        ingestion_run: JobIngestionRun,
+        source_key: str,
+        bulk: bool = False,
+        chunk_size: int = 50,
+        queue_size: Optional[int] = None,
+    ):
+        self.db = db
+        self.ingestion_run = ingestion_run
+        self.source_key = source_key.lower().strip()
+        self.bulk = bulk
+        self.chunk_size = chunk_size
+        self.queue_size = queue_size or 2 * chunk_size
+        self.scraped = 0
+        self.inserted = 0
+        self.duplicated = 0
+        self.failed = 0
+        self.failures: List[Dict[str, Any]] = []
+
+    async def run(self, pages: AsyncIterator[List[Dict[str, Any]]]) -> None:
+        """
+        Drains pages of unified postings through the pipeline. The run row is
+        committed first so its progress is visible while the run is going.
+        """
+        await self.db.commit()
+
+        postings: asyncio.Queue[Optional[QueuedPosting]] = asyncio.Queue(
+            maxsize=self.queue_size
+        )
+        events: asyncio.Queue[Optional[Tuple[str, Dict[str, Any]]]] = asyncio.Queue(
+            maxsize=self.queue_size
+        )
+        tasks = [
+            asyncio.create_task(self._fetch_stage(pages, postings)),
+            asyncio.create_task(self._write_stage(postings, events)),
+            asyncio.create_task(self._publish_stage(events)),
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def _fetch_stage(
+        self,
+        pages: AsyncIterator[List[Dict[str, Any]]],
+        postings: asyncio.Queue[Optional[QueuedPosting]],
+    ) -> None:
+        async with aclosing(pages) as stream:
+            async for page in stream:
+                progress = None
+                if isinstance(page, CrawledPage) and page.validators:
+                    progress = PageProgress(page)
+                for raw_job in page:
+                    self.scraped += 1
+                    await postings.put((raw_job, progress))
+        await postings.put(None)
+
+    async def _write_stage(
+        self,
+        postings: asyncio.Queue[Optional[QueuedPosting]],
+        events: asyncio.Queue[Optional[Tuple[str, Dict[str, Any]]]],
+    ) -> None:
+        finished = False
+        while not finished:
+            item = await postings.get()
+            if item is None:
+                break
+
+            # Take whatever else is already queued rather than waiting on fetches
+            chunk = [item]
+            while len(chunk) < self.chunk_size:
+                try:
+                    item = postings.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is None:
+                    finished = True
+                    break
+                chunk.append(item)
+
+            await self._write_chunk(
+                [raw_job for raw_job, _ in chunk],
+                events,
+                [progress for _, progress in chunk],
+            )
+        await events.put(None)
+
+    async def _write_chunk(
+        self,
+        chunk: List[Dict[str, Any]],
+        events: asyncio.Queue[Optional[Tuple[str, Dict[str, Any]]]],
+        pages: Sequence[Optional[PageProgress]] = (),
+    ) -> None:
+        chunk_events: List[Tuple[str, Dict[str, Any]]] = []
+
+        async def buffer_event(event_type: str, data: Dict[str, Any]) -> None:
+            chunk_events.append((event_type, data))
+
+        outcomes = await JobIngestionService._process_entries(
+            self.db,
+            chunk,
+            self.ingestion_run.id,
+            self.source_key,
+            bulk=self.bulk,
+            publish=buffer_event,
+        )
+        for raw_job, outcome in zip(chunk, outcomes):
+            if isinstance(outcome, Exception):
+                self.failed += 1
+                self.failures.append(
+                    {"external_id": raw_job.get("external_id"), "error": str(outcome)}
+                )
+            elif outcome:
+                self.inserted += 1
+            else:
+                self.duplicated += 1
+
+        self.ingestion_run.items_scraped = self.scraped
+        self.ingestion_run.items_inserted = self.inserted
+        self.ingestion_run.items_failed = self.failed
+        await self.db.commit()
+
+        # Pages whose last posting was in this chunk are done with
+        for progress, outcome in zip(pages, outcomes):
+            if progress is None:
+                continue
+            progress.remaining -= 1
+            progress.failed = progress.failed or isinstance(outcome, Exception)
+            if not progress.remaining and not progress.failed:
+                for url, validators in progress.validators.items():
+                    await ConditionalRequestCache.remember(url, validators)
+
+        for event in chunk_events:
+            await events.put(event)
+
+    async def _publish_stage(
+        self, events: asyncio.Queue[Optional[Tuple[str, Dict[str, Any]]]]
+    ) -> None:
+        finished = False
+        while not finished:
+            event = await events.get()
+            if event is None:
+                break
+
+            # Publish everything already queued in one pipelined round trip
+            batch = [event]
+            while True:
+                try:
+                    event = events.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if event is None:
+                    finished = True
+                    break
+                batch.append(event)
+
+            await EventBus.publish_many(batch)
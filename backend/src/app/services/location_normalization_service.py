@@ -1,6 +1,93 @@
 from __future__ import annotations
 
-from typing import Dict, Any
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple
+
+# Distinct raw location strings memoized; postings share a small set of them
+LOCATION_CACHE_SIZE = 65536
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_WORD_CORE = re.compile(r"[A-Za-z0-9]+")
+
+REMOTE = ("Remote", "TIER_3")
+
+# Gazetteer of token phrases. Remote markers win over every city, tier 1
+# cities over tier 2, and earlier mentions over later ones of the same tier.
+REMOTE_MARKERS = {
+    ("remote",),
+    ("anywhere",),
+    ("virtual",),
+    ("wfh",),
+    ("work", "from", "home"),
+}
+CITIES: Dict[Tuple[str, ...], Tuple[str, str]] = {
+    ("san", "francisco"): ("San Francisco, CA", "TIER_1"),
+    ("bay", "area"): ("San Francisco, CA", "TIER_1"),
+    ("sf",): ("San Francisco, CA", "TIER_1"),
+    ("new", "york"): ("New York, NY", "TIER_1"),
+    ("nyc",): ("New York, NY", "TIER_1"),
+    ("manhattan",): ("New York, NY", "TIER_1"),
+    ("brooklyn",): ("New York, NY", "TIER_1"),
+    ("austin",): ("Austin, TX", "TIER_2"),
+    ("seattle",): ("Seattle, WA", "TIER_2"),
+    ("boston",): ("Boston, MA", "TIER_2"),
+    ("denver",): ("Denver, CO", "TIER_2"),
+    ("los", "angeles"): ("Los Angeles, CA", "TIER_2"),
+    ("la",): ("Los Angeles, CA", "TIER_2"),
+    ("chicago",): ("Chicago, IL", "TIER_2"),
+}
+# Abbreviations that are also state codes or words ("New Orleans, LA") only
+# name the city as the first token of the location
+LEADING_ONLY = {("sf",), ("la",)}
+MAX_PHRASE_TOKENS = 3
+
+STATE_CODES = {
+    "al", "ak", "az", "ar", "ca", "co", "ct", "de", "fl", "ga", "hi", "id", "il",
+    "in", "ia", "ks", "ky", "la", "me", "md", "ma", "mi", "mn", "ms", "mo", "mt",
+    "ne", "nv", "nh", "nj", "nm", "ny", "nc", "nd", "oh", "ok", "or", "pa", "ri",
+    "sc", "sd", "tn", "tx", "ut", "vt", "va", "wa", "wv", "wi", "wy", "dc",
+}  # fmt: skip
+COUNTRY_CODES = {"us", "usa", "uk", "uae"}
+_UPPER_CODES = STATE_CODES | COUNTRY_CODES
+
+
+@lru_cache(maxsize=LOCATION_CACHE_SIZE)
+def _normalize(location_str: str) -> Tuple[str, str]:
+    """(canonical location, COL tier) of a raw location string."""
+    if not location_str.strip():
+        return REMOTE
+    tokens = _TOKEN.findall(location_str.lower())
+
+    best = None
+    for start in range(len(tokens)):
+        for length in range(min(MAX_PHRASE_TOKENS, len(tokens) - start), 0, -1):
+            phrase = tuple(tokens[start : start + length])
+            if phrase in REMOTE_MARKERS:
+                return REMOTE
+            city = CITIES.get(phrase)
+            if city and (start == 0 or phrase not in LEADING_ONLY):
+                # Tier 1 before tier 2; the first mention within a tier
+                if best is None or city[1] < best[1]:
+                    best = city
+                break
+    if best:
+        return best
+
+    # Tier 3: Default/Others
+    # Capitalize words for clean display; state and country codes following
+    # a comma ("Boise, ID") stay upper case
+    words = []
+    after_comma = False
+    for word in location_str.strip().split():
+        if after_comma and _WORD_CORE.fullmatch(word.strip(",()")) and (
+            word.strip(",()").lower() in _UPPER_CODES
+        ):
+            words.append(word.upper())
+        else:
+            words.append(word.capitalize())
+        after_comma = word.endswith(",")
+    return " ".join(words), "TIER_3"
 
 
 class LocationNormalizationService:
@@ -16,59 +103,17 @@ class LocationNormalizationService:
           - TIER_1: High cost of living (SF, NY, Bay Area)
           - TIER_2: Medium-high cost of living (Austin, Seattle, Boston, Denver, LA)
           - TIER_3: Standard cost of living and Remote
+        Matching is on whole tokens against the gazetteer, so "Atlanta" is not
+        Los Angeles; results are memoized per raw string.
         """
-        loc = location_str.lower().strip()
-
-        if not loc or any(word in loc for word in ("remote", "anywhere", "virtual", "wfh")):
-            return {"location": "Remote", "col_tier": "TIER_3"}
-
-        # Tier 1: SF, NY, Bay Area
-        if any(
-            word in loc
-            for word in (
-                "san francisco",
-                "sf",
-                "new york",
-                "nyc",
-                "bay area",
-                "manhattan",
-                "brooklyn",
-            )
-        ):
-            canon = (
-                "New York, NY"
-                if any(w in loc for w in ("new york", "nyc", "manhattan", "brooklyn"))
-                else "San Francisco, CA"
-            )
-            return {"location": canon, "col_tier": "TIER_1"}
-
-        # Tier 2: Austin, Seattle, Boston, Denver, LA
-        if any(
-            word in loc
-            for word in (
-                "austin",
-                "seattle",
-                "boston",
-                "denver",
-                "los angeles",
-                "la",
-                "chicago",
-            )
-        ):
-            canon = "Austin, TX"
-            if "seattle" in loc:
-                canon = "Seattle, WA"
-            elif "boston" in loc:
-                canon = "Boston, MA"
-            elif "denver" in loc:
-                canon = "Denver, CO"
-            elif "los angeles" in loc or "la" in loc:
-                canon = "Los Angeles, CA"
-            elif "chicago" in loc:
-                canon = "Chicago, IL"
-            return {"location": canon, "col_tier": "TIER_2"}
+        location, col_tier = _normalize(location_str or "")
+        return {"location": location, "col_tier": col_tier}
 
-        # Tier 3: Default/Others
-        # Capitalize words for clean display
-        canon_parts = [word.capitalize() for word in location_str.strip().split()]
-        return {"location": " ".join(canon_parts), "col_tier": "TIER_3"}
+    @staticmethod
+    def normalize_locations(location_strs: Sequence[str]) -> List[Dict[str, Any]]:
+        """normalize_location of many strings, resolving each distinct string once."""
+        resolved = {raw: _normalize(raw or "") for raw in set(location_strs)}
+        return [
+            {"location": resolved[raw][0], "col_tier": resolved[raw][1]}
+            for raw in location_strs
+        ]
@@ -3,6 +3,8 @@ from __future__ import annotations
 import time
 from typing import Dict, Any, Optional
 from prometheus_client import Counter, Histogram, Gauge, REGISTRY, generate_latest
+from prometheus_client.openmetrics.exposition import generate_latest as generate_openmetrics
+from app.core.config import parse_buckets, settings
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -17,7 +19,8 @@ HTTP_REQUESTS_TOTAL = Counter(
 HTTP_REQUEST_DURATION = Histogram(
     "careerpilot_api_request_duration_seconds",
     "HTTP request latency in seconds",
-    ["method", "route"]
+    ["method", "route"],
+    buckets=parse_buckets(settings.metrics_latency_buckets)
 )
 
 # Business Metrics
@@ -32,6 +35,97 @@ AVERAGE_HEALTH_SCORE = Gauge(
     "Average Career Health Score across users"
 )
 
+# In-process event dispatch metrics
+EVENT_HANDLER_EVENTS = Counter(
+    "careerpilot_event_handler_events_total",
+    "Events processed by in-process event handlers",
+    ["handler", "outcome"]
+)
+
+EVENT_HANDLER_DURATION = Histogram(
+    "careerpilot_event_handler_duration_seconds",
+    "In-process event handler latency in seconds",
+    ["handler"]
+)
+
+EVENT_HANDLER_QUEUE_DEPTH = Gauge(
+    "careerpilot_event_handler_queue_depth",
+    "Events waiting in the queue of an in-process event handler",
+    ["handler"]
+)
+
+# Redis connection pool metrics
+REDIS_POOL_CONNECTIONS = Gauge(
+    "careerpilot_redis_pool_connections",
+    "Connections of the application Redis pool",
+    ["state"]
+)
+
+REDIS_POOL_CHECKOUTS = Counter(
+    "careerpilot_redis_pool_checkouts_total",
+    "Redis pool connection checkouts by outcome (immediate, waited, timeout)",
+    ["outcome"]
+)
+
+REDIS_POOL_WAIT = Histogram(
+    "careerpilot_redis_pool_wait_seconds",
+    "Time spent waiting for a free Redis pool connection",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+)
+
+# Rate limiter metrics
+RATE_LIMIT_DECISIONS = Counter(
+    "careerpilot_rate_limit_decisions_total",
+    "Rate limit decisions by tier (local lease, redis round trip, fallback) and outcome",
+    ["tier", "outcome"]
+)
+
+# Circuit breaker metrics
+CIRCUIT_BREAKER_STATE = Gauge(
+    "careerpilot_circuit_breaker_state",
+    "Circuit breaker state per dependency (0 closed, 1 half-open, 2 open)",
+    ["service"]
+)
+
+CIRCUIT_BREAKER_TRANSITIONS = Counter(
+    "careerpilot_circuit_breaker_transitions_total",
+    "Circuit breaker transitions made by this worker, by target state",
+    ["service", "state"]
+)
+
+CIRCUIT_BREAKER_CALLS = Counter(
+    "careerpilot_circuit_breaker_calls_total",
+    "Calls through a circuit breaker by outcome (success, failure, rejected)",
+    ["service", "outcome"]
+)
+
+CIRCUIT_STATE_VALUES = {"CLOSED": 0, "HALF_OPEN": 1, "OPEN": 2}
+
+# Embedding cache metrics
+EMBEDDING_CACHE_LOOKUPS = Counter(
+    "careerpilot_embedding_cache_lookups_total",
+    "Embedding cache lookups by tier (memory, redis) and result (hit, miss)",
+    ["tier", "result"]
+)
+
+EMBEDDING_CACHE_ENTRIES = Gauge(
+    "careerpilot_embedding_cache_entries",
+    "Embeddings held in the in-process LRU tier"
+)
+
+EMBEDDING_CACHE_BYTES = Gauge(
+    "careerpilot_embedding_cache_bytes",
+    "Bytes of packed vectors held in the in-process LRU tier"
+)
+
+# Hybrid retrieval metrics
+RETRIEVAL_LEG_DURATION = Histogram(
+    "careerpilot_retrieval_leg_duration_seconds",
+    "Hybrid retrieval latency per leg (vector = embedding + qdrant, bm25, fusion, rerank) and outcome (ok, error, timeout)",
+    ["leg", "outcome"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+)
+
 class MetricsCollectionService:
     """
     Metrics Collection Service (F6.2).
@@ -39,13 +133,18 @@ class MetricsCollectionService:
     """
 
     @classmethod
-    def record_api_request(cls, method: str, route: str, status: int, duration: float) -> None:
+    def record_api_request(
+        cls, method: str, route: str, status: int, duration: float, trace_id: Optional[str] = None
+    ) -> None:
         """
-        Increments HTTP_REQUESTS_TOTAL and observes request latency.
+        Increments HTTP_REQUESTS_TOTAL and observes request latency; the
+        observation links to trace_id as exemplar when given.
         """
         try:
             HTTP_REQUESTS_TOTAL.labels(method=method, route=route, status=str(status)).inc()
-            HTTP_REQUEST_DURATION.labels(method=method, route=route).observe(duration)
+            HTTP_REQUEST_DURATION.labels(method=method, route=route).observe(
+                duration, exemplar={"trace_id": trace_id} if trace_id else None
+            )
         except Exception as e:
             logger.warning(f"Failed to record API request metrics: {e}")
 
@@ -70,11 +169,140 @@ class MetricsCollectionService:
             logger.warning(f"Failed to update average health score gauge: {e}")
 
     @classmethod
-    def get_serialized_metrics(cls) -> str:
+    def record_event_handler(
+        cls, handler: str, outcome: str, duration: Optional[float] = None
+    ) -> None:
+        """
+        Counts an event outcome (handled, failed, dropped) of an in-process
+        event handler and observes its latency when it ran.
+        """
+        try:
+            EVENT_HANDLER_EVENTS.labels(handler=handler, outcome=outcome).inc()
+            if duration is not None:
+                EVENT_HANDLER_DURATION.labels(handler=handler).observe(duration)
+        except Exception as e:
+            logger.warning(f"Failed to record event handler metrics: {e}")
+
+    @classmethod
+    def set_event_queue_depth(cls, handler: str, depth: int) -> None:
+        """
+        Sets the EVENT_HANDLER_QUEUE_DEPTH gauge of a handler.
+        """
+        try:
+            EVENT_HANDLER_QUEUE_DEPTH.labels(handler=handler).set(depth)
+        except Exception as e:
+            logger.warning(f"Failed to update event queue depth gauge: {e}")
+
+    @classmethod
+    def record_redis_pool_checkout(cls, outcome: str, wait: float) -> None:
+        """
+        Counts a Redis pool checkout; waited and timeout outcomes mean the
+        pool was saturated when the connection was requested.
+        """
+        try:
+            REDIS_POOL_CHECKOUTS.labels(outcome=outcome).inc()
+            REDIS_POOL_WAIT.observe(wait)
+        except Exception as e:
+            logger.warning(f"Failed to record Redis pool checkout metrics: {e}")
+
+    @classmethod
+    def update_redis_pool_connections(cls, in_use: int, idle: int, max_connections: int) -> None:
+        """
+        Sets the REDIS_POOL_CONNECTIONS gauges (in_use, idle, max).
+        """
+        try:
+            REDIS_POOL_CONNECTIONS.labels(state="in_use").set(in_use)
+            REDIS_POOL_CONNECTIONS.labels(state="idle").set(idle)
+            REDIS_POOL_CONNECTIONS.labels(state="max").set(max_connections)
+        except Exception as e:
+            logger.warning(f"Failed to update Redis pool gauges: {e}")
+
+    @classmethod
+    def record_rate_limit_decision(cls, tier: str, allowed: bool) -> None:
+        """
+        Counts a rate limit decision; the redis tier marks decisions that
+        waited for a Redis lease.
+        """
+        try:
+            RATE_LIMIT_DECISIONS.labels(
+                tier=tier, outcome="allowed" if allowed else "denied"
+            ).inc()
+        except Exception as e:
+            logger.warning(f"Failed to record rate limit metrics: {e}")
+
+    @classmethod
+    def set_circuit_state(cls, service: str, state: str) -> None:
+        """
+        Sets the CIRCUIT_BREAKER_STATE gauge of a dependency.
+        """
+        try:
+            CIRCUIT_BREAKER_STATE.labels(service=service).set(CIRCUIT_STATE_VALUES[state])
+        except Exception as e:
+            logger.warning(f"Failed to update circuit breaker state gauge: {e}")
+
+    @classmethod
+    def record_circuit_transition(cls, service: str, state: str) -> None:
+        """
+        Counts a circuit breaker transition into state.
+        """
+        try:
+            CIRCUIT_BREAKER_TRANSITIONS.labels(service=service, state=state).inc()
+        except Exception as e:
+            logger.warning(f"Failed to record circuit breaker transition: {e}")
+
+    @classmethod
+    def record_circuit_call(cls, service: str, outcome: str) -> None:
+        """
+        Counts a call through a circuit breaker.
+        """
+        try:
+            CIRCUIT_BREAKER_CALLS.labels(service=service, outcome=outcome).inc()
+        except Exception as e:
+            logger.warning(f"Failed to record circuit breaker call: {e}")
+
+    @classmethod
+    def record_embedding_cache_lookup(cls, tier: str, hits: int, misses: int) -> None:
+        """
+        Counts embedding cache hits and misses of one tier.
+        """
+        try:
+            if hits:
+                EMBEDDING_CACHE_LOOKUPS.labels(tier=tier, result="hit").inc(hits)
+            if misses:
+                EMBEDDING_CACHE_LOOKUPS.labels(tier=tier, result="miss").inc(misses)
+        except Exception as e:
+            logger.warning(f"Failed to record embedding cache metrics: {e}")
+
+    @classmethod
+    def set_embedding_cache_size(cls, entries: int, nbytes: int) -> None:
+        """
+        Sets the EMBEDDING_CACHE_ENTRIES and EMBEDDING_CACHE_BYTES gauges.
+        """
+        try:
+            EMBEDDING_CACHE_ENTRIES.set(entries)
+            EMBEDDING_CACHE_BYTES.set(nbytes)
+        except Exception as e:
+            logger.warning(f"Failed to update embedding cache gauge: {e}")
+
+    @classmethod
+    def record_retrieval_leg(cls, leg: str, outcome: str, duration: float) -> None:
+        """
+        Observes the latency of one hybrid retrieval leg.
+        """
+        try:
+            RETRIEVAL_LEG_DURATION.labels(leg=leg, outcome=outcome).observe(duration)
+        except Exception as e:
+            logger.warning(f"Failed to record retrieval metrics: {e}")
+
+    @classmethod
+    def get_serialized_metrics(cls, openmetrics: bool = False) -> str:
         """
-        Returns serialized metrics output in standard Prometheus format.
+        Returns serialized metrics output in standard Prometheus format, or
+        in OpenMetrics format, which includes exemplars.
         """
         try:
+            if openmetrics:
+                return generate_openmetrics(REGISTRY).decode("utf-8")
             return generate_latest(REGISTRY).decode("utf-8")
         except Exception as e:
             logger.error(f"Failed to serialize Prometheus metrics: {e}")
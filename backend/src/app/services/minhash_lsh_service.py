@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.infrastructure.database.models import JobPosting, JobPostingLSHBand
+
+logger = get_logger(__name__)
+
+# 128 permutations split into 32 bands of 4 rows: postings whose description
+# token sets have Jaccard similarity >= 0.5 share a band ~87% of the time,
+# >= 0.6 ~98.5%, while unrelated postings rarely collide. One extra band keys
+# the cleaned title, so reposts with the same title and a rewritten
+# description are still found.
+NUM_PERM = 128
+NUM_MINHASH_BANDS = 32
+ROWS_PER_BAND = NUM_PERM // NUM_MINHASH_BANDS
+TITLE_BAND = NUM_MINHASH_BANDS
+NUM_BANDS = NUM_MINHASH_BANDS + 1
+
+# Companies with at most this many primaries are scored exhaustively, which
+# is cheap and keeps dedup decisions exact where LSH would not pay off.
+LSH_MIN_PRIMARIES = 200
+
+# (company_id, band, bucket) triples per candidate lookup statement
+LOOKUP_CHUNK_SIZE = 5000
+
+_MERSENNE_PRIME = (1 << 31) - 1
+# Fixed seed: signatures are persisted, so permutations must never change
+_rng = np.random.default_rng(20240613)
+_PERM_A = _rng.integers(1, _MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.integers(0, _MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+
+
+@lru_cache(maxsize=1 << 18)
+def _token_hash(token: str) -> int:
+    """32-bit blake2b hash of a token; job vocabularies repeat heavily, so memoized."""
+    return int.from_bytes(
+        hashlib.blake2b(token.encode("utf-8"), digest_size=4).digest(), "little"
+    )
+
+
+class CompanyCandidates:
+    """
+    Candidate primaries of one company. Exhaustive companies return every
+    primary; otherwise only primaries sharing an LSH bucket are returned,
+    plus primaries that have no signature yet.
+    """
+
+    def __init__(self, exhaustive: bool):
+        self.exhaustive = exhaustive
+        self._postings: Dict[str, JobPosting] = {}
+        self._unindexed: List[str] = []
+        self._buckets: Dict[Tuple[int, int], List[str]] = {}
+
+    @property
+    def postings(self) -> List[JobPosting]:
+        """Every loaded candidate, in load order."""
+        return list(self._postings.values())
+
+    def add(self, posting: JobPosting, buckets: Optional[Sequence[int]] = None) -> None:
+        """Adds a primary, indexed under its band buckets when given."""
+        if posting.id not in self._postings:
+            self._postings[posting.id] = posting
+            if buckets is None and not self.exhaustive:
+                self._unindexed.append(posting.id)
+        if buckets is not None and not self.exhaustive:
+            for band, bucket in enumerate(buckets):
+                self.add_bucket(posting, band, bucket)
+
+    def add_bucket(self, posting: JobPosting, band: int, bucket: int) -> None:
+        """Adds a primary under a single (band, bucket) key."""
+        self._postings.setdefault(posting.id, posting)
+        self._buckets.setdefault((band, bucket), []).append(posting.id)
+
+    def candidates(self, buckets: Sequence[int]) -> List[JobPosting]:
+        """Primaries that may be near-duplicates of a posting with these buckets."""
+        if self.exhaustive:
+            return list(self._postings.values())
+        ids = dict.fromkeys(self._unindexed)
+        for band, bucket in enumerate(buckets):
+            ids.update(dict.fromkeys(self._buckets.get((band, bucket), ())))
+        return [self._postings[posting_id] for posting_id in ids]
+
+
+class MinHashLSHService:
+    """
+    MinHash signatures over description tokens and a persistent LSH band index
+    (job_posting_lsh_bands), used to narrow duplicate candidates to a handful
+    of likely matches before exact Jaccard/cosine scoring.
+    """
+
+    @staticmethod
+    def tokenize(text: str) -> Set[str]:
+        """Description tokens, matching the cosine similarity tokenization."""
+        return set(re.findall(r"\w+", text.lower()))
+
+    @staticmethod
+    def token_hashes(tokens: Iterable[str]) -> np.ndarray:
+        """32-bit blake2b hash of every token, as uint64 for the permutation arithmetic."""
+        tokens = list(tokens)
+        return np.fromiter(
+            (_token_hash(token) for token in tokens), dtype=np.uint64, count=len(tokens)
+        )
+
+    @staticmethod
+    def signature_from_hashes(hashes: np.ndarray) -> bytes:
+        """MinHash signature of a set of token hashes (see token_hashes)."""
+        if not len(hashes):
+            return np.full(NUM_PERM, _MERSENNE_PRIME, dtype="<u4").tobytes()
+        hashes = hashes.astype(np.uint64, copy=False)
+        permuted = (_PERM_A[:, None] * hashes[None, :] + _PERM_B[:, None]) % _MERSENNE_PRIME
+        return permuted.min(axis=1).astype("<u4").tobytes()
+
+    @staticmethod
+    def signature(text: str) -> bytes:
+        """MinHash signature of a description as NUM_PERM little-endian uint32 values."""
+        return MinHashLSHService.signature_from_hashes(
+            MinHashLSHService.token_hashes(MinHashLSHService.tokenize(text))
+        )
+
+    @staticmethod
+    def _bucket(data: bytes) -> int:
+        """Signed 64-bit bucket hash, matching the BIGINT bucket column."""
+        return int.from_bytes(
+            hashlib.blake2b(data, digest_size=8).digest(), "little", signed=True
+        )
+
+    @staticmethod
+    def band_buckets(signature: bytes, title: str = "") -> List[int]:
+        """
+        Bucket of every band: one per group of ROWS_PER_BAND signature values,
+        then the title band over the sorted tokens of the (cleaned) title.
+        """
+        width = ROWS_PER_BAND * 4
+        buckets = [
+            MinHashLSHService._bucket(signature[band * width : (band + 1) * width])
+            for band in range(NUM_MINHASH_BANDS)
+        ]
+        title_key = " ".join(sorted(MinHashLSHService.tokenize(title)))
+        buckets.append(MinHashLSHService._bucket(b"title:" + title_key.encode("utf-8")))
+        return buckets
+
+    @staticmethod
+    def estimate_jaccard(sig1: bytes, sig2: bytes) -> float:
+        """Fraction of matching MinHash values, an estimate of token-set Jaccard."""
+        a = np.frombuffer(sig1, dtype="<u4")
+        b = np.frombuffer(sig2, dtype="<u4")
+        return float(np.count_nonzero(a == b)) / NUM_PERM
+
+    @staticmethod
+    def band_rows(
+        job_posting_id: str, company_id: str, buckets: Sequence[int]
+    ) -> List[Dict[str, object]]:
+        """job_posting_lsh_bands rows of a posting."""
+        return [
+            {
+                "job_posting_id": job_posting_id,
+                "company_id": company_id,
+                "band": band,
+                "bucket": bucket,
+            }
+            for band, bucket in enumerate(buckets)
+        ]
+
+    @staticmethod
+    async def index_postings(
+        db: AsyncSession, entries: Iterable[Tuple[str, str, Sequence[int]]]
+    ) -> None:
+        """
+        Writes the band rows of (job_posting_id, company_id, buckets) entries,
+        replacing rows of postings that were indexed before.
+        """
+        rows = [
+            row
+            for job_posting_id, company_id, buckets in entries
+            for row in MinHashLSHService.band_rows(job_posting_id, company_id, buckets)
+        ]
+        if not rows:
+            return
+        stmt = pg_insert(JobPostingLSHBand)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JobPostingLSHBand.job_posting_id, JobPostingLSHBand.band],
+            set_={"bucket": stmt.excluded.bucket},
+        )
+        await db.execute(stmt, rows)
+
+    @staticmethod
+    async def load_candidates(
+        db: AsyncSession,
+        requests: Dict[str, Sequence[Sequence[int]]],
+        exclude_ids: Iterable[str] = (),
+    ) -> Dict[str, CompanyCandidates]:
+        """
+        Loads candidate primaries for postings about to be deduplicated.
+        requests maps a company id to the band buckets of its incoming
+        postings. Small companies load every primary; large ones only the
+        primaries sharing a bucket with an incoming posting, plus primaries
+        without a signature.
+        """
+        exclude = set(exclude_ids)
+        result: Dict[str, CompanyCandidates] = {}
+        if not requests:
+            return result
+
+        count_res = await db.execute(
+            select(JobPosting.company_id, func.count())
+            .where(
+                JobPosting.company_id.in_(list(requests)),
+                JobPosting.is_primary == True,  # noqa: E712 - compare with active primaries
+            )
+            .group_by(JobPosting.company_id)
+        )
+        counts = dict(count_res.all())
+
+        small = [c for c in requests if counts.get(c, 0) <= LSH_MIN_PRIMARIES]
+        large = [c for c in requests if counts.get(c, 0) > LSH_MIN_PRIMARIES]
+        for company_id in small:
+            result[company_id] = CompanyCandidates(exhaustive=True)
+        for company_id in large:
+            result[company_id] = CompanyCandidates(exhaustive=False)
+
+        if small:
+            res = await db.execute(
+                select(JobPosting).where(
+                    JobPosting.company_id.in_(small),
+                    JobPosting.is_primary == True,  # noqa: E712 - compare with active primaries
+                )
+            )
+            for posting in res.scalars().all():
+                if posting.id not in exclude:
+                    result[posting.company_id].add(posting)
+
+        if large:
+            res = await db.execute(
+                select(JobPosting).where(
+                    JobPosting.company_id.in_(large),
+                    JobPosting.is_primary == True,  # noqa: E712 - compare with active primaries
+                    JobPosting.minhash_signature.is_(None),
+                )
+            )
+            for posting in res.scalars().all():
+                if posting.id not in exclude:
+                    result[posting.company_id].add(posting)
+
+            keys = list(
+                {
+                    (company_id, band, bucket)
+                    for company_id in large
+                    for buckets in requests[company_id]
+                    for band, bucket in enumerate(buckets)
+                }
+            )
+            for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+                res = await db.execute(
+                    select(JobPosting, JobPostingLSHBand.band, JobPostingLSHBand.bucket)
+                    .join(
+                        JobPostingLSHBand,
+                        JobPostingLSHBand.job_posting_id == JobPosting.id,
+                    )
+                    .where(
+                        tuple_(
+                            JobPostingLSHBand.company_id,
+                            JobPostingLSHBand.band,
+                            JobPostingLSHBand.bucket,
+                        ).in_(keys[start : start + LOOKUP_CHUNK_SIZE]),
+                        JobPosting.is_primary == True,  # noqa: E712 - compare with active primaries
+                    )
+                )
+                for posting, band, bucket in res.all():
+                    if posting.id in exclude:
+                        continue
+                    result[posting.company_id].add_bucket(posting, band, bucket)
+
+        return result
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.metrics_collection_service import MetricsCollectionService
+from app.services.redis_service import RedisService
+
+logger = get_logger(__name__)
+
+# Refills the token bucket in KEYS[1] and leases up to ARGV[3] tokens from it,
+# provided at least ARGV[4] are available. Tokens a process leased earlier and
+# did not use (ARGV[5]) are returned first. Time comes from the Redis server,
+# so processes with skewed clocks share one refill schedule.
+# Returns {granted, ms until ARGV[4] tokens are available}.
+LEASE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local minimum = tonumber(ARGV[4])
+local refund = tonumber(ARGV[5])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(bucket[1])
+local ts = tonumber(bucket[2])
+if tokens == nil or ts == nil then
+    tokens = capacity
+    ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate + refund)
+local granted = 0
+local wait = 0
+if tokens >= minimum then
+    granted = math.min(requested, math.floor(tokens))
+    tokens = tokens - granted
+else
+    wait = math.ceil((minimum - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate))
+return {granted, wait}
+"""
+
+
+class _KeyState:
+    """Local view of one rate-limit key."""
+
+    __slots__ = ("tokens", "expires_at", "blocked_until", "fallback_tokens", "fallback_at", "lock")
+
+    def __init__(self):
+        # Tokens leased from Redis and not used yet, valid until expires_at
+        self.tokens = 0
+        self.expires_at = 0.0
+        # Redis reported the bucket empty; deny locally until then
+        self.blocked_until = 0.0
+        # Process-local bucket used while Redis is unreachable
+        self.fallback_tokens: Optional[float] = None
+        self.fallback_at = 0.0
+        self.lock = asyncio.Lock()
+
+
+class HybridRateLimiter:
+    """
+    Two-tier token-bucket rate limiter.
+
+    The authoritative bucket of every key lives in Redis (capacity limit,
+    refilled at limit / window per second). Processes do not ask Redis per
+    request: they lease a batch of tokens (lease_fraction of the limit, at
+    least the request cost) with one EVALSHA and spend it in process, so
+    only about one request per batch waits for Redis. Concurrent requests
+    for a key share one lease call, and a key Redis reported empty is denied
+    locally until the bucket has refilled.
+
+    Overshoot bounds:
+    - While Redis is reachable there is none: a request is only admitted
+      with a token already deducted from the Redis bucket. Leased tokens
+      that go unused for lease_ttl_ms are returned with the next lease, so
+      idle leases hold back at most lease size * processes tokens briefly.
+    - While Redis is unreachable every process falls back to a local bucket
+      with the same limit, so admissions are bounded by limit * processes
+      per window instead of failing open.
+    """
+
+    def __init__(
+        self,
+        client=None,
+        lease_fraction: Optional[float] = None,
+        lease_ttl_ms: Optional[int] = None,
+        max_keys: Optional[int] = None,
+        redis_retry_seconds: Optional[float] = None,
+    ):
+        self.client = client
+        self.lease_fraction = lease_fraction or settings.rate_limit_lease_fraction
+        self.lease_ttl = (
+            settings.rate_limit_lease_ttl_ms if lease_ttl_ms is None else lease_ttl_ms
+        ) / 1000
+        self.max_keys = max_keys or settings.rate_limit_local_keys
+        self.redis_retry_seconds = (
+            settings.rate_limit_redis_retry_seconds
+            if redis_retry_seconds is None
+            else redis_retry_seconds
+        )
+        self.redis_calls = 0
+        self._keys: "OrderedDict[str, _KeyState]" = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._script = None
+        self._redis_retry_at = 0.0
+
+    def _redis(self):
+        return self.client or RedisService.get_client()
+
+    def _state(self, key: str) -> _KeyState:
+        # Key locks belong to the event loop that first waited on them
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._keys.clear()
+            self._loop = loop
+
+        state = self._keys.get(key)
+        if state is None:
+            state = self._keys[key] = _KeyState()
+            if len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+        else:
+            self._keys.move_to_end(key)
+        return state
+
+    def lease_size(self, limit: int, cost: int) -> int:
+        """Tokens requested from Redis per lease for a key with this limit."""
+        return min(limit, max(cost, math.ceil(limit * self.lease_fraction)))
+
+    @staticmethod
+    def _take(state: _KeyState, cost: int, now: float) -> bool:
+        if state.expires_at > now and state.tokens >= cost:
+            state.tokens -= cost
+            return True
+        return False
+
+    async def acquire(self, key: str, limit: int, window_seconds: int, cost: int = 1) -> bool:
+        """
+        Takes cost tokens from the bucket of key.
+        Returns True if the request is allowed, False if the limit is exceeded.
+        """
+        state = self._state(key)
+        now = time.monotonic()
+        if self._take(state, cost, now):
+            return self._decide("local", True)
+        if state.blocked_until > now:
+            return self._decide("local", False)
+        if now < self._redis_retry_at:
+            return self._decide("fallback", self._take_fallback(state, limit, window_seconds, cost))
+
+        async with state.lock:
+            # Another request may have leased tokens while this one waited
+            now = time.monotonic()
+            if self._take(state, cost, now):
+                return self._decide("local", True)
+            if state.blocked_until > now:
+                return self._decide("local", False)
+
+            valid = state.tokens if state.expires_at > now else 0
+            refund = state.tokens - valid
+            need = cost - valid
+            try:
+                granted, wait_ms = await self._lease(
+                    key, limit, window_seconds, max(need, self.lease_size(limit, cost)), need, refund
+                )
+            except Exception as e:
+                if self._redis_retry_at == 0.0:
+                    logger.error(
+                        f"Rate limiter cannot reach Redis: {e}. "
+                        f"Enforcing limits per process until it recovers."
+                    )
+                self._redis_retry_at = time.monotonic() + self.redis_retry_seconds
+                return self._decide(
+                    "fallback", self._take_fallback(state, limit, window_seconds, cost)
+                )
+
+            if self._redis_retry_at:
+                logger.info("Rate limiter reached Redis again; enforcing global limits")
+                self._redis_retry_at = 0.0
+            now = time.monotonic()
+            state.tokens = valid + granted
+            state.expires_at = now + self.lease_ttl
+            state.fallback_tokens = None
+            if wait_ms:
+                state.blocked_until = now + wait_ms / 1000
+            allowed = state.tokens >= cost
+            if allowed:
+                state.tokens -= cost
+            return self._decide("redis", allowed)
+
+    async def _lease(
+        self, key: str, limit: int, window_seconds: int, requested: int, minimum: int, refund: int
+    ) -> Tuple[int, int]:
+        client = self._redis()
+        if self._script is None:
+            # EVALSHA with the cached digest; the script is loaded on NOSCRIPT
+            self._script = client.register_script(LEASE_SCRIPT)
+        self.redis_calls += 1
+        granted, wait_ms = await self._script(
+            keys=[key],
+            args=[limit, limit / (window_seconds * 1000), requested, minimum, refund],
+            client=client,
+        )
+        return int(granted), int(wait_ms)
+
+    @staticmethod
+    def _take_fallback(state: _KeyState, limit: int, window_seconds: int, cost: int) -> bool:
+        now = time.monotonic()
+        if state.fallback_tokens is None:
+            state.fallback_tokens = float(limit)
+        else:
+            state.fallback_tokens = min(
+                float(limit),
+                state.fallback_tokens + (now - state.fallback_at) * limit / window_seconds,
+            )
+        state.fallback_at = now
+        if state.fallback_tokens >= cost:
+            state.fallback_tokens -= cost
+            return True
+        return False
+
+    @staticmethod
+    def _decide(tier: str, allowed: bool) -> bool:
+        MetricsCollectionService.record_rate_limit_decision(tier, allowed)
+        return allowed
+
+    def stats(self) -> Dict[str, int]:
+        """Keys tracked in process and Redis lease calls made so far."""
+        return {"keys": len(self._keys), "redis_calls": self.redis_calls}
+
+
+# Process-wide limiter used by ReliabilityManagerService.check_rate_limit
+rate_limiter = HybridRateLimiter()
@@ -1,12 +1,64 @@
+import asyncio
 import time
+from typing import Dict, Optional
 
-from redis.asyncio import from_url
+from redis.asyncio import BlockingConnectionPool, Redis, from_url
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.services.metrics_collection_service import MetricsCollectionService
 
 logger = get_logger(__name__)
 
+# Commands that lose their connection reconnect and retry this many times
+COMMAND_RETRIES = 3
+
+
+class MeteredConnectionPool(BlockingConnectionPool):
+    """
+    Blocking connection pool that reports its size and every checkout to
+    MetricsCollectionService, so saturation (checkouts that had to wait for
+    a free connection, or gave up after redis_pool_timeout) is visible.
+    """
+
+    async def get_connection(self, *args, **kwargs):
+        saturated = not self.can_get_connection()
+        started = time.perf_counter()
+        try:
+            connection = await super().get_connection(*args, **kwargs)
+        except RedisConnectionError:
+            MetricsCollectionService.record_redis_pool_checkout(
+                "timeout", time.perf_counter() - started
+            )
+            raise
+        MetricsCollectionService.record_redis_pool_checkout(
+            "waited" if saturated else "immediate", time.perf_counter() - started
+        )
+        self._report()
+        return connection
+
+    async def release(self, connection) -> None:
+        await super().release(connection)
+        self._report()
+
+    def _report(self) -> None:
+        MetricsCollectionService.update_redis_pool_connections(
+            len(self._in_use_connections),
+            len(self._available_connections),
+            self.max_connections,
+        )
+
+
+# Application-scoped pool. The FastAPI lifespan opens and closes it; code
+# running outside the app (scripts, tests) gets one opened lazily. Pooled
+# connections belong to the event loop that opened them.
+_pool: Optional[MeteredConnectionPool] = None
+_pool_loop: Optional[asyncio.AbstractEventLoop] = None
+
 
 class RedisService:
     """
@@ -14,17 +66,87 @@ class RedisService:
     """
 
     @staticmethod
-    def get_client():
+    def create_pool() -> MeteredConnectionPool:
+        """
+        A connection pool of redis_max_connections. Idle connections are
+        pinged before reuse after redis_health_check_interval seconds, and
+        commands whose connection broke reconnect with exponential backoff.
+        """
+        return MeteredConnectionPool.from_url(
+            settings.redis_url,
+            max_connections=settings.redis_max_connections,
+            timeout=settings.redis_pool_timeout,
+            health_check_interval=settings.redis_health_check_interval,
+            socket_keepalive=True,
+            retry=Retry(ExponentialBackoff(cap=1.0, base=0.05), COMMAND_RETRIES),
+            retry_on_error=[RedisConnectionError, RedisTimeoutError],
+        )
+
+    @staticmethod
+    async def open_pool() -> None:
         """
-        Returns an async Redis client.
+        Opens the application pool on the running event loop and checks that
+        Redis answers. An unreachable Redis is logged, not raised: callers
+        degrade gracefully and connections are retried on use.
         """
-        return from_url(settings.redis_url)
+        global _pool, _pool_loop
+        await RedisService.close_pool()
+        _pool = RedisService.create_pool()
+        _pool_loop = asyncio.get_running_loop()
+        try:
+            await Redis(connection_pool=_pool).ping()
+            logger.info(
+                f"Redis pool opened with up to {settings.redis_max_connections} connections"
+            )
+        except Exception as e:
+            logger.warning(f"Redis pool opened but Redis is not reachable yet: {e}")
 
+    @staticmethod
+    async def close_pool() -> None:
+        """Disconnects every pooled connection."""
+        global _pool, _pool_loop
+        pool, _pool, _pool_loop = _pool, None, None
+        if pool is not None:
+            try:
+                await pool.disconnect()
+            except Exception as e:
+                logger.warning(f"Error disconnecting the Redis pool: {e}")
+
+    @staticmethod
+    def get_pool() -> MeteredConnectionPool:
+        """The application pool, opened on the running event loop if needed."""
+        global _pool, _pool_loop
+        loop = asyncio.get_running_loop()
+        if _pool is None or _pool_loop is not loop:
+            _pool = RedisService.create_pool()
+            _pool_loop = loop
+        return _pool
+
+    @staticmethod
+    def get_client() -> Redis:
+        """
+        Returns an async Redis client on the application pool. Closing the
+        client returns its connection to the pool instead of disconnecting it.
+        """
+        return Redis(connection_pool=RedisService.get_pool())
+
+    @staticmethod
+    def pool_stats() -> Dict[str, int]:
+        """Connections in use, idle and allowed in the application pool."""
+        if _pool is None:
+            return {"in_use": 0, "idle": 0, "max": settings.redis_max_connections}
+        return {
+            "in_use": len(_pool._in_use_connections),
+            "idle": len(_pool._available_connections),
+            "max": _pool.max_connections,
+        }
 
     @staticmethod
     async def check_health() -> tuple[bool, float]:
         """
         Pings the Redis database and returns latency in milliseconds.
+        A dedicated connection is used so a saturated pool does not hide
+        whether Redis itself is reachable.
         Returns:
             A tuple of (is_connected, latency_ms)
         """
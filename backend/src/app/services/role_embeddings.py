@@ -20,6 +20,7 @@ import asyncio
 
 from app.core.logging import get_logger
 from app.infrastructure.rag.embeddings.service import embedding_service
+from app.infrastructure.rag.embeddings.similarity import cosine
 
 logger = get_logger(__name__)
 
@@ -167,7 +168,7 @@ async def compute_semantic_gap_score(
     if role_emb is None:
         return round(exact_score, 1)
 
-    similarity = embedding_service.cosine_similarity(res_emb, role_emb)
+    similarity = cosine(res_emb, role_emb)
     # Convert cosine similarity [-1,1] → 0-100 score
     semantic_score = max(0.0, min(100.0, (similarity + 1) / 2 * 100))
 
@@ -1,37 +1,43 @@
 from __future__ import annotations
 
+import asyncio
+import bisect
 import contextlib
 import re
 from decimal import Decimal
-from typing import Any, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from uuid import uuid4
 
 from fastapi import HTTPException
-from langchain_core.prompts import ChatPromptTemplate
-from langchain_google_genai import ChatGoogleGenerativeAI
-from pydantic import BaseModel, Field
-from sqlalchemy import select
+from pydantic import BaseModel
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
 from app.core.logging import get_logger
 from app.infrastructure.database.models import NormalizedSkill
 from app.schemas.profile import ProficiencyLevel
 from app.schemas.profile import SkillSchema as ProfileSkillSchema
+from app.services.skill_fallback_service import (
+    LLMExtractedSkill,
+    get_fallback_batcher,
+)
 
 logger = get_logger(__name__)
 
+# Texts matching fewer taxonomy skills than this also run the LLM fallback
+FALLBACK_MIN_SKILLS = 3
 
-class LLMExtractedSkill(BaseModel):
-    canonical_name: str = Field(description="Standardized skill name, e.g. React, Python")
-    category: str = Field(description="Category, e.g. Language, Framework, Database, Infrastructure")
-    alias_resolved_from: str = Field(description="The exact text phrase indicating the skill")
-    confidence_score: float = Field(description="Confidence rating between 0.0 and 1.0")
-    context_sentence: str = Field(description="The exact sentence containing the skill mention")
+# Compiled matchers kept for explicitly passed taxonomies
+MATCHER_CACHE_SIZE = 8
 
+_SENTENCE_DELIMITERS = re.compile(r"[.!?\n]")
+_WORD_BOUNDARY = re.compile(r"\b")
 
-class LLMExtractionResponse(BaseModel):
-    extracted_skills: List[LLMExtractedSkill] = Field(default_factory=list)
+# Bumped whenever this process changes the taxonomy; part of every matcher cache key
+_taxonomy_version = 0
+_matcher_by_identity: Dict[Tuple[int, int, int], Tuple[Sequence[Any], "SkillMatcher"]] = {}
+_matcher_by_content: Dict[Tuple[Any, ...], "SkillMatcher"] = {}
+_db_matcher: Optional[Tuple[Tuple[Any, ...], "SkillMatcher"]] = None
 
 
 class ExtractedSkill(BaseModel):
@@ -42,6 +48,130 @@ class ExtractedSkill(BaseModel):
     alias_resolved_from: str
 
 
+class SkillMatcher:
+    """
+    Every canonical name and alias of a taxonomy compiled into one regex
+    (a trie of the lowercased terms), so a text is scanned once instead of
+    once per term. Matches are identical to searching each term with
+    \\b<term>\\b over the lowercased text: the scan reports the longest
+    term matching at every position, and shorter terms that are prefixes of
+    it are checked for their own trailing word boundary. The lowercased
+    term table doubles as the hash index used to resolve aliases.
+    """
+
+    def __init__(self, skills: Sequence[Any]):
+        # (name, category, terms) in taxonomy order; the first matching skill
+        # of a canonical name wins, as does its first matching term
+        self.skills: List[Tuple[str, Optional[str], List[str]]] = []
+        self.skill_ids: List[Optional[str]] = []
+        self._skills_by_term: Dict[str, List[int]] = {}
+        for index, skill in enumerate(skills):
+            terms = [skill.name] + list(skill.aliases or [])
+            self.skills.append((skill.name, skill.category, terms))
+            self.skill_ids.append(skill.id)
+            for term in terms:
+                if term:
+                    self._skills_by_term.setdefault(term.lower(), []).append(index)
+
+        trie: Dict[str, Any] = {}
+        for term in self._skills_by_term:
+            node = trie
+            for char in term:
+                node = node.setdefault(char, {})
+            node[""] = True
+
+        # Shorter terms that are prefixes of each term
+        self._prefixes: Dict[str, List[str]] = {}
+        for term in self._skills_by_term:
+            node, prefixes = trie, []
+            for length, char in enumerate(term[:-1], start=1):
+                node = node[char]
+                if "" in node:
+                    prefixes.append(term[:length])
+            if prefixes:
+                self._prefixes[term] = prefixes
+
+        self._pattern = (
+            re.compile(r"(?=\b(" + SkillMatcher._trie_pattern(trie) + r")\b)")
+            if trie
+            else None
+        )
+
+    @staticmethod
+    def _trie_pattern(node: Dict[str, Any]) -> str:
+        """Regex of a trie node; optional endings are greedy, so longer terms are tried first."""
+        alternatives = [
+            re.escape(char) + SkillMatcher._trie_pattern(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not alternatives:
+            return ""
+        group = (
+            alternatives[0]
+            if len(alternatives) == 1
+            else "(?:" + "|".join(alternatives) + ")"
+        )
+        return f"(?:{group})?" if "" in node else group
+
+    def resolve(self, term: str) -> Optional[str]:
+        """Id of the first skill whose canonical name or an alias equals term, ignoring case."""
+        indexes = self._skills_by_term.get(term.lower())
+        return self.skill_ids[indexes[0]] if indexes else None
+
+    def find_terms(self, lowered: str) -> Dict[str, int]:
+        """First word-bounded position of every taxonomy term in a lowercased text."""
+        found: Dict[str, int] = {}
+        if self._pattern is None:
+            return found
+        for match in self._pattern.finditer(lowered):
+            start = match.start()
+            term = match.group(1)
+            found.setdefault(term, start)
+            for prefix in self._prefixes.get(term, ()):
+                if prefix not in found and _WORD_BOUNDARY.match(lowered, start + len(prefix)):
+                    found[prefix] = start
+        return found
+
+    def count(self, text: str) -> int:
+        """Number of distinct canonical skills mentioned in text."""
+        found = self.find_terms(text.lower())
+        return len(
+            {self.skills[index][0] for term in found for index in self._skills_by_term[term]}
+        )
+
+    def match(self, text: str) -> Dict[str, ExtractedSkill]:
+        """Skills mentioned in text, keyed by canonical name, in taxonomy order."""
+        extracted: Dict[str, ExtractedSkill] = {}
+        found = self.find_terms(text.lower())
+        if not found:
+            return extracted
+
+        matched = sorted({index for term in found for index in self._skills_by_term[term]})
+        delimiters = [m.start() for m in _SENTENCE_DELIMITERS.finditer(text)]
+        for index in matched:
+            name, category, terms = self.skills[index]
+            if name in extracted:
+                continue
+            term = next(t for t in terms if t and t.lower() in found)
+            start = found[term.lower()]
+            end = start + len(term)
+            # Sentence around the mention: after the previous delimiter, up to the next one
+            before = bisect.bisect_left(delimiters, start)
+            after = bisect.bisect_left(delimiters, end)
+            sentence_start = delimiters[before - 1] + 1 if before else 0
+            sentence_end = delimiters[after] if after < len(delimiters) else len(text)
+            context = text[sentence_start:sentence_end].strip()
+            extracted[name] = ExtractedSkill(
+                canonical_name=name,
+                category=category or "Other",
+                confidence_score=1.0,
+                context_sentence=context or f"Mentions {term}.",
+                alias_resolved_from=term,
+            )
+        return extracted
+
+
 class SkillExtractionService:
     """
     NLP Skill Extraction Service (F2.3). Maps raw strings in job postings
@@ -49,92 +179,119 @@ class SkillExtractionService:
     """
 
     @staticmethod
-    def _extract_context_sentence(text: str, keyword: str) -> str:
+    def invalidate_matcher() -> None:
         """
-        Extracts the sentence containing the keyword from a larger text block.
+        Drops every compiled matcher. Called when this process adds skills;
+        callers that edit loaded skills in place must call it too.
         """
-        idx = text.lower().find(keyword.lower())
-        if idx == -1:
-            return ""
+        global _taxonomy_version, _db_matcher
+        _taxonomy_version += 1
+        _matcher_by_identity.clear()
+        _matcher_by_content.clear()
+        _db_matcher = None
+
+    @staticmethod
+    def matcher_for(skills: Sequence[NormalizedSkill]) -> SkillMatcher:
+        """
+        Compiled matcher of an already loaded taxonomy. Looked up by the
+        identity and length of the sequence first, so callers appending
+        newly created skills to their taxonomy list get a rebuilt matcher,
+        then by content, so a freshly loaded but unchanged taxonomy reuses
+        the compiled one.
+        """
+        identity_key = (_taxonomy_version, id(skills), len(skills))
+        cached = _matcher_by_identity.get(identity_key)
+        if cached is not None:
+            return cached[1]
+
+        content_key = (
+            _taxonomy_version,
+            tuple((skill.name, skill.category, tuple(skill.aliases or ())) for skill in skills),
+        )
+        matcher = _matcher_by_content.get(content_key)
+        if matcher is None:
+            matcher = SkillMatcher(skills)
+            SkillExtractionService._cache_put(_matcher_by_content, content_key, matcher)
+        # Holding the sequence keeps its id from being reused while cached
+        SkillExtractionService._cache_put(_matcher_by_identity, identity_key, (skills, matcher))
+        return matcher
+
+    @staticmethod
+    def _cache_put(cache: Dict[Any, Any], key: Any, value: Any) -> None:
+        """Inserts into a matcher cache, evicting the oldest entry when full."""
+        if len(cache) >= MATCHER_CACHE_SIZE:
+            cache.pop(next(iter(cache)))
+        cache[key] = value
 
-        # Walk back to find the start of the sentence
-        start = idx
-        while start > 0 and text[start - 1] not in (".", "!", "?", "\n"):
-            start -= 1
+    @staticmethod
+    async def get_matcher(db: AsyncSession) -> SkillMatcher:
+        """
+        Compiled matcher of the taxonomy table. Only the skill count and
+        latest creation time are queried per call; the table is reloaded
+        when they change, including after skills added by other workers.
+        """
+        global _db_matcher
+        stamp_res = await db.execute(
+            select(func.count(NormalizedSkill.id), func.max(NormalizedSkill.created_at))
+        )
+        key = (_taxonomy_version, *stamp_res.one())
+        if _db_matcher is not None and _db_matcher[0] == key:
+            return _db_matcher[1]
 
-        # Walk forward to find the end of the sentence
-        end = idx + len(keyword)
-        while end < len(text) and text[end] not in (".", "!", "?", "\n"):
-            end += 1
+        res = await db.execute(select(NormalizedSkill))
+        matcher = SkillMatcher(res.scalars().all())
+        _db_matcher = (key, matcher)
+        return matcher
 
-        return text[start:end].strip()
+    @staticmethod
+    def match_taxonomy(
+        text: str, skills: Sequence[NormalizedSkill]
+    ) -> Dict[str, ExtractedSkill]:
+        """
+        Matches text against an already loaded skills taxonomy with
+        word-boundary semantics over canonical names and aliases, in a
+        single scan of the cached compiled matcher.
+        Returns extracted skills keyed by canonical name.
+        """
+        return SkillExtractionService.matcher_for(skills).match(text)
+
+    @staticmethod
+    async def _extract_with_llm(text: str) -> List[LLMExtractedSkill]:
+        """
+        Queries the LLM to catch emerging skills not yet in the taxonomy,
+        through the shared micro-batching, content-hash cached fallback.
+        """
+        return await get_fallback_batcher().extract(text)
 
     @staticmethod
-    async def extract_skills_from_text(db: AsyncSession, text: str) -> List[ExtractedSkill]:
+    async def extract_skills_from_text(
+        db: AsyncSession,
+        text: str,
+        taxonomy: Optional[Sequence[NormalizedSkill]] = None,
+    ) -> List[ExtractedSkill]:
         """
         Extracts skills from text by matching against database taxonomy.
         If confidence or coverage is low, runs an LLM fallback.
+        Callers processing many texts can pass a preloaded taxonomy to skip
+        the per-call taxonomy version check.
         """
         if not text or len(text.strip()) < 5:
             return []
 
-        # 1. Fetch skills taxonomy from DB
-        stmt = select(NormalizedSkill)
-        res = await db.execute(stmt)
-        skills_in_db = res.scalars().all()
+        # 1. Compiled matcher of the DB skills taxonomy (cached per taxonomy version)
+        if taxonomy is None:
+            matcher = await SkillExtractionService.get_matcher(db)
+        else:
+            matcher = SkillExtractionService.matcher_for(taxonomy)
 
-        extracted = {}
-
-        # 2. String/Regex Matching against DB skills
-        for skill in skills_in_db:
-            # Build search list (canonical name + aliases)
-            terms = [skill.name] + (skill.aliases or [])
-            for term in terms:
-                pattern = r"\b" + re.escape(term.lower()) + r"\b"
-                if re.search(pattern, text.lower()):
-                    # Find context sentence
-                    context = SkillExtractionService._extract_context_sentence(text, term)
-                    # Deduplicate by canonical name
-                    if skill.name not in extracted:
-                        extracted[skill.name] = ExtractedSkill(
-                            canonical_name=skill.name,
-                            category=skill.category or "Other",
-                            confidence_score=1.0,
-                            context_sentence=context or f"Mentions {term}.",
-                            alias_resolved_from=term,
-                        )
+        # 2. Single-scan matching against the taxonomy
+        extracted = matcher.match(text)
 
         # 3. LLM Fallback: If no skills found or as a verification step, query the LLM
         # to catch other emerging skills not yet in our DB.
-        if len(extracted) < 3:
+        if len(extracted) < FALLBACK_MIN_SKILLS:
             try:
-                llm = ChatGoogleGenerativeAI(
-                    model=settings.model_name,
-                    temperature=0.0,
-                )
-                structured_llm = llm.with_structured_output(LLMExtractionResponse)
-
-                prompt = ChatPromptTemplate.from_messages(
-                    [
-                        (
-                            "system",
-                            (
-                                "You are an expert NLP parser specializing in technical skill extraction. "
-                                "Identify all technical skills, frameworks, programming languages, databases, "
-                                "cloud infrastructure tools, and methodologies in the text. "
-                                "For each skill, extract the canonical name, standard category, "
-                                "alias_resolved_from (exact mention), a confidence score (0.0 to 1.0), and "
-                                "the context_sentence where it is mentioned."
-                            ),
-                        ),
-                        ("human", "{text}"),
-                    ]
-                )
-
-                chain = prompt | structured_llm
-                llm_res = await chain.ainvoke({"text": text})
-
-                for s in llm_res.extracted_skills:
+                for s in await SkillExtractionService._extract_with_llm(text):
                     if s.canonical_name not in extracted:
                         extracted[s.canonical_name] = ExtractedSkill(
                             canonical_name=s.canonical_name,
@@ -149,25 +306,41 @@ class SkillExtractionService:
         return list(extracted.values())
 
     @staticmethod
-    async def resolve_alias(db: AsyncSession, raw_skill_name: str) -> Optional[NormalizedSkill]:
+    async def prefetch_fallback(
+        texts: Sequence[str], taxonomy: Sequence[NormalizedSkill]
+    ) -> None:
         """
-        Resolves a raw text skill string to a canonical NormalizedSkill record.
+        Starts the LLM fallback of every text that matches fewer than
+        FALLBACK_MIN_SKILLS taxonomy skills, concurrently, so the batcher can
+        group them into shared prompts. Later extract_skills_from_text calls
+        of the same texts are served from the fallback cache; failures are
+        left to those calls.
         """
-        name_clean = raw_skill_name.strip().lower()
+        matcher = SkillExtractionService.matcher_for(taxonomy)
+        needed = {
+            text
+            for text in texts
+            if text
+            and len(text.strip()) >= 5
+            and matcher.count(text) < FALLBACK_MIN_SKILLS
+        }
+        if needed:
+            batcher = get_fallback_batcher()
+            await asyncio.gather(
+                *(batcher.extract(text) for text in needed), return_exceptions=True
+            )
 
-        # Query all skills to find matches (canonical or alias)
-        stmt = select(NormalizedSkill)
-        res = await db.execute(stmt)
-        skills = res.scalars().all()
-
-        for skill in skills:
-            if skill.name.lower() == name_clean:
-                return skill
-            for alias in (skill.aliases or []):
-                if alias.lower() == name_clean:
-                    return skill
-
-        return None
+    @staticmethod
+    async def resolve_alias(db: AsyncSession, raw_skill_name: str) -> Optional[NormalizedSkill]:
+        """
+        Resolves a raw text skill string to a canonical NormalizedSkill record
+        through the term index of the cached taxonomy matcher.
+        """
+        matcher = await SkillExtractionService.get_matcher(db)
+        skill_id = matcher.resolve(raw_skill_name.strip())
+        if skill_id is None:
+            return None
+        return await db.get(NormalizedSkill, skill_id)
 
     @staticmethod
     async def add_new_skill(
@@ -191,4 +364,5 @@ class SkillExtractionService:
         )
         db.add(skill)
         await db.flush()
+        SkillExtractionService.invalidate_matcher()
         return skill
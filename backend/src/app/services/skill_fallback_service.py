@@ -0,0 +1,391 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_google_genai import ChatGoogleGenerativeAI
+from pydantic import BaseModel, Field
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.services.redis_service import RedisService
+
+logger = get_logger(__name__)
+
+# Descriptions grouped into one prompt may not exceed this many characters in total
+BATCH_MAX_CHARS = 16000
+
+_KEY_PREFIX = "skill_fallback"
+
+_SYSTEM_PROMPT = (
+    "You are an expert NLP parser specializing in technical skill extraction. "
+    "Identify all technical skills, frameworks, programming languages, databases, "
+    "cloud infrastructure tools, and methodologies in the text. "
+    "For each skill, extract the canonical name, standard category, "
+    "alias_resolved_from (exact mention), a confidence score (0.0 to 1.0), and "
+    "the context_sentence where it is mentioned."
+)
+
+
+class LLMExtractedSkill(BaseModel):
+    canonical_name: str = Field(description="Standardized skill name, e.g. React, Python")
+    category: str = Field(description="Category, e.g. Language, Framework, Database, Infrastructure")
+    alias_resolved_from: str = Field(description="The exact text phrase indicating the skill")
+    confidence_score: float = Field(description="Confidence rating between 0.0 and 1.0")
+    context_sentence: str = Field(description="The exact sentence containing the skill mention")
+
+
+class LLMExtractionResponse(BaseModel):
+    extracted_skills: List[LLMExtractedSkill] = Field(default_factory=list)
+
+
+class LLMBatchItem(BaseModel):
+    index: int = Field(description="Number of the description, as given in its header")
+    extracted_skills: List[LLMExtractedSkill] = Field(default_factory=list)
+
+
+class LLMBatchExtractionResponse(BaseModel):
+    results: List[LLMBatchItem] = Field(default_factory=list)
+
+
+class GeminiSkillFallbackModel:
+    """
+    Gemini skill extraction. One client is shared by every call; several
+    descriptions are sent as one numbered prompt and answered per number.
+    """
+
+    def __init__(self):
+        self.name = settings.model_name
+        llm = ChatGoogleGenerativeAI(model=settings.model_name, temperature=0.0)
+        self._single = ChatPromptTemplate.from_messages(
+            [("system", _SYSTEM_PROMPT), ("human", "{text}")]
+        ) | llm.with_structured_output(LLMExtractionResponse)
+        self._batch = ChatPromptTemplate.from_messages(
+            [
+                (
+                    "system",
+                    _SYSTEM_PROMPT
+                    + " The input holds several job descriptions, each starting with a "
+                    "'### Description <number>' header. Extract the skills of every "
+                    "description separately and return them under its number.",
+                ),
+                ("human", "{text}"),
+            ]
+        ) | llm.with_structured_output(LLMBatchExtractionResponse)
+
+    async def extract_batch(self, texts: Sequence[str]) -> List[List[LLMExtractedSkill]]:
+        if len(texts) == 1:
+            res = await self._single.ainvoke({"text": texts[0]})
+            return [res.extracted_skills]
+
+        prompt = "\n\n".join(
+            f"### Description {index}\n{text}" for index, text in enumerate(texts)
+        )
+        res = await self._batch.ainvoke({"text": prompt})
+        by_index: Dict[int, List[LLMExtractedSkill]] = {}
+        for item in res.results:
+            by_index.setdefault(item.index, []).extend(item.extracted_skills)
+        return [by_index.get(index, []) for index in range(len(texts))]
+
+
+class FakeSkillFallbackModel:
+    """
+    Local, deterministic stand-in for the LLM used by tests and benchmarks:
+    finds a fixed vocabulary of technologies with word-boundary matching.
+    latency simulates the per-prompt round trip; prompts and texts count
+    the calls made.
+    """
+
+    VOCABULARY: Dict[str, str] = {
+        "Python": "Language",
+        "Go": "Language",
+        "Rust": "Language",
+        "TypeScript": "Language",
+        "Java": "Language",
+        "Kotlin": "Language",
+        "SQL": "Language",
+        "React": "Framework",
+        "Django": "Framework",
+        "FastAPI": "Framework",
+        "Spring": "Framework",
+        "PyTorch": "Framework",
+        "PostgreSQL": "Database",
+        "Redis": "Database",
+        "MongoDB": "Database",
+        "Kafka": "Infrastructure",
+        "Docker": "Infrastructure",
+        "Kubernetes": "Infrastructure",
+        "Terraform": "Infrastructure",
+        "AWS": "Cloud",
+        "GCP": "Cloud",
+        "Azure": "Cloud",
+        "GraphQL": "Methodology",
+        "CI/CD": "Methodology",
+    }
+
+    name = "fake"
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.prompts = 0
+        self.texts = 0
+        self._patterns: List[Tuple[str, str, re.Pattern]] = [
+            (name, category, re.compile(r"\b" + re.escape(name.lower()) + r"\b"))
+            for name, category in self.VOCABULARY.items()
+        ]
+
+    async def extract_batch(self, texts: Sequence[str]) -> List[List[LLMExtractedSkill]]:
+        self.prompts += 1
+        self.texts += len(texts)
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return [self._extract(text) for text in texts]
+
+    def _extract(self, text: str) -> List[LLMExtractedSkill]:
+        lowered = text.lower()
+        skills = []
+        for name, category, pattern in self._patterns:
+            match = pattern.search(lowered)
+            if not match:
+                continue
+            start = max(text.rfind(d, 0, match.start()) for d in ".!?\n") + 1
+            ends = [i for i in (text.find(d, match.end()) for d in ".!?\n") if i != -1]
+            skills.append(
+                LLMExtractedSkill(
+                    canonical_name=name,
+                    category=category,
+                    alias_resolved_from=text[match.start() : match.end()],
+                    confidence_score=0.8,
+                    context_sentence=text[start : min(ends, default=len(text))].strip(),
+                )
+            )
+        return skills
+
+
+class SkillFallbackBatcher:
+    """
+    Micro-batching front of the fallback model. Short descriptions submitted
+    concurrently share one prompt (up to batch_size descriptions and
+    BATCH_MAX_CHARS characters); longer ones are sent on their own. A batch
+    is sent once the callers already scheduled have run, unless more
+    descriptions keep arriving or model calls are in flight, in which case it
+    waits arrival_gap at a time for more, max_wait at most. A lone caller is
+    not held back.
+    Answers are cached by the SHA-256 of the description, and concurrent
+    requests for the same description share one model call.
+    With ttl_seconds set, answers are also shared with other workers through
+    Redis, keyed by model name and content hash; a batch is looked up there
+    before the model is called. Redis errors are logged and treated as misses.
+    Failed calls are not cached and raise to every waiting caller; callers
+    of a cancelled call are cancelled.
+    """
+
+    def __init__(
+        self,
+        model,
+        batch_size: int = 8,
+        max_wait: float = 0.05,
+        arrival_gap: float = 0.005,
+        short_chars: int = 2000,
+        cache_size: int = 10000,
+        ttl_seconds: int = 0,
+        client=None,
+    ):
+        self.model = model
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.arrival_gap = arrival_gap
+        self.short_chars = short_chars
+        self.cache_size = cache_size
+        self.ttl_seconds = ttl_seconds
+        self.client = client
+        self._cache: "OrderedDict[str, List[LLMExtractedSkill]]" = OrderedDict()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        """Drops the per-event-loop state (pending batch, timer, in-flight calls)."""
+        self._pending: List[Tuple[str, str]] = []
+        self._pending_chars = 0
+        self._pending_since = 0.0
+        self._pending_seen = 0
+        self._timer: Optional[asyncio.Handle] = None
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._tasks: set = set()
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def _redis(self):
+        return self.client or RedisService.get_client()
+
+    def _shared_key(self, key: str) -> str:
+        model = getattr(self.model, "name", type(self.model).__name__)
+        return f"{_KEY_PREFIX}:{model}:{key}"
+
+    async def extract(self, text: str) -> List[LLMExtractedSkill]:
+        """Fallback skills of one description."""
+        key = self.content_hash(text)
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return list(cached)
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._reset()
+
+        future = self._in_flight.get(key)
+        if future is None:
+            future = loop.create_future()
+            self._in_flight[key] = future
+            if len(text) > self.short_chars:
+                self._start([(key, text)])
+            else:
+                if self._pending_chars + len(text) > BATCH_MAX_CHARS:
+                    self._flush()
+                if not self._pending:
+                    self._pending_since = loop.time()
+                self._pending.append((key, text))
+                self._pending_chars += len(text)
+                if len(self._pending) >= self.batch_size:
+                    self._flush()
+                elif self._timer is None:
+                    # With model calls in flight, other callers are likely on their way
+                    self._pending_seen = 0 if self._tasks else len(self._pending)
+                    self._timer = loop.call_soon(self._check)
+
+        # Shielded: a cancelled caller must not cancel the answer others wait for
+        return list(await asyncio.shield(future))
+
+    def _check(self) -> None:
+        """Sends the pending batch unless more descriptions came since last checked."""
+        self._timer = None
+        waited = self._loop.time() - self._pending_since
+        if len(self._pending) > self._pending_seen and waited < self.max_wait:
+            self._pending_seen = len(self._pending)
+            self._timer = self._loop.call_later(
+                min(self.arrival_gap, self.max_wait - waited), self._check
+            )
+        else:
+            self._flush()
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_chars = self._pending, [], 0
+        if batch:
+            self._start(batch)
+
+    def _start(self, batch: List[Tuple[str, str]]) -> None:
+        task = asyncio.get_running_loop().create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _remember(self, key: str, skills: List[LLMExtractedSkill]) -> None:
+        if self.cache_size:
+            self._cache[key] = skills
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _resolve(self, key: str, skills: List[LLMExtractedSkill]) -> None:
+        self._remember(key, skills)
+        future = self._in_flight.pop(key, None)
+        if future is not None and not future.done():
+            future.set_result(skills)
+
+    async def _shared_answers(
+        self, batch: List[Tuple[str, str]]
+    ) -> List[Tuple[str, str]]:
+        """Resolves the descriptions answered in Redis; returns the others."""
+        if not self.ttl_seconds:
+            return batch
+        try:
+            values = await self._redis().mget(
+                [self._shared_key(key) for key, _ in batch]
+            )
+        except Exception as e:
+            logger.warning(f"Skill fallback cache lookup in Redis failed: {e}")
+            return batch
+        missing = []
+        for (key, text), value in zip(batch, values, strict=True):
+            if value:
+                skills = json.loads(value)
+                self._resolve(key, [LLMExtractedSkill.model_validate(s) for s in skills])
+            else:
+                missing.append((key, text))
+        return missing
+
+    async def _share(self, answers: List[Tuple[str, List[LLMExtractedSkill]]]) -> None:
+        if not self.ttl_seconds or not answers:
+            return
+        try:
+            async with self._redis().pipeline(transaction=False) as pipe:
+                for key, skills in answers:
+                    pipe.set(
+                        self._shared_key(key),
+                        json.dumps([skill.model_dump() for skill in skills]),
+                        ex=self.ttl_seconds,
+                    )
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f"Skill fallback cache store in Redis failed: {e}")
+
+    async def _run(self, batch: List[Tuple[str, str]]) -> None:
+        try:
+            missing = await self._shared_answers(batch)
+            if not missing:
+                return
+            results = await self.model.extract_batch([text for _, text in missing])
+        except asyncio.CancelledError:
+            # Waiting callers would otherwise wait forever on the shielded futures
+            for key, _ in batch:
+                future = self._in_flight.pop(key, None)
+                if future is not None and not future.done():
+                    future.cancel()
+            raise
+        except Exception as e:
+            logger.error(f"Skill fallback call for {len(batch)} descriptions failed: {e}")
+            for key, _ in batch:
+                future = self._in_flight.pop(key, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
+            return
+
+        results = list(results) + [[]] * (len(missing) - len(results))
+        answers = [(key, skills) for (key, _), skills in zip(missing, results)]
+        for key, skills in answers:
+            self._resolve(key, skills)
+        await self._share(answers)
+
+
+_batcher: Optional[SkillFallbackBatcher] = None
+
+
+def get_fallback_batcher() -> SkillFallbackBatcher:
+    """Process-wide fallback batcher over the configured model."""
+    global _batcher
+    if _batcher is None:
+        model = (
+            FakeSkillFallbackModel()
+            if settings.skill_fallback_model == "fake"
+            else GeminiSkillFallbackModel()
+        )
+        _batcher = SkillFallbackBatcher(
+            model,
+            batch_size=settings.skill_fallback_batch_size,
+            max_wait=settings.skill_fallback_max_wait_ms / 1000,
+            short_chars=settings.skill_fallback_short_chars,
+            cache_size=settings.skill_fallback_cache_size,
+            ttl_seconds=settings.skill_fallback_cache_ttl_seconds,
+        )
+    return _batcher
@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from uuid import uuid4
+
+from sqlalchemy import distinct, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logging import get_logger
+from app.infrastructure.database.models import (
+    JobPosting,
+    RawJobPosting,
+    StagingReprocessCheckpoint,
+)
+from app.services.database_service import AsyncSessionLocal, async_engine
+from app.services.job_ingestion_service import CONTENT_FIELDS, JobIngestionService
+from app.utils.event_bus import EventBus
+
+logger = get_logger(__name__)
+
+# Raw postings re-derived and committed per checkpoint
+REPROCESS_CHUNK_SIZE = 500
+
+
+class StagingReprocessService:
+    """
+    Rebuilds job_postings, compensation_records and job_postings_skills from
+    the staged raw_job_postings, without calling any provider API. Used to
+    apply changes to title/location normalization, compensation parsing or
+    the skills taxonomy to existing data.
+    """
+
+    @staticmethod
+    def _raw_job(row: Any) -> Dict[str, Any]:
+        """Unified job dictionary of a staged raw posting row."""
+        return {
+            "external_id": row.external_id,
+            "title": row.title,
+            "company_name": row.company_name,
+            "description": row.description,
+            "location_raw": row.location_raw,
+            "url": row.url,
+            "salary_raw": row.salary_raw,
+            "raw_payload": row.raw_payload,
+        }
+
+    @staticmethod
+    async def _load_checkpoint(
+        db: AsyncSession, job_name: str, source_key: str, restart: bool
+    ) -> StagingReprocessCheckpoint:
+        """
+        Returns the checkpoint of (job_name, source_key), creating it on the
+        first run. restart rewinds an existing checkpoint to the beginning.
+        """
+        stmt = select(StagingReprocessCheckpoint).where(
+            StagingReprocessCheckpoint.job_name == job_name,
+            StagingReprocessCheckpoint.source_key == source_key,
+        )
+        res = await db.execute(stmt)
+        checkpoint = res.scalar_one_or_none()
+
+        if not checkpoint:
+            checkpoint = StagingReprocessCheckpoint(
+                id=str(uuid4()),
+                job_name=job_name,
+                source_key=source_key,
+                rows_processed=0,
+                status="RUNNING",
+            )
+            db.add(checkpoint)
+        elif restart:
+            checkpoint.last_raw_id = None
+            checkpoint.rows_processed = 0
+            checkpoint.status = "RUNNING"
+            checkpoint.started_at = datetime.utcnow()
+            checkpoint.completed_at = None
+
+        await db.commit()
+        return checkpoint
+
+    @staticmethod
+    async def _refresh_rows(
+        db: AsyncSession,
+        refreshes: Sequence[Tuple[str, Dict[str, Any], Sequence[str]]],
+    ) -> int:
+        """
+        Refreshes existing core postings in one savepoint. A failing batch is
+        rolled back and retried row by row, each row in its own savepoint.
+        Returns the number of postings that could not be refreshed.
+        """
+        if not refreshes:
+            return 0
+        try:
+            async with db.begin_nested():
+                await JobIngestionService.refresh_postings(db, refreshes)
+            return 0
+        except Exception as ex:
+            logger.warning(
+                f"Bulk refresh of {len(refreshes)} postings failed ({ex}). Retrying row by row."
+            )
+
+        failed = 0
+        for posting_id, raw_job, changed in refreshes:
+            try:
+                async with db.begin_nested():
+                    await JobIngestionService.refresh_postings(
+                        db, [(posting_id, raw_job, changed)]
+                    )
+            except Exception as ex:
+                logger.error(
+                    f"Failed refreshing staged posting {raw_job['external_id']}: {ex}",
+                    exc_info=True,
+                )
+                failed += 1
+        return failed
+
+    @staticmethod
+    async def reprocess_chunk(
+        db: AsyncSession, source_key: str, rows: Sequence[Any]
+    ) -> Dict[str, int]:
+        """
+        Re-derives the core rows of a chunk of staged raw postings in bulk.
+        Postings that already exist re-run every normalization stage; staged
+        postings without a core posting go through the full ingestion path.
+        Failing rows are rolled back and counted as failed instead of failing
+        the chunk, so the checkpoint still advances past them.
+        """
+        raw_jobs = [StagingReprocessService._raw_job(row) for row in rows]
+        external_ids = [raw_job["external_id"] for raw_job in raw_jobs]
+
+        core_res = await db.execute(
+            select(JobPosting.source_id, JobPosting.id).where(
+                JobPosting.source_id.in_(external_ids)
+            )
+        )
+        core = dict(core_res.all())
+
+        refreshes = [
+            (core[raw_job["external_id"]], raw_job, CONTENT_FIELDS)
+            for raw_job in raw_jobs
+            if raw_job["external_id"] in core
+        ]
+        refresh_failed = await StagingReprocessService._refresh_rows(db, refreshes)
+
+        created = 0
+        failed = refresh_failed
+        missing = [
+            (row, raw_job)
+            for row, raw_job in zip(rows, raw_jobs)
+            if raw_job["external_id"] not in core
+        ]
+        if missing:
+            # The raw rows are already staged, so the run id is only a placeholder
+            outcomes = await JobIngestionService._process_entries(
+                db,
+                [raw_job for _, raw_job in missing],
+                missing[0][0].ingestion_run_id,
+                source_key,
+                bulk=True,
+            )
+            created = sum(outcome is True for outcome in outcomes)
+            failed += sum(isinstance(outcome, Exception) for outcome in outcomes)
+
+        return {
+            "refreshed": len(refreshes) - refresh_failed,
+            "created": created,
+            "failed": failed,
+        }
+
+    @staticmethod
+    async def reprocess_source(
+        source_key: str,
+        job_name: str = "default",
+        chunk_size: int = REPROCESS_CHUNK_SIZE,
+        restart: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Streams the staged raw postings of one source with a server-side
+        cursor, in raw id order, and re-derives them chunk by chunk. Every
+        chunk commits together with its checkpoint, so an interrupted job
+        resumes after the last committed chunk. A completed job is a no-op
+        unless restart is set.
+        """
+        source_key = source_key.lower().strip()
+        stats = {
+            "source_key": source_key,
+            "rows": 0,
+            "refreshed": 0,
+            "created": 0,
+            "failed": 0,
+            "chunks": 0,
+        }
+
+        async with AsyncSessionLocal() as write_db, AsyncSessionLocal() as read_db:
+            checkpoint = await StagingReprocessService._load_checkpoint(
+                write_db, job_name, source_key, restart
+            )
+            if checkpoint.status == "COMPLETED":
+                logger.info(
+                    f"Reprocess job '{job_name}' already completed for {source_key}. Skipping."
+                )
+                stats["rows"] = checkpoint.rows_processed
+                return stats
+
+            stmt = (
+                select(
+                    RawJobPosting.id,
+                    RawJobPosting.ingestion_run_id,
+                    RawJobPosting.external_id,
+                    RawJobPosting.title,
+                    RawJobPosting.company_name,
+                    RawJobPosting.description,
+                    RawJobPosting.location_raw,
+                    RawJobPosting.url,
+                    RawJobPosting.salary_raw,
+                    RawJobPosting.raw_payload,
+                )
+                .where(RawJobPosting.source_key == source_key)
+                .order_by(RawJobPosting.id)
+                .execution_options(yield_per=chunk_size)
+            )
+            if checkpoint.last_raw_id:
+                stmt = stmt.where(RawJobPosting.id > checkpoint.last_raw_id)
+
+            result = await read_db.stream(stmt)
+            async for rows in result.partitions(chunk_size):
+                chunk_stats = await StagingReprocessService.reprocess_chunk(
+                    write_db, source_key, rows
+                )
+                checkpoint.last_raw_id = rows[-1].id
+                checkpoint.rows_processed += len(rows)
+                await write_db.commit()
+
+                stats["rows"] += len(rows)
+                stats["refreshed"] += chunk_stats["refreshed"]
+                stats["created"] += chunk_stats["created"]
+                stats["failed"] += chunk_stats["failed"]
+                stats["chunks"] += 1
+                logger.info(
+                    f"Reprocessed {checkpoint.rows_processed} staged postings of {source_key} "
+                    f"(job '{job_name}')"
+                )
+
+            checkpoint.status = "COMPLETED"
+            checkpoint.completed_at = datetime.utcnow()
+            await write_db.commit()
+
+        await EventBus.publish(
+            "market.staging_reprocess.completed",
+            {"job_name": job_name, **stats},
+        )
+        return stats
+
+    @staticmethod
+    async def list_source_keys() -> List[str]:
+        """Source keys that have staged raw postings."""
+        async with AsyncSessionLocal() as db:
+            res = await db.execute(
+                select(distinct(RawJobPosting.source_key)).order_by(
+                    RawJobPosting.source_key
+                )
+            )
+            return list(res.scalars().all())
+
+    @staticmethod
+    async def reprocess_all(
+        source_keys: Optional[Sequence[str]] = None,
+        job_name: str = "default",
+        workers: Optional[int] = None,
+        chunk_size: int = REPROCESS_CHUNK_SIZE,
+        restart: bool = False,
+    ) -> Dict[str, Dict[str, Any] | Exception]:
+        """
+        Reprocesses every source (or the given ones) in parallel worker
+        processes, one source_key per task. Returns the stats, or the raised
+        exception, per source; failed sources resume from their checkpoint
+        on the next run.
+        """
+        if source_keys is None:
+            source_keys = await StagingReprocessService.list_source_keys()
+        if not source_keys:
+            return {}
+
+        loop = asyncio.get_running_loop()
+        # Spawned workers build their own engine instead of inheriting pooled connections
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(
+            max_workers=workers or min(len(source_keys), multiprocessing.cpu_count()),
+            mp_context=context,
+        ) as pool:
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        pool, _reprocess_worker, key, job_name, chunk_size, restart
+                    )
+                    for key in source_keys
+                ),
+                return_exceptions=True,
+            )
+        return dict(zip(source_keys, results))
+
+
+def _reprocess_worker(
+    source_key: str, job_name: str, chunk_size: int, restart: bool
+) -> Dict[str, Any]:
+    """Process pool entry point reprocessing one source."""
+
+    async def run() -> Dict[str, Any]:
+        try:
+            return await StagingReprocessService.reprocess_source(
+                source_key, job_name, chunk_size, restart
+            )
+        finally:
+            await async_engine.dispose()
+
+    return asyncio.run(run())
@@ -1,35 +1,282 @@
 from __future__ import annotations
 
+import asyncio
 import json
-from datetime import datetime
-from uuid import uuid4
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
 
+from redis.exceptions import ResponseError
+
+from app.core.config import settings
 from app.core.logging import get_logger
 from app.services.redis_service import RedisService
+from app.utils.event_dispatcher import Event, EventDispatcher
 
 logger = get_logger(__name__)
 
+# Streams are trimmed with MAXLEN ~, letting Redis drop whole nodes at a time;
+# lengths may overshoot event_stream_maxlen slightly
+TRIM_APPROXIMATE = True
+DEAD_LETTER_STREAM = "dead-letter"
+
+StreamHandler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+def stream_key(event_type: str) -> str:
+    """Redis stream holding the events of one type."""
+    return f"{settings.event_stream_prefix}:{event_type}"
+
+
+def _decode(value: Any) -> Any:
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
 
 class EventBus:
     """
-    Lightweight asynchronous event publisher.
-    Publishes events to Redis Pub/Sub channels and logs them.
+    Asynchronous event publisher.
+    Events are dispatched to in-process handlers (dispatcher) and appended
+    to one Redis stream per event type over the shared connection pool. Streams are
+    bounded to about event_stream_maxlen entries and are read through
+    consumer groups (EventConsumer), so events published while no consumer
+    is connected are not lost.
     """
 
     @staticmethod
-    async def publish(event_type: str, data: dict) -> None:
-        event = {
-            "event_id": str(uuid4()),
-            "event_type": event_type,
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "data": data,
+    def stream_fields(event: Event) -> Dict[str, str]:
+        """Stream entry fields of an event; data is stored as JSON."""
+        return {
+            "event_id": event.event_id,
+            "event_type": event.event_type,
+            "timestamp": event.timestamp,
+            "data": json.dumps(event.data),
         }
-        event_str = json.dumps(event)
-        logger.info(f"Publishing event '{event_type}': {event_str}")
+
+    @staticmethod
+    async def publish(event_type: str, data: dict) -> None:
+        await EventBus.publish_many([(event_type, data)])
+
+    @staticmethod
+    async def publish_many(events: Sequence[Tuple[str, dict]]) -> List[str]:
+        """
+        Dispatches events in process and appends the ones that cross
+        processes to their streams with one pipelined round trip.
+        Returns the stream entry ids, or an empty list if Redis failed.
+        """
+        return await dispatcher.publish_many(events)
+
+    @staticmethod
+    async def append_to_streams(events: Sequence[Event]) -> List[str]:
+        """Appends events to their Redis streams in order, pipelined."""
+        if not events:
+            return []
+        entries = [
+            (stream_key(event.event_type), EventBus.stream_fields(event)) for event in events
+        ]
 
         try:
             client = RedisService.get_client()
-            await client.publish(event_type, event_str)
-            await client.close()
+            async with client.pipeline(transaction=False) as pipe:
+                for key, fields in entries:
+                    pipe.xadd(
+                        key,
+                        fields,
+                        maxlen=settings.event_stream_maxlen,
+                        approximate=TRIM_APPROXIMATE,
+                    )
+                entry_ids = await pipe.execute()
         except Exception as e:
-            logger.error(f"Failed to publish event to Redis: {e}")
+            logger.error(f"Failed to publish {len(entries)} events to Redis: {e}")
+            return []
+
+        logger.debug(
+            f"Published {len(entries)} events: "
+            + ", ".join(f"{event.event_type}/{event.event_id}" for event in events)
+        )
+        return [_decode(entry_id) for entry_id in entry_ids]
+
+
+# Process-wide dispatcher; every event also goes on to Redis
+dispatcher = EventDispatcher(
+    forward=lambda events: EventBus.append_to_streams(events),
+    queue_size=settings.event_handler_queue_size,
+)
+
+
+class EventConsumer:
+    """
+    Reads event streams as one consumer of a consumer group.
+
+    Every poll hands up to batch_size events to handler and acknowledges the
+    ones it processed. An event whose handler raised stays pending and is
+    claimed again once it has been idle for retry_idle_ms; after
+    max_deliveries deliveries it is moved to the dead-letter stream instead.
+    Handlers therefore see an event at least once and should be idempotent.
+    """
+
+    def __init__(
+        self,
+        group: str,
+        consumer: str,
+        event_types: Sequence[str],
+        handler: StreamHandler,
+        batch_size: int = 100,
+        block_ms: Optional[int] = 1000,
+        max_deliveries: Optional[int] = None,
+        retry_idle_ms: Optional[int] = None,
+        client=None,
+    ):
+        self.group = group
+        self.consumer = consumer
+        self.streams = [stream_key(event_type) for event_type in event_types]
+        self.handler = handler
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.max_deliveries = max_deliveries or settings.event_consumer_max_deliveries
+        self.retry_idle_ms = (
+            settings.event_consumer_retry_idle_ms if retry_idle_ms is None else retry_idle_ms
+        )
+        self.client = client
+        self.handled = 0
+        self.failed = 0
+        self.dead_lettered = 0
+        self._groups_ready = False
+        self._next_reclaim = 0.0
+
+    def _redis(self):
+        return self.client or RedisService.get_client()
+
+    async def ensure_groups(self, start_id: str = "0") -> None:
+        """
+        Creates the consumer group on every stream (and the stream itself).
+        A new group starts at start_id, by default the oldest retained event.
+        """
+        client = self._redis()
+        for stream in self.streams:
+            try:
+                await client.xgroup_create(stream, self.group, id=start_id, mkstream=True)
+            except ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+        self._groups_ready = True
+
+    @staticmethod
+    def decode_event(entry_id: Any, fields: Dict[Any, Any]) -> Dict[str, Any]:
+        """The published event of a stream entry, with its stream id."""
+        decoded = {_decode(key): _decode(value) for key, value in fields.items()}
+        return {
+            "event_id": decoded.get("event_id"),
+            "event_type": decoded.get("event_type"),
+            "timestamp": decoded.get("timestamp"),
+            "data": json.loads(decoded.get("data") or "null"),
+            "stream_id": _decode(entry_id),
+        }
+
+    async def poll(self) -> int:
+        """
+        Processes one batch: pending events due for retry first, then new
+        ones (waiting up to block_ms when nothing was retried).
+        Returns the number of events handled successfully.
+        """
+        client = self._redis()
+        if not self._groups_ready:
+            await self.ensure_groups()
+
+        handled = 0
+        retried = False
+        loop = asyncio.get_running_loop()
+        if loop.time() >= self._next_reclaim:
+            self._next_reclaim = loop.time() + self.retry_idle_ms / 2000
+            for stream in self.streams:
+                claimed = await client.xautoclaim(
+                    stream,
+                    self.group,
+                    self.consumer,
+                    min_idle_time=self.retry_idle_ms,
+                    start_id="0-0",
+                    count=self.batch_size,
+                )
+                entries = claimed[1]
+                if entries:
+                    retried = True
+                    handled += await self._handle(client, stream, entries, claimed=True)
+
+        response = await client.xreadgroup(
+            self.group,
+            self.consumer,
+            {stream: ">" for stream in self.streams},
+            count=self.batch_size,
+            block=None if retried else self.block_ms,
+        )
+        for stream, entries in response.items() if isinstance(response, dict) else response or []:
+            handled += await self._handle(client, _decode(stream), entries)
+        return handled
+
+    async def _handle(
+        self, client, stream: str, entries: List[Tuple[Any, Any]], claimed: bool = False
+    ) -> int:
+        deliveries: Dict[Any, int] = {}
+        if claimed:
+            async with client.pipeline(transaction=False) as pipe:
+                for entry_id, _ in entries:
+                    pipe.xpending_range(
+                        stream, self.group, min=entry_id, max=entry_id, count=1
+                    )
+                for entry_id, pending in zip(
+                    [entry_id for entry_id, _ in entries], await pipe.execute()
+                ):
+                    if pending:
+                        deliveries[entry_id] = pending[0]["times_delivered"]
+
+        acked = []
+        dead = []
+        for entry_id, fields in entries:
+            # Entries trimmed from the stream while pending have no fields
+            if not fields:
+                acked.append(entry_id)
+                continue
+            if deliveries.get(entry_id, 1) > self.max_deliveries:
+                dead.append((entry_id, fields))
+                continue
+            event = self.decode_event(entry_id, fields)
+            try:
+                await self.handler(event)
+            except Exception as e:
+                self.failed += 1
+                logger.error(
+                    f"Handler of group '{self.group}' failed on {event['event_type']} "
+                    f"event {event['event_id']}: {e}"
+                )
+                continue
+            acked.append(entry_id)
+
+        if acked or dead:
+            async with client.pipeline(transaction=False) as pipe:
+                for entry_id, fields in dead:
+                    pipe.xadd(
+                        stream_key(DEAD_LETTER_STREAM),
+                        {**fields, "stream": stream, "group": self.group},
+                        maxlen=settings.event_stream_maxlen,
+                        approximate=TRIM_APPROXIMATE,
+                    )
+                pipe.xack(stream, self.group, *acked, *[entry_id for entry_id, _ in dead])
+                await pipe.execute()
+        for entry_id, _ in dead:
+            logger.warning(
+                f"Event {_decode(entry_id)} of {stream} moved to the dead-letter stream "
+                f"after {deliveries[entry_id] - 1} failed deliveries"
+            )
+
+        handled = len(acked) - sum(1 for _, fields in entries if not fields)
+        self.handled += handled
+        self.dead_lettered += len(dead)
+        return handled
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Polls until stop is set; Redis errors are logged and retried."""
+        while not stop.is_set():
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Event consumer '{self.group}/{self.consumer}' poll failed: {e}")
+                await asyncio.sleep(1.0)
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from uuid import uuid4
+
+from app.core.logging import get_logger
+from app.services.metrics_collection_service import MetricsCollectionService
+
+logger = get_logger(__name__)
+
+DEFAULT_QUEUE_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class Event:
+    """An event as handed to in-process handlers and forwarded to Redis."""
+
+    event_type: str
+    data: Dict[str, Any]
+    event_id: str = field(default_factory=lambda: str(uuid4()))
+    timestamp: str = field(default_factory=lambda: datetime.utcnow().isoformat() + "Z")
+
+
+EventHandler = Callable[[Event], Awaitable[None]]
+Forwarder = Callable[[List[Event]], Awaitable[List[str]]]
+
+
+def _matches(pattern: str, event_type: str) -> bool:
+    """Exact event type, or a prefix pattern such as "market.*"."""
+    if pattern.endswith("*"):
+        return event_type.startswith(pattern[:-1])
+    return pattern == event_type
+
+
+class _Subscription:
+    def __init__(self, name: str, patterns: Tuple[str, ...], handler: EventHandler, queue_size: int):
+        self.name = name
+        self.patterns = patterns
+        self.handler = handler
+        self.queue_size = queue_size
+        self.queue: Optional[asyncio.Queue[Event]] = None
+        self.task: Optional[asyncio.Task] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.handled = 0
+        self.failed = 0
+        self.dropped = 0
+
+    def matches(self, event_type: str) -> bool:
+        return any(_matches(pattern, event_type) for pattern in self.patterns)
+
+
+class EventDispatcher:
+    """
+    Typed in-process event dispatch.
+
+    Handlers subscribe to event types (or "prefix.*" patterns). Every handler
+    has its own bounded queue and worker task, so a slow or failing handler
+    neither blocks the publisher nor the other handlers: exceptions are
+    logged and counted, and events offered to a full queue are dropped and
+    counted. Events are additionally handed to forward (the Redis streams of
+    EventBus) unless their type is local-only.
+    """
+
+    def __init__(
+        self,
+        forward: Optional[Forwarder] = None,
+        local_only: Iterable[str] = (),
+        queue_size: int = DEFAULT_QUEUE_SIZE,
+    ):
+        self.forward = forward
+        self.local_only = set(local_only)
+        self.queue_size = queue_size
+        self._subscriptions: Dict[str, _Subscription] = {}
+
+    def subscribe(
+        self,
+        event_types: Union[str, Sequence[str]],
+        handler: EventHandler,
+        name: Optional[str] = None,
+        queue_size: Optional[int] = None,
+    ) -> str:
+        """Registers handler for event_types; returns the subscription name."""
+        patterns = (event_types,) if isinstance(event_types, str) else tuple(event_types)
+        name = name or f"{handler.__module__}.{handler.__qualname__}"
+        if name in self._subscriptions:
+            raise ValueError(f"Event handler '{name}' is already subscribed")
+        self._subscriptions[name] = _Subscription(
+            name, patterns, handler, queue_size or self.queue_size
+        )
+        return name
+
+    def on(
+        self,
+        event_types: Union[str, Sequence[str]],
+        name: Optional[str] = None,
+        queue_size: Optional[int] = None,
+    ) -> Callable[[EventHandler], EventHandler]:
+        """Decorator form of subscribe."""
+
+        def register(handler: EventHandler) -> EventHandler:
+            self.subscribe(event_types, handler, name=name, queue_size=queue_size)
+            return handler
+
+        return register
+
+    def unsubscribe(self, name: str) -> None:
+        subscription = self._subscriptions.pop(name, None)
+        if subscription and subscription.task:
+            subscription.task.cancel()
+
+    def is_local_only(self, event_type: str) -> bool:
+        return any(_matches(pattern, event_type) for pattern in self.local_only)
+
+    def dispatch(self, event: Event) -> int:
+        """
+        Queues event for every matching handler without waiting for them.
+        Returns the number of handlers it was queued for.
+        """
+        queued = 0
+        for subscription in list(self._subscriptions.values()):
+            if not subscription.matches(event.event_type):
+                continue
+            queue = self._queue(subscription)
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                subscription.dropped += 1
+                MetricsCollectionService.record_event_handler(subscription.name, "dropped")
+                logger.warning(
+                    f"Event handler '{subscription.name}' queue is full; "
+                    f"dropped {event.event_type} event {event.event_id}"
+                )
+                continue
+            MetricsCollectionService.set_event_queue_depth(subscription.name, queue.qsize())
+            queued += 1
+        return queued
+
+    async def publish(self, event_type: str, data: dict) -> None:
+        await self.publish_many([(event_type, data)])
+
+    async def publish_many(self, events: Sequence[Tuple[str, dict]]) -> List[str]:
+        """
+        Dispatches events in process and forwards the ones that are not
+        local-only. Returns the ids assigned by the forwarder.
+        """
+        built = [Event(event_type, data) for event_type, data in events]
+        for event in built:
+            self.dispatch(event)
+        remote = [event for event in built if not self.is_local_only(event.event_type)]
+        if not remote or self.forward is None:
+            return []
+        return await self.forward(remote)
+
+    async def drain(self) -> None:
+        """Waits until every event queued on the running loop has been handled."""
+        loop = asyncio.get_running_loop()
+        for subscription in list(self._subscriptions.values()):
+            if subscription.queue is not None and subscription.loop is loop:
+                await subscription.queue.join()
+
+    async def close(self) -> None:
+        """Stops the handler workers; queued events are discarded."""
+        tasks = [s.task for s in self._subscriptions.values() if s.task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for subscription in self._subscriptions.values():
+            subscription.queue = subscription.task = subscription.loop = None
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-handler counters and current queue depth."""
+        return {
+            name: {
+                "handled": s.handled,
+                "failed": s.failed,
+                "dropped": s.dropped,
+                "queued": s.queue.qsize() if s.queue is not None else 0,
+            }
+            for name, s in self._subscriptions.items()
+        }
+
+    def _queue(self, subscription: _Subscription) -> asyncio.Queue[Event]:
+        # Queues and workers belong to the event loop they were started on
+        loop = asyncio.get_running_loop()
+        if subscription.loop is not loop:
+            subscription.loop = loop
+            subscription.queue = asyncio.Queue(maxsize=subscription.queue_size)
+            subscription.task = loop.create_task(self._work(subscription, subscription.queue))
+        return subscription.queue
+
+    async def _work(self, subscription: _Subscription, queue: asyncio.Queue[Event]) -> None:
+        while True:
+            event = await queue.get()
+            started = time.perf_counter()
+            try:
+                await subscription.handler(event)
+                subscription.handled += 1
+                outcome = "handled"
+            except Exception as e:
+                subscription.failed += 1
+                outcome = "failed"
+                logger.error(
+                    f"Event handler '{subscription.name}' failed on {event.event_type} "
+                    f"event {event.event_id}: {e}"
+                )
+            finally:
+                queue.task_done()
+            MetricsCollectionService.record_event_handler(
+                subscription.name, outcome, time.perf_counter() - started
+            )
+            MetricsCollectionService.set_event_queue_depth(subscription.name, queue.qsize())
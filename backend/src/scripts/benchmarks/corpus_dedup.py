@@ -0,0 +1,110 @@
+"""
+Measures offline corpus re-dedup clustering throughput.
+
+Generates a synthetic corpus of --postings active postings spread over
+companies of skewed sizes (a few employers with thousands of openings, a long
+tail of small ones) and clusters every company with
+CorpusDedupService.cluster_company in a process pool, without a database.
+
+Usage (from backend/src):
+    python -m scripts.benchmarks.corpus_dedup --postings 100000 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from app.services.corpus_dedup_service import CorpusDedupService
+
+TITLES = [
+    "Senior Backend Engineer",
+    "Backend Engineer",
+    "Data Engineer",
+    "Frontend Developer",
+    "Staff Python Developer",
+    "Machine Learning Engineer",
+    "Product Manager",
+    "Site Reliability Engineer",
+]
+LOCATIONS = ["Remote", "New York, NY", "Austin, TX", "San Francisco, CA"]
+
+
+def company_sizes(total: int, rng: random.Random) -> List[int]:
+    """Pareto-distributed company sizes summing to total."""
+    sizes = []
+    while total > 0:
+        size = min(total, max(1, int(rng.paretovariate(1.1) * 5)), 15000)
+        sizes.append(size)
+        total -= size
+    return sizes
+
+
+def build_company(company: int, size: int, seed: int) -> List[Dict[str, Any]]:
+    """Synthetic active postings of one company; ~10% are near-duplicate reposts."""
+    rng = random.Random(seed)
+    vocab = [f"term{i}" for i in range(3000)]
+    templates = [rng.choices(vocab, k=150) for _ in range(max(1, size // 20))]
+    rows = []
+    for i in range(size):
+        tokens = list(rng.choice(templates))
+        for _ in range(rng.randint(10 if rng.random() > 0.1 else 0, 60)):
+            tokens[rng.randrange(len(tokens))] = rng.choice(vocab)
+        rows.append(
+            {
+                "id": f"c{company}p{i}",
+                "company_id": f"c{company}",
+                "raw_title": rng.choice(TITLES),
+                "location": rng.choice(LOCATIONS),
+                "description": " ".join(tokens),
+                "created_at": datetime(2024, 1, 1) + timedelta(minutes=i),
+                "title_tokens": None,
+                "description_tf": None,
+                "minhash_signature": None,
+                "dedupe_fingerprint": None,
+            }
+        )
+    return rows
+
+
+def cluster(company: int, size: int, seed: int) -> tuple[int, int, float]:
+    rows = build_company(company, size, seed)
+    started = time.perf_counter()
+    clusters = CorpusDedupService.cluster_company(rows)
+    merged = sum(len(c["members"]) for c in clusters)
+    return len(clusters), merged, time.perf_counter() - started
+
+
+def main(postings: int, workers: int) -> None:
+    rng = random.Random(42)
+    sizes = company_sizes(postings, rng)
+    started = time.perf_counter()
+    clusters = merged = 0
+    cluster_seconds = 0.0
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        for n_clusters, n_merged, seconds in pool.map(
+            cluster, range(len(sizes)), sizes, range(len(sizes)), chunksize=16
+        ):
+            clusters += n_clusters
+            merged += n_merged
+            cluster_seconds += seconds
+    elapsed = time.perf_counter() - started
+
+    print(f"postings:   {postings} in {len(sizes)} companies (largest {max(sizes)})")
+    print(f"clusters:   {clusters}, {merged} postings merged")
+    print(f"clustering: {cluster_seconds:8.2f}s of worker time")
+    print(f"wall clock: {elapsed:8.2f}s with {workers} workers (includes corpus generation)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--postings", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    args = parser.parse_args()
+    main(args.postings, args.workers)
@@ -0,0 +1,119 @@
+"""
+Compares scalar and vectorized (sparse matrix) dedup scoring.
+
+Builds a synthetic company with --candidates stored primaries and scores a
+batch of --incoming postings against it, once posting by posting with
+JobDeduplicationService.find_best_match and once with
+JobDeduplicationService.match_company_batch. Runs in memory without a
+database, and checks that both paths reach the same decisions.
+
+Usage (from backend/src):
+    python -m scripts.benchmarks.dedup_scoring --candidates 10000 --incoming 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Dict, List, Optional, Tuple
+
+from app.infrastructure.database.models import JobPosting
+from app.services.job_deduplication_service import JobDeduplicationService
+
+TITLES = [
+    "Senior Backend Engineer",
+    "Backend Engineer",
+    "Data Engineer",
+    "Frontend Developer",
+    "Staff Python Developer",
+    "Machine Learning Engineer",
+]
+LOCATIONS = ["Remote", "New York, NY", "Austin, TX", "San Francisco, CA"]
+
+
+def build_postings(count: int, prefix: str, rng: random.Random) -> List[JobPosting]:
+    """Synthetic postings of one company, drawn from a few shared description templates."""
+    vocab = [f"term{i}" for i in range(2000)]
+    templates = [rng.choices(vocab, k=120) for _ in range(50)]
+    postings = []
+    for i in range(count):
+        tokens = list(rng.choice(templates))
+        for _ in range(rng.randint(0, 40)):
+            tokens[rng.randrange(len(tokens))] = rng.choice(vocab)
+        job = JobPosting(
+            id=f"{prefix}{i}",
+            company_id="bench",
+            raw_title=rng.choice(TITLES),
+            description=" ".join(tokens),
+            location=rng.choice(LOCATIONS),
+        )
+        JobDeduplicationService.apply_features(job)
+        postings.append(job)
+    return postings
+
+
+def exact_primaries(candidates: List[JobPosting]) -> Dict[str, JobPosting]:
+    exact: Dict[str, JobPosting] = {}
+    for job in candidates:
+        exact.setdefault(job.dedupe_fingerprint, job)
+    return exact
+
+
+def run_scalar(
+    incoming: List[JobPosting], candidates: List[JobPosting]
+) -> List[Tuple[Optional[str], float]]:
+    candidates = list(candidates)
+    exact = exact_primaries(candidates)
+    decisions = []
+    for job in incoming:
+        if job.dedupe_fingerprint in exact:
+            best, score = exact[job.dedupe_fingerprint], 1.0
+        else:
+            best, score, _ = JobDeduplicationService.find_best_match(job, candidates)
+        if not (best and score > 0.85):
+            candidates.append(job)
+            exact.setdefault(job.dedupe_fingerprint, job)
+        decisions.append((best.id if best else None, round(score, 9)))
+    return decisions
+
+
+def run_vectorized(
+    incoming: List[JobPosting], candidates: List[JobPosting]
+) -> List[Tuple[Optional[str], float]]:
+    matches = JobDeduplicationService.match_company_batch(
+        incoming, candidates, exact_primaries(candidates)
+    )
+    return [(best.id if best else None, round(score, 9)) for best, score, _ in matches]
+
+
+def main(candidate_count: int, incoming_count: int) -> None:
+    rng = random.Random(42)
+    candidates = build_postings(candidate_count, "c", rng)
+    incoming = build_postings(incoming_count, "n", rng)
+
+    started = time.perf_counter()
+    scalar = run_scalar(incoming, candidates)
+    scalar_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    vectorized = run_vectorized(incoming, candidates)
+    vectorized_seconds = time.perf_counter() - started
+
+    merged = sum(1 for _, score in vectorized if score > 0.85)
+    review = sum(1 for _, score in vectorized if 0.75 <= score <= 0.85)
+    pairs = candidate_count * incoming_count
+    print(f"candidates: {candidate_count}  incoming: {incoming_count}")
+    print(f"decisions:  {merged} auto-merged, {review} queued for review")
+    print(f"scalar:     {scalar_seconds:8.2f}s  {pairs / scalar_seconds:12.0f} pairs/s")
+    print(f"vectorized: {vectorized_seconds:8.2f}s  {pairs / vectorized_seconds:12.0f} pairs/s")
+    print(f"speedup:    {scalar_seconds / vectorized_seconds:8.2f}x")
+    print(f"identical decisions: {scalar == vectorized}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=10000)
+    parser.add_argument("--incoming", type=int, default=200)
+    args = parser.parse_args()
+    main(args.candidates, args.incoming)
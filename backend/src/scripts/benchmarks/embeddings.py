@@ -0,0 +1,84 @@
+"""
+Throughput of bulk embedding: one request per text versus embed_batch.
+
+Embeds --texts job-posting-like strings with the local deterministic
+backend, which sleeps --latency seconds per request to stand in for the
+provider round trip, so no API key or network is needed. Two modes are
+compared:
+- per item, as bulk jobs did before: embed_text for every text, all texts
+  concurrently on the event loop's default executor;
+- embed_batch: chunks of embedding_batch_size texts, at most
+  embedding_max_concurrency requests in flight on the embedding executor.
+Reports texts per second and backend requests per mode.
+
+Usage (from backend/src):
+    python -m scripts.benchmarks.embeddings --texts 2000 --latency 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import time
+
+from app.core.config import settings
+from app.infrastructure.rag.embeddings.service import EmbeddingService, LocalEmbeddingBackend
+
+SKILLS = ["python", "kubernetes", "react", "sql", "terraform", "go", "spark", "figma"]
+
+
+def make_texts(count: int) -> list[str]:
+    return [
+        f"Engineer {i} | Company {i % 37} | Builds services | "
+        f"{SKILLS[i % len(SKILLS)]} {SKILLS[(i * 3) % len(SKILLS)]}"
+        for i in range(count)
+    ]
+
+
+async def per_item(texts: list[str], latency: float) -> tuple[float, int]:
+    backend = LocalEmbeddingBackend(latency=latency)
+    service = EmbeddingService(backend=backend)
+    loop = asyncio.get_running_loop()
+    started = time.perf_counter()
+    await asyncio.gather(
+        *(loop.run_in_executor(None, service.embed_text_sync, text) for text in texts)
+    )
+    return len(texts) / (time.perf_counter() - started), backend.requests
+
+
+async def batched(texts: list[str], latency: float) -> tuple[float, int]:
+    backend = LocalEmbeddingBackend(latency=latency)
+    service = EmbeddingService(backend=backend)
+    started = time.perf_counter()
+    vectors = await service.embed_batch(texts)
+    assert all(vector is not None for vector in vectors)
+    return len(texts) / (time.perf_counter() - started), backend.requests
+
+
+async def run(count: int, latency: float) -> None:
+    texts = make_texts(count)
+    results = {
+        "per item, default executor": await per_item(texts, latency),
+        "embed_batch": await batched(texts, latency),
+    }
+
+    print(
+        f"{count} texts, {latency * 1000:.0f}ms per request, batch size "
+        f"{settings.embedding_batch_size}, {settings.embedding_max_concurrency} in flight"
+    )
+    baseline = results["per item, default executor"][0]
+    for name, (per_second, requests) in results.items():
+        print(
+            f"{name:28} {per_second:9.1f} texts/s  requests {requests:6}  "
+            f"{per_second / baseline:6.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="Simulated seconds per provider request"
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.texts, args.latency))
@@ -0,0 +1,119 @@
+"""
+Compares event publishing throughput of the Redis Streams EventBus with the
+previous pub/sub publish path.
+
+The previous path opened a Redis client per event, PUBLISHed the JSON event
+and closed the client again. It is measured next to EventBus.publish (one
+XADD per event on the shared pool) and EventBus.publish_many (pipelined XADDs
+in batches of --batch-size). Events go to the configured Redis, or to an
+in-process fakeredis server with --fake, under a throwaway stream prefix that
+is deleted afterwards.
+
+Usage (from backend/src):
+    python -m scripts.benchmarks.event_bus --events 5000
+    python -m scripts.benchmarks.event_bus --events 5000 --fake
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+from uuid import uuid4
+
+from redis.asyncio import from_url
+
+from app.core.config import settings
+from app.services.redis_service import RedisService
+from app.utils.event_bus import EventBus
+
+
+def build_events(count: int) -> List[Dict[str, Any]]:
+    """Payloads shaped like market.job_ingested events."""
+    return [
+        {
+            "job_posting_id": str(uuid4()),
+            "company_id": str(uuid4()),
+            "title": "Senior Backend Engineer",
+            "skills": ["Python", "FastAPI", "Kubernetes"],
+            "index": i,
+        }
+        for i in range(count)
+    ]
+
+
+async def legacy_publish(connect: Callable[[], Any], event_type: str, data: dict) -> None:
+    """The pub/sub publish path EventBus used before streams."""
+    event = {
+        "event_id": str(uuid4()),
+        "event_type": event_type,
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "data": data,
+    }
+    client = connect()
+    await client.publish(event_type, json.dumps(event))
+    await client.aclose()
+
+
+async def run(count: int, batch_size: int, fake: bool) -> None:
+    if fake:
+        import fakeredis
+
+        server = fakeredis.FakeServer()
+
+        def connect():
+            return fakeredis.FakeAsyncRedis(server=server)
+
+        shared = connect()
+        RedisService.get_client = staticmethod(lambda: shared)
+    else:
+
+        def connect():
+            return from_url(settings.redis_url)
+
+    settings.event_stream_prefix = f"bench-{uuid4().hex[:8]}"
+    event_type = "market.job_ingested"
+    payloads = build_events(count)
+
+    timings = {}
+    started = time.perf_counter()
+    for data in payloads:
+        await legacy_publish(connect, event_type, data)
+    timings["pub/sub, client per event"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for data in payloads:
+        await EventBus.publish(event_type, data)
+    timings["streams, publish"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for offset in range(0, count, batch_size):
+        await EventBus.publish_many(
+            [(event_type, data) for data in payloads[offset : offset + batch_size]]
+        )
+    timings[f"streams, publish_many({batch_size})"] = time.perf_counter() - started
+
+    client = connect()
+    stored = await client.xlen(f"{settings.event_stream_prefix}:{event_type}")
+    await client.delete(f"{settings.event_stream_prefix}:{event_type}")
+    await client.aclose()
+
+    print(f"events: {count} per path, {stored} stored in the stream")
+    baseline = timings["pub/sub, client per event"]
+    for name, seconds in timings.items():
+        print(
+            f"{name:32} {seconds:8.3f}s {count / seconds:10.1f} events/s "
+            f"{baseline / seconds:6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--events", type=int, default=5000)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--fake", action="store_true", help="Publish to in-process fakeredis")
+    args = parser.parse_args()
+    asyncio.run(run(args.events, args.batch_size, args.fake))
@@ -0,0 +1,149 @@
+"""
+Latency of hybrid retrieval with the vector and BM25 legs run one after the other versus concurrently.
+
+Indexes --postings synthetic postings into an in-memory Qdrant with the
+local embedding backend (--embedding-ms per request stands in for the
+provider round trip) and answers the BM25 query from a session double
+that takes --bm25-ms, so no services are needed. The reranker is
+stubbed to fail, so results fall back to RRF scores. Compared:
+- sequential: awaiting the vector leg, then the BM25 leg, as before;
+- HybridRetrievalService.search: both legs concurrently.
+Also times the RRF fusion itself for --fusion-size candidates per leg,
+the previous dict loop against reciprocal_rank_fusion.
+
+Usage (from backend/src):
+    python -m scripts.benchmarks.hybrid_retrieval --postings 2000 --queries 20
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from types import SimpleNamespace
+from uuid import uuid4
+
+from qdrant_client import AsyncQdrantClient
+
+from app.infrastructure.rag.embeddings.service import EmbeddingService, LocalEmbeddingBackend
+from app.services.agent import retrieval
+from app.services.agent.models import HybridRetrievalRequest
+from app.services.agent.retrieval import BM25_QUERY, HybridRetrievalService, reciprocal_rank_fusion
+
+SKILLS = ["python", "kubernetes", "react", "sql", "terraform", "go", "spark", "figma", "swift"]
+
+
+class SessionDouble:
+    def __init__(self, postings, delay: float):
+        self.postings, self.delay = postings, delay
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+    async def execute(self, sql, params):
+        if sql is BM25_QUERY:
+            await asyncio.sleep(self.delay)
+            rows = [
+                SimpleNamespace(id=str(p["job_id"]), title=p["title"], company_name=p["company_name"])
+                for p in random.sample(self.postings, params["limit"])
+            ]
+        else:
+            rows = []
+        return SimpleNamespace(fetchall=lambda: rows)
+
+
+class RerankerDown:
+    async def ainvoke(self, prompt):
+        raise RuntimeError("reranker stubbed out")
+
+
+def legacy_rrf(vector_ids, bm25_ids, k: int = 60):
+    candidates = {}
+    for rank, jid in enumerate(vector_ids, start=1):
+        candidates[jid] = {"vector_rank": rank, "bm25_rank": None}
+    for rank, jid in enumerate(bm25_ids, start=1):
+        candidates.setdefault(jid, {"vector_rank": None, "bm25_rank": None})["bm25_rank"] = rank
+    merged = []
+    for jid, cand in candidates.items():
+        score = 0.0
+        if cand["vector_rank"] is not None:
+            score += 1.0 / (k + cand["vector_rank"])
+        if cand["bm25_rank"] is not None:
+            score += 1.0 / (k + cand["bm25_rank"])
+        merged.append((jid, score))
+    merged.sort(key=lambda x: x[1], reverse=True)
+    return merged
+
+
+async def run(postings: int, queries: int, embedding_ms: float, bm25_ms: float, fusion_size: int) -> None:
+    random.seed(25)
+    retrieval.embedding_service = EmbeddingService(
+        backend=LocalEmbeddingBackend(latency=embedding_ms / 1000)
+    )
+    service = HybridRetrievalService(
+        qdrant=AsyncQdrantClient(location=":memory:"),
+        llm=RerankerDown(),
+        session_factory=lambda: session,
+    )
+    corpus = [
+        {
+            "job_id": uuid4(),
+            "title": f"{random.choice(SKILLS).title()} Engineer {i}",
+            "company_name": f"Company {i % 50}",
+            "description": " ".join(random.sample(SKILLS, 4)),
+            "skills": random.sample(SKILLS, 3),
+            "location": "Remote",
+        }
+        for i in range(postings)
+    ]
+    await service.index_job_postings(corpus)
+    session = SessionDouble(corpus, bm25_ms / 1000)
+    request = HybridRetrievalRequest(query="", limit=10, rerank_top_k=30)
+
+    async def sequential(query: str) -> None:
+        await service._vector_search(query, request.rerank_top_k)
+        await service._bm25_search(query, request.rerank_top_k)
+
+    async def concurrent(query: str) -> None:
+        await service.search(session, request.model_copy(update={"query": query}))
+
+    print(
+        f"{postings} postings, {embedding_ms:g}ms query embedding, {bm25_ms:g}ms BM25 query, "
+        f"{queries} queries"
+    )
+    for name, fn in [("sequential legs", sequential), ("concurrent legs", concurrent)]:
+        latencies = []
+        for i in range(queries):
+            # Distinct queries, so the embedding cache (if any) does not answer
+            query = f"{random.choice(SKILLS)} {random.choice(SKILLS)} engineer {i} {name}"
+            started = time.perf_counter()
+            await fn(query)
+            latencies.append(time.perf_counter() - started)
+        print(f"{name:18} p50 {statistics.median(latencies) * 1000:8.1f} ms")
+
+    vector_ids = [uuid4() for _ in range(fusion_size)]
+    bm25_ids = random.sample(vector_ids, fusion_size // 2) + [uuid4() for _ in range(fusion_size // 2)]
+    for name, fn in [
+        ("RRF dict loop", lambda: legacy_rrf(vector_ids, bm25_ids)),
+        ("RRF vectorized", lambda: reciprocal_rank_fusion([vector_ids, bm25_ids])),
+    ]:
+        started = time.perf_counter()
+        for _ in range(20):
+            fn()
+        print(f"{name:18} {(time.perf_counter() - started) / 20 * 1000:8.2f} ms for {fusion_size} per leg")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--postings", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=20)
+    parser.add_argument("--embedding-ms", type=float, default=80.0)
+    parser.add_argument("--bm25-ms", type=float, default=40.0)
+    parser.add_argument("--fusion-size", type=int, default=10000)
+    args = parser.parse_args()
+    asyncio.run(run(args.postings, args.queries, args.embedding_ms, args.bm25_ms, args.fusion_size))
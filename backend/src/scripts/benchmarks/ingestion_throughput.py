@@ -0,0 +1,139 @@
+"""
+Compares row-by-row and set-based (bulk) job ingestion throughput.
+
+Generates synthetic unified postings, runs them through
+JobIngestionService.process_job_entry and JobIngestionService.process_job_batch
+against the configured database, and rolls every run back. Event publishing is
+disabled so only database and normalization work is measured.
+
+Usage (from backend/src):
+    python -m scripts.benchmarks.ingestion_throughput --count 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import time
+from typing import Any, Dict, List
+from uuid import uuid4
+
+from sqlalchemy import select
+
+from app.infrastructure.database.models import (
+    JobIngestionRun,
+    JobSource,
+    NormalizedSkill,
+)
+from app.services.database_service import AsyncSessionLocal, async_engine
+from app.services.job_ingestion_service import BULK_BATCH_SIZE, JobIngestionService
+from app.utils.event_bus import EventBus
+
+SKILLS = [
+    ("Python", "Language"),
+    ("FastAPI", "Framework"),
+    ("Kubernetes", "Infrastructure"),
+    ("PostgreSQL", "Database"),
+    ("Redis", "Database"),
+    ("React", "Framework"),
+]
+TITLES = [
+    "Senior Backend Engineer",
+    "Frontend Engineer",
+    "Staff Python Developer",
+    "Junior Fullstack Engineer",
+]
+
+
+def build_postings(count: int, tag: str) -> List[Dict[str, Any]]:
+    """Synthetic unified postings; every description names >= 3 taxonomy skills."""
+    rng = random.Random(42)
+    postings = []
+    for i in range(count):
+        skills = ", ".join(name for name, _ in rng.sample(SKILLS, 3))
+        low = rng.randrange(80, 180) * 1000
+        postings.append(
+            {
+                "external_id": f"{tag}_{i}",
+                "title": rng.choice(TITLES),
+                "company_name": f"Bench Company {i % 50} {tag}",
+                "description": (
+                    f"Role {i}: we use {skills} every day. "
+                    f"Salary is ${low} - ${low + 30000} a year."
+                ),
+                "location_raw": rng.choice(["Remote", "New York, NY", "Austin, TX"]),
+                "url": f"https://example.com/{tag}/{i}",
+                "salary_raw": None,
+                "raw_payload": {"id": i},
+            }
+        )
+    return postings
+
+
+async def _noop_publish(event_type: str, data: Dict[str, Any]) -> None:
+    return None
+
+
+async def run_mode(count: int, bulk: bool) -> float:
+    """Ingests count postings in one rolled-back transaction; returns seconds."""
+    tag = f"bench{uuid4().hex[:8]}"
+    postings = build_postings(count, tag)
+
+    async with AsyncSessionLocal() as session:
+        for name, category in SKILLS:
+            res = await session.execute(
+                select(NormalizedSkill).where(NormalizedSkill.name == name)
+            )
+            if not res.scalar_one_or_none():
+                session.add(
+                    NormalizedSkill(
+                        id=str(uuid4()),
+                        name=name,
+                        category=category,
+                        aliases=[name.lower()],
+                    )
+                )
+        source = JobSource(id=str(uuid4()), name=tag, source_key=tag)
+        session.add(source)
+        await session.flush()
+        run_id = str(uuid4())
+        session.add(JobIngestionRun(id=run_id, source_id=source.id, status="RUNNING"))
+        await session.flush()
+
+        started = time.perf_counter()
+        if bulk:
+            for start in range(0, count, BULK_BATCH_SIZE):
+                await JobIngestionService.process_job_batch(
+                    session, postings[start : start + BULK_BATCH_SIZE], run_id, tag
+                )
+        else:
+            for posting in postings:
+                await JobIngestionService.process_job_entry(
+                    session, posting, run_id, tag
+                )
+        elapsed = time.perf_counter() - started
+        await session.rollback()
+
+    return elapsed
+
+
+async def main(count: int) -> None:
+    EventBus.publish = staticmethod(_noop_publish)
+    try:
+        row_seconds = await run_mode(count, bulk=False)
+        bulk_seconds = await run_mode(count, bulk=True)
+    finally:
+        await async_engine.dispose()
+
+    print(f"postings: {count}")
+    print(f"row-by-row: {row_seconds:8.2f}s  {count / row_seconds:10.1f} postings/s")
+    print(f"bulk:       {bulk_seconds:8.2f}s  {count / bulk_seconds:10.1f} postings/s")
+    print(f"speedup:    {row_seconds / bulk_seconds:8.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=1000)
+    args = parser.parse_args()
+    asyncio.run(main(args.count))
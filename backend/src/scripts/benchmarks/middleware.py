@@ -0,0 +1,171 @@
+"""
+Requests per second through the application middleware stack, built from
+BaseHTTPMiddleware classes (as before) and from the plain ASGI middleware.
+
+Both stacks wrap the same minimal FastAPI app in the order app.main uses:
+request ID, trusted host, CORS, metrics and rate limiting. GET /api/v2/bench
+answers a small JSON document, so the numbers are dominated by middleware
+overhead. Requests are driven as raw ASGI calls with --concurrency in
+flight; the rate limiter decision itself is stubbed to "allow" so Redis is
+not part of the measurement (see scripts.benchmarks.rate_limiter for that).
+
+Usage (from backend/src):
+    python -m scripts.benchmarks.middleware --requests 20000 --concurrency 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import re
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import JSONResponse
+
+from app.core.logging import request_id_var
+from app.middleware.metrics import MetricsMiddleware
+from app.middleware.rate_limit import RateLimitMiddleware, route_cost
+from app.middleware.request_id import RequestIDMiddleware
+from app.services.metrics_collection_service import MetricsCollectionService
+from app.services.reliability_manager_service import ReliabilityManagerService
+
+
+class LegacyRequestIDMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+        token = request_id_var.set(request_id)
+        request.state.request_id = request_id
+        try:
+            response = await call_next(request)
+            response.headers["X-Request-ID"] = request_id
+            return response
+        finally:
+            request_id_var.reset(token)
+
+
+class LegacyMetricsMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        start_time = time.perf_counter()
+        response = await call_next(request)
+        duration = time.perf_counter() - start_time
+        path = request.url.path
+        if path.startswith("/api"):
+            route = re.sub(r"/[a-f0-9\-]{36}", "/{uuid}", path)
+            route = re.sub(r"/circuits/[a-zA-Z0-9\-_]+/reset", "/circuits/{service_name}/reset", route)
+            MetricsCollectionService.record_api_request(
+                request.method, route, response.status_code, duration
+            )
+        return response
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+        if not path.startswith("/api/v2"):
+            return await call_next(request)
+        client = request.client.host if request.client else "unknown_ip"
+        allowed = await ReliabilityManagerService.check_rate_limit(
+            client, path, 100, 60, cost=route_cost(path)
+        )
+        if not allowed:
+            return JSONResponse(status_code=429, content={"detail": "Too many requests."})
+        return await call_next(request)
+
+
+def build_app(legacy: bool, middleware: bool = True) -> FastAPI:
+    bench = FastAPI()
+
+    @bench.get("/api/v2/bench")
+    async def bench_route():
+        return {"ok": True, "request_id": request_id_var.get()}
+
+    if not middleware:
+        return bench
+    bench.add_middleware(LegacyRequestIDMiddleware if legacy else RequestIDMiddleware)
+    bench.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])
+    bench.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+    bench.add_middleware(LegacyMetricsMiddleware if legacy else MetricsMiddleware)
+    bench.add_middleware(LegacyRateLimitMiddleware if legacy else RateLimitMiddleware)
+    return bench
+
+
+async def call(asgi_app) -> int:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": "/api/v2/bench",
+        "raw_path": b"/api/v2/bench",
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"testserver"), (b"user-agent", b"bench")],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    status = 0
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await asyncio.Event().wait()
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await asgi_app(scope, receive, send)
+    return status
+
+
+async def measure(asgi_app, requests: int, concurrency: int) -> float:
+    remaining = requests
+
+    async def worker() -> None:
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            assert await call(asgi_app) == 200
+
+    for _ in range(200):
+        await call(asgi_app)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return requests / (time.perf_counter() - started)
+
+
+async def run(requests: int, concurrency: int) -> None:
+    async def allow(*args, **kwargs) -> bool:
+        return True
+
+    ReliabilityManagerService.check_rate_limit = allow
+
+    apps = {
+        "no middleware": build_app(legacy=False, middleware=False),
+        "BaseHTTPMiddleware stack": build_app(legacy=True),
+        "pure ASGI stack": build_app(legacy=False),
+    }
+    results = {name: await measure(asgi_app, requests, concurrency) for name, asgi_app in apps.items()}
+
+    print(f"{requests} requests, {concurrency} in flight")
+    baseline = results["BaseHTTPMiddleware stack"]
+    for name, per_second in results.items():
+        print(f"{name:26} {per_second:9.1f} req/s {per_second / baseline:6.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency))
@@ -0,0 +1,101 @@
+"""
+Recall versus memory of fp32, fp16 and int8 embeddings on a synthetic corpus.
+
+Builds --vectors 768-dim vectors around --clusters centres (embeddings of
+similar postings or roles cluster, which makes near ties common) and
+--queries queries near corpus vectors. Each precision is searched with
+QuantizedIndex, with and without re-scoring --oversampling * k candidates
+against the float32 vectors, which live in a memory-mapped file on disk.
+Recall@k is measured against exact float32 search.
+
+Reports in-memory bytes per vector and in total, recall@k and median
+latency per query, to choose embedding_cache_precision and the
+qdrant_*_precision of each collection. The first line gives the memory
+of the same vectors as lists of Python floats, as the caches held them.
+
+Usage (from backend/src):
+    python -m scripts.benchmarks.quantization --vectors 50000 --queries 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from app.infrastructure.rag.embeddings.quantization import PRECISIONS, QuantizedIndex
+from app.infrastructure.rag.embeddings.similarity import VectorIndex
+
+DIM = 768
+
+
+def corpus(vectors: int, queries: int, clusters: int, seed: int = 24):
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((clusters, DIM), dtype=np.float32)
+    members = centres[rng.integers(0, clusters, vectors)]
+    data = members + 0.5 * rng.standard_normal((vectors, DIM), dtype=np.float32)
+    picks = rng.integers(0, vectors, queries)
+    probes = data[picks] + 0.3 * rng.standard_normal((queries, DIM), dtype=np.float32)
+    return data, probes
+
+
+def list_bytes(vector: list) -> int:
+    """Memory of a list of Python floats (list plus float objects)."""
+    return sys.getsizeof(vector) + sum(sys.getsizeof(x) for x in vector)
+
+
+def run(vectors: int, queries: int, clusters: int, k: int, oversampling: float) -> None:
+    data, probes = corpus(vectors, queries, clusters)
+    ids = list(range(vectors))
+    truth = [set(i for i, _ in hits) for hits in VectorIndex(ids, data).search_many(probes, k)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "vectors.f32")
+        on_disk = np.memmap(path, dtype=np.float32, mode="w+", shape=data.shape)
+        on_disk[:] = data
+        on_disk.flush()
+
+        per_list = list_bytes(data[0].tolist())
+        print(
+            f"{vectors} vectors x {DIM} dims, {clusters} clusters, {queries} queries, "
+            f"recall@{k}, re-scoring {oversampling:g}x candidates from disk"
+        )
+        print(
+            f"{'python lists':10} {'':10} {per_list:6} B/vector "
+            f"{per_list * vectors / 2**20:8.1f} MiB"
+        )
+        for precision in PRECISIONS:
+            index = QuantizedIndex(ids, data, precision, full_precision=on_disk, oversampling=oversampling)
+            for rescore in (False, True):
+                if precision == "fp32" and rescore:
+                    continue
+                recalls, latencies = [], []
+                for probe, expected in zip(probes, truth):
+                    started = time.perf_counter()
+                    hits = index.search(probe, k, rescore=rescore)
+                    latencies.append(time.perf_counter() - started)
+                    recalls.append(len(expected & {i for i, _ in hits}) / k)
+                print(
+                    f"{precision:10} {'rescored' if rescore else 'quantized':10} "
+                    f"{index.nbytes // vectors:6} B/vector {index.nbytes / 2**20:8.1f} MiB  "
+                    f"recall {statistics.mean(recalls):.4f}  "
+                    f"p50 {statistics.median(latencies) * 1000:7.2f} ms"
+                )
+            del index
+        del on_disk
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--clusters", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--oversampling", type=float, default=4.0)
+    args = parser.parse_args()
+    run(args.vectors, args.queries, args.clusters, args.k, args.oversampling)
@@ -0,0 +1,142 @@
+"""
+Measures the latency the rate limiter adds to every request under load.
+
+--users simulated users send --requests requests each, all users
+concurrently, and every request first passes the limiter, as it does in
+RateLimitMiddleware. Two limiters are compared:
+- the previous one, which sent the full Lua script with EVAL over a new
+  Redis connection on every request;
+- HybridRateLimiter, which decides from tokens leased from Redis in
+  batches and calls EVALSHA over the shared pool once per lease.
+Reports allowed requests, Redis calls and p50/p95/p99 of the added latency
+per request. Limits are sized so that some users run out of tokens.
+
+Runs against the configured Redis, or an in-process fakeredis server with
+--fake. For end-to-end numbers, run scripts/locustfile.py (RateLimitedUser)
+against a server and compare its percentiles with and without this change.
+
+Usage (from backend/src):
+    python -m scripts.benchmarks.rate_limiter --users 50 --requests 200
+    python -m scripts.benchmarks.rate_limiter --users 50 --requests 200 --fake
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List
+from uuid import uuid4
+
+from redis.asyncio import from_url
+
+from app.core.config import settings
+from app.services.rate_limiter_service import HybridRateLimiter
+from app.services.redis_service import RedisService
+
+LEGACY_SCRIPT = """
+local key = KEYS[1]
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local current = tonumber(redis.call('get', key) or "0")
+if current >= limit then
+    return 0
+else
+    redis.call("incrby", key, 1)
+    if current == 0 then
+        redis.call("expire", key, window)
+    end
+    return 1
+end
+"""
+
+
+async def load(
+    check: Callable[[str], Awaitable[bool]], users: int, requests: int
+) -> Dict[str, float]:
+    """Every user sends requests sequential checks, all users concurrently."""
+    latencies: List[float] = []
+    allowed = 0
+
+    async def user(index: int) -> None:
+        nonlocal allowed
+        key = f"user-{index}"
+        for _ in range(requests):
+            started = time.perf_counter()
+            result = await check(key)
+            latencies.append(time.perf_counter() - started)
+            allowed += result
+
+    await asyncio.gather(*(user(i) for i in range(users)))
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        "allowed": allowed,
+        "p50_us": cuts[49] * 1e6,
+        "p95_us": cuts[94] * 1e6,
+        "p99_us": cuts[98] * 1e6,
+    }
+
+
+async def run(users: int, requests: int, limit: int, fake: bool) -> None:
+    if fake:
+        import fakeredis
+
+        server = fakeredis.FakeServer()
+
+        def connect():
+            return fakeredis.FakeAsyncRedis(server=server)
+
+        shared = connect()
+        RedisService.get_client = staticmethod(lambda: shared)
+    else:
+
+        def connect():
+            return from_url(settings.redis_url)
+
+    prefix = f"rate_limit:bench-{uuid4().hex[:8]}"
+    window = 60
+    legacy_calls = 0
+
+    async def legacy(key: str) -> bool:
+        nonlocal legacy_calls
+        legacy_calls += 1
+        async with connect() as redis:
+            result = await redis.eval(LEGACY_SCRIPT, 1, f"{prefix}:legacy:{key}", limit, window)
+            return result == 1
+
+    limiter = HybridRateLimiter()
+
+    async def hybrid(key: str) -> bool:
+        return await limiter.acquire(f"{prefix}:hybrid:{key}", limit, window)
+
+    results = {
+        "EVAL, connection per request": (await load(legacy, users, requests), legacy_calls),
+    }
+    results["hybrid, leased EVALSHA"] = (await load(hybrid, users, requests), limiter.redis_calls)
+
+    client = connect()
+    keys = await client.keys(f"{prefix}:*")
+    if keys:
+        await client.delete(*keys)
+    await client.aclose()
+    if not fake:
+        await RedisService.close_pool()
+
+    print(f"{users} users x {requests} requests, limit {limit}/{window}s per user")
+    for name, (result, calls) in results.items():
+        print(
+            f"{name:30} allowed {result['allowed']:6}  redis calls {calls:6}  "
+            f"p50 {result['p50_us']:8.1f}us  p95 {result['p95_us']:8.1f}us  "
+            f"p99 {result['p99_us']:8.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=100, help="Requests per user and minute")
+    parser.add_argument("--fake", action="store_true", help="Use in-process fakeredis")
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.requests, args.limit, args.fake))
@@ -0,0 +1,132 @@
+"""
+Load test of Redis-heavy API routes with and without the application Redis pool.
+
+Drives GET /api/v2/dashboard and GET /api/v2/market/trends in process
+(httpx over ASGI) with --users concurrent users. Both routes pass the Redis
+rate limiter and are served from their Redis caches once warm, so their
+latency is dominated by Redis round trips. Every route runs twice: with a
+new Redis connection per client, as every service did before the pool, and
+on the application pool. Reports p50/p95/p99 latency per route and mode.
+
+Needs the configured database and Redis. Each user stays below the
+per-route rate limit; rate-limit keys are cleared between modes.
+
+Usage (from backend/src):
+    python -m scripts.benchmarks.redis_pool --users 20 --requests 80
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Dict, List
+
+from httpx import ASGITransport, AsyncClient
+from redis.asyncio import from_url
+
+from app.core.config import settings
+from app.main import app
+from app.services.database_service import async_engine
+from app.services.redis_service import RedisService
+
+ROUTES = ["/api/v2/dashboard", "/api/v2/market/trends?sort_by=frequency&limit=10"]
+
+
+async def register_users(client: AsyncClient, count: int) -> List[Dict[str, str]]:
+    """Registers count throwaway users; returns their auth headers."""
+    tag = random.randint(100000, 999999)
+    headers = []
+    for i in range(count):
+        email = f"pool_load_{tag}_{i}@example.com"
+        password = "TestPassword123!"
+        await client.post("/api/v2/auth/register", json={"email": email, "password": password})
+        login = await client.post(
+            "/api/v2/auth/login", json={"email": email, "password": password}
+        )
+        headers.append({"Authorization": f"Bearer {login.json()['access_token']}"})
+    return headers
+
+
+async def clear_rate_limits() -> None:
+    client = from_url(settings.redis_url)
+    keys = await client.keys("rate_limit:*")
+    if keys:
+        await client.delete(*keys)
+    await client.aclose()
+
+
+async def load(
+    client: AsyncClient, route: str, users: List[Dict[str, str]], requests: int
+) -> Dict[str, float]:
+    """Every user sends requests sequential requests, all users concurrently."""
+    latencies: List[float] = []
+    errors = 0
+
+    async def user(headers: Dict[str, str]) -> None:
+        nonlocal errors
+        for _ in range(requests):
+            started = time.perf_counter()
+            resp = await client.get(route, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if resp.status_code != 200:
+                errors += 1
+
+    # Warm the caches, then measure
+    for headers in users:
+        await client.get(route, headers=headers)
+    started = time.perf_counter()
+    await asyncio.gather(*(user(headers) for headers in users))
+    elapsed = time.perf_counter() - started
+
+    cuts = statistics.quantiles(latencies, n=100)
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "per_second": len(latencies) / elapsed,
+        "p50_ms": cuts[49] * 1000,
+        "p95_ms": cuts[94] * 1000,
+        "p99_ms": cuts[98] * 1000,
+    }
+
+
+async def run(users: int, requests: int) -> None:
+    pooled_client = RedisService.get_client
+    per_client = staticmethod(lambda: from_url(settings.redis_url))
+
+    transport = ASGITransport(app=app)
+    try:
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            headers = await register_users(client, users)
+            for mode, factory in [("connection per client", per_client), ("pool", None)]:
+                RedisService.get_client = factory or pooled_client
+                await clear_rate_limits()
+                for route in ROUTES:
+                    result = await load(client, route, headers, requests)
+                    print(
+                        f"{mode:22} {route.split('?')[0]:24} "
+                        f"{result['per_second']:8.1f} req/s  p50 {result['p50_ms']:7.2f}ms  "
+                        f"p95 {result['p95_ms']:7.2f}ms  p99 {result['p99_ms']:7.2f}ms  "
+                        f"errors {result['errors']}"
+                    )
+    finally:
+        RedisService.get_client = pooled_client
+        await RedisService.close_pool()
+        await async_engine.dispose()
+
+    print(f"pool: {RedisService.pool_stats()['max']} connections max")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument(
+        "--requests",
+        type=int,
+        default=80,
+        help="Requests per user and route; keep below the rate limit of 100/minute",
+    )
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.requests))
@@ -0,0 +1,103 @@
+"""
+Per-query latency of comparing one profile embedding against a corpus of role or posting vectors.
+
+Builds --vectors random 768-dim embeddings and scores --queries profile
+vectors against all of them, keeping the --k best. Compared:
+- the previous pure-Python cosine similarity, called pairwise for every
+  corpus vector, then sorted (run on --legacy-queries queries only, as it
+  takes seconds per query);
+- cosine_many on a float32 matrix plus top_k (argpartition);
+- VectorIndex.search on preloaded unit rows, and search_many for all
+  queries at once.
+Checks that every method returns the same top-k ids.
+
+Usage (from backend/src):
+    python -m scripts.benchmarks.similarity --vectors 50000 --queries 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import statistics
+import time
+
+import numpy as np
+
+from app.infrastructure.rag.embeddings.similarity import VectorIndex, as_matrix, cosine_many, top_k
+
+DIM = 768
+
+
+def legacy_cosine(a, b) -> float:
+    if len(a) != len(b):
+        return 0.0
+    dot = sum(x * y for x, y in zip(a, b, strict=False))
+    norm_a = math.sqrt(sum(x * x for x in a))
+    norm_b = math.sqrt(sum(x * x for x in b))
+    if norm_a == 0 or norm_b == 0:
+        return 0.0
+    return dot / (norm_a * norm_b)
+
+
+def timed(fn, queries):
+    latencies, results = [], []
+    for query in queries:
+        started = time.perf_counter()
+        results.append(fn(query))
+        latencies.append(time.perf_counter() - started)
+    return statistics.median(latencies) * 1000, results
+
+
+def run(vectors: int, queries: int, legacy_queries: int, k: int) -> None:
+    rng = np.random.default_rng(23)
+    corpus = rng.standard_normal((vectors, DIM), dtype=np.float32)
+    profiles = rng.standard_normal((queries, DIM), dtype=np.float32)
+    ids = list(range(vectors))
+
+    corpus_lists = corpus.tolist()
+    started = time.perf_counter()
+    matrix = as_matrix(corpus_lists)
+    index = VectorIndex(ids, matrix)
+    load_seconds = time.perf_counter() - started
+
+    def legacy(query):
+        query = query.tolist()
+        scores = [legacy_cosine(query, row) for row in corpus_lists]
+        return sorted(range(len(scores)), key=scores.__getitem__, reverse=True)[:k]
+
+    def matvec(query):
+        return top_k(cosine_many(matrix, query), k)[0].tolist()
+
+    def indexed(query):
+        return [i for i, _ in index.search(query, k)]
+
+    results = {}
+    results["pure Python, pairwise"] = timed(legacy, profiles[:legacy_queries])
+    results["cosine_many + top_k"] = timed(matvec, profiles)
+    results["VectorIndex.search"] = timed(indexed, profiles)
+    started = time.perf_counter()
+    batched = [[i for i, _ in hits] for hits in index.search_many(profiles, k)]
+    results["VectorIndex.search_many"] = ((time.perf_counter() - started) * 1000 / queries, batched)
+
+    expected = results["VectorIndex.search"][1]
+    for name, (_, found) in results.items():
+        assert found == expected[: len(found)], f"{name} returned different top-{k} ids"
+
+    print(
+        f"{vectors} vectors x {DIM} dims, top {k}; index loaded in {load_seconds:.2f}s "
+        f"({index.matrix.nbytes / 2**20:.0f} MiB)"
+    )
+    baseline = results["pure Python, pairwise"][0]
+    for name, (ms, found) in results.items():
+        print(f"{name:26} {ms:10.3f} ms/query  {baseline / ms:9.1f}x  ({len(found)} queries)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--vectors", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--legacy-queries", type=int, default=2)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+    run(args.vectors, args.queries, args.legacy_queries, args.k)
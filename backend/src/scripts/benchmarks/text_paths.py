@@ -0,0 +1,337 @@
+"""
+Offline throughput benchmarks of the CPU-bound text paths of ingestion.
+
+Generates a synthetic skills taxonomy and job-description corpus and times
+SkillExtractionService.extract_skills_from_text,
+CompensationExtractionService.extract_salary_from_text,
+LocationNormalizationService.normalize_location and JobDeduplicationService
+batch scoring at several corpus sizes. Nothing touches a database or the
+network: the taxonomy is passed in and the LLM fallback runs on the local
+fake model.
+
+Every throughput is compared with a JSON baseline, and the run exits with
+status 1 when one drops by more than --max-regression percent.
+--update-baseline stores this run as the new baseline. Baselines are only
+comparable on the machine that recorded them.
+
+Usage (from backend/src):
+    python -m scripts.benchmarks.text_paths
+    python -m scripts.benchmarks.text_paths --sizes 500 5000 --max-regression 15
+    python -m scripts.benchmarks.text_paths --update-baseline
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence
+
+from app.infrastructure.database.models import JobPosting, NormalizedSkill
+from app.services import skill_fallback_service
+from app.services.compensation_extraction_service import CompensationExtractionService
+from app.services.job_deduplication_service import JobDeduplicationService
+from app.services.location_normalization_service import LocationNormalizationService
+from app.services.skill_extraction_service import SkillExtractionService
+from app.services.skill_fallback_service import FakeSkillFallbackModel, SkillFallbackBatcher
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "text_paths.json"
+DEFAULT_SIZES = [200, 2000, 10000]
+MIN_MEASURE_SECONDS = 0.2
+
+REAL_SKILLS = [
+    ("Python", "Language", ["py"]),
+    ("JavaScript", "Language", ["js", "node.js"]),
+    ("TypeScript", "Language", ["ts"]),
+    ("Go", "Language", ["golang"]),
+    ("C++", "Language", ["cpp"]),
+    ("React", "Framework", ["react.js"]),
+    ("React Native", "Framework", []),
+    ("FastAPI", "Framework", []),
+    ("PostgreSQL", "Database", ["postgres"]),
+    ("Kubernetes", "Infrastructure", ["k8s"]),
+    ("Machine Learning", "Domain", ["ml"]),
+    (".NET", "Framework", ["dotnet"]),
+]
+SYLLABLES = ["ka", "zo", "ri", "vex", "tan", "lu", "mor", "qi", "dex", "sul", "ny", "pra"]
+FILLER = (
+    "we are looking for an engineer who enjoys building reliable systems with a "
+    "collaborative team and cares about quality testing ownership mentoring and "
+    "shipping product features to customers every week across many time zones"
+).split()
+SALARIES = [
+    "Salary: ${low},000 - ${high},000 per year.",
+    "Pay rate: £{low} - £{high} per hour.",
+    "Compensation of €{low},500 / month.",
+    "Base ${low}0000 to ${high}0000 annually.",
+    "Competitive salary and equity.",
+]
+LOCATIONS = [
+    "San Francisco, CA",
+    "new york city",
+    "Remote - US",
+    "Austin, TX",
+    "Seattle, WA",
+    "Atlanta, GA",
+    "Los Angeles",
+    "Boise, ID",
+    "Berlin, Germany",
+    "Anywhere",
+    "Chicago, IL (Hybrid)",
+    "Salt Lake City, UT",
+]
+TITLES = ["Senior Backend Engineer", "Data Engineer", "Frontend Developer", "ML Engineer"]
+
+
+def build_taxonomy(size: int, rng: random.Random) -> List[NormalizedSkill]:
+    """Real-looking skills followed by synthetic ones with one or two aliases."""
+    skills = [
+        NormalizedSkill(name=name, category=category, aliases=aliases)
+        for name, category, aliases in REAL_SKILLS
+    ]
+    names = {name.lower() for name, _, _ in REAL_SKILLS}
+    while len(skills) < size:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+        if name.lower() in names:
+            continue
+        names.add(name.lower())
+        aliases = [f"{name.lower()}.js"] if rng.random() < 0.3 else []
+        if rng.random() < 0.3:
+            aliases.append(f"{name} {rng.choice(['db', 'cloud', 'sdk'])}")
+        skills.append(
+            NormalizedSkill(name=name, category=rng.choice(["Framework", "Tool"]), aliases=aliases)
+        )
+    return skills
+
+
+def build_corpus(
+    count: int, taxonomy: Sequence[NormalizedSkill], rng: random.Random
+) -> List[Dict[str, str]]:
+    """Postings of ~150-word descriptions mentioning a few taxonomy terms."""
+    corpus = []
+    for i in range(count):
+        sentences = []
+        for _ in range(rng.randint(6, 10)):
+            words = rng.choices(FILLER, k=rng.randint(10, 18))
+            if rng.random() < 0.5:
+                skill = rng.choice(taxonomy)
+                words.insert(rng.randrange(len(words)), rng.choice([skill.name] + skill.aliases))
+            sentences.append(" ".join(words).capitalize() + ".")
+        low = rng.randint(6, 20)
+        sentences.append(rng.choice(SALARIES).format(low=low, high=low + rng.randint(1, 5)))
+        corpus.append(
+            {
+                "title": rng.choice(TITLES),
+                "company": "bench",
+                "description": " ".join(sentences),
+                "location": rng.choice(LOCATIONS),
+                "id": f"p{i}",
+            }
+        )
+    return corpus
+
+
+def _best_of(repeat: int, run: Callable[[], int]) -> Dict[str, float]:
+    """
+    Fastest of repeat measurements; run returns the number of items it
+    processed. Short runs are repeated within a measurement until it lasts
+    MIN_MEASURE_SECONDS, so small corpus sizes are not dominated by noise.
+    """
+    best = None
+    items = 0
+    for _ in range(repeat):
+        loops = 0
+        started = time.perf_counter()
+        while True:
+            items = run()
+            loops += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= MIN_MEASURE_SECONDS:
+                break
+        best = elapsed / loops if best is None else min(best, elapsed / loops)
+    return {"items": items, "seconds": round(best, 6), "per_second": round(items / best, 1)}
+
+
+# Each benchmark prepares its inputs untimed and returns the timed run
+
+
+def prepare_skill_extraction(corpus, taxonomy) -> Callable[[], int]:
+    # Compile the taxonomy matcher up front; it is cached across calls
+    SkillExtractionService.matcher_for(taxonomy)
+
+    async def extract_all() -> None:
+        for posting in corpus:
+            await SkillExtractionService.extract_skills_from_text(
+                None, posting["description"], taxonomy=taxonomy
+            )
+
+    def run() -> int:
+        # Fresh fallback cache per run, so every repeat pays for the fallback calls
+        skill_fallback_service._batcher = SkillFallbackBatcher(
+            FakeSkillFallbackModel(), max_wait=0.0, cache_size=0
+        )
+        asyncio.run(extract_all())
+        return len(corpus)
+
+    return run
+
+
+def prepare_compensation(corpus, taxonomy) -> Callable[[], int]:
+    def run() -> int:
+        for posting in corpus:
+            CompensationExtractionService.extract_salary_from_text(posting["description"])
+        return len(corpus)
+
+    return run
+
+
+def prepare_location(corpus, taxonomy) -> Callable[[], int]:
+    def run() -> int:
+        for posting in corpus:
+            LocationNormalizationService.normalize_location(posting["location"])
+        return len(corpus)
+
+    return run
+
+
+def prepare_dedup_scoring(corpus, taxonomy) -> Callable[[], int]:
+    """Scores the last 10% of the corpus against the rest as one company batch; items are pairs."""
+    postings = []
+    for posting in corpus:
+        job = JobPosting(
+            id=posting["id"],
+            company_id=posting["company"],
+            raw_title=posting["title"],
+            description=posting["description"],
+            location=posting["location"],
+        )
+        JobDeduplicationService.apply_features(job)
+        postings.append(job)
+    split = len(postings) - max(1, len(postings) // 10)
+    candidates, incoming = postings[:split], postings[split:]
+    exact: Dict[str, JobPosting] = {}
+    for job in candidates:
+        exact.setdefault(job.dedupe_fingerprint, job)
+
+    def run() -> int:
+        JobDeduplicationService.match_company_batch(incoming, candidates, exact)
+        return len(incoming) * len(candidates)
+
+    return run
+
+
+BENCHMARKS: Dict[str, Callable[[List[Dict[str, str]], List[NormalizedSkill]], Callable[[], int]]] = {
+    "skill_extraction": prepare_skill_extraction,
+    "compensation": prepare_compensation,
+    "location": prepare_location,
+    "dedup_scoring": prepare_dedup_scoring,
+}
+
+
+def run_suite(
+    sizes: Sequence[int],
+    taxonomy_size: int = 3000,
+    repeat: int = 3,
+    seed: int = 42,
+    benchmarks: Optional[Sequence[str]] = None,
+) -> Dict[str, Dict[str, float]]:
+    """Throughput of every benchmark at every corpus size, keyed "<benchmark>@<size>"."""
+    rng = random.Random(seed)
+    taxonomy = build_taxonomy(taxonomy_size, rng)
+    results: Dict[str, Dict[str, float]] = {}
+    for size in sizes:
+        corpus = build_corpus(size, taxonomy, random.Random(seed + size))
+        for name in benchmarks or BENCHMARKS:
+            result = _best_of(repeat, BENCHMARKS[name](corpus, taxonomy))
+            results[f"{name}@{size}"] = result
+            print(
+                f"{name + '@' + str(size):24} {result['seconds']:10.6f}s "
+                f"{result['per_second']:14.1f} items/s"
+            )
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    max_regression: float,
+) -> List[str]:
+    """Benchmarks whose throughput fell more than max_regression percent below the baseline."""
+    regressions = []
+    for key, result in results.items():
+        base = baseline.get(key)
+        if not base:
+            continue
+        drop = (base["per_second"] - result["per_second"]) / base["per_second"] * 100
+        if drop > max_regression:
+            regressions.append(
+                f"{key}: {result['per_second']:.1f} items/s is {drop:.1f}% below "
+                f"the baseline {base['per_second']:.1f} items/s"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--taxonomy-size", type=int, default=3000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--benchmarks", nargs="*", choices=list(BENCHMARKS), default=None)
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--max-regression",
+        type=float,
+        default=30.0,
+        help="Allowed throughput drop against the baseline, in percent",
+    )
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.taxonomy_size, args.repeat, benchmarks=args.benchmarks)
+
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(
+            json.dumps(
+                {
+                    "environment": {
+                        "python": platform.python_version(),
+                        "machine": platform.machine(),
+                        "processor": platform.processor(),
+                    },
+                    "taxonomy_size": args.taxonomy_size,
+                    "results": results,
+                },
+                indent=2,
+            )
+            + "\n"
+        )
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --update-baseline to record one")
+        return 0
+    stored = json.loads(args.baseline.read_text())
+    if stored.get("taxonomy_size") != args.taxonomy_size:
+        print(
+            f"baseline was recorded with a taxonomy of {stored.get('taxonomy_size')} skills; "
+            "skipping comparison"
+        )
+        return 0
+
+    regressions = compare(results, stored["results"], args.max_regression)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if not regressions:
+        print(f"no regressions above {args.max_regression:.0f}%")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,56 @@
+"""
+Re-deduplicates all active job postings offline, company by company.
+
+Usage (from backend/src):
+    python -m scripts.corpus_dedup --workers 8
+    python -m scripts.corpus_dedup --threshold 0.9 --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from app.services.corpus_dedup_service import CorpusDedupService
+
+
+def print_progress(stats: dict) -> None:
+    print(
+        f"[{stats['elapsed_seconds']:8.1f}s] {stats['companies']} companies, "
+        f"{stats['postings']} postings, {stats['clusters']} clusters, "
+        f"{stats['merged']} merged",
+        flush=True,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threshold", type=float, default=0.85, help="Merge score threshold")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--companies", nargs="*", default=None, help="Company ids (default: all)"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="Report clusters without merging"
+    )
+    args = parser.parse_args()
+
+    stats = asyncio.run(
+        CorpusDedupService.run(
+            company_ids=args.companies,
+            threshold=args.threshold,
+            workers=args.workers,
+            dry_run=args.dry_run,
+            progress=print_progress,
+        )
+    )
+    mode = "would merge" if stats["dry_run"] else "merged"
+    print(
+        f"Done: {stats['postings']} postings in {stats['companies']} companies, "
+        f"{stats['clusters']} clusters, {mode} {stats['merged']} postings "
+        f"in {stats['elapsed_seconds']}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -49,3 +49,26 @@ class CareerPilotUser(HttpUser):
     def check_health(self):
         """Simulates checking system health endpoints."""
         self.client.get("/api/v2/health")
+
+
+class RateLimitedUser(HttpUser):
+    """
+    Sends a constant stream of cheap rate-limited requests, so response
+    percentiles are dominated by the latency RateLimitMiddleware adds.
+    Each user gets its own rate-limit bucket (keyed by client token) and
+    runs it dry, covering both the allowed and the denied (429) path.
+    Run alone with: locust -f scripts/locustfile.py RateLimitedUser
+    """
+    wait_time = between(0.01, 0.05)
+
+    def on_start(self):
+        self.headers = {"Authorization": f"Bearer load-test-{random.randint(10**19, 10**20 - 1)}"}
+
+    @task
+    def limited_request(self):
+        """Requests a route without a handler; the limiter still runs first."""
+        with self.client.get(
+            "/api/v2/rate-limit-probe", headers=self.headers, catch_response=True
+        ) as resp:
+            if resp.status_code in (404, 429):
+                resp.success()
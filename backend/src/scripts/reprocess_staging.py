@@ -0,0 +1,57 @@
+"""
+Rebuilds job postings from staged raw postings without refetching.
+
+Usage (from backend/src):
+    python -m scripts.reprocess_staging --job title-v2 --workers 4
+    python -m scripts.reprocess_staging --job title-v2 --sources greenhouse lever
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from app.services.staging_reprocess_service import (
+    REPROCESS_CHUNK_SIZE,
+    StagingReprocessService,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--job",
+        default="default",
+        help="Checkpoint name; rerunning the same job resumes it",
+    )
+    parser.add_argument(
+        "--sources", nargs="*", default=None, help="Source keys (default: all staged)"
+    )
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=REPROCESS_CHUNK_SIZE)
+    parser.add_argument(
+        "--restart", action="store_true", help="Start over instead of resuming"
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(
+        StagingReprocessService.reprocess_all(
+            source_keys=args.sources,
+            job_name=args.job,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            restart=args.restart,
+        )
+    )
+    for source_key, result in results.items():
+        if isinstance(result, Exception):
+            print(f"{source_key}: FAILED ({result})")
+        else:
+            print(
+                f"{source_key}: {result['rows']} rows, {result['refreshed']} refreshed, "
+                f"{result['created']} created in {result['chunks']} chunks"
+            )
+
+
+if __name__ == "__main__":
+    main()
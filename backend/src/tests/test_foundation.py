@@ -1,6 +1,11 @@
 from unittest.mock import AsyncMock, MagicMock, patch
 
+import asyncio
+
+import fakeredis
 import pytest
+from fakeredis.aioredis import FakeConnection
+from prometheus_client import REGISTRY
 from fastapi.testclient import TestClient
 from pydantic import ValidationError
 
@@ -8,7 +13,11 @@ from app.core.config import Settings
 from app.main import app
 from app.services.database_service import DatabaseService
 from app.services.qdrant_service import QdrantService
-from app.services.redis_service import RedisService
+from app.services import redis_service
+from app.services.redis_service import MeteredConnectionPool, RedisService
+from app.utils import event_bus
+from app.utils.event_bus import EventBus, EventConsumer
+from app.utils.event_dispatcher import EventDispatcher
 
 
 # 1. Settings validation tests
@@ -160,3 +169,380 @@ def test_api_health_endpoint_degraded(mock_qdrant, mock_redis, mock_db):
     assert data["services"]["database"]["error"] is not None
     assert data["services"]["redis"]["status"] == "connected"
     assert data["services"]["qdrant"]["status"] == "connected"
+
+
+# 6. EventBus (Redis Streams) tests
+@pytest.fixture
+def fake_streams(monkeypatch):
+    redis = fakeredis.FakeAsyncRedis()
+    monkeypatch.setattr(RedisService, "get_client", staticmethod(lambda: redis))
+    monkeypatch.setattr(event_bus.settings, "event_stream_prefix", "test-events")
+    return redis
+
+
+@pytest.mark.asyncio
+async def test_event_bus_streams_are_durable_and_bounded(fake_streams, monkeypatch):
+    # Published before any consumer exists: still delivered to a new group
+    await EventBus.publish("market.job_ingested", {"job": 1})
+    ids = await EventBus.publish_many(
+        [("market.job_ingested", {"job": 2}), ("market.job_updated", {"job": 3})]
+    )
+    assert len(ids) == 2
+
+    received = []
+
+    async def handler(event):
+        received.append((event["event_type"], event["data"]))
+
+    consumer = EventConsumer(
+        "digest",
+        "worker-1",
+        ["market.job_ingested", "market.job_updated"],
+        handler,
+        block_ms=None,
+    )
+    assert await consumer.poll() == 3
+    assert received == [
+        ("market.job_ingested", {"job": 1}),
+        ("market.job_ingested", {"job": 2}),
+        ("market.job_updated", {"job": 3}),
+    ]
+    assert await consumer.poll() == 0
+    pending = await fake_streams.xpending("test-events:market.job_ingested", "digest")
+    assert pending["pending"] == 0
+
+    monkeypatch.setattr(event_bus, "TRIM_APPROXIMATE", False)
+    monkeypatch.setattr(event_bus.settings, "event_stream_maxlen", 5)
+    await EventBus.publish_many([("market.job_ingested", {"job": i}) for i in range(20)])
+    assert await fake_streams.xlen("test-events:market.job_ingested") == 5
+
+
+@pytest.mark.asyncio
+async def test_event_consumer_retries_then_dead_letters(fake_streams):
+    await EventBus.publish_many(
+        [("profile.updated", {"user": "ok"}), ("profile.updated", {"user": "poison"})]
+    )
+    calls = []
+
+    async def handler(event):
+        calls.append(event["data"]["user"])
+        if event["data"]["user"] == "poison":
+            raise ValueError("cannot handle")
+
+    consumer = EventConsumer(
+        "sync",
+        "worker-1",
+        ["profile.updated"],
+        handler,
+        block_ms=None,
+        max_deliveries=3,
+        retry_idle_ms=0,
+    )
+    for _ in range(5):
+        await consumer.poll()
+
+    assert calls == ["ok", "poison", "poison", "poison"]
+    assert consumer.handled == 1
+    assert consumer.failed == 3
+    assert consumer.dead_lettered == 1
+    pending = await fake_streams.xpending("test-events:profile.updated", "sync")
+    assert pending["pending"] == 0
+    dead = await fake_streams.xrange("test-events:dead-letter")
+    assert len(dead) == 1
+    assert dead[0][1][b"stream"] == b"test-events:profile.updated"
+    assert EventConsumer.decode_event(*dead[0])["data"] == {"user": "poison"}
+
+
+@pytest.mark.asyncio
+async def test_event_bus_publish_survives_redis_outage(monkeypatch):
+    def unreachable():
+        raise ConnectionError("Redis unreachable")
+
+    monkeypatch.setattr(RedisService, "get_client", staticmethod(unreachable))
+    await EventBus.publish("market.job_ingested", {"job": 1})
+    assert await EventBus.publish_many([("market.job_ingested", {"job": 1})]) == []
+
+
+# 7. In-process event dispatch tests
+@pytest.mark.asyncio
+async def test_event_dispatcher_isolates_handlers():
+    dispatcher = EventDispatcher()
+    seen = []
+    release = asyncio.Event()
+
+    @dispatcher.on("market.*", name="test.slow")
+    async def slow(event):
+        await release.wait()
+        seen.append(("slow", event.data["n"]))
+
+    @dispatcher.on(["market.job_ingested", "profile.updated"], name="test.flaky")
+    async def flaky(event):
+        if event.data["n"] == 1:
+            raise RuntimeError("boom")
+        seen.append(("flaky", event.data["n"]))
+
+    # Publishing does not wait for handlers
+    for n in range(3):
+        await dispatcher.publish("market.job_ingested", {"n": n})
+    await dispatcher.publish("profile.updated", {"n": 3})
+    await asyncio.sleep(0)
+    assert seen == [("flaky", 0), ("flaky", 2), ("flaky", 3)]
+
+    release.set()
+    await dispatcher.drain()
+    assert [n for name, n in seen if name == "slow"] == [0, 1, 2]
+    stats = dispatcher.stats()
+    assert stats["test.slow"] == {"handled": 3, "failed": 0, "dropped": 0, "queued": 0}
+    assert stats["test.flaky"]["failed"] == 1
+    assert REGISTRY.get_sample_value(
+        "careerpilot_event_handler_events_total",
+        {"handler": "test.flaky", "outcome": "failed"},
+    ) >= 1
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_event_dispatcher_bounded_queue_drops():
+    dispatcher = EventDispatcher(queue_size=2)
+    release = asyncio.Event()
+
+    @dispatcher.on("market.job_ingested", name="test.blocked")
+    async def blocked(event):
+        await release.wait()
+
+    await dispatcher.publish("market.job_ingested", {"n": 0})
+    await asyncio.sleep(0)
+    # The first event is in the handler: two more fit the queue, two are dropped
+    for n in range(1, 5):
+        await dispatcher.publish("market.job_ingested", {"n": n})
+    assert dispatcher.stats()["test.blocked"] == {
+        "handled": 0,
+        "failed": 0,
+        "dropped": 2,
+        "queued": 2,
+    }
+    release.set()
+    await dispatcher.drain()
+    await dispatcher.close()
+
+
+@pytest.mark.asyncio
+async def test_event_bus_forwards_all_but_local_only_events(fake_streams, monkeypatch):
+    from app.utils.event_bus import dispatcher
+
+    received = []
+
+    async def record(event):
+        received.append(event)
+
+    name = dispatcher.subscribe("market.*", record, name="test.forwarding")
+    monkeypatch.setattr(dispatcher, "local_only", {"market.skill_trends_refreshed"})
+    try:
+        ids = await EventBus.publish_many(
+            [
+                ("market.job_ingested", {"job": 1}),
+                ("market.skill_trends_refreshed", {"total_skills_tracked": 10}),
+            ]
+        )
+        await dispatcher.drain()
+    finally:
+        dispatcher.unsubscribe(name)
+
+    assert [event.event_type for event in received] == [
+        "market.job_ingested",
+        "market.skill_trends_refreshed",
+    ]
+    assert len(ids) == 1
+    assert not await fake_streams.exists("test-events:market.skill_trends_refreshed")
+    stored = await fake_streams.xrange("test-events:market.job_ingested")
+    assert EventConsumer.decode_event(*stored[0])["event_id"] == received[0].event_id
+
+
+@pytest.mark.asyncio
+async def test_profile_events_invalidate_dashboard_in_process(fake_streams, monkeypatch):
+    from app.services.dashboard_service import DashboardAggregationService
+    from app.utils.event_bus import dispatcher
+
+    invalidated = []
+
+    async def invalidate(user_id):
+        invalidated.append(user_id)
+
+    monkeypatch.setattr(DashboardAggregationService, "invalidate_cache", staticmethod(invalidate))
+    await EventBus.publish("profile.updated", {"user_id": "user-1"})
+    await EventBus.publish("cohort.assignment.updated", {"user_id": "user-2"})
+    await dispatcher.drain()
+    assert invalidated == ["user-1", "user-2"]
+
+
+# 8. Application Redis pool tests
+@pytest.mark.asyncio
+async def test_redis_clients_share_application_pool(monkeypatch):
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(
+        RedisService,
+        "create_pool",
+        staticmethod(
+            lambda: MeteredConnectionPool(
+                max_connections=4, connection_class=FakeConnection, server=server
+            )
+        ),
+    )
+    await RedisService.open_pool()
+    try:
+        pool = RedisService.get_pool()
+        for _ in range(5):
+            async with RedisService.get_client() as client:
+                await client.incr("hits")
+        assert RedisService.get_client().connection_pool is pool
+        # Closing clients released their connection instead of disconnecting it
+        assert RedisService.pool_stats() == {"in_use": 0, "idle": 1, "max": 4}
+    finally:
+        await RedisService.close_pool()
+    assert redis_service._pool is None
+
+
+@pytest.mark.asyncio
+async def test_redis_pool_reports_saturation():
+    pool = MeteredConnectionPool(
+        max_connections=1,
+        timeout=0.05,
+        connection_class=FakeConnection,
+        server=fakeredis.FakeServer(),
+    )
+
+    def checkouts(outcome):
+        return REGISTRY.get_sample_value(
+            "careerpilot_redis_pool_checkouts_total", {"outcome": outcome}
+        ) or 0.0
+
+    before = {outcome: checkouts(outcome) for outcome in ("immediate", "waited", "timeout")}
+    held = await pool.get_connection()
+    with pytest.raises(Exception, match="No connection available"):
+        await pool.get_connection()
+
+    async def release_soon():
+        await asyncio.sleep(0.01)
+        await pool.release(held)
+
+    waited, _ = await asyncio.gather(pool.get_connection(), release_soon())
+    await pool.release(waited)
+    await pool.disconnect()
+
+    assert checkouts("immediate") - before["immediate"] == 1
+    assert checkouts("timeout") - before["timeout"] == 1
+    assert checkouts("waited") - before["waited"] == 1
+    assert REGISTRY.get_sample_value(
+        "careerpilot_redis_pool_connections", {"state": "in_use"}
+    ) == 0
+
+
+# 9. ASGI middleware stack tests
+async def _run_asgi(asgi_app, path, headers, on_message):
+    """Drives one GET request through asgi_app, handing every sent message to on_message."""
+    disconnected = asyncio.Event()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path.split("?")[0],
+        "raw_path": path.split("?")[0].encode(),
+        "query_string": path.partition("?")[2].encode(),
+        "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in headers.items()],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    requested = False
+
+    async def receive():
+        nonlocal requested
+        if not requested:
+            requested = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        await on_message(message)
+        if message["type"] == "http.response.body" and not message.get("more_body", False):
+            disconnected.set()
+
+    await asyncio.wait_for(asgi_app(scope, receive, send), timeout=5)
+
+
+@pytest.mark.asyncio
+async def test_chat_stream_passes_through_middleware_unbuffered(monkeypatch):
+    from app.api.v1 import chat as chat_api
+    from app.core.logging import request_id_var
+
+    release = asyncio.Event()
+    seen_request_ids = []
+
+    async def stream_message(message):
+        seen_request_ids.append(request_id_var.get())
+        yield "Hel"
+        await release.wait()
+        yield "lo"
+
+    monkeypatch.setattr(chat_api.chat_service, "stream_message", stream_message)
+
+    start = {}
+    chunks = []
+
+    async def on_message(message):
+        if message["type"] == "http.response.start":
+            start.update(message)
+        elif message["type"] == "http.response.body" and message.get("body"):
+            chunks.append(message["body"].decode())
+            # The first token reaches the client while the model is still generating
+            if "Hel" in "".join(chunks) and not release.is_set():
+                assert not any("[DONE]" in chunk for chunk in chunks)
+                release.set()
+
+    await _run_asgi(app, "/chat/stream?message=hi", {"X-Request-ID": "req-stream-1"}, on_message)
+
+    assert start["status"] == 200
+    assert (b"x-request-id", b"req-stream-1") in [(k.lower(), v) for k, v in start["headers"]]
+    body = "".join(chunks)
+    assert body.index("event: meta") < body.index("data: Hel") < body.index("data: lo")
+    assert body.rstrip().endswith("data: [DONE]")
+    assert len(chunks) >= 4
+    # The request id context variable is visible inside the streamed generator
+    assert seen_request_ids == ["req-stream-1"]
+
+
+@pytest.mark.asyncio
+async def test_middleware_stack_rate_limits_and_records_metrics(monkeypatch):
+    from httpx import ASGITransport, AsyncClient
+    from app.services.reliability_manager_service import ReliabilityManagerService
+
+    allowed = {"value": False}
+
+    async def check_rate_limit(*args, **kwargs):
+        return allowed["value"]
+
+    monkeypatch.setattr(ReliabilityManagerService, "check_rate_limit", check_rate_limit)
+
+    def requests_404():
+        return REGISTRY.get_sample_value(
+            "careerpilot_api_requests_total",
+            {"method": "GET", "route": "unmatched", "status": "404"},
+        ) or 0.0
+
+    before = requests_404()
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        resp = await client.get("/api/v2/dashboard")
+        assert resp.status_code == 429
+        assert resp.json() == {"detail": "Too many requests. Please try again later."}
+
+        allowed["value"] = True
+        resp = await client.get(
+            "/api/v2/0b8f6c1e-5a7d-4c1b-9a8e-2f3d4c5b6a79", headers={"X-Request-ID": "req-404"}
+        )
+    assert resp.status_code == 404
+    assert resp.headers["X-Request-ID"] == "req-404"
+    assert requests_404() - before == 1
@@ -1,6 +1,9 @@
 from __future__ import annotations
 
+import asyncio
 import random
+import re
+import time
 from datetime import date
 
 import pytest
@@ -24,6 +27,7 @@ from app.services.benchmark_calculator_service import (
 from app.services.compensation_extraction_service import (
     CompensationExtractionService,
 )
+from app.services.corpus_dedup_service import CorpusDedupService
 from app.services.database_service import (
     AsyncSessionLocal,
     async_engine,
@@ -32,6 +36,19 @@ from app.services.job_deduplication_service import JobDeduplicationService
 from app.services.location_normalization_service import (
     LocationNormalizationService,
 )
+from app.services.minhash_lsh_service import (
+    NUM_BANDS,
+    CompanyCandidates,
+    MinHashLSHService,
+)
+from app.services.skill_extraction_service import (
+    SkillExtractionService,
+    SkillMatcher,
+)
+from app.services.skill_fallback_service import (
+    FakeSkillFallbackModel,
+    SkillFallbackBatcher,
+)
 from app.services.skill_trend_service import SkillTrendService
 
 
@@ -81,6 +98,384 @@ def test_title_and_company_cleaning():
     assert JobDeduplicationService.clean_company(c2) == "acme"
 
 
+def test_precomputed_features_match_text_similarity():
+    """Stored title tokens and TF vectors score like the raw-text similarities."""
+
+    def posting(title: str, description: str, location: str = "Remote") -> JobPosting:
+        job = JobPosting(
+            id=str(random.random()),
+            company_id="acme",
+            raw_title=title,
+            description=description,
+            location=location,
+        )
+        JobDeduplicationService.apply_features(job)
+        return job
+
+    a = posting(
+        "Senior Backend Engineer",
+        "Python developer with Kubernetes experience. Python APIs.",
+    )
+    b = posting(
+        "Backend Software Engineer",
+        "Seeking a Python developer who has Kubernetes and DevOps skills",
+    )
+    fa = JobDeduplicationService.features(a)
+    fb = JobDeduplicationService.features(b)
+
+    assert JobDeduplicationService.title_similarity(fa, fb) == pytest.approx(
+        JobDeduplicationService.calculate_jaccard_similarity(
+            JobDeduplicationService.clean_title(a.raw_title),
+            JobDeduplicationService.clean_title(b.raw_title),
+        )
+    )
+    assert JobDeduplicationService.description_similarity(fa, fb) == pytest.approx(
+        JobDeduplicationService.calculate_cosine_similarity(a.description, b.description)
+    )
+
+    # Fingerprints ignore case, whitespace, punctuation and seniority tags
+    repost = posting(
+        "Backend Engineer",
+        "python developer  with kubernetes experience - Python APIs",
+    )
+    assert repost.dedupe_fingerprint == a.dedupe_fingerprint
+    assert posting(a.raw_title, a.description, "Austin, TX").dedupe_fingerprint != (
+        a.dedupe_fingerprint
+    )
+    best, score, sims = JobDeduplicationService.find_best_match(repost, [b, a])
+    assert best is a
+    assert score == pytest.approx(1.0)
+
+
+def _synthetic_postings(rng: random.Random, count: int, prefix: str) -> list[JobPosting]:
+    titles = ["Backend Engineer", "Senior Backend Engineer", "Data Engineer", "Frontend Developer"]
+    locations = ["Remote", "Austin, TX", "New York, NY"]
+    words = [f"w{i}" for i in range(40)]
+    base = " ".join(rng.choices(words, k=30))
+    postings = []
+    for i in range(count):
+        tokens = base.split()
+        for _ in range(rng.randint(0, 12)):
+            tokens[rng.randrange(len(tokens))] = rng.choice(words)
+        job = JobPosting(
+            id=f"{prefix}{i}",
+            company_id="acme",
+            raw_title=rng.choice(titles),
+            description=" ".join(tokens) if rng.random() > 0.05 else "",
+            location=rng.choice(locations),
+        )
+        JobDeduplicationService.apply_features(job)
+        postings.append(job)
+    return postings
+
+
+def _scalar_matches(incoming, company_candidates, exact, buckets):
+    """Posting-by-posting decisions of the scalar path."""
+    decisions = []
+    for job, job_buckets in zip(incoming, buckets):
+        if job.dedupe_fingerprint in exact:
+            best, score = exact[job.dedupe_fingerprint], 1.0
+        else:
+            best, score, _ = JobDeduplicationService.find_best_match(
+                job, company_candidates.candidates(job_buckets)
+            )
+        if not (best and score > 0.85):
+            company_candidates.add(job, job_buckets)
+            exact.setdefault(job.dedupe_fingerprint, job)
+        decisions.append((best.id if best else None, round(score, 12)))
+    return decisions
+
+
+@pytest.mark.parametrize("exhaustive", [True, False])
+def test_vectorized_batch_matches_scalar_decisions(exhaustive):
+    """Matrix batch scoring reaches the same decisions as scalar scoring."""
+    rng = random.Random(7)
+    stored = _synthetic_postings(rng, 60, "s")
+    incoming = _synthetic_postings(rng, 80, "n")
+    # An exact repost of a stored primary takes the fingerprint path
+    incoming[5].raw_title = stored[0].raw_title
+    incoming[5].description = stored[0].description
+    incoming[5].location = stored[0].location
+    incoming[5].title_tokens = incoming[5].description_tf = incoming[5].dedupe_fingerprint = None
+    JobDeduplicationService.apply_features(incoming[5])
+
+    def load():
+        candidates = CompanyCandidates(exhaustive=exhaustive)
+        exact = {}
+        for job in stored:
+            candidates.add(job, JobDeduplicationService.lsh_buckets(job))
+            exact.setdefault(job.dedupe_fingerprint, job)
+        return candidates, exact
+
+    buckets = [JobDeduplicationService.lsh_buckets(job) for job in incoming]
+    candidates, exact = load()
+    expected = _scalar_matches(incoming, candidates, exact, buckets)
+
+    candidates, exact = load()
+    matches = JobDeduplicationService.match_with_candidates(
+        incoming, buckets, candidates, exact
+    )
+    actual = [(best.id if best else None, round(score, 12)) for best, score, _ in matches]
+
+    assert actual == expected
+    assert expected[5] == (stored[0].id, 1.0)
+    assert sum(1 for _, score in expected if score > 0.85) > 5
+    assert sum(1 for _, score in expected if 0.75 <= score <= 0.85) > 0
+
+
+@pytest.mark.parametrize("exhaustive_limit", [1000, 0])
+def test_cluster_company_collapses_duplicate_chains(exhaustive_limit):
+    """Union-find joins transitive duplicates and keeps the oldest posting."""
+    words = [f"w{i}" for i in range(80)]
+    base = words[:40]
+
+    def row(i: int, tokens: list[str], title: str = "Backend Engineer", days: int = 0) -> dict:
+        return {
+            "id": f"p{i}",
+            "company_id": "acme",
+            "raw_title": title,
+            "location": "Remote",
+            "description": " ".join(tokens),
+            "created_at": date(2024, 1, 1 + days),
+            "title_tokens": None,
+            "description_tf": None,
+            "minhash_signature": None,
+            "dedupe_fingerprint": None,
+        }
+
+    rows = [
+        row(0, base, days=3),
+        # p1 ~ p0 and p2 ~ p1 while p2 is only a review-level match of p0,
+        # so p0, p1 and p2 form one cluster
+        row(1, base[:30] + words[40:50], days=1),
+        row(2, base[:20] + words[40:60], days=2),
+        # Exact repost of p0
+        row(3, base, "Senior Backend Engineer", days=5),
+        # Unrelated posting
+        row(4, words[40:80], "Marketing Lead", days=0),
+    ]
+    clusters = CorpusDedupService.cluster_company(
+        rows, threshold=0.85, exhaustive_limit=exhaustive_limit
+    )
+
+    assert len(clusters) == 1
+    assert clusters[0]["canonical_id"] == "p1"
+    members = {m["id"]: m for m in clusters[0]["members"]}
+    assert set(members) == {"p0", "p2", "p3"}
+    assert members["p3"]["score"] == pytest.approx(1.0)
+    assert all(m["score"] > 0.85 for m in members.values())
+    assert JobDeduplicationService.calculate_cosine_similarity(
+        rows[0]["description"], rows[2]["description"]
+    ) == pytest.approx(0.5)
+
+
+def test_minhash_lsh_buckets():
+    """Near-duplicate descriptions share LSH buckets; unrelated ones do not."""
+    base = (
+        "We are hiring a backend engineer to build Python services with FastAPI, "
+        "PostgreSQL and Kubernetes. You will own APIs, observability and on-call."
+    )
+    repost = base + " Apply today."
+    other = "Marketing lead for brand campaigns, events and social media growth."
+
+    sig_base = MinHashLSHService.signature(base)
+    sig_repost = MinHashLSHService.signature(repost)
+    sig_other = MinHashLSHService.signature(other)
+    assert len(sig_base) == 128 * 4
+    assert MinHashLSHService.signature(base) == sig_base
+
+    jaccard = JobDeduplicationService.calculate_jaccard_similarity(base, repost)
+    assert abs(MinHashLSHService.estimate_jaccard(sig_base, sig_repost) - jaccard) < 0.15
+    assert MinHashLSHService.estimate_jaccard(sig_base, sig_other) < 0.1
+
+    b_base = MinHashLSHService.band_buckets(sig_base, "backend engineer")
+    b_repost = MinHashLSHService.band_buckets(sig_repost, "engineer backend")
+    b_other = MinHashLSHService.band_buckets(sig_other, "marketing lead")
+    assert len(b_base) == NUM_BANDS
+    # Title band ignores token order
+    assert b_base[-1] == b_repost[-1]
+    assert sum(a == b for a, b in zip(b_base[:-1], b_repost[:-1])) > 0
+    assert not any(a == b for a, b in zip(b_base, b_other))
+
+
+def test_skill_matcher_matches_word_boundary_regexes():
+    """The compiled matcher finds exactly the skills of per-term \\b regexes."""
+    taxonomy = [
+        NormalizedSkill(name="Java", category="Language", aliases=[]),
+        NormalizedSkill(name="JavaScript", category="Language", aliases=["js", "node.js"]),
+        NormalizedSkill(name="React", category="Framework", aliases=[]),
+        NormalizedSkill(name="React Native", category="Framework", aliases=[]),
+        NormalizedSkill(name="C++", category="Language", aliases=["cpp"]),
+        NormalizedSkill(name="C", category=None, aliases=[]),
+        NormalizedSkill(name="Machine Learning", category="Domain", aliases=["ml"]),
+        NormalizedSkill(name="Learning", category="Domain", aliases=[]),
+        NormalizedSkill(name="Go", category="Language", aliases=["golang"]),
+        NormalizedSkill(name=".NET", category="Framework", aliases=["dotnet"]),
+    ]
+    text = (
+        "We build React Native apps in JavaScript. Experience with C++/cpp "
+        "and Machine Learning is a plus!\nGood communication; golang welcome. "
+        "asp.NET and node.js services."
+    )
+
+    def regex_match(skill_terms):
+        lowered = text.lower()
+        return [
+            term
+            for term in skill_terms
+            if re.search(r"\b" + re.escape(term.lower()) + r"\b", lowered)
+        ]
+
+    expected = {}
+    for skill in taxonomy:
+        terms = regex_match([skill.name] + skill.aliases)
+        if terms:
+            expected[skill.name] = terms[0]
+
+    extracted = SkillMatcher(taxonomy).match(text)
+    assert {name: s.alias_resolved_from for name, s in extracted.items()} == expected
+    assert list(extracted) == [s.name for s in taxonomy if s.name in expected]
+    # "Java" only occurs inside "JavaScript"; "Go" only inside "Good"
+    assert "Java" not in extracted and "Go" in extracted
+    assert extracted["Go"].alias_resolved_from == "golang"
+    assert extracted["Go"].context_sentence == "Good communication; golang welcome"
+    assert extracted["Learning"].context_sentence == (
+        "Experience with C++/cpp and Machine Learning is a plus"
+    )
+    assert extracted["C"].category == "Other"
+
+    # Cached per taxonomy sequence; appending a skill recompiles
+    matcher = SkillExtractionService.matcher_for(taxonomy)
+    assert SkillExtractionService.matcher_for(taxonomy) is matcher
+    assert SkillExtractionService.matcher_for(list(taxonomy)) is matcher
+    taxonomy.append(NormalizedSkill(name="Communication", category="Soft", aliases=[]))
+    assert "Communication" in SkillExtractionService.match_taxonomy(text, taxonomy)
+
+
+async def test_fallback_batcher_groups_and_caches_descriptions():
+    """Short descriptions share prompts, long ones go alone, answers are cached by content."""
+    model = FakeSkillFallbackModel(latency=0.01)
+    batcher = SkillFallbackBatcher(model, batch_size=4, max_wait=0.01, short_chars=200)
+    texts = [f"Posting {i}: we use Rust and Kafka. Remote first." for i in range(6)]
+    long_text = "We deploy services with Docker on AWS. " * 10
+
+    results = await asyncio.gather(
+        *(batcher.extract(text) for text in texts + [texts[0], long_text])
+    )
+    # Two prompts of short descriptions (4 + 2) and one for the long description;
+    # the repeated description waits for the first call instead of adding a text
+    assert (model.prompts, model.texts) == (3, 7)
+    assert [s.canonical_name for s in results[0]] == ["Rust", "Kafka"]
+    assert results[0][0].context_sentence == "Posting 0: we use Rust and Kafka"
+    assert results[6] == results[0]
+    assert {s.canonical_name for s in results[7]} == {"Docker", "AWS"}
+
+    assert await batcher.extract(texts[3]) == results[3]
+    assert model.prompts == 3
+
+    class FailingModel:
+        async def extract_batch(self, texts):
+            raise RuntimeError("quota exceeded")
+
+    failing = SkillFallbackBatcher(FailingModel(), max_wait=0.0)
+    with pytest.raises(RuntimeError):
+        await failing.extract(texts[0])
+    # Failures are not cached
+    failing.model = model
+    assert await failing.extract(texts[0]) == results[0]
+
+
+async def test_fallback_batcher_only_waits_for_arriving_callers():
+    """A lone caller is sent at once; callers arriving together still share a prompt."""
+    model = FakeSkillFallbackModel(latency=0.05)
+    batcher = SkillFallbackBatcher(model, batch_size=8, max_wait=5.0, arrival_gap=0.05)
+
+    started = time.perf_counter()
+    await batcher.extract("Sequential caller using Go.")
+    assert time.perf_counter() - started < 0.1
+    assert model.prompts == 1
+
+    async def staggered(i):
+        await asyncio.sleep(0.005 * i)
+        return await batcher.extract(f"Staggered caller {i} using Rust.")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(staggered(i) for i in range(4)))
+    assert time.perf_counter() - started < 1.0
+    # The first is sent at once; the others arrive while it runs and share a prompt
+    assert (model.prompts, model.texts) == (3, 5)
+
+
+async def test_fallback_batcher_shares_answers_through_redis():
+    """Workers share answers by model and content hash; other models miss."""
+    import fakeredis
+
+    server = fakeredis.FakeServer()
+    texts = [f"Shared posting {i} on Kubernetes and Terraform." for i in range(3)]
+
+    first_model = FakeSkillFallbackModel()
+    first = SkillFallbackBatcher(
+        first_model, ttl_seconds=60, client=fakeredis.FakeAsyncRedis(server=server)
+    )
+    answers = await asyncio.gather(*(first.extract(text) for text in texts[:2]))
+
+    second_model = FakeSkillFallbackModel()
+    second = SkillFallbackBatcher(
+        second_model, ttl_seconds=60, client=fakeredis.FakeAsyncRedis(server=server)
+    )
+    assert await asyncio.gather(*(second.extract(text) for text in texts)) == [
+        *answers,
+        await first.extract(texts[2]),
+    ]
+    # Only the description the first worker never saw reaches the second model
+    assert (second_model.prompts, second_model.texts) == (1, 1)
+
+    other_model = FakeSkillFallbackModel()
+    other_model.name = "other"
+    other = SkillFallbackBatcher(
+        other_model, ttl_seconds=60, client=fakeredis.FakeAsyncRedis(server=server)
+    )
+    await other.extract(texts[0])
+    assert other_model.texts == 1
+
+
+async def test_fallback_batcher_cancelled_call_releases_waiters():
+    """Cancelling a model call cancels its waiters instead of leaving them hanging."""
+    model = FakeSkillFallbackModel(latency=5.0)
+    batcher = SkillFallbackBatcher(model, max_wait=0.0)
+    text = "Cancelled posting on Go."
+
+    waiter = asyncio.create_task(batcher.extract(text))
+    await asyncio.sleep(0.01)
+    assert model.prompts == 1
+    for task in list(batcher._tasks):
+        task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await asyncio.wait_for(waiter, timeout=1.0)
+    assert not batcher._in_flight
+
+    model.latency = 0.0
+    assert [s.canonical_name for s in await batcher.extract(text)] == ["Go"]
+
+
+def test_text_path_benchmark_gate(monkeypatch):
+    """The offline benchmark suite runs without services and flags throughput drops."""
+    from scripts.benchmarks import text_paths
+
+    monkeypatch.setattr(text_paths, "MIN_MEASURE_SECONDS", 0.0)
+    results = text_paths.run_suite([20], taxonomy_size=50, repeat=1)
+    assert set(results) == {f"{name}@20" for name in text_paths.BENCHMARKS}
+    assert all(result["per_second"] > 0 for result in results.values())
+
+    assert text_paths.compare(results, results, max_regression=10.0) == []
+    faster = {
+        key: {**result, "per_second": result["per_second"] * 2}
+        for key, result in results.items()
+    }
+    assert len(text_paths.compare(results, faster, max_regression=10.0)) == len(results)
+    assert text_paths.compare(results, faster, max_regression=60.0) == []
+
+
 def test_location_normalization():
     """Verify locations are correctly resolved to cost-of-living tiers."""
     tier1 = LocationNormalizationService.normalize_location("San Francisco, CA")
@@ -98,6 +493,30 @@ def test_location_normalization():
     assert remote["col_tier"] == "TIER_3"
 
 
+def test_location_normalization_matches_whole_tokens():
+    """Short gazetteer entries must not match inside other place names."""
+    for raw in ["Atlanta, GA", "Dallas, TX", "Philadelphia, PA", "New Orleans, LA"]:
+        assert LocationNormalizationService.normalize_location(raw)["col_tier"] == "TIER_3"
+
+    assert LocationNormalizationService.normalize_location("LA") == {
+        "location": "Los Angeles, CA",
+        "col_tier": "TIER_2",
+    }
+    assert LocationNormalizationService.normalize_location("SF Bay Area")["col_tier"] == "TIER_1"
+    assert LocationNormalizationService.normalize_location("Chicago, IL (Hybrid)") == {
+        "location": "Chicago, IL",
+        "col_tier": "TIER_2",
+    }
+    assert LocationNormalizationService.normalize_location("boise, id")["location"] == "Boise, ID"
+    assert LocationNormalizationService.normalize_location("")["location"] == "Remote"
+
+    raws = ["Atlanta, GA", "nyc", "Atlanta, GA", "Remote", "Austin, TX"]
+    batch = LocationNormalizationService.normalize_locations(raws)
+    assert batch == [LocationNormalizationService.normalize_location(raw) for raw in raws]
+    batch[0]["location"] = "changed"
+    assert LocationNormalizationService.normalize_location("Atlanta, GA")["location"] == "Atlanta, GA"
+
+
 # ── 2. Unit Tests for Compensation Extraction ──────────────────────────
 
 
@@ -126,6 +545,21 @@ def test_compensation_regex_extraction():
     assert res3["payment_interval"] == "MONTHLY"
 
 
+def test_compensation_batch_extraction():
+    """Batch extraction equals per-text extraction, repeats included."""
+    texts = [
+        "Salary: $140,000 to $180,000 per year",
+        "Competitive salary and great benefits",
+        "",
+        "Pay rate: £60 - £80 per hour",
+        "Salary: $140,000 to $180,000 per year",
+    ]
+    batch = CompensationExtractionService.extract_salaries_from_texts(texts)
+    assert batch == [CompensationExtractionService.extract_salary_from_text(t) for t in texts]
+    assert batch[1] is None and batch[2] is None
+    assert batch[0] is not batch[4]
+
+
 def test_compensation_normalization():
     """Verify pay rates are standardized to USD annual equivalents."""
     # GBP Hourly rate: £60 to £80
@@ -0,0 +1,1033 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from datetime import date, datetime
+from uuid import uuid4
+
+import httpx
+import pytest
+from sqlalchemy import delete, func, select
+
+from app.infrastructure.database.models import (
+    Company,
+    CompensationRecord,
+    DedupeAuditLog,
+    JobDuplicate,
+    JobIngestionRun,
+    JobPosting,
+    JobPostingLSHBand,
+    JobPostingSkill,
+    JobSource,
+    NormalizedSkill,
+    RawJobPosting,
+    StagingReprocessCheckpoint,
+)
+from app.services.corpus_dedup_service import CorpusDedupService
+from app.services.database_service import AsyncSessionLocal, async_engine
+from app.services import minhash_lsh_service, skill_fallback_service
+from app.services.job_ingestion_service import (
+    ConditionalRequestCache,
+    GreenhouseCrawlerClient,
+    JobFetchOrchestrator,
+    JobIngestionService,
+)
+from app.services.job_deduplication_service import JobDeduplicationService
+from app.services.skill_extraction_service import SkillExtractionService
+from app.services.skill_fallback_service import (
+    FakeSkillFallbackModel,
+    SkillFallbackBatcher,
+)
+from app.services.staging_reprocess_service import StagingReprocessService
+from app.utils.event_bus import EventBus
+
+
+@pytest.fixture(autouse=True)
+async def cleanup_db_engine():
+    await async_engine.dispose()
+    yield
+    await async_engine.dispose()
+
+
+def _sample_jobs(tag: str) -> list[dict]:
+    def job(ext_id: str, company: str, title: str, description: str) -> dict:
+        return {
+            "external_id": f"{tag}_{ext_id}",
+            "title": title,
+            "company_name": f"{company} {tag}",
+            "description": description,
+            "location_raw": "Remote",
+            "url": f"https://example.com/{tag}/{ext_id}",
+            "salary_raw": None,
+            "raw_payload": {"id": ext_id},
+        }
+
+    return [
+        job(
+            "1",
+            "Acme",
+            "Senior Backend Engineer",
+            "Python, FastAPI and Kubernetes developer. Salary is $150000 a year.",
+        ),
+        job(
+            "2",
+            "Globex",
+            "Frontend Engineer",
+            "Python, FastAPI and Kubernetes with React. Salary is $90000 - $110000 a year.",
+        ),
+        # Exact repost of job 1 under a new id: auto-merged into job 1
+        job(
+            "3",
+            "Acme",
+            "Senior Backend Engineer",
+            "Python, FastAPI and Kubernetes developer. Salary is $150000 a year.",
+        ),
+        # Same external id twice in one batch: second one is a duplicate
+        job(
+            "2",
+            "Globex",
+            "Frontend Engineer",
+            "Python, FastAPI and Kubernetes with React. Salary is $90000 - $110000 a year.",
+        ),
+    ]
+
+
+async def _ingest(monkeypatch, bulk: bool, tag: str):
+    events = []
+
+    async def record(event_type, data):
+        events.append(event_type)
+
+    monkeypatch.setattr(EventBus, "publish", staticmethod(record))
+
+    async with AsyncSessionLocal() as session:
+        for name, cat in [
+            ("Python", "Language"),
+            ("FastAPI", "Framework"),
+            ("Kubernetes", "Infrastructure"),
+        ]:
+            res = await session.execute(
+                select(NormalizedSkill).where(NormalizedSkill.name == name)
+            )
+            if not res.scalar_one_or_none():
+                session.add(
+                    NormalizedSkill(
+                        id=str(uuid4()), name=name, category=cat, aliases=[name.lower()]
+                    )
+                )
+        source = JobSource(id=str(uuid4()), name=tag, source_key=tag)
+        run_id = str(uuid4())
+        session.add(source)
+        await session.flush()
+        session.add(JobIngestionRun(id=run_id, source_id=source.id, status="RUNNING"))
+        await session.flush()
+
+        jobs = _sample_jobs(tag)
+        if bulk:
+            results = await JobIngestionService.process_job_batch(
+                session, jobs, run_id, tag
+            )
+        else:
+            results = [
+                await JobIngestionService.process_job_entry(
+                    session, job, run_id, tag
+                )
+                for job in jobs
+            ]
+
+        ids = [job["external_id"] for job in jobs]
+        postings = (
+            await session.execute(
+                select(JobPosting).where(JobPosting.source_id.in_(ids))
+            )
+        ).scalars().all()
+        posting_ids = [p.id for p in postings]
+        counts = {
+            "raw": await session.scalar(
+                select(func.count()).where(RawJobPosting.external_id.in_(ids))
+            ),
+            "primary": sum(1 for p in postings if p.is_primary),
+            "merged": sum(1 for p in postings if p.merged_into_id),
+            "skills": await session.scalar(
+                select(func.count()).where(
+                    JobPostingSkill.job_posting_id.in_(posting_ids)
+                )
+            ),
+            "compensation": await session.scalar(
+                select(func.count()).where(
+                    CompensationRecord.job_posting_id.in_(posting_ids)
+                )
+            ),
+            "duplicates": await session.scalar(
+                select(func.count()).where(
+                    JobDuplicate.duplicate_job_id.in_(posting_ids)
+                )
+            ),
+            "fingerprinted": sum(1 for p in postings if p.dedupe_fingerprint),
+            "lsh_bands": await session.scalar(
+                select(func.count()).where(
+                    JobPostingLSHBand.job_posting_id.in_(posting_ids)
+                )
+            ),
+        }
+        await session.rollback()
+
+    return results, events, counts
+
+
+@pytest.mark.asyncio
+async def test_bulk_batch_matches_row_by_row(monkeypatch):
+    tag = f"bulk{random.randint(100000, 999999)}"
+
+    row_results, row_events, row_counts = await _ingest(monkeypatch, False, tag)
+    bulk_results, bulk_events, bulk_counts = await _ingest(monkeypatch, True, tag)
+
+    assert row_results == [True, True, False, False]
+    assert bulk_results == row_results
+    assert bulk_events == row_events
+    assert bulk_counts == row_counts
+    assert bulk_counts["raw"] == 3
+    assert bulk_counts["merged"] == 1
+    assert bulk_counts["skills"] == 6
+    assert bulk_counts["lsh_bands"] == 3 * minhash_lsh_service.NUM_BANDS
+    assert bulk_counts["fingerprinted"] == 3
+
+
+@pytest.mark.asyncio
+async def test_lsh_candidates_keep_dedup_decisions(monkeypatch):
+    # Every company takes the LSH candidate path instead of the exhaustive scan
+    monkeypatch.setattr(minhash_lsh_service, "LSH_MIN_PRIMARIES", -1)
+    tag = f"lsh{random.randint(100000, 999999)}"
+
+    row_results, row_events, row_counts = await _ingest(monkeypatch, False, tag)
+    bulk_results, bulk_events, bulk_counts = await _ingest(monkeypatch, True, tag)
+
+    assert row_results == [True, True, False, False]
+    assert bulk_results == row_results
+    assert bulk_events == row_events
+    assert bulk_counts == row_counts
+    assert bulk_counts["merged"] == 1
+    assert bulk_counts["duplicates"] == 1
+
+
+async def _dedupe_company(monkeypatch, batch: bool, tag: str):
+    merged = []
+
+    async def record(event_type, data):
+        merged.append(data["merged_job_id"])
+
+    monkeypatch.setattr(EventBus, "publish", staticmethod(record))
+    rng = random.Random(11)
+    words = [f"w{i}" for i in range(30)]
+    base = rng.choices(words, k=25)
+
+    async with AsyncSessionLocal() as session:
+        company = Company(id=str(uuid4()), name=f"Dedupe Co {tag}")
+        session.add(company)
+        await session.flush()
+
+        postings = []
+        for i in range(40):
+            tokens = list(base)
+            for _ in range(rng.randint(0, 10)):
+                tokens[rng.randrange(len(tokens))] = rng.choice(words)
+            postings.append(
+                JobPosting(
+                    id=str(uuid4()),
+                    company_id=company.id,
+                    title="Backend Engineer",
+                    raw_title=rng.choice(["Backend Engineer", "Senior Backend Engineer", "Data Engineer"]),
+                    location=rng.choice(["Remote", "Austin, TX"]),
+                    description=" ".join(tokens),
+                    url=f"https://example.com/{tag}/{i}",
+                    source="TEST",
+                    source_id=f"{tag}_{batch}_{i}",
+                    post_date=date.today(),
+                )
+            )
+        if batch:
+            session.add_all(postings)
+            await session.flush()
+            results = await JobDeduplicationService.deduplicate_batch(session, postings)
+        else:
+            # Row-by-row ingestion inserts and evaluates one posting at a time
+            results = []
+            for posting in postings:
+                session.add(posting)
+                await session.flush()
+                results.append(
+                    await JobDeduplicationService.evaluate_and_deduplicate(session, posting)
+                )
+
+        ids = [p.id for p in postings]
+        pairs = (
+            await session.execute(
+                select(JobDuplicate.duplicate_job_id, JobDuplicate.primary_job_id, JobDuplicate.status)
+                .where(JobDuplicate.duplicate_job_id.in_(ids))
+            )
+        ).all()
+        audits = await session.scalar(
+            select(func.count()).where(DedupeAuditLog.merged_job_id.in_(ids))
+        )
+        await session.rollback()
+
+    # Compare by position, since the two runs use different posting ids
+    position = {posting_id: i for i, posting_id in enumerate(ids)}
+    decisions = [position.get(r) if r else None for r in results]
+    duplicates = sorted((position[d], position[p], status) for d, p, status in pairs)
+    return decisions, duplicates, audits, [position[m] for m in merged]
+
+
+@pytest.mark.asyncio
+async def test_deduplicate_batch_matches_evaluate_and_deduplicate(monkeypatch):
+    tag = f"dedupe{random.randint(100000, 999999)}"
+
+    scalar = await _dedupe_company(monkeypatch, False, tag)
+    batch = await _dedupe_company(monkeypatch, True, tag)
+
+    decisions, duplicates, audits, merged = batch
+    assert batch == scalar
+    assert audits == len(merged) == sum(1 for d in decisions if d is not None)
+    assert len(merged) > 5
+    assert any(status == "PENDING_REVIEW" for _, _, status in duplicates)
+
+
+@pytest.mark.asyncio
+async def test_corpus_dedup_merges_clusters_into_oldest_posting(monkeypatch):
+    events = []
+
+    async def record(event_type, data):
+        events.append((event_type, data))
+
+    monkeypatch.setattr(EventBus, "publish", staticmethod(record))
+    tag = f"corpus{random.randint(100000, 999999)}"
+    words = [f"w{i}" for i in range(60)]
+    base = words[:40]
+
+    async with AsyncSessionLocal() as session:
+        company = Company(id=str(uuid4()), name=f"Corpus Co {tag}")
+        session.add(company)
+        await session.flush()
+
+        def posting(i: int, tokens: list[str], days: int, **kwargs) -> JobPosting:
+            kwargs.setdefault("raw_title", "Backend Engineer")
+            return JobPosting(
+                id=str(uuid4()),
+                company_id=company.id,
+                title=kwargs["raw_title"],
+                location="Remote",
+                description=" ".join(tokens),
+                url=f"https://example.com/{tag}/{i}",
+                source="TEST",
+                source_id=f"{tag}_{i}",
+                post_date=date.today(),
+                created_at=datetime(2024, 1, 1 + days),
+                **kwargs,
+            )
+
+        # Ingested out of order: the newer posting became the primary
+        newer = posting(0, base, days=5)
+        older = posting(1, base[:36] + words[40:44], days=1)
+        other = posting(2, words[20:60], days=0, raw_title="Data Analyst")
+        session.add_all([newer, older, other])
+        await session.flush()
+        child = posting(
+            3, base, days=6, is_primary=False, is_active=False, merged_into_id=newer.id
+        )
+        session.add(child)
+        await session.commit()
+        ids = [newer.id, older.id, other.id, child.id]
+
+    progress = []
+    try:
+        dry = await CorpusDedupService.run(company_ids=[company.id], workers=1, dry_run=True)
+        stats = await CorpusDedupService.run(
+            company_ids=[company.id], workers=1, progress=progress.append
+        )
+
+        async with AsyncSessionLocal() as session:
+            rows = {
+                p.id: p
+                for p in (
+                    await session.execute(select(JobPosting).where(JobPosting.id.in_(ids)))
+                ).scalars()
+            }
+            dup = (
+                await session.execute(
+                    select(JobDuplicate).where(JobDuplicate.duplicate_job_id == newer.id)
+                )
+            ).scalar_one()
+    finally:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(JobPosting).where(JobPosting.id.in_(ids)))
+            await session.execute(delete(Company).where(Company.id == company.id))
+            await session.commit()
+
+    assert dry["merged"] == 1 and dry["dry_run"]
+    assert stats == {**dry, "dry_run": False, "elapsed_seconds": stats["elapsed_seconds"]}
+    assert stats["companies"] == 1 and stats["postings"] == 3 and stats["clusters"] == 1
+    assert progress[-1]["merged"] == 1
+
+    assert rows[older.id].is_primary and rows[older.id].is_active
+    assert rows[other.id].is_primary
+    assert not rows[newer.id].is_primary and not rows[newer.id].is_active
+    assert rows[newer.id].merged_into_id == older.id
+    # Postings merged into the demoted primary follow it to the canonical one
+    assert rows[child.id].merged_into_id == older.id
+    assert dup.primary_job_id == older.id and dup.status == "AUTO_MERGED"
+    assert events == [("market.corpus_dedup.completed", stats)]
+
+
+class _FakePagedOrchestrator(JobFetchOrchestrator):
+    """Serves 10 postings per page for 3 pages per target, tracking concurrency."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.requests = []
+
+    async def fetch_page(self, source_key, target, page):
+        self.requests.append((target, page))
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if page > 3:
+            return []
+        query, location = target
+        return [
+            {"external_id": f"{query}-{location}-{page}-{i}"} for i in range(10)
+        ]
+
+
+@pytest.mark.asyncio
+async def test_fetch_orchestrator_fans_out_with_bounded_concurrency():
+    async with _FakePagedOrchestrator(max_in_flight=3, max_pages=5) as orch:
+        jobs = await orch.fetch("jsearch", ["python", "go"], ["NYC", "Remote"], 1000)
+
+    # 4 targets x 3 non-empty pages, each target stops after its first empty page
+    assert len(jobs) == 120
+    assert len({job["external_id"] for job in jobs}) == 120
+    assert orch.peak_in_flight <= 3
+    assert {target for target, _ in orch.requests} == {
+        ("python", "NYC"),
+        ("python", "Remote"),
+        ("go", "NYC"),
+        ("go", "Remote"),
+    }
+    assert all(page <= 5 for _, page in orch.requests)
+
+
+@pytest.mark.asyncio
+async def test_fetch_orchestrator_stops_at_limit():
+    async with _FakePagedOrchestrator(max_in_flight=2, max_pages=10) as orch:
+        jobs = await orch.fetch("adzuna", ["python"], ["Remote"], limit=25)
+
+    assert len(jobs) == 25
+    # Two workers stop claiming pages once 25 postings are in hand
+    assert len(orch.requests) <= 4
+
+
+@pytest.mark.asyncio
+async def test_fetch_orchestrator_pages_lever_boards_on_pooled_client():
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        board = request.url.path.rsplit("/", 1)[-1]
+        skip = int(request.url.params["skip"])
+        seen.append((board, skip))
+        count = 100 if skip == 0 else 30 if skip == 100 else 0
+        return httpx.Response(
+            200,
+            json=[
+                {"id": f"{board}-{skip + i}", "text": "Engineer", "categories": {}}
+                for i in range(count)
+            ],
+        )
+
+    async with JobFetchOrchestrator(max_in_flight=4, max_pages=5) as orch:
+        orch._clients["lever"] = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler)
+        )
+        jobs = await orch.fetch("lever", ["acme", "globex"], limit=500)
+
+    assert len(jobs) == 260
+    assert {board for board, _ in seen} == {"acme", "globex"}
+    assert {job["company_name"] for job in jobs} == {"Acme", "Globex"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("bulk", [False, True])
+async def test_trigger_run_streams_with_live_counters(monkeypatch, bulk):
+    tag = f"stream{random.randint(100000, 999999)}"
+    run_ids = []
+    events = []
+    visible = []
+
+    async def record(event_type, data):
+        events.append(event_type)
+        if event_type == "market.job_ingestion_run.started":
+            run_ids.append(data["run_id"])
+        elif event_type == "market.job_ingested":
+            # Events are only published once their chunk is committed
+            async with AsyncSessionLocal() as other:
+                visible.append(
+                    await other.get(JobPosting, data["job_posting_id"]) is not None
+                )
+
+    async def committed_inserted() -> int:
+        async with AsyncSessionLocal() as other:
+            run = await other.get(JobIngestionRun, run_ids[0])
+            return run.items_inserted if run else 0
+
+    async def fake_fetch_page(self, source_key, target, page):
+        if page > 4:
+            return []
+        # Page n is only served once the previous pages are committed,
+        # which requires counters to be written while the run is going.
+        for _ in range(200):
+            if await committed_inserted() >= (page - 1) * 5:
+                break
+            await asyncio.sleep(0.01)
+        else:
+            raise AssertionError("run counters were not committed during the run")
+        return [
+            {
+                "external_id": f"{tag}_{page}_{i}",
+                "title": "Backend Engineer",
+                "company_name": f"Stream Co {tag} {page} {i}",
+                "description": f"Python, FastAPI and Kubernetes role {page}-{i}.",
+                "location_raw": "Remote",
+                "url": f"https://example.com/{tag}/{page}/{i}",
+                "salary_raw": None,
+                "raw_payload": {"page": page, "i": i},
+            }
+            for i in range(5)
+        ]
+
+    async def record_many(batch):
+        for event_type, data in batch:
+            await record(event_type, data)
+
+    monkeypatch.setattr(EventBus, "publish", staticmethod(record))
+    monkeypatch.setattr(EventBus, "publish_many", staticmethod(record_many))
+    monkeypatch.setattr(JobFetchOrchestrator, "fetch_page", fake_fetch_page)
+
+    async with AsyncSessionLocal() as session:
+        for name, cat in [
+            ("Python", "Language"),
+            ("FastAPI", "Framework"),
+            ("Kubernetes", "Infrastructure"),
+        ]:
+            res = await session.execute(
+                select(NormalizedSkill).where(NormalizedSkill.name == name)
+            )
+            if not res.scalar_one_or_none():
+                session.add(
+                    NormalizedSkill(
+                        id=str(uuid4()), name=name, category=cat, aliases=[name.lower()]
+                    )
+                )
+        await session.commit()
+
+        run_id = await JobIngestionService.trigger_run(
+            session, "jsearch", tag, "Remote", limit=100, bulk=bulk
+        )
+        await session.commit()
+
+    async with AsyncSessionLocal() as session:
+        run = await session.get(JobIngestionRun, run_id)
+        assert run.status == "COMPLETED"
+        assert run.items_scraped == 20
+        assert run.items_inserted == 20
+        assert run.items_failed == 0
+
+    assert events.count("market.job_ingested") == 20
+    assert all(visible)
+    assert events[0] == "market.job_ingestion_run.started"
+    assert events[-1] == "market.ingestion_completed"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("bulk", [False, True])
+async def test_recrawl_skips_unchanged_and_refreshes_changed(monkeypatch, bulk):
+    tag = f"hash{random.randint(100000, 999999)}"
+    events = []
+
+    async def record(event_type, data):
+        events.append((event_type, data))
+
+    monkeypatch.setattr(EventBus, "publish", staticmethod(record))
+
+    async def ingest(session, jobs, run_id):
+        if bulk:
+            return await JobIngestionService.process_job_batch(
+                session, jobs, run_id, tag
+            )
+        return [
+            await JobIngestionService.process_job_entry(session, job, run_id, tag)
+            for job in jobs
+        ]
+
+    async with AsyncSessionLocal() as session:
+        for name, cat in [
+            ("Python", "Language"),
+            ("FastAPI", "Framework"),
+            ("Kubernetes", "Infrastructure"),
+            ("React", "Framework"),
+        ]:
+            res = await session.execute(
+                select(NormalizedSkill).where(NormalizedSkill.name == name)
+            )
+            if not res.scalar_one_or_none():
+                session.add(
+                    NormalizedSkill(
+                        id=str(uuid4()), name=name, category=cat, aliases=[name.lower()]
+                    )
+                )
+        source = JobSource(id=str(uuid4()), name=tag, source_key=tag)
+        run_id = str(uuid4())
+        session.add(source)
+        await session.flush()
+        session.add(JobIngestionRun(id=run_id, source_id=source.id, status="RUNNING"))
+        await session.flush()
+
+        jobs = _sample_jobs(tag)[:2]
+        assert await ingest(session, jobs, run_id) == [True, True]
+
+        recrawl = [dict(job) for job in jobs]
+        recrawl[1]["description"] = "Python, FastAPI, Kubernetes and React. No salary listed."
+        recrawl[1]["title"] = "Senior Frontend Engineer"
+        events.clear()
+
+        assert await ingest(session, recrawl, run_id) == [False, False]
+        assert [event_type for event_type, _ in events] == ["market.job_updated"]
+        payload = events[0][1]
+        assert payload["changed_fields"] == ["title", "description"]
+        assert "React" in payload["skills"]
+
+        posting = (
+            await session.execute(
+                select(JobPosting).where(
+                    JobPosting.source_id == recrawl[1]["external_id"]
+                )
+            )
+        ).scalar_one()
+        await session.refresh(posting)
+        assert posting.title == "Senior Frontend Engineer"
+        assert posting.compensation_min is None
+        assert posting.content_hash == JobIngestionService.content_hash(recrawl[1])
+        assert await session.scalar(
+            select(func.count()).where(JobPostingSkill.job_posting_id == posting.id)
+        ) == len(payload["skills"])
+        assert await session.scalar(
+            select(func.count()).where(CompensationRecord.job_posting_id == posting.id)
+        ) == 0
+        raw = (
+            await session.execute(
+                select(RawJobPosting).where(
+                    RawJobPosting.external_id == recrawl[1]["external_id"]
+                )
+            )
+        ).scalar_one()
+        await session.refresh(raw)
+        assert raw.description == recrawl[1]["description"]
+
+        # A third identical crawl is a no-op
+        events.clear()
+        assert await ingest(session, recrawl, run_id) == [False, False]
+        assert events == []
+        await session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_board_crawl_sends_conditional_requests():
+    board = f"board{random.randint(100000, 999999)}"
+    seen_headers = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200,
+            headers={"ETag": '"v1"'},
+            json={"jobs": [{"id": 1, "title": "Engineer", "content": "<p>Go</p>"}]},
+        )
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        first = await GreenhouseCrawlerClient.fetch_board_jobs(board, client)
+        # Validators are only stored once the page has been processed
+        again = await GreenhouseCrawlerClient.fetch_board_jobs(board, client)
+        for url, validators in first.validators.items():
+            await ConditionalRequestCache.remember(url, validators)
+        second = await GreenhouseCrawlerClient.fetch_board_jobs(board, client)
+
+    assert [job["external_id"] for job in first] == ["greenhouse_1"]
+    assert again == first
+    assert second == []
+    assert seen_headers == [None, None, '"v1"']
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "limit, fail, stored",
+    [(2, False, True), (1, False, False), (2, True, False)],
+    ids=["committed", "truncated", "failed_item"],
+)
+async def test_board_validators_stored_after_commit(monkeypatch, limit, fail, stored):
+    board = f"vboard{random.randint(100000, 999999)}"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        jobs = [
+            {"id": f"{board}{i}", "title": "Engineer", "content": f"<p>Python {i}</p>"}
+            for i in range(2)
+        ]
+        return httpx.Response(200, headers={"ETag": '"v1"'}, json={"jobs": jobs})
+
+    async def ignore(*args, **kwargs):
+        pass
+
+    monkeypatch.setattr(EventBus, "publish", staticmethod(ignore))
+    monkeypatch.setattr(EventBus, "publish_many", staticmethod(ignore))
+    monkeypatch.setattr(
+        skill_fallback_service, "_batcher", SkillFallbackBatcher(FakeSkillFallbackModel())
+    )
+    if fail:
+        process_job_entry = JobIngestionService.process_job_entry
+
+        async def flaky(db, raw_job, *args, **kwargs):
+            if raw_job["external_id"].endswith("1"):
+                raise RuntimeError("boom")
+            return await process_job_entry(db, raw_job, *args, **kwargs)
+
+        monkeypatch.setattr(JobIngestionService, "process_job_entry", staticmethod(flaky))
+
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        monkeypatch.setattr(JobFetchOrchestrator, "client_for", lambda self, key: client)
+        async with AsyncSessionLocal() as session:
+            await JobIngestionService.trigger_run(
+                session, "greenhouse", board, "", limit=limit
+            )
+            await session.commit()
+
+    headers = await ConditionalRequestCache.request_headers(
+        ConditionalRequestCache.cache_key(
+            f"https://boards-api.greenhouse.io/v1/boards/{board}/jobs",
+            {"content": "true"},
+        )
+    )
+    assert headers == ({"If-None-Match": '"v1"'} if stored else {})
+
+
+@pytest.mark.asyncio
+async def test_reprocess_from_staging_resumes_from_checkpoint(monkeypatch):
+    tag = f"reproc{random.randint(100000, 999999)}"
+
+    async def ignore(event_type, data):
+        return None
+
+    monkeypatch.setattr(EventBus, "publish", staticmethod(ignore))
+
+    jobs = [
+        {
+            "external_id": f"{tag}_{i}",
+            "title": "Backend Engineer",
+            "company_name": f"Reprocess Co {tag} {i}",
+            "description": f"Python, FastAPI and Kubernetes role number {i}.",
+            "location_raw": "Remote",
+            "url": f"https://example.com/{tag}/{i}",
+            "salary_raw": None,
+            "raw_payload": {"i": i},
+        }
+        for i in range(5)
+    ]
+    async with AsyncSessionLocal() as session:
+        source = JobSource(id=str(uuid4()), name=tag, source_key=tag)
+        run_id = str(uuid4())
+        session.add(source)
+        await session.flush()
+        session.add(JobIngestionRun(id=run_id, source_id=source.id, status="RUNNING"))
+        await session.flush()
+        await JobIngestionService.process_job_batch(session, jobs, run_id, tag)
+        await session.commit()
+
+    try:
+        # A normalization change that only a reprocess can apply to stored rows
+        original = JobIngestionService.normalize_title
+        monkeypatch.setattr(
+            JobIngestionService,
+            "normalize_title",
+            staticmethod(lambda raw_title: "Reprocessed " + original(raw_title)),
+        )
+
+        # Crash on the second chunk: only the first chunk is checkpointed
+        real_chunk = StagingReprocessService.reprocess_chunk
+        calls = []
+
+        async def crashing_chunk(db, source_key, rows):
+            calls.append(len(rows))
+            if len(calls) == 2:
+                raise RuntimeError("worker died")
+            return await real_chunk(db, source_key, rows)
+
+        monkeypatch.setattr(
+            StagingReprocessService, "reprocess_chunk", staticmethod(crashing_chunk)
+        )
+        with pytest.raises(RuntimeError):
+            await StagingReprocessService.reprocess_source(tag, tag, chunk_size=2)
+
+        async with AsyncSessionLocal() as session:
+            checkpoint = (
+                await session.execute(
+                    select(StagingReprocessCheckpoint).where(
+                        StagingReprocessCheckpoint.job_name == tag
+                    )
+                )
+            ).scalar_one()
+            assert checkpoint.status == "RUNNING"
+            assert checkpoint.rows_processed == 2
+
+        monkeypatch.setattr(
+            StagingReprocessService, "reprocess_chunk", staticmethod(real_chunk)
+        )
+        stats = await StagingReprocessService.reprocess_source(tag, tag, chunk_size=2)
+        assert stats["rows"] == 3
+        assert stats["refreshed"] == 3
+
+        async with AsyncSessionLocal() as session:
+            titles = (
+                await session.execute(
+                    select(JobPosting.title).where(
+                        JobPosting.source_id.in_([job["external_id"] for job in jobs])
+                    )
+                )
+            ).scalars().all()
+            assert sorted(titles) == ["Reprocessed Backend Engineer"] * 5
+            skill_links = await session.scalar(
+                select(func.count())
+                .select_from(JobPostingSkill)
+                .join(JobPosting)
+                .where(JobPosting.source_id.in_([job["external_id"] for job in jobs]))
+            )
+            assert skill_links == 15
+
+        # Completed jobs are not redone unless restarted
+        stats = await StagingReprocessService.reprocess_source(tag, tag, chunk_size=2)
+        assert stats["chunks"] == 0
+    finally:
+        async with AsyncSessionLocal() as session:
+            ids = [job["external_id"] for job in jobs]
+            posting_ids = select(JobPosting.id).where(JobPosting.source_id.in_(ids))
+            await session.execute(
+                delete(JobPostingSkill).where(
+                    JobPostingSkill.job_posting_id.in_(posting_ids)
+                )
+            )
+            await session.execute(
+                delete(CompensationRecord).where(
+                    CompensationRecord.job_posting_id.in_(posting_ids)
+                )
+            )
+            await session.execute(delete(JobPosting).where(JobPosting.source_id.in_(ids)))
+            await session.execute(delete(JobSource).where(JobSource.source_key == tag))
+            await session.execute(
+                delete(StagingReprocessCheckpoint).where(
+                    StagingReprocessCheckpoint.job_name == tag
+                )
+            )
+            await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_reprocess_chunk_records_failing_rows(monkeypatch):
+    """A malformed staged row fails on its own instead of failing its chunk."""
+    tag = f"reprocbad{random.randint(100000, 999999)}"
+
+    async def ignore(*args, **kwargs):
+        return None
+
+    monkeypatch.setattr(EventBus, "publish", staticmethod(ignore))
+    monkeypatch.setattr(EventBus, "publish_many", staticmethod(ignore))
+    monkeypatch.setattr(
+        skill_fallback_service, "_batcher", SkillFallbackBatcher(FakeSkillFallbackModel())
+    )
+
+    jobs = [
+        {
+            "external_id": f"{tag}_{i}",
+            "title": "Backend Engineer",
+            "company_name": f"Reprocess Co {tag} {i}",
+            "description": f"Python, FastAPI and Kubernetes role number {i}.",
+            "location_raw": "Remote",
+            "url": f"https://example.com/{tag}/{i}",
+            "salary_raw": None,
+            "raw_payload": {"i": i},
+        }
+        for i in range(4)
+    ]
+    ids = [job["external_id"] for job in jobs]
+    async with AsyncSessionLocal() as session:
+        source = JobSource(id=str(uuid4()), name=tag, source_key=tag)
+        run_id = str(uuid4())
+        session.add(source)
+        await session.flush()
+        session.add(JobIngestionRun(id=run_id, source_id=source.id, status="RUNNING"))
+        await session.flush()
+        await JobIngestionService.process_job_batch(session, jobs, run_id, tag)
+        # Rows 2 and 3 are staged without a core posting
+        await session.execute(delete(JobPosting).where(JobPosting.source_id.in_(ids[2:])))
+        await session.commit()
+
+    try:
+        refresh_postings = JobIngestionService.refresh_postings
+        process_job_batch = JobIngestionService.process_job_batch
+        process_job_entry = JobIngestionService.process_job_entry
+
+        async def bad_refresh(db, refreshes, *args, **kwargs):
+            if any(raw_job["external_id"] == ids[1] for _, raw_job, _ in refreshes):
+                raise RuntimeError("malformed staged row")
+            return await refresh_postings(db, refreshes, *args, **kwargs)
+
+        async def bad_batch(db, raw_jobs, *args, **kwargs):
+            if any(raw_job["external_id"] == ids[3] for raw_job in raw_jobs):
+                raise RuntimeError("malformed staged row")
+            return await process_job_batch(db, raw_jobs, *args, **kwargs)
+
+        async def bad_entry(db, raw_job, *args, **kwargs):
+            if raw_job["external_id"] == ids[3]:
+                raise RuntimeError("malformed staged row")
+            return await process_job_entry(db, raw_job, *args, **kwargs)
+
+        monkeypatch.setattr(JobIngestionService, "refresh_postings", staticmethod(bad_refresh))
+        monkeypatch.setattr(JobIngestionService, "process_job_batch", staticmethod(bad_batch))
+        monkeypatch.setattr(JobIngestionService, "process_job_entry", staticmethod(bad_entry))
+
+        stats = await StagingReprocessService.reprocess_source(tag, tag, chunk_size=4)
+        assert stats["rows"] == 4
+        assert stats["refreshed"] == 1
+        assert stats["created"] == 1
+        assert stats["failed"] == 2
+
+        async with AsyncSessionLocal() as session:
+            checkpoint = (
+                await session.execute(
+                    select(StagingReprocessCheckpoint).where(
+                        StagingReprocessCheckpoint.job_name == tag
+                    )
+                )
+            ).scalar_one()
+            assert checkpoint.status == "COMPLETED"
+            assert checkpoint.rows_processed == 4
+            stored = (
+                await session.execute(
+                    select(JobPosting.source_id).where(JobPosting.source_id.in_(ids))
+                )
+            ).scalars().all()
+            assert sorted(stored) == ids[:3]
+    finally:
+        async with AsyncSessionLocal() as session:
+            await session.execute(delete(JobPosting).where(JobPosting.source_id.in_(ids)))
+            await session.execute(delete(JobSource).where(JobSource.source_key == tag))
+            await session.execute(
+                delete(StagingReprocessCheckpoint).where(
+                    StagingReprocessCheckpoint.job_name == tag
+                )
+            )
+            await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_add_new_skill_invalidates_cached_matcher():
+    """add_new_skill makes the new skill matchable without waiting for a reload."""
+    name = f"Skill{uuid4().hex[:8]}"
+    text = f"Hands-on experience with {name.lower()} pipelines."
+    async with AsyncSessionLocal() as session:
+        matcher = await SkillExtractionService.get_matcher(session)
+        assert await SkillExtractionService.get_matcher(session) is matcher
+        assert name not in matcher.match(text)
+
+        await SkillExtractionService.add_new_skill(session, name, "Tooling", [])
+        refreshed = await SkillExtractionService.get_matcher(session)
+        assert refreshed is not matcher
+        assert refreshed.match(text)[name].context_sentence == text.rstrip(".")
+        await session.rollback()
+
+        # The rolled back skill disappears again on the next version check
+        assert name not in (await SkillExtractionService.get_matcher(session)).match(text)
+
+
+@pytest.mark.asyncio
+async def test_resolve_alias_uses_term_index():
+    name = f"Skill{uuid4().hex[:8]}"
+    async with AsyncSessionLocal() as session:
+        skill = await SkillExtractionService.add_new_skill(
+            session, name, "Tooling", [f"{name.lower()}-cli"]
+        )
+        assert (
+            await SkillExtractionService.resolve_alias(session, f"  {name.upper()} ")
+        ).id == skill.id
+        assert (
+            await SkillExtractionService.resolve_alias(session, f"{name}-CLI")
+        ).id == skill.id
+        assert await SkillExtractionService.resolve_alias(session, f"{name}-sdk") is None
+        await session.rollback()
+
+
+@pytest.mark.asyncio
+async def test_bulk_ingestion_batches_llm_fallback(monkeypatch):
+    """Postings with few taxonomy skills share fallback prompts during bulk ingestion."""
+    model = FakeSkillFallbackModel()
+    monkeypatch.setattr(
+        skill_fallback_service, "_batcher", SkillFallbackBatcher(model, batch_size=8)
+    )
+
+    async def record(event_type, data):
+        pass
+
+    monkeypatch.setattr(EventBus, "publish", staticmethod(record))
+    tag = f"fallback{random.randint(100000, 999999)}"
+    jobs = [
+        {
+            "external_id": f"{tag}_{i}",
+            "title": title,
+            "company_name": f"{company} {tag}",
+            "description": description,
+            "location_raw": "Remote",
+            "url": f"https://example.com/{tag}/{i}",
+            "salary_raw": None,
+            "raw_payload": {"id": i},
+        }
+        for i, (company, title, description) in enumerate(
+            [
+                ("Initech", "Systems Engineer", "Build storage engines in Rust. Terraform a plus."),
+                ("Umbrella", "Data Engineer", "Stream events with Kafka and MongoDB."),
+                ("Hooli", "Platform Engineer", "Own our GCP estate and CI/CD pipelines."),
+            ]
+        )
+    ]
+
+    async with AsyncSessionLocal() as session:
+        source = JobSource(id=str(uuid4()), name=tag, source_key=tag)
+        run_id = str(uuid4())
+        session.add(source)
+        await session.flush()
+        session.add(JobIngestionRun(id=run_id, source_id=source.id, status="RUNNING"))
+        await session.flush()
+
+        results = await JobIngestionService.process_job_batch(session, jobs, run_id, tag)
+        links = (
+            await session.execute(
+                select(JobPostingSkill.extraction_method, JobPostingSkill.raw_mention)
+                .join(JobPosting, JobPosting.id == JobPostingSkill.job_posting_id)
+                .where(JobPosting.source_id.in_([job["external_id"] for job in jobs]))
+            )
+        ).all()
+        await session.rollback()
+
+    assert results == [True, True, True]
+    assert model.prompts == 1 and model.texts == 3
+    assert {
+        mention for method, mention in links if method == "LLM_FALLBACK"
+    } >= {"Rust", "Kafka", "GCP", "CI/CD"}
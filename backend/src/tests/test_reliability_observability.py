@@ -156,3 +156,614 @@ async def test_openapi_specification_endpoint():
         assert "openapi" in spec
         assert "paths" in spec
         assert "/api/v2/docs/openapi.json" in spec["paths"]
+
+@pytest.mark.asyncio
+async def test_hybrid_rate_limiter_leases_tokens_without_overshoot():
+    """
+    Test two limiter processes sharing one Redis admit exactly the limit,
+    deciding most requests from leased tokens instead of Redis round trips.
+    """
+    import asyncio
+    import fakeredis
+    from app.services.rate_limiter_service import HybridRateLimiter
+
+    server = fakeredis.FakeServer()
+    first = HybridRateLimiter(client=fakeredis.FakeAsyncRedis(server=server))
+    second = HybridRateLimiter(client=fakeredis.FakeAsyncRedis(server=server))
+
+    results = await asyncio.gather(
+        *[(first, second)[i % 2].acquire("rate_limit:bucket:u:/r", 100, 60) for i in range(300)]
+    )
+    assert sum(results) == 100
+    assert first.stats()["redis_calls"] + second.stats()["redis_calls"] < 30
+
+    # A denied key is answered locally until its bucket has refilled
+    calls = first.stats()["redis_calls"]
+    assert not await first.acquire("rate_limit:bucket:u:/r", 100, 60)
+    assert first.stats()["redis_calls"] == calls
+
+@pytest.mark.asyncio
+async def test_hybrid_rate_limiter_costs_and_redis_fallback():
+    """
+    Test route cost weights drain buckets faster, unused leases are returned,
+    and limits stay enforced per process while Redis is unreachable.
+    """
+    import fakeredis
+    from app.middleware.rate_limit import route_cost
+    from app.services.rate_limiter_service import HybridRateLimiter
+
+    assert route_cost("/api/v2/agents/run") == 5
+    assert route_cost("/api/v2/research/company/acme") == 5
+    assert route_cost("/api/v2/dashboard") == 1
+
+    server = fakeredis.FakeServer()
+    client = fakeredis.FakeAsyncRedis(server=server)
+    limiter = HybridRateLimiter(client=client)
+    assert [await limiter.acquire("costly", 10, 60, cost=4) for _ in range(3)] == [True, True, False]
+
+    # Leased tokens left unused past the lease TTL go back to the Redis bucket
+    short_lease = HybridRateLimiter(client=client, lease_ttl_ms=0)
+    assert await short_lease.acquire("refund", 100, 3600)
+    assert await short_lease.acquire("refund", 100, 3600)
+    tokens = float(await client.hget("refund", "tokens"))
+    assert 88 <= tokens < 90
+
+    class Unreachable:
+        def register_script(self, script):
+            async def run(**kwargs):
+                raise ConnectionError("redis down")
+            return run
+
+    offline = HybridRateLimiter(client=Unreachable(), redis_retry_seconds=60)
+    results = [await offline.acquire("offline", 5, 60) for _ in range(8)]
+    assert results == [True] * 5 + [False] * 3
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_local_state_shared_through_redis(monkeypatch):
+    """
+    Test breakers decide in process, share transitions with other workers
+    through Redis, limit half-open probes and export their state.
+    """
+    import fakeredis
+    from app.services import circuit_breaker_service
+    from app.services.circuit_breaker_service import BreakerSettings, CircuitBreakerRegistry
+
+    monkeypatch.setitem(
+        circuit_breaker_service.DEPENDENCY_SETTINGS,
+        "test-dependency",
+        BreakerSettings(failure_threshold=3, cooldown_seconds=0.0, half_open_max_probes=1),
+    )
+    server = fakeredis.FakeServer()
+    worker_a = CircuitBreakerRegistry(client=fakeredis.FakeAsyncRedis(server=server))
+    worker_b = CircuitBreakerRegistry(client=fakeredis.FakeAsyncRedis(server=server))
+
+    breaker = worker_a.get("test-dependency")
+    for _ in range(3):
+        probe = breaker.acquire()
+        breaker.record_failure(ValueError("upstream down"), probe)
+    assert breaker.state == "OPEN"
+    await worker_a.flush()
+
+    # The other worker adopts the transition on its next sync
+    assert await worker_b.sync() == 1
+    assert worker_b.get("test-dependency").state == "OPEN"
+    circuits = {c["service_name"]: c for c in await worker_b.snapshot()}
+    assert circuits["test-dependency"]["state"] == "OPEN"
+    assert circuits["test-dependency"]["failure_count"] == 3
+
+    # After the cooldown one probe at a time is let through; its success closes the circuit
+    probe = breaker.acquire()
+    assert probe and breaker.state == "HALF_OPEN"
+    with pytest.raises(CircuitOpenException):
+        breaker.acquire()
+    breaker.record_success(probe)
+    assert breaker.state == "CLOSED"
+    await worker_a.flush()
+    assert await worker_b.sync() == 1
+    assert worker_b.get("test-dependency").state == "CLOSED"
+
+    metrics = MetricsCollectionService.get_serialized_metrics()
+    assert 'careerpilot_circuit_breaker_state{service="test-dependency"} 0.0' in metrics
+    assert 'careerpilot_circuit_breaker_transitions_total{service="test-dependency",state="OPEN"}' in metrics
+
+@pytest.mark.asyncio
+async def test_cancelled_probe_releases_half_open_slot(monkeypatch):
+    """
+    Test a half-open probe that is cancelled frees its slot, so the next
+    call can probe and close the circuit.
+    """
+    import asyncio
+    import fakeredis
+    from app.services import circuit_breaker_service
+    from app.services.circuit_breaker_service import BreakerSettings, CircuitBreakerRegistry
+
+    monkeypatch.setitem(
+        circuit_breaker_service.DEPENDENCY_SETTINGS,
+        "test-cancelled-probe",
+        BreakerSettings(failure_threshold=1, cooldown_seconds=0.0, half_open_max_probes=1),
+    )
+    registry = CircuitBreakerRegistry(client=fakeredis.FakeAsyncRedis())
+    monkeypatch.setattr(
+        "app.services.reliability_manager_service.circuit_breakers", registry
+    )
+    breaker = registry.get("test-cancelled-probe")
+    breaker.record_failure(ValueError("upstream down"), breaker.acquire())
+    assert breaker.state == "OPEN"
+
+    async def hanging_call():
+        await asyncio.sleep(10)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(
+            ReliabilityManagerService.execute_with_breaker("test-cancelled-probe", hanging_call),
+            timeout=0.01,
+        )
+    assert breaker.state == "HALF_OPEN"
+    assert breaker.probes_in_flight == 0
+
+    async def healthy_call():
+        return "ok"
+
+    assert await ReliabilityManagerService.execute_with_breaker(
+        "test-cancelled-probe", healthy_call
+    ) == "ok"
+    assert breaker.state == "CLOSED"
+    await registry.flush()
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_works_without_redis(monkeypatch):
+    """
+    Test protected calls are decided locally when Redis is unreachable.
+    """
+    from app.services import circuit_breaker_service
+    from app.services.circuit_breaker_service import CircuitBreakerRegistry
+
+    class Unreachable:
+        def __getattr__(self, name):
+            raise ConnectionError("redis down")
+
+    registry = CircuitBreakerRegistry(client=Unreachable())
+    monkeypatch.setattr(circuit_breaker_service, "circuit_breakers", registry)
+    monkeypatch.setattr(
+        "app.services.reliability_manager_service.circuit_breakers", registry
+    )
+
+    def failing_call():
+        raise ValueError("timeout")
+
+    assert await ReliabilityManagerService.execute_with_breaker("qdrant-vector-service", lambda: 42) == 42
+    for _ in range(5):
+        with pytest.raises(ValueError):
+            await ReliabilityManagerService.execute_with_breaker("qdrant-vector-service", failing_call)
+    assert await ReliabilityManagerService.execute_with_breaker(
+        "qdrant-vector-service", failing_call, fallback_func=lambda: "cached"
+    ) == "cached"
+    await registry.flush()
+
+@pytest.mark.asyncio
+async def test_metrics_route_labels_stay_bounded(monkeypatch):
+    """
+    Test HTTP metrics are labelled with matched route templates and that
+    randomized paths collapse into the unmatched bucket.
+    """
+    import random
+    import string
+    from prometheus_client import REGISTRY
+    from app.middleware.metrics import UNMATCHED_ROUTE, route_templates
+
+    async def allow(*args, **kwargs):
+        return True
+
+    monkeypatch.setattr(ReliabilityManagerService, "check_rate_limit", allow)
+
+    def route_labels():
+        return {
+            sample.labels["route"]
+            for metric in REGISTRY.collect()
+            if metric.name == "careerpilot_api_requests"
+            for sample in metric.samples
+            if sample.name == "careerpilot_api_requests_total"
+        }
+
+    before = route_labels()
+    rng = random.Random(20)
+
+    def segment():
+        return "".join(rng.choices(string.ascii_lowercase + string.digits + "-_", k=rng.randint(1, 24)))
+
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        for _ in range(100):
+            await client.get(f"/api/v2/{segment()}/{segment()}")
+            await client.get(f"/api/v1/{uuid4()}")
+            # Matches a route template by path but not by method (405)
+            await client.get(f"/api/v2/market/postings/{uuid4()}/ghost-analyze")
+
+    new_labels = route_labels() - before
+    templates = set(route_templates(app.routes).values())
+    assert new_labels <= templates | {UNMATCHED_ROUTE}
+    assert len(new_labels) <= 2
+    assert "/api/v2/market/postings/{posting_id}/ghost-analyze" in route_labels()
+    assert UNMATCHED_ROUTE in route_labels()
+
+@pytest.mark.asyncio
+async def test_metrics_latency_exemplars_link_trace_ids():
+    """
+    Test request latency observations carry the OpenTelemetry trace id as
+    exemplar in the OpenMetrics exposition.
+    """
+    from opentelemetry.sdk.trace import TracerProvider
+    from app.core.config import parse_buckets
+
+    assert parse_buckets("1, 0.1,0.5") == (0.1, 0.5, 1.0)
+    with pytest.raises(ValueError):
+        parse_buckets("0,1")
+
+    tracer = TracerProvider().get_tracer(__name__)
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+        with tracer.start_as_current_span("exemplar-request") as span:
+            await client.get("/api/v2/health/liveness-exemplar")
+        trace_id = format(span.get_span_context().trace_id, "032x")
+
+        resp = await client.get("/metrics", headers={"Accept": "application/openmetrics-text"})
+    assert resp.headers["content-type"].startswith("application/openmetrics-text")
+    assert f'trace_id="{trace_id}"' in resp.text
+
+@pytest.mark.asyncio
+async def test_embed_batch_chunks_requests_and_preserves_order(monkeypatch):
+    """
+    Test embed_batch sends chunks of embedding_batch_size to the backend, at
+    most embedding_max_concurrency at a time, and returns vectors in input order.
+    """
+    import threading
+    from app.core.config import settings
+    from app.infrastructure.rag.embeddings.service import EmbeddingService, LocalEmbeddingBackend
+
+    monkeypatch.setattr(settings, "embedding_batch_size", 8)
+    monkeypatch.setattr(settings, "embedding_max_concurrency", 3)
+
+    class CountingBackend(LocalEmbeddingBackend):
+        def __init__(self):
+            super().__init__(latency=0.02)
+            self.in_flight = 0
+            self.max_in_flight = 0
+            self.sizes = []
+            self.lock = threading.Lock()
+
+        def embed(self, texts, task_type):
+            with self.lock:
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+                self.sizes.append(len(texts))
+            try:
+                return super().embed(texts, task_type)
+            finally:
+                with self.lock:
+                    self.in_flight -= 1
+
+    backend = CountingBackend()
+    service = EmbeddingService(backend=backend)
+    texts = [f"python engineer {i} with kubernetes" for i in range(50)] + ["  "]
+    vectors = await service.embed_batch(texts)
+
+    assert len(vectors) == 51
+    assert vectors[-1] is None
+    assert vectors[:50] == [LocalEmbeddingBackend._embed(text) for text in texts[:50]]
+    assert sorted(backend.sizes) == [2, 8, 8, 8, 8, 8, 8]
+    assert backend.max_in_flight <= 3
+    assert service.embed_text_sync(texts[0]) == vectors[0]
+    assert service.cosine_similarity(vectors[0], vectors[1]) > 0.5
+
+@pytest.mark.asyncio
+async def test_embed_batch_retries_failed_chunks(monkeypatch):
+    """
+    Test a failing chunk is retried on its own and, once retries are
+    exhausted, only its texts come back as None.
+    """
+    from app.core.config import settings
+    from app.infrastructure.rag.embeddings import service as embeddings
+    from app.infrastructure.rag.embeddings.service import EmbeddingService, LocalEmbeddingBackend
+
+    monkeypatch.setattr(settings, "embedding_batch_size", 4)
+    monkeypatch.setattr(settings, "embedding_max_retries", 2)
+    monkeypatch.setattr(embeddings, "_RETRY_BACKOFF_SECONDS", 0.0)
+
+    class FlakyBackend(LocalEmbeddingBackend):
+        def __init__(self):
+            super().__init__()
+            self.attempts = {}
+
+        def embed(self, texts, task_type):
+            attempt = self.attempts[texts[0]] = self.attempts.get(texts[0], 0) + 1
+            if texts[0] == "broken" or (texts[0] == "flaky" and attempt == 1):
+                raise RuntimeError("503 service unavailable")
+            return super().embed(texts, task_type)
+
+    backend = FlakyBackend()
+    texts = ["ok 1", "ok 2", "ok 3", "ok 4", "flaky", "f 2", "f 3", "f 4", "broken", "b 2"]
+    vectors = await EmbeddingService(backend=backend).embed_batch(texts)
+
+    assert all(vector is not None for vector in vectors[:8])
+    assert vectors[8:] == [None, None]
+    assert backend.attempts == {"ok 1": 1, "flaky": 2, "broken": 3}
+
+@pytest.mark.asyncio
+async def test_embedding_cache_serves_repeats_from_both_tiers():
+    """
+    Test repeated texts are embedded once: the in-process LRU answers this
+    worker, Redis answers a second worker, and whitespace variants share an entry.
+    """
+    import fakeredis
+    import numpy as np
+    from app.infrastructure.rag.embeddings.cache import EmbeddingCache
+    from app.infrastructure.rag.embeddings.service import EmbeddingService, LocalEmbeddingBackend
+    from app.services.metrics_collection_service import EMBEDDING_CACHE_LOOKUPS
+
+    def lookups(tier, result):
+        return EMBEDDING_CACHE_LOOKUPS.labels(tier=tier, result=result)._value.get()
+
+    server = fakeredis.FakeServer()
+    first_backend, second_backend = LocalEmbeddingBackend(), LocalEmbeddingBackend()
+    first = EmbeddingService(
+        backend=first_backend, cache=EmbeddingCache(client=fakeredis.FakeAsyncRedis(server=server))
+    )
+    second = EmbeddingService(
+        backend=second_backend, cache=EmbeddingCache(client=fakeredis.FakeAsyncRedis(server=server))
+    )
+    texts = ["Senior Python Engineer", "Data  Scientist\n", "Senior Python Engineer", "Data Scientist"]
+
+    vectors = await first.embed_batch(texts)
+    assert first_backend.texts == 2
+    assert vectors[0] == vectors[2] and vectors[1] == vectors[3]
+
+    memory_hits, redis_hits = lookups("memory", "hit"), lookups("redis", "hit")
+    cached = await first.embed_batch(texts)
+    assert first_backend.texts == 2
+    # The LRU holds packed float32 vectors
+    assert np.allclose(cached, vectors, atol=1e-6)
+    assert lookups("memory", "hit") - memory_hits == 4
+
+    again = await second.embed_batch(["Data Scientist", "Senior Python Engineer"])
+    assert second_backend.texts == 0
+    assert lookups("redis", "hit") - redis_hits == 2
+    assert again[1] == pytest.approx(vectors[0], abs=1e-6)
+    assert await second.embed_text("Senior   Python Engineer") == again[1]
+
+@pytest.mark.asyncio
+async def test_embedding_cache_version_invalidation_and_warm_up():
+    """
+    Test warm-up loads the most used entries of the current namespace and
+    a new cache version drops the entries of the previous one.
+    """
+    import fakeredis
+    from app.infrastructure.rag.embeddings.cache import EmbeddingCache
+    from app.infrastructure.rag.embeddings.service import EmbeddingService, LocalEmbeddingBackend
+
+    server = fakeredis.FakeServer()
+    redis = fakeredis.FakeAsyncRedis(server=server)
+    writer = EmbeddingService(backend=LocalEmbeddingBackend(), cache=EmbeddingCache(client=redis, version="1"))
+    await writer.embed_batch([f"role {i}" for i in range(10)])
+    for _ in range(3):
+        await writer.embed_batch(["role 7", "role 3"])
+
+    restarted = EmbeddingCache(client=fakeredis.FakeAsyncRedis(server=server), version="1")
+    assert await restarted.warm_up(LocalEmbeddingBackend.model, limit=2) == 2
+    assert len(restarted) == 2
+    cached = await restarted.get_many(LocalEmbeddingBackend.model, "SEMANTIC_SIMILARITY", ["role 7", "role 3"])
+    assert all(vector is not None for vector in cached)
+
+    upgraded_backend = LocalEmbeddingBackend()
+    upgraded = EmbeddingService(
+        backend=upgraded_backend, cache=EmbeddingCache(client=redis, version="2")
+    )
+    assert await upgraded.warm_up() == 0
+    assert await redis.keys("embedding_cache:local-feature-hash-768:v1:*") == []
+    await upgraded.embed_batch(["role 7"])
+    assert upgraded_backend.texts == 1
+
+def test_vector_similarity_and_top_k_search():
+    """
+    Test the NumPy similarity helpers agree with the exact definitions and
+    VectorIndex returns the k most similar ids, best first.
+    """
+    import math
+    import numpy as np
+    from app.infrastructure.rag.embeddings.similarity import (
+        VectorIndex, cosine, cosine_many, dot, top_k,
+    )
+
+    assert cosine([1.0, 0.0], [0.0, 2.0]) == 0.0
+    assert cosine([1.0, 2.0], [2.0, 4.0]) == pytest.approx(1.0)
+    assert cosine([0.0, 0.0], [1.0, 1.0]) == 0.0
+    assert cosine([1.0], [1.0, 2.0]) == 0.0
+    assert dot([1.0, 2.0, 3.0], [4.0, 5.0, 6.0]) == pytest.approx(32.0)
+
+    rng = np.random.default_rng(7)
+    corpus = rng.standard_normal((500, 64)).astype(np.float32)
+    corpus[42] = 0.0
+    query = rng.standard_normal(64).astype(np.float32)
+
+    def exact(a, b):
+        norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(x * x for x in b))
+        return sum(x * y for x, y in zip(a, b)) / norm if norm else 0.0
+
+    expected = [exact(query.tolist(), row.tolist()) for row in corpus]
+    assert cosine_many(corpus, query) == pytest.approx(expected, abs=1e-5)
+
+    indices, scores = top_k(np.array([0.1, 0.9, 0.5, 0.7], dtype=np.float32), 2)
+    assert indices.tolist() == [1, 3]
+    assert top_k(np.array([0.3, 0.1], dtype=np.float32), 5)[0].tolist() == [0, 1]
+
+    index = VectorIndex([f"role-{i}" for i in range(500)], corpus)
+    best = sorted(range(500), key=expected.__getitem__, reverse=True)[:5]
+    hits = index.search(query, k=5)
+    assert [i for i, _ in hits] == [f"role-{i}" for i in best]
+    assert [s for _, s in hits] == pytest.approx([expected[i] for i in best], abs=1e-5)
+    batched = index.search_many([query, corpus[3]], k=5)[0]
+    assert [i for i, _ in batched] == [i for i, _ in hits]
+    assert [s for _, s in batched] == pytest.approx([s for _, s in hits], abs=1e-5)
+    assert index.search_many([corpus[3]], k=1)[0][0][0] == "role-3"
+    with pytest.raises(ValueError):
+        VectorIndex(["a"], corpus[:2])
+
+@pytest.mark.asyncio
+async def test_quantized_vectors_round_trip_and_rescore():
+    """
+    Test fp16 and int8 packing shrinks vectors with bounded error, the cache
+    stores packed vectors, and int8 search re-scored in full precision
+    returns the exact top-k.
+    """
+    import fakeredis
+    import numpy as np
+    from app.infrastructure.rag.embeddings.cache import EmbeddingCache
+    from app.infrastructure.rag.embeddings.quantization import QuantizedIndex, pack, unpack
+    from app.infrastructure.rag.embeddings.similarity import VectorIndex
+
+    rng = np.random.default_rng(24)
+    vector = rng.standard_normal(768).astype(np.float32)
+    assert len(pack(vector, "fp32")) == 3072
+    assert len(pack(vector, "fp16")) == 1536
+    assert len(pack(vector, "int8")) == 772
+    assert np.allclose(unpack(pack(vector, "fp16"), "fp16"), vector, atol=1e-2)
+    scale = np.abs(vector).max() / 127
+    assert np.abs(unpack(pack(vector, "int8"), "int8") - vector).max() <= scale / 2 + 1e-6
+    assert not unpack(pack(np.zeros(4), "int8"), "int8").any()
+
+    cache = EmbeddingCache(client=fakeredis.FakeAsyncRedis(), precision="int8")
+    await cache.put_many("model", "SEMANTIC_SIMILARITY", [("text", vector.tolist())])
+    assert cache.nbytes == 772
+    assert cache.namespace("model").endswith(":int8")
+    cached = (await cache.get_many("model", "SEMANTIC_SIMILARITY", ["text"]))[0]
+    assert np.dot(cached, vector) / (np.linalg.norm(cached) * np.linalg.norm(vector)) > 0.999
+
+    # Clustered corpus: many near-ties, where int8 alone can misorder neighbours
+    centers = rng.standard_normal((20, 128)).astype(np.float32)
+    corpus = centers[rng.integers(0, 20, 2000)] + 0.3 * rng.standard_normal((2000, 128)).astype(np.float32)
+    ids = list(range(2000))
+    exact = VectorIndex(ids, corpus)
+    quantized = QuantizedIndex(ids, corpus, "int8", full_precision=corpus, oversampling=4.0)
+    assert quantized.nbytes < exact.matrix.nbytes / 3
+    for query in corpus[:20] + 0.1:
+        expected = exact.search(query, 10)
+        rescored = quantized.search(query, 10)
+        assert [i for i, _ in rescored] == [i for i, _ in expected]
+        assert [s for _, s in rescored] == pytest.approx([s for _, s in expected], abs=1e-5)
+
+@pytest.mark.asyncio
+async def test_hybrid_retrieval_runs_legs_concurrently_and_degrades(monkeypatch):
+    """
+    Test hybrid retrieval against an in-memory Qdrant and Postgres session
+    doubles: both legs run concurrently and are fused with RRF (k=60), and a
+    leg that times out or fails leaves the results of the other. BM25 runs
+    on a session of its own, never on the caller's.
+    """
+    import asyncio
+    import time
+    from types import SimpleNamespace
+    from uuid import UUID
+    from qdrant_client import AsyncQdrantClient
+    from app.core.config import settings
+    from app.infrastructure.rag.embeddings.service import EmbeddingService, LocalEmbeddingBackend
+    from app.services.agent import retrieval
+    from app.services.agent.models import HybridRetrievalRequest
+    from app.services.agent.retrieval import BM25_QUERY, HybridRetrievalService, reciprocal_rank_fusion
+    from app.services.metrics_collection_service import RETRIEVAL_LEG_DURATION
+
+    assert reciprocal_rank_fusion([["a", "b", "c"], ["c", "d"]]) == [
+        ("c", pytest.approx(1 / 63 + 1 / 61)), ("a", pytest.approx(1 / 61)),
+        ("b", pytest.approx(1 / 62)), ("d", pytest.approx(1 / 62)),
+    ]
+    assert reciprocal_rank_fusion([[], []]) == []
+
+    postings = [
+        {"job_id": uuid4(), "title": title, "company_name": company, "description": description,
+         "skills": skills, "location": "Remote"}
+        for title, company, description, skills in [
+            ("Python Backend Engineer", "Acme", "Build APIs in python", ["python", "fastapi"]),
+            ("Frontend Developer", "Globex", "React user interfaces", ["react", "typescript"]),
+            ("Data Engineer", "Initech", "Spark pipelines in python", ["python", "spark"]),
+            ("Mobile Developer", "Umbrella", "Native apps", ["swift", "kotlin"]),
+        ]
+    ]
+    by_id = {p["job_id"]: p for p in postings}
+
+    class SessionDouble:
+        """Answers the BM25 and description queries like Postgres would."""
+
+        def __init__(self, bm25_ids, delay=0.0):
+            self.bm25_ids, self.delay = bm25_ids, delay
+            self.closed = False
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc_info):
+            self.closed = True
+
+        async def execute(self, sql, params):
+            if sql is BM25_QUERY:
+                await asyncio.sleep(self.delay)
+                rows = [SimpleNamespace(id=str(i), title=by_id[i]["title"],
+                                        company_name=by_id[i]["company_name"]) for i in self.bm25_ids]
+            else:
+                rows = [SimpleNamespace(id=i, description=by_id[UUID(i)]["description"]) for i in params["ids"]]
+            return SimpleNamespace(fetchall=lambda: rows)
+
+    class RerankerDown:
+        async def ainvoke(self, prompt):
+            raise RuntimeError("reranker unavailable")
+
+    monkeypatch.setattr(
+        retrieval, "embedding_service", EmbeddingService(backend=LocalEmbeddingBackend(latency=0.2))
+    )
+    lexical = [postings[2]["job_id"], postings[0]["job_id"]]
+    lexical_sessions = []
+
+    def lexical_session(delay=0.2):
+        lexical_sessions.append(SessionDouble(lexical, delay))
+        return lexical_sessions[-1]
+
+    class CallerSession(SessionDouble):
+        async def execute(self, sql, params):
+            assert sql is not BM25_QUERY, "BM25 must not run on the caller's session"
+            return await super().execute(sql, params)
+
+    service = HybridRetrievalService(
+        qdrant=AsyncQdrantClient(location=":memory:"), llm=RerankerDown(),
+        session_factory=lexical_session,
+    )
+    assert await service.index_job_postings(postings) == 4
+
+    request = HybridRetrievalRequest(query="python engineer", limit=4, rerank_top_k=4)
+    started = time.perf_counter()
+    results = await service.search(CallerSession([]), request)
+    assert time.perf_counter() - started < 0.35
+    fused = {r.job_id: r for r in results}
+    assert set(fused[postings[0]["job_id"]].retrieval_sources) == {"vector", "bm25"}
+    both = fused[postings[2]["job_id"]]
+    assert both.rrf_score == pytest.approx(1 / (60 + both.vector_rank) + 1 / (60 + both.bm25_rank))
+    assert [r.rrf_score for r in results] == sorted((r.rrf_score for r in results), reverse=True)
+
+    # The BM25 leg times out: vector results only, without waiting for it
+    timeouts = RETRIEVAL_LEG_DURATION.labels(leg="bm25", outcome="timeout")._sum.get()
+    monkeypatch.setattr(settings, "retrieval_lexical_timeout", 0.3)
+    service.session_factory = lambda: lexical_session(delay=5.0)
+    started = time.perf_counter()
+    results = await service.search(CallerSession([]), request)
+    assert time.perf_counter() - started < 1.0
+    assert results and all(r.retrieval_sources == ["vector"] for r in results)
+    # The cancelled query only took its own session down
+    assert lexical_sessions[-1].closed
+    assert RETRIEVAL_LEG_DURATION.labels(leg="bm25", outcome="timeout")._sum.get() > timeouts
+
+    # Qdrant fails: BM25 results only
+    class QdrantDown:
+        async def query_points(self, **kwargs):
+            raise ConnectionError("qdrant unreachable")
+
+    service.qdrant = QdrantDown()
+    service.session_factory = lambda: lexical_session(delay=0.0)
+    results = await service.search(CallerSession([]), request)
+    assert [r.job_id for r in results] == lexical
+    assert all(r.retrieval_sources == ["bm25"] for r in results)